@@ -29,6 +29,31 @@ from ...engine.schemas.agent_schemas import (
 
 setup_logger("ERROR")
 
+# Characters remembered from the end of the text already seen in a block,
+# to check that the next cumulative text continues it
+_SEEN_TAIL = 16
+
+
+def _text_delta(seen: Dict, key: Tuple[str, int], text: str) -> str:
+    """
+    Return the part of the cumulative ``text`` of block ``key`` that has
+    not been seen yet.
+
+    AgentScope messages repeat all text so far in every chunk; slicing at
+    the last seen length keeps the cost per chunk proportional to the
+    delta instead of to the whole text.
+    """
+    prev = seen.get(key)
+    seen[key] = (len(text), text[-_SEEN_TAIL:])
+    if prev is None:
+        return text
+
+    length, tail = prev
+    if length <= len(text) and text[length - len(tail) : length] == tail:
+        return text[length:]
+    # Not a continuation, treat it as new text
+    return text
+
 
 async def adapt_agentscope_message_stream(
     source_stream: AsyncIterator[Tuple[Msg, bool]],
@@ -46,8 +71,8 @@ async def adapt_agentscope_message_stream(
         type=MessageType.REASONING,
         role="assistant",
     )
-    local_truncate_memory = ""
-    local_truncate_reasoning_memory = ""
+    # (block type, ordinal among blocks of that type) -> seen text
+    seen_text = {}
     should_start_message = True
     should_start_reasoning_message = True
     tool_use_messages_dict = {}
@@ -56,16 +81,13 @@ async def adapt_agentscope_message_stream(
 
     # Run agent
     async for msg, last in source_stream:
-        # deepcopy required to avoid modifying the original message object
-        # which may be used elsewhere in the streaming pipeline
-        msg = copy.deepcopy(msg)
-
+        # The source msg is shared with the rest of the pipeline and is
+        # only ever read here, never copied or modified
         assert isinstance(msg, Msg), f"Expected Msg, got {type(msg)}"
 
         # If a new message, create new Message
         if msg.id != msg_id:
-            local_truncate_memory = ""
-            local_truncate_reasoning_memory = ""
+            seen_text = {}
 
             # Yield new Msg instances as they are logged
             last_content = ""
@@ -87,39 +109,47 @@ async def adapt_agentscope_message_stream(
             # Cache msg id
             msg_id = msg.id
 
+        # msg content
+        content = msg.content
+
         new_blocks = []
         new_tool_blocks = []
-        if isinstance(msg.content, List):
-            for block in msg.content:
+        if isinstance(content, List):
+            for block in content:
                 if block.get("type", "") != "tool_use":
                     new_blocks.append(block)
                 else:
                     new_tool_blocks.append(block)
             if new_tool_blocks:
                 if tool_start:  # Only for close the last msg
-                    msg.content = new_tool_blocks
+                    content = new_tool_blocks
                 else:
                     tool_start = True
 
             else:
-                msg.content = new_blocks
+                content = new_blocks
 
-        if not msg.content:
+        if not content:
             continue
 
-        # msg content
-        content = msg.content
-
         # msg usage
         usage = getattr(msg, "usage", None)
 
-        # msg metadata
+        # msg metadata, copied so the emitted messages never share it
         metadata = msg.metadata
+        if isinstance(metadata, dict):
+            metadata = dict(metadata)
 
         if isinstance(content, str):
             last_content = content
         else:
+            ordinals = {}
             for element in content:
+                if isinstance(element, dict):
+                    block_type = element.get("type")
+                    ordinal = ordinals.get(block_type, 0)
+                    ordinals[block_type] = ordinal + 1
+                    block_key = (block_type, ordinal)
                 if isinstance(element, str) and element:
                     if should_start_message:
                         index = None
@@ -151,9 +181,10 @@ async def adapt_agentscope_message_stream(
                             continue
                         fn = type_converters[blk_type]
                         # Send  message, element, last, tool_start, metadata
-                        # and usage
+                        # and usage. The block is copied since converters
+                        # may modify it.
                         out = fn(
-                            element,
+                            copy.deepcopy(element),
                             message,
                             last,
                             tool_start,
@@ -198,13 +229,7 @@ async def adapt_agentscope_message_stream(
                             text_delta_content = TextContent(
                                 delta=True,
                                 index=index,
-                                text=text.removeprefix(
-                                    local_truncate_memory,
-                                ),
-                            )
-                            local_truncate_memory = element.get(
-                                "text",
-                                "",
+                                text=_text_delta(seen_text, block_key, text),
                             )
                             text_delta_content = message.add_delta_content(
                                 new_content=text_delta_content,
@@ -251,14 +276,12 @@ async def adapt_agentscope_message_stream(
                             text_delta_content = TextContent(
                                 delta=True,
                                 index=index,
-                                text=reasoning.removeprefix(
-                                    local_truncate_reasoning_memory,
+                                text=_text_delta(
+                                    seen_text,
+                                    block_key,
+                                    reasoning,
                                 ),
                             )
-                            local_truncate_reasoning_memory = element.get(
-                                "thinking",
-                                "",
-                            )
                             text_delta_content = (
                                 reasoning_message.add_delta_content(
                                     new_content=text_delta_content,
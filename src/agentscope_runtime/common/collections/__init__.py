@@ -1,22 +1,36 @@
 # -*- coding: utf-8 -*-
+from .async_redis import LoopLocalRedis
 from .base_mapping import Mapping
 from .base_set import SetCollection
 from .base_queue import Queue
+from .base_sorted_set import SortedSetCollection
+from .base_port_allocator import PortAllocator
 from .redis_set import RedisSetCollection
 from .redis_queue import RedisQueue
 from .redis_mapping import RedisMapping
+from .redis_sorted_set import RedisSortedSetCollection
+from .redis_port_allocator import RedisPortAllocator
 from .in_memory_queue import InMemoryQueue
 from .in_memory_set import InMemorySetCollection
 from .in_memory_mapping import InMemoryMapping
+from .in_memory_sorted_set import InMemorySortedSetCollection
+from .in_memory_port_allocator import InMemoryPortAllocator
 
 __all__ = [
+    "LoopLocalRedis",
     "Mapping",
     "SetCollection",
     "Queue",
+    "SortedSetCollection",
+    "PortAllocator",
     "RedisSetCollection",
     "RedisQueue",
     "RedisMapping",
+    "RedisSortedSetCollection",
+    "RedisPortAllocator",
     "InMemoryQueue",
     "InMemorySetCollection",
     "InMemoryMapping",
+    "InMemorySortedSetCollection",
+    "InMemoryPortAllocator",
 ]
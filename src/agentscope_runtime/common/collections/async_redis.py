@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import threading
+import weakref
+from typing import Any, Callable
+
+
+class LoopLocalRedis:
+    """
+    Hands out one ``redis.asyncio`` client per event loop.
+
+    Async Redis connections belong to the loop that opened them, so one
+    client cannot be shared between e.g. the server loop and loops started
+    with ``asyncio.run()`` in worker threads.
+    """
+
+    def __init__(self, factory: Callable[[], Any]):
+        self.factory = factory
+        self._clients = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def get(self):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._clients.get(loop)
+            if client is None:
+                client = self.factory()
+                self._clients[loop] = client
+        return client
+
+    async def aclose(self):
+        """Close the client of the running loop, if any."""
+        with self._lock:
+            client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Dict, Iterator, List, Tuple
 
 
 class Mapping(ABC):
@@ -18,3 +19,61 @@ class Mapping(ABC):
     @abstractmethod
     def scan(self, prefix: str):
         pass
+
+    # Bulk operations. The defaults fall back to one call per key;
+    # networked backends override them to batch round trips.
+    def mget(self, keys: List[str]) -> List[Any]:
+        return [self.get(key) for key in keys]
+
+    def mset(self, items: Dict[str, Any]):
+        for key, value in items.items():
+            self.set(key, value)
+
+    def mdelete(self, keys: List[str]):
+        for key in keys:
+            self.delete(key)
+
+    def scan_items(
+        self,
+        prefix: str = "",
+        count: int = 100,
+    ) -> Iterator[Tuple[str, Any]]:
+        """Yield ``(key, value)`` pairs for keys starting with ``prefix``.
+
+        Values are fetched in batches of roughly ``count`` keys. Keys
+        deleted between the scan and the fetch are skipped.
+        """
+        batch = []
+        for key in self.scan(prefix):
+            batch.append(key)
+            if len(batch) >= count:
+                yield from self._zip_existing(batch)
+                batch = []
+        if batch:
+            yield from self._zip_existing(batch)
+
+    def _zip_existing(self, keys: List[str]) -> Iterator[Tuple[str, Any]]:
+        for key, value in zip(keys, self.mget(keys)):
+            if value is not None:
+                yield key, value
+
+    # Async variants. The defaults call the sync methods directly, which
+    # is right for in-memory backends; networked ones override them.
+    async def aset(self, key: str, value: Any):
+        self.set(key, value)
+
+    async def aget(self, key: str) -> Any:
+        return self.get(key)
+
+    async def adelete(self, key: str):
+        self.delete(key)
+
+    async def amget(self, keys: List[str]) -> List[Any]:
+        return self.mget(keys)
+
+    async def amdelete(self, keys: List[str]):
+        self.mdelete(keys)
+
+    async def ascan(self, prefix: str = "") -> AsyncIterator[str]:
+        for key in list(self.scan(prefix)):
+            yield key
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+import socket
+import time
+from abc import ABC, abstractmethod
+from typing import Iterable, List, Set
+
+# Seconds a newly allocated port is kept before it can be reclaimed
+PORT_RECLAIM_GRACE = 300
+
+
+def is_port_bindable(port: int) -> bool:
+    """Whether nothing else on this host listens on ``port``."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        try:
+            s.bind(("", port))
+            return True
+        except OSError:
+            return False
+
+
+class PortAllocator(ABC):
+    """
+    Host ports of a range, handed out from a bitmap.
+
+    Bit ``i`` (most significant bit first, as Redis ``SETBIT`` counts) is
+    set while ``port_range[i]`` is allocated. The scan for free ports
+    starts from a rotating cursor at the last port handed out, so it
+    passes over few allocated ports whatever the occupancy, and free
+    ports are claimed by test-and-set. Ports something else on the host
+    has bound are skipped.
+    """
+
+    def __init__(self, port_range: range, check_bind: bool = True):
+        self.port_range = port_range
+        self.check_bind = check_bind
+
+    @abstractmethod
+    def _load(self) -> bytes:
+        """The bitmap; missing trailing bytes are all free."""
+
+    @abstractmethod
+    def _get_cursor(self) -> int:
+        pass
+
+    @abstractmethod
+    def _set_cursor(self, offset: int):
+        pass
+
+    @abstractmethod
+    def _claim(self, offsets: List[int]) -> List[int]:
+        """Set the bits of ``offsets``; return those that were free."""
+
+    @abstractmethod
+    def _release(self, offsets: List[int]):
+        pass
+
+    @abstractmethod
+    def _mark(self, offsets: List[int]):
+        """Set the bits of ports found in use elsewhere."""
+
+    @abstractmethod
+    def _claimed_since(self, offsets: List[int], since: float) -> Set[int]:
+        """Those of ``offsets`` claimed at ``since`` or later."""
+
+    def _scan(
+        self,
+        bitmap: bytes,
+        start: int,
+        n: int,
+        exclude: Set[int],
+    ) -> List[int]:
+        size = len(self.port_range)
+        found = []
+        checked = 0
+        offset = start % size
+        while checked < size and len(found) < n:
+            byte_index = offset >> 3
+            value = bitmap[byte_index] if byte_index < len(bitmap) else 0
+            if value == 0xFF and not offset & 7:
+                # Skip a whole byte of allocated ports
+                step = min(8, size - offset)
+            else:
+                step = 1
+                if (
+                    not value & (0x80 >> (offset & 7))
+                    and offset not in exclude
+                ):
+                    found.append(offset)
+            checked += step
+            offset = (offset + step) % size
+        return found
+
+    def allocate(self, n: int) -> List[int]:
+        """Allocate ``n`` free ports.
+
+        Raises:
+            RuntimeError: If not enough free ports are available.
+        """
+        ports = []
+        tried = set()
+        while len(ports) < n:
+            need = n - len(ports)
+            offsets = self._scan(self._load(), self._get_cursor(), need, tried)
+            if not offsets:
+                self.release(ports)
+                raise RuntimeError(
+                    "Not enough free ports available in the specified range.",
+                )
+            tried.update(offsets)
+            self._set_cursor((offsets[-1] + 1) % len(self.port_range))
+            for offset in self._claim(offsets):
+                port = self.port_range[offset]
+                if not self.check_bind or is_port_bindable(port):
+                    ports.append(port)
+                else:
+                    # Bound by something else, try the next one
+                    self._release([offset])
+        return ports
+
+    def _offsets(self, ports: Iterable[int]) -> List[int]:
+        return [
+            int(port) - self.port_range.start
+            for port in ports
+            if int(port) in self.port_range
+        ]
+
+    def release(self, ports: Iterable[int]):
+        offsets = self._offsets(ports)
+        if offsets:
+            self._release(offsets)
+
+    def allocated(self) -> List[int]:
+        bitmap = self._load()
+        return [
+            port
+            for offset, port in enumerate(self.port_range)
+            if offset >> 3 < len(bitmap)
+            and bitmap[offset >> 3] & (0x80 >> (offset & 7))
+        ]
+
+    def reconcile(
+        self,
+        in_use: Iterable[int],
+        grace: float = PORT_RECLAIM_GRACE,
+    ) -> int:
+        """Match the bitmap to the ports actually in use.
+
+        Ports in ``in_use`` are marked allocated. Allocated ports not in
+        it are reclaimed, unless they were allocated within the last
+        ``grace`` seconds (their container may still be being created).
+
+        Returns:
+            int: The number of ports reclaimed.
+        """
+        in_use_offsets = set(self._offsets(in_use))
+        self._mark(sorted(in_use_offsets))
+        leaked = [
+            offset
+            for offset in self._offsets(self.allocated())
+            if offset not in in_use_offsets
+        ]
+        if not leaked:
+            return 0
+        recent = self._claimed_since(leaked, time.time() - grace)
+        leaked = [offset for offset in leaked if offset not in recent]
+        if leaked:
+            self._release(leaked)
+        return len(leaked)
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 # file: base_queue.py
 from abc import ABC, abstractmethod
+from typing import List
 
 
 class Queue(ABC):
@@ -23,3 +24,26 @@ class Queue(ABC):
     @abstractmethod
     def size(self) -> int:
         pass
+
+    def enqueue_many(self, items: List[dict]):
+        for item in items:
+            self.enqueue(item)
+
+    def dequeue_many(self, count: int) -> List[dict]:
+        """Dequeue up to ``count`` items, fewer if the queue runs empty."""
+        items = []
+        for _ in range(count):
+            item = self.dequeue()
+            if item is None:
+                break
+            items.append(item)
+        return items
+
+    async def aenqueue(self, item: dict):
+        self.enqueue(item)
+
+    async def adequeue(self) -> dict:
+        return self.dequeue()
+
+    async def asize(self) -> int:
+        return self.size()
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 # file: base_set_collection.py
 from abc import ABC, abstractmethod
+from typing import List
 
 
 class SetCollection(ABC):
@@ -23,3 +24,36 @@ class SetCollection(ABC):
     @abstractmethod
     def to_list(self) -> list:
         pass
+
+    @abstractmethod
+    def size(self) -> int:
+        pass
+
+    def remove_many(self, values: List[str]):
+        for value in values:
+            self.remove(value)
+
+    def move(self, value: str, sources: List["SetCollection"]) -> bool:
+        """Add value and remove it from each of sources.
+
+        Returns whether value was added, i.e. was not in this set yet.
+        """
+        added = self.add(value)
+        for source in sources:
+            source.remove(value)
+        return added
+
+    async def aadd(self, value: str):
+        return self.add(value)
+
+    async def aremove(self, value: str):
+        self.remove(value)
+
+    async def amove(self, value: str, sources: List["SetCollection"]):
+        return self.move(value, sources)
+
+    async def aremove_many(self, values: List[str]):
+        self.remove_many(values)
+
+    async def asize(self) -> int:
+        return self.size()
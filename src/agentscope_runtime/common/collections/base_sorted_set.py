@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+from abc import ABC, abstractmethod
+from typing import List, Optional, Tuple
+
+
+class SortedSetCollection(ABC):
+    """
+    Set of members ordered by a float score, e.g. a deadline timestamp.
+    """
+
+    @abstractmethod
+    def add(self, member: str, score: float, gt: bool = False):
+        """Insert or update member. With ``gt`` only raise its score."""
+
+    @abstractmethod
+    def remove(self, member: str):
+        pass
+
+    @abstractmethod
+    def score(self, member: str) -> Optional[float]:
+        pass
+
+    @abstractmethod
+    def pop_due(
+        self,
+        max_score: float,
+        limit: int = 100,
+    ) -> List[Tuple[str, float]]:
+        """
+        Remove and return up to ``limit`` members with score <= max_score,
+        lowest score first. A member is returned to one caller only.
+        """
+
+    @abstractmethod
+    def peek_min(self) -> Optional[Tuple[str, float]]:
+        pass
+
+    @abstractmethod
+    def clear(self):
+        pass
+
+    @abstractmethod
+    def size(self) -> int:
+        pass
+
+    def remove_many(self, members: List[str]):
+        for member in members:
+            self.remove(member)
+
+    async def aadd(self, member: str, score: float, gt: bool = False):
+        return self.add(member, score, gt=gt)
+
+    async def aremove_many(self, members: List[str]):
+        self.remove_many(members)
@@ -25,3 +25,11 @@ class InMemoryMapping(Mapping):
             yield from list(
                 key for key in self.store if key.startswith(prefix)
             )
+
+    def scan_items(self, prefix: str = "", count: int = 100):
+        prefix = prefix or ""
+        yield from [
+            (key, value)
+            for key, value in list(self.store.items())
+            if key.startswith(prefix) and value is not None
+        ]
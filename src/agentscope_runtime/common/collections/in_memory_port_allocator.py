@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+from typing import List, Set
+
+from .base_port_allocator import PortAllocator
+
+
+class InMemoryPortAllocator(PortAllocator):
+    def __init__(self, port_range: range, check_bind: bool = True):
+        super().__init__(port_range, check_bind=check_bind)
+        self.bitmap = bytearray((len(port_range) + 7) // 8)
+        self.cursor = 0
+        self.claimed_at = {}
+        self.lock = threading.Lock()
+
+    def _load(self) -> bytes:
+        with self.lock:
+            return bytes(self.bitmap)
+
+    def _get_cursor(self) -> int:
+        return self.cursor
+
+    def _set_cursor(self, offset: int):
+        self.cursor = offset
+
+    def _claim(self, offsets: List[int]) -> List[int]:
+        claimed = []
+        now = time.time()
+        with self.lock:
+            for offset in offsets:
+                mask = 0x80 >> (offset & 7)
+                if not self.bitmap[offset >> 3] & mask:
+                    self.bitmap[offset >> 3] |= mask
+                    self.claimed_at[offset] = now
+                    claimed.append(offset)
+        return claimed
+
+    def _release(self, offsets: List[int]):
+        with self.lock:
+            for offset in offsets:
+                self.bitmap[offset >> 3] &= ~(0x80 >> (offset & 7)) & 0xFF
+                self.claimed_at.pop(offset, None)
+
+    def _mark(self, offsets: List[int]):
+        with self.lock:
+            for offset in offsets:
+                self.bitmap[offset >> 3] |= 0x80 >> (offset & 7)
+
+    def _claimed_since(self, offsets: List[int], since: float) -> Set[int]:
+        with self.lock:
+            return {
+                offset
+                for offset in offsets
+                if self.claimed_at.get(offset, 0) >= since
+            }
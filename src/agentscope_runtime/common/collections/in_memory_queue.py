@@ -15,6 +15,14 @@ class InMemoryQueue(Queue):
             return self.queue.pop(0)
         return None
 
+    def enqueue_many(self, items: list):
+        self.queue.extend(items)
+
+    def dequeue_many(self, count: int) -> list:
+        items = self.queue[:count]
+        del self.queue[:count]
+        return items
+
     def peek(self):
         if self.queue:
             return self.queue[0]
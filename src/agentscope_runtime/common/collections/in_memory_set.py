@@ -25,3 +25,6 @@ class InMemorySetCollection(SetCollection):
 
     def to_list(self) -> list:
         return list(self.set)
+
+    def size(self) -> int:
+        return len(self.set)
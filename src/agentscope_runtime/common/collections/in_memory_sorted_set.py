@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+import heapq
+import threading
+from typing import List, Optional, Tuple
+
+from .base_sorted_set import SortedSetCollection
+
+
+class InMemorySortedSetCollection(SortedSetCollection):
+    """
+    Min-heap with lazy deletion: updates push a new entry and stale ones
+    are skipped when they reach the top.
+    """
+
+    def __init__(self):
+        self.scores = {}
+        self.heap = []
+        self.lock = threading.Lock()
+
+    def add(self, member: str, score: float, gt: bool = False):
+        score = float(score)
+        with self.lock:
+            current = self.scores.get(member)
+            if current is not None and (
+                current == score or (gt and current > score)
+            ):
+                return False
+            self.scores[member] = score
+            heapq.heappush(self.heap, (score, member))
+            if len(self.heap) > 2 * len(self.scores) + 64:
+                self._compact()
+            return current is None
+
+    def _compact(self):
+        self.heap = [(s, m) for m, s in self.scores.items()]
+        heapq.heapify(self.heap)
+
+    def _drop_stale(self):
+        while self.heap:
+            score, member = self.heap[0]
+            if self.scores.get(member) == score:
+                return
+            heapq.heappop(self.heap)
+
+    def remove(self, member: str):
+        with self.lock:
+            self.scores.pop(member, None)
+
+    def score(self, member: str) -> Optional[float]:
+        return self.scores.get(member)
+
+    def pop_due(
+        self,
+        max_score: float,
+        limit: int = 100,
+    ) -> List[Tuple[str, float]]:
+        due = []
+        with self.lock:
+            while len(due) < limit:
+                self._drop_stale()
+                if not self.heap or self.heap[0][0] > max_score:
+                    break
+                score, member = heapq.heappop(self.heap)
+                del self.scores[member]
+                due.append((member, score))
+        return due
+
+    def peek_min(self) -> Optional[Tuple[str, float]]:
+        with self.lock:
+            self._drop_stale()
+            if not self.heap:
+                return None
+            score, member = self.heap[0]
+            return member, score
+
+    def clear(self):
+        with self.lock:
+            self.scores.clear()
+            self.heap.clear()
+
+    def size(self) -> int:
+        return len(self.scores)
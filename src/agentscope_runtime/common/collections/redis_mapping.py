@@ -1,14 +1,29 @@
 # -*- coding: utf-8 -*-
+import asyncio
 import json
 
-from typing import Any
+from typing import Any, AsyncIterator, Dict, List, Optional
 
+from .async_redis import LoopLocalRedis
 from .base_mapping import Mapping
 
 
 class RedisMapping(Mapping):
-    def __init__(self, redis_client, prefix: str = ""):
+    """
+    JSON values stored under ``<prefix>:<key>``.
+
+    Async methods use ``async_client`` when given and otherwise run the
+    sync call in a worker thread.
+    """
+
+    def __init__(
+        self,
+        redis_client,
+        prefix: str = "",
+        async_client: Optional[LoopLocalRedis] = None,
+    ):
         self.client = redis_client
+        self.async_client = async_client
         self.prefix = prefix.rstrip(":") + ":" if prefix else ""
 
     def _get_full_key(self, key: str) -> str:
@@ -19,6 +34,11 @@ class RedisMapping(Mapping):
             return full_key[len(self.prefix) :]
         return full_key
 
+    def _decode_key(self, key) -> str:
+        if isinstance(key, bytes):
+            return key.decode("utf-8")
+        return str(key)
+
     def set(self, key: str, value: Any):
         self.client.set(self._get_full_key(key), json.dumps(value))
 
@@ -29,20 +49,109 @@ class RedisMapping(Mapping):
     def delete(self, key: str):
         self.client.delete(self._get_full_key(key))
 
-    def scan(self, prefix: str = ""):
+    def mget(self, keys: List[str]) -> List[Any]:
+        if not keys:
+            return []
+        values = self.client.mget([self._get_full_key(key) for key in keys])
+        return [json.loads(value) if value else None for value in values]
+
+    def mset(self, items: Dict[str, Any]):
+        if not items:
+            return
+        self.client.mset(
+            {
+                self._get_full_key(key): json.dumps(value)
+                for key, value in items.items()
+            },
+        )
+
+    def mdelete(self, keys: List[str]):
+        if keys:
+            self.client.delete(*[self._get_full_key(key) for key in keys])
+
+    def scan(self, prefix: str = "", count: Optional[int] = None):
         search_pattern = f"{self._get_full_key(prefix)}*"
         cursor = 0
         while True:
             cursor, keys = self.client.scan(
                 cursor=cursor,
                 match=search_pattern,
+                count=count,
             )
             for key in keys:
-                if isinstance(key, bytes):
-                    decoded_key = key.decode("utf-8")
-                else:
-                    decoded_key = str(key)
-                yield self._strip_prefix(decoded_key)
+                yield self._strip_prefix(self._decode_key(key))
 
             if cursor == 0:
                 break
+
+    def scan_items(self, prefix: str = "", count: int = 100):
+        # One SCAN page is fetched with a single MGET instead of one GET
+        # per key
+        search_pattern = f"{self._get_full_key(prefix or '')}*"
+        cursor = 0
+        while True:
+            cursor, keys = self.client.scan(
+                cursor=cursor,
+                match=search_pattern,
+                count=count,
+            )
+            if keys:
+                values = self.client.mget(keys)
+                for key, value in zip(keys, values):
+                    if not value:
+                        continue
+                    yield (
+                        self._strip_prefix(self._decode_key(key)),
+                        json.loads(value),
+                    )
+
+            if cursor == 0:
+                break
+
+    async def aset(self, key: str, value: Any):
+        if self.async_client is None:
+            return await asyncio.to_thread(self.set, key, value)
+        await self.async_client.get().set(
+            self._get_full_key(key),
+            json.dumps(value),
+        )
+
+    async def aget(self, key: str) -> Any:
+        if self.async_client is None:
+            return await asyncio.to_thread(self.get, key)
+        value = await self.async_client.get().get(self._get_full_key(key))
+        return json.loads(value) if value else None
+
+    async def adelete(self, key: str):
+        if self.async_client is None:
+            return await asyncio.to_thread(self.delete, key)
+        await self.async_client.get().delete(self._get_full_key(key))
+
+    async def amget(self, keys: List[str]) -> List[Any]:
+        if not keys:
+            return []
+        if self.async_client is None:
+            return await asyncio.to_thread(self.mget, keys)
+        values = await self.async_client.get().mget(
+            [self._get_full_key(key) for key in keys],
+        )
+        return [json.loads(value) if value else None for value in values]
+
+    async def amdelete(self, keys: List[str]):
+        if not keys:
+            return
+        if self.async_client is None:
+            return await asyncio.to_thread(self.mdelete, keys)
+        await self.async_client.get().delete(
+            *[self._get_full_key(key) for key in keys],
+        )
+
+    async def ascan(self, prefix: str = "") -> AsyncIterator[str]:
+        if self.async_client is None:
+            for key in await asyncio.to_thread(list, self.scan(prefix)):
+                yield key
+            return
+        async for key in self.async_client.get().scan_iter(
+            match=f"{self._get_full_key(prefix)}*",
+        ):
+            yield self._strip_prefix(self._decode_key(key))
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+import time
+from typing import List, Set
+
+from redis.client import NEVER_DECODE
+
+from .base_port_allocator import PortAllocator
+
+
+class RedisPortAllocator(PortAllocator):
+    """
+    Bitmap under ``<key>:bitmap``, shared by all processes allocating
+    from the same range. A scan reads it in one round trip and the found
+    ports are claimed with pipelined ``SETBIT``; the claim times, kept in
+    the ``<key>:claimed_at`` hash, protect new allocations from
+    :meth:`reconcile`.
+    """
+
+    def __init__(
+        self,
+        redis_client,
+        key: str,
+        port_range: range,
+        check_bind: bool = True,
+    ):
+        super().__init__(port_range, check_bind=check_bind)
+        self.client = redis_client
+        self.bitmap_key = f"{key}:bitmap"
+        self.cursor_key = f"{key}:cursor"
+        self.claimed_at_key = f"{key}:claimed_at"
+
+    def _load(self) -> bytes:
+        # The bitmap is binary, whatever the client decodes
+        bitmap = self.client.execute_command(
+            "GET",
+            self.bitmap_key,
+            **{NEVER_DECODE: True},
+        )
+        return bitmap or b""
+
+    def _get_cursor(self) -> int:
+        return int(self.client.get(self.cursor_key) or 0)
+
+    def _set_cursor(self, offset: int):
+        self.client.set(self.cursor_key, offset)
+
+    def _claim(self, offsets: List[int]) -> List[int]:
+        pipe = self.client.pipeline(transaction=False)
+        for offset in offsets:
+            pipe.setbit(self.bitmap_key, offset, 1)
+        claimed = [
+            offset
+            for offset, was_set in zip(offsets, pipe.execute())
+            if not was_set
+        ]
+        if claimed:
+            now = time.time()
+            self.client.hset(
+                self.claimed_at_key,
+                mapping={str(offset): now for offset in claimed},
+            )
+        return claimed
+
+    def _release(self, offsets: List[int]):
+        pipe = self.client.pipeline(transaction=False)
+        for offset in offsets:
+            pipe.setbit(self.bitmap_key, offset, 0)
+        pipe.hdel(self.claimed_at_key, *[str(offset) for offset in offsets])
+        pipe.execute()
+
+    def _mark(self, offsets: List[int]):
+        if not offsets:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        for offset in offsets:
+            pipe.setbit(self.bitmap_key, offset, 1)
+        pipe.execute()
+
+    def _claimed_since(self, offsets: List[int], since: float) -> Set[int]:
+        claimed_at = self.client.hmget(
+            self.claimed_at_key,
+            [str(offset) for offset in offsets],
+        )
+        return {
+            offset
+            for offset, value in zip(offsets, claimed_at)
+            if value is not None and float(value) >= since
+        }
@@ -1,12 +1,22 @@
 # -*- coding: utf-8 -*-
 # file: redis_queue.py
+import asyncio
 import json
+from typing import Optional
+
+from .async_redis import LoopLocalRedis
 from .base_queue import Queue
 
 
 class RedisQueue(Queue):
-    def __init__(self, redis_client, queue_name: str):
+    def __init__(
+        self,
+        redis_client,
+        queue_name: str,
+        async_client: Optional[LoopLocalRedis] = None,
+    ):
         self.client = redis_client
+        self.async_client = async_client
         self.queue_name = queue_name
 
     def enqueue(self, item: dict):
@@ -16,6 +26,24 @@ class RedisQueue(Queue):
         item = self.client.lpop(self.queue_name)
         return json.loads(item) if item is not None else None
 
+    def enqueue_many(self, items: list):
+        if items:
+            self.client.rpush(
+                self.queue_name,
+                *[json.dumps(item) for item in items],
+            )
+
+    def dequeue_many(self, count: int) -> list:
+        if count <= 0:
+            return []
+        # LRANGE + LTRIM inside MULTI so concurrent consumers never get
+        # the same item
+        pipe = self.client.pipeline()
+        pipe.lrange(self.queue_name, 0, count - 1)
+        pipe.ltrim(self.queue_name, count, -1)
+        items, _ = pipe.execute()
+        return [json.loads(item) for item in items]
+
     def peek(self) -> dict:
         item = self.client.lindex(self.queue_name, 0)
         return json.loads(item) if item is not None else None
@@ -25,3 +53,19 @@ class RedisQueue(Queue):
 
     def size(self) -> int:
         return self.client.llen(self.queue_name)
+
+    async def aenqueue(self, item: dict):
+        if self.async_client is None:
+            return await asyncio.to_thread(self.enqueue, item)
+        await self.async_client.get().rpush(self.queue_name, json.dumps(item))
+
+    async def adequeue(self) -> dict:
+        if self.async_client is None:
+            return await asyncio.to_thread(self.dequeue)
+        item = await self.async_client.get().lpop(self.queue_name)
+        return json.loads(item) if item is not None else None
+
+    async def asize(self) -> int:
+        if self.async_client is None:
+            return await asyncio.to_thread(self.size)
+        return await self.async_client.get().llen(self.queue_name)
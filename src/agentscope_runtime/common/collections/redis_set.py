@@ -1,10 +1,20 @@
 # -*- coding: utf-8 -*-
+import asyncio
+from typing import Optional
+
+from .async_redis import LoopLocalRedis
 from .base_set import SetCollection
 
 
 class RedisSetCollection(SetCollection):
-    def __init__(self, redis_client, set_name: str):
+    def __init__(
+        self,
+        redis_client,
+        set_name: str,
+        async_client: Optional[LoopLocalRedis] = None,
+    ):
         self.client = redis_client
+        self.async_client = async_client
         self.set_name = set_name
 
     def add(self, value: str):
@@ -13,6 +23,18 @@ class RedisSetCollection(SetCollection):
     def remove(self, value: str):
         self.client.srem(self.set_name, value)
 
+    def remove_many(self, values: list):
+        if values:
+            self.client.srem(self.set_name, *values)
+
+    def move(self, value: str, sources: list) -> bool:
+        # One transaction, so the value is never seen in two sets
+        pipe = self.client.pipeline(transaction=True)
+        pipe.sadd(self.set_name, value)
+        for source in sources:
+            pipe.srem(source.set_name, value)
+        return pipe.execute()[0] == 1
+
     def contains(self, value: str) -> bool:
         return self.client.sismember(self.set_name, value)
 
@@ -21,3 +43,37 @@ class RedisSetCollection(SetCollection):
 
     def to_list(self) -> list:
         return list(self.client.smembers(self.set_name))
+
+    def size(self) -> int:
+        return self.client.scard(self.set_name)
+
+    async def aadd(self, value: str):
+        if self.async_client is None:
+            return await asyncio.to_thread(self.add, value)
+        return await self.async_client.get().sadd(self.set_name, value) == 1
+
+    async def aremove(self, value: str):
+        if self.async_client is None:
+            return await asyncio.to_thread(self.remove, value)
+        await self.async_client.get().srem(self.set_name, value)
+
+    async def amove(self, value: str, sources: list) -> bool:
+        if self.async_client is None:
+            return await asyncio.to_thread(self.move, value, sources)
+        pipe = self.async_client.get().pipeline(transaction=True)
+        pipe.sadd(self.set_name, value)
+        for source in sources:
+            pipe.srem(source.set_name, value)
+        return (await pipe.execute())[0] == 1
+
+    async def aremove_many(self, values: list):
+        if not values:
+            return
+        if self.async_client is None:
+            return await asyncio.to_thread(self.remove_many, values)
+        await self.async_client.get().srem(self.set_name, *values)
+
+    async def asize(self) -> int:
+        if self.async_client is None:
+            return await asyncio.to_thread(self.size)
+        return await self.async_client.get().scard(self.set_name)
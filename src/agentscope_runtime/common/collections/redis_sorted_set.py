@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+import asyncio
+from typing import List, Optional, Tuple
+
+from .async_redis import LoopLocalRedis
+from .base_sorted_set import SortedSetCollection
+
+
+class RedisSortedSetCollection(SortedSetCollection):
+    def __init__(
+        self,
+        redis_client,
+        set_name: str,
+        async_client: Optional[LoopLocalRedis] = None,
+    ):
+        self.client = redis_client
+        self.async_client = async_client
+        self.set_name = set_name
+
+    def add(self, member: str, score: float, gt: bool = False):
+        return self.client.zadd(self.set_name, {member: score}, gt=gt) == 1
+
+    def remove(self, member: str):
+        self.client.zrem(self.set_name, member)
+
+    def remove_many(self, members: List[str]):
+        if members:
+            self.client.zrem(self.set_name, *members)
+
+    def score(self, member: str) -> Optional[float]:
+        return self.client.zscore(self.set_name, member)
+
+    def pop_due(
+        self,
+        max_score: float,
+        limit: int = 100,
+    ) -> List[Tuple[str, float]]:
+        candidates = self.client.zrangebyscore(
+            self.set_name,
+            "-inf",
+            max_score,
+            start=0,
+            num=limit,
+            withscores=True,
+        )
+        if not candidates:
+            return []
+
+        # Claim each member with its own ZREM so that when several
+        # replicas pop concurrently, only the one that removed it owns it
+        pipe = self.client.pipeline(transaction=False)
+        for member, _ in candidates:
+            pipe.zrem(self.set_name, member)
+        removed = pipe.execute()
+        return [
+            (member, float(score))
+            for (member, score), ok in zip(candidates, removed)
+            if ok
+        ]
+
+    def peek_min(self) -> Optional[Tuple[str, float]]:
+        items = self.client.zrange(self.set_name, 0, 0, withscores=True)
+        if not items:
+            return None
+        member, score = items[0]
+        return member, float(score)
+
+    def clear(self):
+        self.client.delete(self.set_name)
+
+    def size(self) -> int:
+        return self.client.zcard(self.set_name)
+
+    async def aadd(self, member: str, score: float, gt: bool = False):
+        if self.async_client is None:
+            return await asyncio.to_thread(self.add, member, score, gt)
+        added = await self.async_client.get().zadd(
+            self.set_name,
+            {member: score},
+            gt=gt,
+        )
+        return added == 1
+
+    async def aremove_many(self, members: List[str]):
+        if not members:
+            return
+        if self.async_client is None:
+            return await asyncio.to_thread(self.remove_many, members)
+        await self.async_client.get().zrem(self.set_name, *members)
@@ -37,3 +37,10 @@ class BaseClient(ABC):
     @abstractmethod
     def get_status(self, container_id):
         """Get the current status of the specified container."""
+
+    def pull_images(self, images, max_workers=4, progress=None):
+        """
+        Pull images ahead of the containers using them. Runtimes that pull
+        images themselves (e.g. on the nodes of a cluster) do nothing.
+        """
+        return {}
@@ -2,7 +2,6 @@
 # pylint: disable=too-many-branches
 import atexit
 import logging
-import socket
 import traceback
 
 import boxlite
@@ -10,11 +9,12 @@ from boxlite import SyncBoxlite
 
 from .base_client import BaseClient
 from ..collections import (
-    RedisSetCollection,
-    InMemorySetCollection,
+    RedisPortAllocator,
+    InMemoryPortAllocator,
     RedisMapping,
     InMemoryMapping,
 )
+from ..collections.base_port_allocator import PORT_RECLAIM_GRACE
 
 logger = logging.getLogger(__name__)
 
@@ -66,21 +66,23 @@ class BoxliteClient(BaseClient):
                     "Unable to connect to the Redis server.",
                 ) from e
 
-            self.port_set = RedisSetCollection(
+            redis_port_key = getattr(
+                self.config,
+                "redis_port_key",
+                "boxlite:ports",
+            )
+            self.port_allocator = RedisPortAllocator(
                 redis_client,
-                set_name=getattr(
-                    self.config,
-                    "redis_port_key",
-                    "boxlite:ports",
-                ),
+                key=f"{redis_port_key}_allocator",
+                port_range=self.port_range,
             )
             self.ports_cache = RedisMapping(
                 redis_client,
-                prefix=getattr(self.config, "redis_port_key", "boxlite:ports"),
+                prefix=redis_port_key,
             )
         else:
             # Use in-memory collections
-            self.port_set = InMemorySetCollection()
+            self.port_allocator = InMemoryPortAllocator(self.port_range)
             self.ports_cache = InMemoryMapping()
 
         # Initialize BoxLite runtime
@@ -307,10 +309,9 @@ class BoxliteClient(BaseClient):
             # Clean up port cache
             self.ports_cache.delete(container_id)
 
-            # Remove ports from port set
+            # Release the ports
             if ports:
-                for host_port in ports:
-                    self.port_set.remove(host_port)
+                self.port_allocator.release(ports)
 
             return True
         except Exception as e:
@@ -404,31 +405,19 @@ class BoxliteClient(BaseClient):
         Raises:
             RuntimeError: If not enough free ports are available
         """
-        free_ports = []
-
-        for port in self.port_range:
-            if len(free_ports) >= n:
-                break  # We have found enough ports
-
-            if not self.port_set.add(port):
-                continue  # Port already in set
-
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                try:
-                    s.bind(("", port))
-                    free_ports.append(port)  # Port is available
-                except OSError:
-                    # Bind failed, port is in use
-                    self.port_set.remove(port)
-                    # Try the next one
-                    continue
-
-        if len(free_ports) < n:
-            raise RuntimeError(
-                "Not enough free ports available in the specified range.",
-            )
-
-        return free_ports
+        try:
+            return self.port_allocator.allocate(n)
+        except RuntimeError:
+            # Reclaim the ports of boxes removed behind our back
+            in_use = set()
+            for _, ports in self.ports_cache.scan_items():
+                in_use.update(ports or [])
+            if not self.port_allocator.reconcile(
+                in_use,
+                grace=PORT_RECLAIM_GRACE,
+            ):
+                raise
+            return self.port_allocator.allocate(n)
 
     def _format_ports(self, host_ports):
         """
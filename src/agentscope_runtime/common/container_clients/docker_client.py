@@ -1,21 +1,30 @@
 # -*- coding: utf-8 -*-
+import concurrent.futures
+import threading
+import time
 import traceback
 import logging
-import socket
 
 import docker
 
 from .base_client import BaseClient
 from ..collections import (
-    RedisSetCollection,
-    InMemorySetCollection,
+    RedisPortAllocator,
+    InMemoryPortAllocator,
     RedisMapping,
     InMemoryMapping,
 )
+from ..collections.base_port_allocator import PORT_RECLAIM_GRACE
 
 
 logger = logging.getLogger(__name__)
 
+# Seconds before a failed Docker event stream is opened again
+IMAGE_EVENTS_RETRY = 30
+
+# Image events after which a cached image may no longer be present
+_IMAGE_GONE_ACTIONS = ("delete", "untag")
+
 
 class DockerClient(BaseClient):
     def __init__(self, config=None):
@@ -40,16 +49,17 @@ class DockerClient(BaseClient):
                     "Unable to connect to the Redis server.",
                 ) from e
 
-            self.port_set = RedisSetCollection(
+            self.port_allocator = RedisPortAllocator(
                 redis_client,
-                set_name=self.config.redis_port_key,
+                key=f"{self.config.redis_port_key}_allocator",
+                port_range=self.port_range,
             )
             self.ports_cache = RedisMapping(
                 redis_client,
                 prefix=self.config.redis_port_key,
             )
         else:
-            self.port_set = InMemorySetCollection()
+            self.port_allocator = InMemoryPortAllocator(self.port_range)
             self.ports_cache = InMemoryMapping()
 
         try:
@@ -64,6 +74,23 @@ class DockerClient(BaseClient):
                 "export DOCKER_HOST=unix://$HOME/.colima/docker.sock",
             ) from e
 
+        # Images known to be present locally. The cache is only trusted
+        # while the Docker image events are watched, as they invalidate it.
+        self._images = set()
+        self._image_lock = threading.Lock()
+        # Bumped on every image removal event, so a check that raced with
+        # one does not mark the image present
+        self._images_generation = 0
+        # Pulls in flight, so concurrent creates share a single pull
+        self._pulls = {}
+        self._events_thread = None
+        self._events_retry_at = 0.0
+
+        try:
+            self.reconcile_ports()
+        except Exception as e:
+            logger.warning(f"Failed to reconcile host ports: {e}")
+
     def create(
         self,
         image,
@@ -85,32 +112,7 @@ class DockerClient(BaseClient):
                 port_mapping[container_port] = host_port
 
         try:
-            try:
-                # Check if the image exists locally
-                self.client.images.get(image)
-                logger.debug(f"Image '{image}' found locally.")
-            except docker.errors.ImageNotFound:
-                logger.info(
-                    f"Image '{image}' not found locally. "
-                    f"Attempting to pull it...",
-                )
-                try:
-                    logger.info(
-                        f"Attempting to pull: {image}, "
-                        f"it might take several minutes.",
-                    )
-                    self.client.images.pull(image)
-                    logger.debug(
-                        f"Image '{image}' successfully pulled.",
-                    )
-                except Exception as e:
-                    logger.error(
-                        f"Failed to pull image '{image}': {str(e)}",
-                    )
-                    return None, None, None
-
-            except docker.errors.APIError as e:
-                logger.error(f"Error occurred while checking the image: {e}")
+            if not self.ensure_image(image):
                 return None, None, None
 
             # Create and run the container
@@ -134,6 +136,156 @@ class DockerClient(BaseClient):
             logger.debug(f"{traceback.format_exc()}")
             return None, None, None
 
+    def ensure_image(self, image):
+        """Make sure ``image`` is present locally, pulling it if needed.
+
+        Concurrent calls for an image being pulled wait for that pull
+        instead of starting their own.
+
+        Returns:
+            bool: Whether the image is present.
+        """
+        self._watch_image_events()
+        with self._image_lock:
+            if self._events_thread is not None and image in self._images:
+                return True
+            future = self._pulls.get(image)
+            owner = future is None
+            if owner:
+                future = self._pulls[image] = concurrent.futures.Future()
+            generation = self._images_generation
+        if not owner:
+            return future.result()
+
+        present = False
+        try:
+            present = self._get_or_pull(image)
+        finally:
+            with self._image_lock:
+                if present and generation == self._images_generation:
+                    self._images.add(image)
+                del self._pulls[image]
+            future.set_result(present)
+        return present
+
+    def _get_or_pull(self, image):
+        try:
+            # Check if the image exists locally
+            self.client.images.get(image)
+            logger.debug(f"Image '{image}' found locally.")
+            return True
+        except docker.errors.ImageNotFound:
+            logger.info(
+                f"Image '{image}' not found locally. "
+                f"Attempting to pull it...",
+            )
+        except docker.errors.APIError as e:
+            logger.error(f"Error occurred while checking the image: {e}")
+            return False
+
+        try:
+            logger.info(
+                f"Attempting to pull: {image}, "
+                f"it might take several minutes.",
+            )
+            self.client.images.pull(image)
+            logger.debug(
+                f"Image '{image}' successfully pulled.",
+            )
+            return True
+        except Exception as e:
+            logger.error(
+                f"Failed to pull image '{image}': {str(e)}",
+            )
+            return False
+
+    def _watch_image_events(self):
+        with self._image_lock:
+            if (
+                self._events_thread is not None
+                or time.monotonic() < self._events_retry_at
+            ):
+                return
+            try:
+                events = self.client.events(
+                    decode=True,
+                    filters={"type": "image"},
+                )
+            except Exception as e:
+                logger.warning(
+                    f"Cannot watch Docker image events, image presence "
+                    f"will not be cached: {e}",
+                )
+                self._events_retry_at = time.monotonic() + IMAGE_EVENTS_RETRY
+                return
+            self._events_thread = threading.Thread(
+                target=self._consume_image_events,
+                args=(events,),
+                name="docker-image-events",
+                daemon=True,
+            )
+            self._events_thread.start()
+
+    def _consume_image_events(self, events):
+        try:
+            for event in events:
+                if event.get("Action") in _IMAGE_GONE_ACTIONS:
+                    # Events name images by id or by one of their tags,
+                    # so forget them all
+                    with self._image_lock:
+                        self._images.clear()
+                        self._images_generation += 1
+        except Exception as e:
+            logger.warning(f"Docker image event stream failed: {e}")
+        finally:
+            with self._image_lock:
+                self._images.clear()
+                self._images_generation += 1
+                self._events_thread = None
+                self._events_retry_at = time.monotonic() + IMAGE_EVENTS_RETRY
+
+    def pull_images(self, images, max_workers=4, progress=None):
+        """Pull the missing ones of ``images`` in parallel.
+
+        Args:
+            images: Image names.
+            max_workers: Images pulled at once.
+            progress: Called with ``(done, total, image, present)`` as each
+                image is done.
+
+        Returns:
+            dict: Whether each image is present.
+        """
+        images = list(dict.fromkeys(images))
+        results = {}
+        if not images:
+            return results
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="image-pull",
+        ) as executor:
+            futures = {
+                executor.submit(self.ensure_image, image): image
+                for image in images
+            }
+            for done, future in enumerate(
+                concurrent.futures.as_completed(futures),
+                start=1,
+            ):
+                image = futures[future]
+                try:
+                    results[image] = future.result()
+                except Exception as e:
+                    logger.error(f"Failed to pull image '{image}': {e}")
+                    results[image] = False
+                logger.info(
+                    f"Pre-pulled {done}/{len(images)} images: '{image}' "
+                    f"{'ready' if results[image] else 'failed'}",
+                )
+                if progress is not None:
+                    progress(done, len(images), image, results[image])
+        return results
+
     def start(self, container_id):
         """Start a Docker container."""
         try:
@@ -175,8 +327,7 @@ class DockerClient(BaseClient):
 
             # Remove ports
             if ports:
-                for host_port in ports:
-                    self.port_set.remove(host_port)
+                self.port_allocator.release(ports)
 
             return True
         except Exception as e:
@@ -202,29 +353,34 @@ class DockerClient(BaseClient):
         return None
 
     def _find_free_ports(self, n):
-        free_ports = []
-
-        for port in self.port_range:
-            if len(free_ports) >= n:
-                break  # We have found enough ports
-
-            if not self.port_set.add(port):
-                continue
-
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                try:
-                    s.bind(("", port))
-                    free_ports.append(port)  # Port is available
-
-                except OSError:
-                    # Bind failed, port is in use
-                    self.port_set.remove(port)
-                    # Try the next one
-                    continue
-
-        if len(free_ports) < n:
-            raise RuntimeError(
-                "Not enough free ports available in the specified range.",
-            )
-
-        return free_ports
+        try:
+            return self.port_allocator.allocate(n)
+        except RuntimeError:
+            # Reclaim the ports of containers removed behind our back
+            if not self.reconcile_ports():
+                raise
+            return self.port_allocator.allocate(n)
+
+    def reconcile_ports(self, grace=PORT_RECLAIM_GRACE):
+        """Reclaim allocated host ports that no container uses.
+
+        The ports in use are those published by containers in
+        ``docker ps`` and those recorded for the containers created by
+        this client; ports allocated within the last ``grace`` seconds are
+        kept.
+
+        Returns:
+            int: The number of ports reclaimed.
+        """
+        in_use = set()
+        for container in self.client.containers.list(sparse=True):
+            for port in container.attrs.get("Ports") or []:
+                if port.get("PublicPort"):
+                    in_use.add(port["PublicPort"])
+        for _, ports in self.ports_cache.scan_items():
+            in_use.update(ports or [])
+
+        reclaimed = self.port_allocator.reconcile(in_use, grace=grace)
+        if reclaimed:
+            logger.info(f"Reclaimed {reclaimed} leaked host ports")
+        return reclaimed
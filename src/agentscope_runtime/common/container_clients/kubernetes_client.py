@@ -1,6 +1,5 @@
 # -*- coding: utf-8 -*-
 # pylint: disable=too-many-branches,too-many-statements
-import time
 import hashlib
 import traceback
 import logging
@@ -12,9 +11,49 @@ from kubernetes import config as k8s_config
 from kubernetes.client.rest import ApiException
 
 from .base_client import BaseClient
+from .kubernetes_watcher import PENDING, ObjectWatcher
 
 logger = logging.getLogger(__name__)
 
+# Labels of the pods and deployments this client creates
+CREATED_BY_SELECTOR = "created-by=kubernetes-client"
+
+
+def _pod_ready(pod):
+    if pod is None:
+        return False
+    if pod.status.phase == "Running":
+        # Check if all containers are ready
+        if pod.status.container_statuses and all(
+            container.ready for container in pod.status.container_statuses
+        ):
+            return True
+    elif pod.status.phase in ["Failed", "Succeeded"]:
+        return False
+    return PENDING
+
+
+def _deployment_ready(deployment):
+    if deployment is None:
+        return False
+    if (
+        deployment.status
+        and deployment.status.ready_replicas
+        and deployment.status.ready_replicas == deployment.spec.replicas
+    ):
+        return True
+    return PENDING
+
+
+def _loadbalancer_address(service):
+    if service is None:
+        return None
+    if service.status.load_balancer and service.status.load_balancer.ingress:
+        ingress = service.status.load_balancer.ingress[0]
+        # Return IP or hostname
+        return ingress.ip or ingress.hostname
+    return PENDING
+
 
 class KubernetesClient(BaseClient):
     def __init__(
@@ -39,6 +78,24 @@ class KubernetesClient(BaseClient):
             self.v1 = client.CoreV1Api()
             self.apps_v1 = client.AppsV1Api()  # For Deployments
             self.namespace = namespace
+            # Readiness is waited for through one watch per kind
+            self.pod_watcher = ObjectWatcher(
+                self.v1.list_namespaced_pod,
+                self.v1.read_namespaced_pod,
+                namespace,
+                label_selector=CREATED_BY_SELECTOR,
+            )
+            self.deployment_watcher = ObjectWatcher(
+                self.apps_v1.list_namespaced_deployment,
+                self.apps_v1.read_namespaced_deployment,
+                namespace,
+                label_selector=CREATED_BY_SELECTOR,
+            )
+            self.service_watcher = ObjectWatcher(
+                self.v1.list_namespaced_service,
+                self.v1.read_namespaced_service,
+                namespace,
+            )
             # Test connection
             self.v1.list_namespace()
             logger.debug("Kubernetes client initialized successfully")
@@ -270,6 +327,55 @@ class KubernetesClient(BaseClient):
         runtime_config=None,
     ):
         """Create a new Kubernetes Pod."""
+        result = self._submit_pod(
+            image,
+            name,
+            ports,
+            volumes,
+            environment,
+            runtime_config,
+        )
+        if result[0] is None:
+            return result
+
+        name = result[0]
+        if not self.wait_for_pod_ready(name, timeout=60):
+            logger.error(f"Pod '{name}' failed to become ready")
+            return None, None, None
+        return result
+
+    def create_batch(self, specs, timeout=60):
+        """
+        Create a pod for each of ``specs``, the keyword arguments of
+        :meth:`create`, and wait for them to be ready together.
+
+        Returns:
+            list: ``(name, ports, ip)`` per spec, as returned by
+            :meth:`create`.
+        """
+        submitted = [self._submit_pod(**spec) for spec in specs]
+        ready = self.wait_for_pods_ready(
+            [result[0] for result in submitted if result[0] is not None],
+            timeout=timeout,
+        )
+        results = []
+        for result in submitted:
+            if result[0] is not None and not ready[result[0]]:
+                logger.error(f"Pod '{result[0]}' failed to become ready")
+                result = (None, None, None)
+            results.append(result)
+        return results
+
+    def _submit_pod(
+        self,
+        image,
+        name=None,
+        ports=None,
+        volumes=None,
+        environment=None,
+        runtime_config=None,
+    ):
+        """Create a pod and its service, without waiting for them."""
         if not name:
             name = f"pod-{hashlib.md5(image.encode()).hexdigest()[:8]}"
         try:
@@ -334,10 +440,6 @@ class KubernetesClient(BaseClient):
                 f"Pod '{name}' created with exposed ports: {exposed_ports}",
             )
 
-            if not self.wait_for_pod_ready(name, timeout=60):
-                logger.error(f"Pod '{name}' failed to become ready")
-                return None, None, None
-
             return name, exposed_ports, pod_node_ip
         except Exception as e:
             logger.error(f"An error occurred: {e}, {traceback.format_exc()}")
@@ -526,30 +628,35 @@ class KubernetesClient(BaseClient):
 
     def wait_for_pod_ready(self, container_id, timeout=300):
         """Wait for a pod to be ready."""
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            try:
-                pod = self.v1.read_namespaced_pod(
-                    name=container_id,
-                    namespace=self.namespace,
-                )
-                if pod.status.phase == "Running":
-                    # Check if all containers are ready
-                    if pod.status.container_statuses:
-                        all_ready = all(
-                            container.ready
-                            for container in pod.status.container_statuses
-                        )
-                        if all_ready:
-                            return True
-                elif pod.status.phase in ["Failed", "Succeeded"]:
-                    return False
-                time.sleep(2)
-            except ApiException as e:
-                if e.status == 404:
-                    return False
-                time.sleep(2)
-        return False
+        return self.pod_watcher.wait(
+            container_id,
+            _pod_ready,
+            timeout,
+            default=False,
+        )
+
+    async def wait_for_pod_ready_async(self, container_id, timeout=300):
+        """Wait for a pod to be ready, without holding a thread."""
+        return await self.pod_watcher.wait_async(
+            container_id,
+            _pod_ready,
+            timeout,
+            default=False,
+        )
+
+    def wait_for_pods_ready(self, container_ids, timeout=300):
+        """
+        Wait for pods to be ready, all within ``timeout``.
+
+        Returns:
+            dict: Whether each pod is ready.
+        """
+        return self.pod_watcher.wait_many(
+            container_ids,
+            _pod_ready,
+            timeout,
+            default=False,
+        )
 
     def _create_multi_port_service(self, pod_name, port_list):
         """Create a single service with multiple ports for the pod."""
@@ -593,8 +700,7 @@ class KubernetesClient(BaseClient):
                 body=service,
             )
 
-            # Wait for service to be ready
-            time.sleep(1)
+            # The node ports are allocated as the service is created
             return True
         except Exception as e:
             logger.error(
@@ -965,8 +1071,7 @@ class KubernetesClient(BaseClient):
                             "type": "LoadBalancer",
                             "ports": [p["port"] for p in parsed_ports],
                         }
-                        # Wait a bit and try to get LoadBalancer IP
-                        time.sleep(2)
+                        # Try to get LoadBalancer IP
                         load_balancer_ip = self._get_loadbalancer_ip(
                             service_name,
                         )
@@ -994,56 +1099,25 @@ class KubernetesClient(BaseClient):
 
     def wait_for_deployment_ready(self, deployment_name, timeout=300):
         """Wait for a deployment to be ready."""
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            try:
-                deployment = self.apps_v1.read_namespaced_deployment(
-                    name=deployment_name,
-                    namespace=self.namespace,
-                )
-
-                # Check if deployment is ready
-                if (
-                    deployment.status.ready_replicas
-                    and deployment.status.ready_replicas
-                    == deployment.spec.replicas
-                ):
-                    return True
-
-                time.sleep(3)
-            except ApiException as e:
-                if e.status == 404:
-                    return False
-                time.sleep(3)
-        return False
+        return self.deployment_watcher.wait(
+            deployment_name,
+            _deployment_ready,
+            timeout,
+            default=False,
+        )
 
     def _get_loadbalancer_ip(self, service_name, timeout=30):
         """Get LoadBalancer external IP address."""
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            try:
-                service = self.v1.read_namespaced_service(
-                    name=service_name,
-                    namespace=self.namespace,
-                )
-
-                if (
-                    service.status.load_balancer
-                    and service.status.load_balancer.ingress
-                ):
-                    ingress = service.status.load_balancer.ingress[0]
-                    # Return IP or hostname
-                    return ingress.ip or ingress.hostname
-
-                time.sleep(2)
-            except Exception as e:
-                logger.debug(f"Waiting for LoadBalancer IP: {e}")
-                time.sleep(2)
-
-        logger.debug(
-            f"LoadBalancer IP not available for service {service_name}",
+        address = self.service_watcher.wait(
+            service_name,
+            _loadbalancer_address,
+            timeout,
         )
-        return None
+        if address is None:
+            logger.debug(
+                f"LoadBalancer IP not available for service {service_name}",
+            )
+        return address
 
     def remove_deployment(self, deployment_name, remove_service=True):
         """Remove a Kubernetes Deployment and optionally its service."""
@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+"""
+Waiting for Kubernetes objects to reach a state through a shared watch.
+
+Instead of one polling loop per object, every wait on objects of a kind
+in a namespace is served by a single list-and-watch, which resolves each
+wait as soon as an event shows its object reached the state waited for.
+
+The watch needs the ``list`` and ``watch`` verbs on the kinds waited for
+(pods, deployments and services). Without them, waits are only resolved
+by the direct reads made every resync interval.
+"""
+import asyncio
+import concurrent.futures
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from kubernetes import watch
+from kubernetes.client.rest import ApiException
+
+logger = logging.getLogger(__name__)
+
+# Returned by conditions while their object is still to be waited for
+PENDING = object()
+
+# Seconds before the watch is opened again after an error
+RETRY_DELAY = 1.0
+
+Condition = Callable[[Any], Any]
+
+
+class ObjectWatcher:
+    """
+    Waits for objects of one kind in a namespace to meet a condition.
+
+    The watch is started by the first wait and stopped once nothing is
+    waited for. A condition is called with the latest version of its
+    object, or with ``None`` once the object is deleted, and returns
+    :data:`PENDING` until the wait is over. Every ``resync_interval``
+    seconds, waits also read their object directly, so they are resolved
+    even if the watch misses events or cannot be opened.
+    """
+
+    def __init__(
+        self,
+        list_func: Callable,
+        read_func: Callable,
+        namespace: str,
+        label_selector: Optional[str] = None,
+        watch_timeout: int = 60,
+        resync_interval: float = 10.0,
+        watch_factory: Callable = watch.Watch,
+    ):
+        """
+        Args:
+            list_func: The ``list_namespaced_*`` method of the kind.
+            read_func: The ``read_namespaced_*`` method of the kind.
+            namespace: Namespace of the objects.
+            label_selector: Selects the objects watched.
+            watch_timeout: Seconds each watch request is kept open.
+            resync_interval: Seconds between direct reads of an object
+                waited for.
+            watch_factory: Creates the ``Watch`` objects.
+        """
+        self.list_func = list_func
+        self.read_func = read_func
+        self.namespace = namespace
+        self.label_selector = label_selector
+        self.watch_timeout = watch_timeout
+        self.resync_interval = resync_interval
+        self.watch_factory = watch_factory
+
+        self._lock = threading.Lock()
+        # Latest version of each object, while the watch is in sync
+        self._objects: Dict[str, Any] = {}
+        self._waiters: Dict[
+            str,
+            List[Tuple[Condition, concurrent.futures.Future]],
+        ] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._watch = None
+        self._forbidden_logged = False
+
+    def _resolve(self, name, future, value) -> None:
+        # Called with the lock held
+        waiters = self._waiters.get(name, [])
+        for i, (_, waiter) in enumerate(waiters):
+            if waiter is future:
+                del waiters[i]
+                if not waiters:
+                    del self._waiters[name]
+                future.set_result(value)
+                return
+
+    def _evaluate(self, name, obj) -> None:
+        # Called with the lock held
+        for condition, future in list(self._waiters.get(name, [])):
+            try:
+                result = condition(obj)
+            except Exception as e:
+                logger.debug(f"Condition on '{name}' failed: {e}")
+                continue
+            if result is not PENDING:
+                self._resolve(name, future, result)
+
+    def _add_waiter(self, name, condition) -> concurrent.futures.Future:
+        future = concurrent.futures.Future()
+        with self._lock:
+            self._waiters.setdefault(name, []).append((condition, future))
+            if name in self._objects:
+                self._evaluate(name, self._objects[name])
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name="k8s-watch",
+                    daemon=True,
+                )
+                self._thread.start()
+        return future
+
+    def _remove_waiter(self, name, future) -> None:
+        with self._lock:
+            waiters = self._waiters.get(name, [])
+            waiters[:] = [w for w in waiters if w[1] is not future]
+            if not waiters:
+                self._waiters.pop(name, None)
+            if not self._waiters and self._watch is not None:
+                # Ends the watch once its current request is over
+                self._watch.stop()
+
+    def _resync(self, name, condition, future) -> None:
+        try:
+            obj = self.read_func(name=name, namespace=self.namespace)
+        except ApiException as e:
+            if e.status != 404:
+                return
+            obj = None
+        except Exception:
+            return
+        result = condition(obj)
+        if result is not PENDING:
+            with self._lock:
+                self._resolve(name, future, result)
+
+    def _list(self) -> str:
+        result = self.list_func(
+            namespace=self.namespace,
+            label_selector=self.label_selector,
+        )
+        with self._lock:
+            self._objects = {obj.metadata.name: obj for obj in result.items}
+            for name in list(self._waiters):
+                if name in self._objects:
+                    self._evaluate(name, self._objects[name])
+        return result.metadata.resource_version
+
+    def _stream(self, resource_version) -> None:
+        with self._lock:
+            if not self._waiters:
+                return
+            self._watch = self.watch_factory()
+        for event in self._watch.stream(
+            self.list_func,
+            namespace=self.namespace,
+            label_selector=self.label_selector,
+            resource_version=resource_version,
+            timeout_seconds=self.watch_timeout,
+        ):
+            obj = event["object"]
+            name = obj.metadata.name
+            with self._lock:
+                if event["type"] == "DELETED":
+                    self._objects.pop(name, None)
+                    self._evaluate(name, None)
+                elif event["type"] in ("ADDED", "MODIFIED"):
+                    self._objects[name] = obj
+                    self._evaluate(name, obj)
+                if not self._waiters:
+                    self._watch.stop()
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                if not self._waiters:
+                    self._objects = {}
+                    self._watch = None
+                    self._thread = None
+                    return
+            try:
+                self._stream(self._list())
+            except ApiException as e:
+                if e.status != 403:
+                    logger.debug(f"Kubernetes watch interrupted: {e}")
+                    time.sleep(RETRY_DELAY)
+                    continue
+                if not self._forbidden_logged:
+                    self._forbidden_logged = True
+                    logger.warning(
+                        "Kubernetes watch forbidden, grant list/watch on "
+                        f"{getattr(self.list_func, '__name__', 'objects')} "
+                        f"in namespace '{self.namespace}'; waits fall back "
+                        f"to reads "
+                        f"every {self.resync_interval}s",
+                    )
+                # Retried at the pace of the resync reads
+                time.sleep(self.resync_interval)
+            except Exception as e:
+                # E.g. an expired resource version, list again
+                logger.debug(f"Kubernetes watch interrupted: {e}")
+                time.sleep(RETRY_DELAY)
+
+    def _wait_future(self, name, condition, future, deadline, default):
+        while True:
+            remaining = deadline - time.monotonic()
+            try:
+                return future.result(
+                    max(0.0, min(remaining, self.resync_interval)),
+                )
+            except concurrent.futures.TimeoutError:
+                if remaining <= self.resync_interval:
+                    return default
+                self._resync(name, condition, future)
+
+    def wait(
+        self,
+        name: str,
+        condition: Condition,
+        timeout: float,
+        default: Any = None,
+    ) -> Any:
+        """Wait until ``condition`` of object ``name`` is met.
+
+        Returns:
+            The result of ``condition``, or ``default`` on timeout.
+        """
+        return self.wait_many([name], condition, timeout, default)[name]
+
+    def wait_many(
+        self,
+        names: List[str],
+        condition: Condition,
+        timeout: float,
+        default: Any = None,
+    ) -> Dict[str, Any]:
+        """Wait until ``condition`` is met for each of ``names``, all
+        within ``timeout``.
+
+        Returns:
+            dict: The result of ``condition`` per name, or ``default`` for
+            those that timed out.
+        """
+        futures = {name: self._add_waiter(name, condition) for name in names}
+        deadline = time.monotonic() + timeout
+        try:
+            return {
+                name: self._wait_future(
+                    name,
+                    condition,
+                    future,
+                    deadline,
+                    default,
+                )
+                for name, future in futures.items()
+            }
+        finally:
+            for name, future in futures.items():
+                self._remove_waiter(name, future)
+
+    async def wait_async(
+        self,
+        name: str,
+        condition: Condition,
+        timeout: float,
+        default: Any = None,
+    ) -> Any:
+        """Async version of :meth:`wait`; no thread is held while
+        waiting."""
+        future = self._add_waiter(name, condition)
+        wrapped = asyncio.wrap_future(future)
+        deadline = time.monotonic() + timeout
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                done, _ = await asyncio.wait(
+                    {wrapped},
+                    timeout=max(0.0, min(remaining, self.resync_interval)),
+                )
+                if done:
+                    return wrapped.result()
+                if remaining <= self.resync_interval:
+                    return default
+                await asyncio.to_thread(
+                    self._resync,
+                    name,
+                    condition,
+                    future,
+                )
+        finally:
+            self._remove_waiter(name, future)
@@ -23,6 +23,12 @@ from ..deployers.adapter.responses.response_api_protocol_adapter import (
 )
 from ..deployers.adapter.agui import AGUIDefaultAdapter, AGUIAdaptorConfig
 from ..deployers.utils.deployment_modes import DeploymentMode
+from ..deployers.utils.service_utils.admission_control import (
+    AdmissionController,
+)
+from ..deployers.utils.service_utils.task_manager import (
+    BackgroundTaskManager,
+)
 from ..deployers.utils.service_utils.fastapi_factory import FastAPIAppFactory
 from ..runner import Runner
 from ..schemas.agent_schemas import AgentRequest
@@ -55,6 +61,8 @@ class AgentApp(BaseApp):
         enable_embedded_worker: bool = False,
         a2a_config: Optional["AgentCardWithRuntimeConfig"] = None,
         agui_config: Optional[AGUIAdaptorConfig] = None,
+        admission_controller: Optional[AdmissionController] = None,
+        task_manager: Optional[BackgroundTaskManager] = None,
         **kwargs,
     ):
         """
@@ -100,6 +108,43 @@ class AgentApp(BaseApp):
                         task_timeout=120,
                     )
             agui_config: Config for AGUI adaptor.
+            admission_controller: Concurrency limit shared by all
+                endpoints except GET ones, with a bounded wait queue.
+                Requests over it are rejected with 429/503 and
+                ``Retry-After``; its state is reported on ``/health``.
+
+                Example::
+
+                    from agentscope_runtime.engine.deployers.utils.service_utils.admission_control import (
+                        AdmissionController,
+                    )
+
+                    controller = AdmissionController(
+                        max_concurrency=64,
+                        route_limits={"/process": 48},
+                        max_queue_size=128,
+                        queue_timeout=5,
+                        target_latency=30,
+                    )
+            task_manager: Runs ``@task`` endpoints when no Celery broker is
+                configured, on a bounded worker pool, with task state kept
+                in its task store (in memory by default; Redis and SQLite
+                stores are available). Task results expire with the store
+                TTL.
+
+                Example::
+
+                    from agentscope_runtime.engine.deployers.utils.service_utils.task_manager import (
+                        BackgroundTaskManager,
+                    )
+                    from agentscope_runtime.engine.deployers.utils.service_utils.task_store import (
+                        SQLiteTaskStore,
+                    )
+
+                    task_manager = BackgroundTaskManager(
+                        store=SQLiteTaskStore("tasks.db", ttl=86400),
+                        max_workers=4,
+                    )
             **kwargs: Additional keyword arguments passed to FastAPI app
         """
 
@@ -112,6 +157,8 @@ class AgentApp(BaseApp):
         self.broker_url = broker_url
         self.backend_url = backend_url
         self.enable_embedded_worker = enable_embedded_worker
+        self.admission_controller = admission_controller
+        self.task_manager = task_manager
 
         self._runner = runner
         self.custom_endpoints = []  # Store custom endpoints
@@ -311,6 +358,8 @@ class AgentApp(BaseApp):
             backend_url=self.backend_url,
             enable_embedded_worker=self.enable_embedded_worker,
             app_kwargs=self._app_kwargs,
+            admission_controller=self.admission_controller,
+            task_manager=self.task_manager,
             **kwargs,
         )
 
@@ -328,6 +377,10 @@ class AgentApp(BaseApp):
             "stream": self.stream,
             "protocol_adapters": self.protocol_adapters,
         }
+        if self.admission_controller is not None:
+            deploy_kwargs["admission_controller"] = self.admission_controller
+        if self.task_manager is not None:
+            deploy_kwargs["task_manager"] = self.task_manager
         deploy_kwargs.update(kwargs)
         return await deployer.deploy(**deploy_kwargs)
 
@@ -350,8 +403,20 @@ class AgentApp(BaseApp):
 
         return decorator
 
-    def task(self, path: str, queue: str = "default"):
-        """Decorator to register custom task endpoints"""
+    def task(
+        self,
+        path: str,
+        queue: str = "default",
+        priority: int = 0,
+        stream: Optional[bool] = None,
+    ):
+        """Decorator to register custom task endpoints.
+
+        Without Celery, tasks with a lower ``priority`` run first; a
+        request can override it with the ``priority`` query parameter.
+        With Celery, ``stream=True`` makes a generator task publish its
+        items as they are produced (see `CeleryMixin`).
+        """
 
         def decorator(func: Callable):
             # Store task configuration for FastAPIAppFactory to handle
@@ -362,6 +427,8 @@ class AgentApp(BaseApp):
                 "module": getattr(func, "__module__", None),
                 "function_name": getattr(func, "__name__", None),
                 "queue": queue,
+                "priority": priority,
+                "stream": stream,
                 "task_type": True,  # Mark as task endpoint
                 "original_func": func,
             }
@@ -24,12 +24,18 @@ class BaseApp(CeleryMixin):
         # Initialize CeleryMixin
         CeleryMixin.__init__(self, broker_url, backend_url)
 
-    def task(self, path: str, queue: str = "celery"):
+    def task(
+        self,
+        path: str,
+        queue: str = "celery",
+        stream: Optional[bool] = None,
+    ):
         """
         Register an asynchronous task endpoint.
         POST <path>  -> Create a task and return task ID
         GET  <path>/{task_id} -> Check the task status and result
-        Combines Celery and FastAPI routing functionality.
+        Combines Celery and FastAPI routing functionality. See
+        `CeleryMixin.register_celery_task` for ``stream``.
         """
         if self.celery_app is None:
             raise RuntimeError(
@@ -46,7 +52,11 @@ class BaseApp(CeleryMixin):
 
         def decorator(func: Callable):
             # Register Celery task using CeleryMixin
-            celery_task = self.register_celery_task(func, queue=queue)
+            celery_task = self.register_celery_task(
+                func,
+                queue=queue,
+                stream=stream,
+            )
 
             # Add FastAPI HTTP routes
             @self.post(path)
@@ -1,12 +1,19 @@
 # -*- coding: utf-8 -*-
 import inspect
 import asyncio
+import json
 import logging
-from typing import Callable, Optional, List
+import time
+from typing import Any, AsyncIterator, Callable, Dict, Optional, List
 from celery import Celery
 
 logger = logging.getLogger(__name__)
 
+STREAM_KEY_PREFIX = "agentscope:task_stream"
+DEFAULT_STREAM_TTL = 86400  # seconds
+# Seconds between progress updates of a streaming task's state
+STREAM_PROGRESS_INTERVAL = 1.0
+
 
 class CeleryMixin:
     """
@@ -18,7 +25,33 @@ class CeleryMixin:
         self,
         broker_url: Optional[str] = None,
         backend_url: Optional[str] = None,
+        stream_url: Optional[str] = None,
+        stream_ttl: int = DEFAULT_STREAM_TTL,
     ):
+        """
+        Args:
+            broker_url: Celery broker URL
+            backend_url: Celery result backend URL
+            stream_url: Redis URL that generator tasks publish their items
+                to as they are produced, instead of returning them together.
+                Setting it turns streaming on for all generator tasks; a
+                streaming task returns ``{"streamed": True, "total": n}``
+                and its items are read with `get_streamed_results`.
+            stream_ttl: Seconds the published items are kept
+        """
+        self.stream_url = stream_url
+        # Used by tasks registered with ``stream=True`` if no stream_url
+        self._redis_url = stream_url or next(
+            (
+                url
+                for url in (backend_url, broker_url)
+                if url and url.startswith(("redis://", "rediss://"))
+            ),
+            None,
+        )
+        self.stream_ttl = stream_ttl
+        self._stream_client = None
+
         if broker_url and backend_url:
             self.celery_app = Celery(
                 "agentscope_runtime",
@@ -33,10 +66,71 @@ class CeleryMixin:
     def get_registered_queues(self) -> set[str]:
         return self._registered_queues
 
-    def register_celery_task(self, func: Callable, queue: str = "celery"):
-        """Register a Celery task for the given function."""
+    def _get_stream_client(self):
+        if self._stream_client is None and self._redis_url:
+            import redis
+
+            self._stream_client = redis.Redis.from_url(self._redis_url)
+        return self._stream_client
+
+    @staticmethod
+    def _stream_key(task_id: str) -> str:
+        return f"{STREAM_KEY_PREFIX}:{task_id}"
+
+    def _publish_item(self, task_id: str, item: Any) -> None:
+        key = self._stream_key(task_id)
+        pipe = self._get_stream_client().pipeline()
+        pipe.rpush(key, json.dumps(item))
+        pipe.expire(key, self.stream_ttl)
+        pipe.execute()
+
+    def get_streamed_results(
+        self,
+        task_id: str,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> List[Any]:
+        """Items a generator task has published so far, from ``offset``."""
+        client = self._get_stream_client()
+        if client is None or (limit is not None and limit <= 0):
+            return []
+        end = -1 if limit is None else offset + limit - 1
+        return [
+            json.loads(value)
+            for value in client.lrange(self._stream_key(task_id), offset, end)
+        ]
+
+    def _count_streamed(self, task_id: str) -> int:
+        client = self._get_stream_client()
+        if client is None:
+            return 0
+        return client.llen(self._stream_key(task_id))
+
+    def register_celery_task(
+        self,
+        func: Callable,
+        queue: str = "celery",
+        stream: Optional[bool] = None,
+    ):
+        """Register a Celery task for the given function.
+
+        Args:
+            func: The task function.
+            queue: The queue the task is sent to.
+            stream: Whether a generator ``func`` publishes its items as
+                they are produced rather than returning them as a list.
+                Defaults to whether ``stream_url`` is set; ``True`` uses
+                the Redis result backend or broker if it is not.
+        """
         if self.celery_app is None:
             raise RuntimeError("Celery is not configured.")
+        if stream is None:
+            stream = self.stream_url is not None
+        if stream and self._get_stream_client() is None:
+            raise RuntimeError(
+                "Streaming task results needs a Redis stream_url, "
+                "backend_url or broker_url.",
+            )
 
         self._registered_queues.add(queue)
 
@@ -58,17 +152,42 @@ class CeleryMixin:
             # Fallback: string representation for anything else
             return str(x)
 
-        async def _collect_async_gen(agen):
-            items = []
+        def _publish(task, progress, x):
+            # Publish each item as it comes, and keep none in memory
+            self._publish_item(task.request.id, _coerce_result(x))
+            progress["total"] += 1
+            # The first item marks the task as streamed; later ones only
+            # refresh the total now and then, as readers count the
+            # published items themselves
+            now = time.monotonic()
+            if now - progress["reported_at"] >= STREAM_PROGRESS_INTERVAL:
+                progress["reported_at"] = now
+                task.update_state(
+                    state="PROGRESS",
+                    meta={"streamed": True, "total": progress["total"]},
+                )
+
+        def _new_progress():
+            return {"total": 0, "reported_at": float("-inf")}
+
+        async def _collect_async_gen(task, agen):
+            if not stream:
+                return [_coerce_result(x) async for x in agen]
+            progress = _new_progress()
             async for x in agen:
-                items.append(_coerce_result(x))
-            return items
+                _publish(task, progress, x)
+            return {"streamed": True, "total": progress["total"]}
 
-        def _collect_gen(gen):
-            return [_coerce_result(x) for x in gen]
+        def _collect_gen(task, gen):
+            if not stream:
+                return [_coerce_result(x) for x in gen]
+            progress = _new_progress()
+            for x in gen:
+                _publish(task, progress, x)
+            return {"streamed": True, "total": progress["total"]}
 
-        @self.celery_app.task(queue=queue)
-        def wrapper(*args, **kwargs):
+        @self.celery_app.task(queue=queue, bind=True)
+        def wrapper(task, *args, **kwargs):
             # 1) async generator function
             if inspect.isasyncgenfunction(func):
                 result = func(*args, **kwargs)
@@ -79,10 +198,10 @@ class CeleryMixin:
                 result = func(*args, **kwargs)
             # 3) async generator
             if inspect.isasyncgen(result):
-                return asyncio.run(_collect_async_gen(result))
+                return asyncio.run(_collect_async_gen(task, result))
             # 4) sync generator
             if inspect.isgenerator(result):
-                return _collect_gen(result)
+                return _collect_gen(task, result)
             # 5) normal return
             return _coerce_result(result)
 
@@ -106,21 +225,103 @@ class CeleryMixin:
 
         self.celery_app.worker_main(cmd)
 
-    def get_task_status(self, task_id: str):
-        """Get task status from Celery result backend."""
+    def get_task_status(
+        self,
+        task_id: str,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ):
+        """Get task status from Celery result backend.
+
+        For generator tasks publishing their items, ``result`` is the page
+        of up to ``limit`` items (all by default) from ``offset`` on, also
+        while the task still runs, along with the ``total`` so far.
+        """
         if self.celery_app is None:
             return {"error": "Celery not configured"}
 
         result = self.celery_app.AsyncResult(task_id)
         if result.state == "PENDING":
             return {"status": "pending", "result": None}
-        elif result.state == "SUCCESS":
-            return {"status": "finished", "result": result.result}
+        elif result.state in ("PROGRESS", "SUCCESS"):
+            info = result.info
+            if not (isinstance(info, dict) and info.get("streamed")):
+                if result.state == "PROGRESS":
+                    return {"status": "pending", "result": None}
+                return {"status": "finished", "result": result.result}
+            total = info["total"]
+            if result.state == "PROGRESS":
+                # The task state is only refreshed now and then
+                total = max(total, self._count_streamed(task_id))
+            return {
+                "status": (
+                    "finished" if result.state == "SUCCESS" else "pending"
+                ),
+                "result": self.get_streamed_results(task_id, offset, limit),
+                "offset": offset,
+                "total": total,
+            }
         elif result.state == "FAILURE":
             return {"status": "error", "result": str(result.info)}
         else:
             return {"status": result.state, "result": None}
 
+    async def stream_task_results(
+        self,
+        task_id: str,
+        offset: int = 0,
+        poll_interval: float = 0.5,
+        pending_timeout: Optional[float] = 60.0,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield the results of a task as they are published.
+
+        Yields ``{"result": item}`` per result, then a last
+        ``{"status": ...}`` once the task is done; the task state is
+        polled every ``poll_interval`` seconds. Celery reports unknown
+        task ids as pending, so after ``pending_timeout`` seconds without
+        the task starting, ``{"status": "pending"}`` is yielded last.
+        """
+        if self.celery_app is None:
+            yield {"error": "Celery not configured"}
+            return
+
+        started = time.monotonic()
+        while True:
+            result = self.celery_app.AsyncResult(task_id)
+            state, info = await asyncio.to_thread(
+                lambda: (result.state, result.info),
+            )
+            if (
+                state == "PENDING"
+                and pending_timeout is not None
+                and time.monotonic() - started >= pending_timeout
+            ):
+                yield {"status": "pending"}
+                return
+            streamed = isinstance(info, dict) and info.get("streamed")
+            # Also read the items a failed generator published
+            if streamed or state == "FAILURE":
+                items = await asyncio.to_thread(
+                    self.get_streamed_results,
+                    task_id,
+                    offset,
+                )
+                for item in items:
+                    yield {"result": item}
+                offset += len(items)
+
+            if state == "SUCCESS":
+                # All items were published before the task succeeded, so
+                # the read above got the rest of them
+                if not streamed:
+                    yield {"result": result.result}
+                yield {"status": "finished"}
+                return
+            if state == "FAILURE":
+                yield {"status": "error", "error": str(result.info)}
+                return
+            await asyncio.sleep(poll_interval)
+
     def submit_task(self, func: Callable, *args, **kwargs):
         """Submit task directly to Celery queue."""
         if not hasattr(func, "celery_task"):
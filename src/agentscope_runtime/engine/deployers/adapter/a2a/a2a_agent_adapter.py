@@ -1,17 +1,21 @@
 # -*- coding: utf-8 -*-
 # pylint: disable=unused-argument
+import asyncio
 import logging
 import traceback
 from typing import Callable
 
 from a2a.server.agent_execution import AgentExecutor, RequestContext
 from a2a.server.events import EventQueue
-from a2a.types import UnsupportedOperationError
-from a2a.utils.errors import ServerError
+from a2a.server.tasks import TaskUpdater
 
 from agentscope_runtime.engine.deployers.adapter.a2a.a2a_adapter_utils import (
     agent_message_to_a2a_message,
 )
+from agentscope_runtime.engine.deployers.adapter.request_guard import (
+    DEADLINE_GRACE,
+    guard_stream,
+)
 from agentscope_runtime.engine.schemas.agent_schemas import (
     AgentRequest,
     RunStatus,
@@ -23,6 +27,7 @@ logger = logging.getLogger(__name__)
 class A2AExecutor(AgentExecutor):
     def __init__(self, func: Callable, **kwargs):
         self._func = func
+        self._timeout = kwargs.get("timeout")  # seconds
 
     async def execute(
         self,
@@ -51,13 +56,25 @@ class A2AExecutor(AgentExecutor):
         )
 
         try:
-            async for event in self._func(request=request):
+            # The run is cancelled at its deadline, or by the request
+            # handler when the task is canceled.
+            async for event in guard_stream(
+                lambda: self._func(request=request),
+                name="a2a",
+                timeout=self._timeout,
+                grace=DEADLINE_GRACE,
+            ):
                 if event.object == "response":
                     if event.status == RunStatus.Completed:
                         if event.output:
                             message = event.output[len(event.output) - 1]
                             a2a_message = agent_message_to_a2a_message(message)
                             await event_queue.enqueue_event(a2a_message)
+        except asyncio.TimeoutError:
+            logger.error(
+                f"Task {context.task_id} timed out after "
+                f"{self._timeout} seconds",
+            )
         except Exception as e:
             logger.error(f"An error occurred: {e}, {traceback.format_exc()}")
 
@@ -66,4 +83,10 @@ class A2AExecutor(AgentExecutor):
         context: RequestContext,
         event_queue: EventQueue,
     ) -> None:
-        raise ServerError(error=UnsupportedOperationError())
+        # The request handler cancels the running execute() afterwards.
+        updater = TaskUpdater(
+            event_queue,
+            context.task_id,
+            context.context_id,
+        )
+        await updater.cancel()
@@ -233,7 +233,7 @@ class A2AFastAPIDefaultAdapter(ProtocolAdapter):
             **kwargs: Additional arguments for registry registration
         """
         request_handler = DefaultRequestHandler(
-            agent_executor=A2AExecutor(func=func),
+            agent_executor=A2AExecutor(func=func, timeout=self._task_timeout),
             task_store=InMemoryTaskStore(),
         )
 
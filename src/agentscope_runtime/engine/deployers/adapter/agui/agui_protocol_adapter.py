@@ -7,7 +7,7 @@ from typing import Any, AsyncGenerator, Callable, List, Optional
 from uuid import uuid4
 
 from ag_ui.core.types import Context, Message, Tool
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
@@ -20,6 +20,7 @@ from .agui_adapter_utils import (
     RunErrorEvent,
 )
 from ..protocol_adapter import ProtocolAdapter
+from ..request_guard import DEADLINE_GRACE, guard_stream
 
 logger = logging.getLogger(__name__)
 
@@ -99,6 +100,7 @@ class AGUIDefaultAdapter(ProtocolAdapter):
         self._execution_func: Optional[
             Callable[[AgentRequest], AsyncGenerator[Event, None]]
         ] = None
+        self._timeout = kwargs.get("timeout", 300)  # seconds
         self._max_concurrent_requests = kwargs.get(
             "max_concurrent_requests",
             100,
@@ -108,9 +110,13 @@ class AGUIDefaultAdapter(ProtocolAdapter):
     async def _handle_requests(
         self,
         agent_run_input: FlexibleRunAgentInput,
+        request: Request,
     ) -> StreamingResponse:
         """
         Handle AG-UI streaming request.
+
+        The agent run is cancelled when the request times out or the client
+        disconnects, which also frees its concurrency slot.
         """
         await self._semaphore.acquire()
         request_id = f"agui_{uuid4()}"
@@ -124,6 +130,7 @@ class AGUIDefaultAdapter(ProtocolAdapter):
                 self._stream_with_semaphore(
                     agent_run_input,
                     request_id,
+                    http_request=request,
                 ),
                 media_type="text/event-stream",
                 headers=SSE_HEADERS,
@@ -201,10 +208,26 @@ class AGUIDefaultAdapter(ProtocolAdapter):
         self,
         request: FlexibleRunAgentInput,
         request_id: str,
+        http_request: Optional[Request] = None,
     ):
         try:
-            async for chunk in self._generate_stream_response(request):
+            async for chunk in guard_stream(
+                lambda: self._generate_stream_response(request),
+                name="agui",
+                timeout=self._timeout,
+                is_disconnected=(
+                    http_request.is_disconnected if http_request else None
+                ),
+                grace=DEADLINE_GRACE,
+            ):
                 yield chunk
+        except asyncio.TimeoutError:
+            logger.error(f"Request timeout after {self._timeout} seconds")
+            error_event = RunErrorEvent(
+                message=f"Request timed out after {self._timeout} seconds",
+                code="timeout",
+            )
+            yield self.as_sse_data(error_event)
         finally:
             self._semaphore.release()
             logger.info("[AGUI] end request_id=%s", request_id)
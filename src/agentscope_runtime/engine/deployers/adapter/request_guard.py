@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+"""
+Per-request deadlines and cancellation for protocol adapters.
+
+A protocol adapter runs the agent stream of a request through
+:func:`guard_stream`. The stream then runs in its own task, which is
+cancelled, together with everything it awaits, once the request deadline
+has passed or the client has disconnected. The deadline is kept in a
+context variable, so ``Runner.stream_query`` and the query handler it calls
+can read it with :func:`get_request_deadline` and
+:func:`get_remaining_time`.
+"""
+import asyncio
+import contextvars
+import logging
+import time
+from contextlib import contextmanager
+from typing import (
+    AsyncGenerator,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterator,
+    Optional,
+    TypeVar,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Time the adapters leave to the runner to report a timeout itself before
+# they cut the stream.
+DEADLINE_GRACE = 1.0  # seconds
+DISCONNECT_POLL_INTERVAL = 0.5  # seconds
+
+_request_deadline: contextvars.ContextVar[
+    Optional[float]
+] = contextvars.ContextVar("request_deadline", default=None)
+
+_ITEM, _ERROR, _DONE, _CANCELLED = range(4)
+
+
+class RequestTimeoutError(asyncio.TimeoutError):
+    """The request deadline passed before its stream finished."""
+
+
+class RequestMetrics:
+    """Outcome counters of the requests guarded under one name."""
+
+    def __init__(self) -> None:
+        self.started = 0
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.abandoned = 0
+
+    def get_metrics(self) -> Dict[str, int]:
+        return {
+            "started": self.started,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+            "abandoned": self.abandoned,
+            "in_flight": self.started
+            - self.completed
+            - self.failed
+            - self.timed_out
+            - self.abandoned,
+        }
+
+
+_metrics: Dict[str, RequestMetrics] = {}
+
+
+def get_request_metrics() -> Dict[str, Dict[str, int]]:
+    """Outcome counters of guarded requests, per adapter name.
+
+    ``timed_out`` counts requests cancelled at their deadline and
+    ``abandoned`` requests cancelled because the client went away.
+    """
+    return {name: m.get_metrics() for name, m in _metrics.items()}
+
+
+def get_request_deadline() -> Optional[float]:
+    """Deadline of the current request in ``time.monotonic()`` seconds,
+    or ``None`` if it has none."""
+    return _request_deadline.get()
+
+
+def get_remaining_time() -> Optional[float]:
+    """Seconds left until the deadline of the current request, or ``None``
+    if it has none."""
+    deadline = _request_deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+@contextmanager
+def request_deadline(timeout: Optional[float]) -> Iterator[Optional[float]]:
+    """Set the deadline of the current request to ``timeout`` seconds from
+    now, unless an earlier deadline is already set.
+
+    Yields:
+        Optional[float]: The deadline in effect.
+    """
+    deadline = _request_deadline.get()
+    if timeout is not None:
+        new_deadline = time.monotonic() + timeout
+        if deadline is None or new_deadline < deadline:
+            deadline = new_deadline
+    token = _request_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _request_deadline.reset(token)
+
+
+async def _produce(
+    stream: Callable[[], AsyncIterator[T]],
+    queue: asyncio.Queue,
+) -> None:
+    try:
+        async for item in stream():
+            await queue.put((_ITEM, item))
+    except Exception as e:
+        await queue.put((_ERROR, e))
+    else:
+        await queue.put((_DONE, None))
+
+
+def _wake_on_cancel(queue: asyncio.Queue, producer: asyncio.Task) -> None:
+    if producer.cancelled():
+        # What is left in the queue is not delivered any more.
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait((_CANCELLED, None))
+
+
+async def _watch(
+    producer: asyncio.Task,
+    cutoff: Optional[float],
+    is_disconnected: Optional[Callable[[], Awaitable[bool]]],
+    poll_interval: float,
+    outcome: Dict[str, str],
+) -> None:
+    while not producer.done():
+        delay = poll_interval if is_disconnected else None
+        if cutoff is not None:
+            remaining = cutoff - time.monotonic()
+            if remaining <= 0:
+                outcome["reason"] = "timed_out"
+                producer.cancel()
+                return
+            delay = remaining if delay is None else min(delay, remaining)
+        if delay is None:
+            return
+        await asyncio.sleep(delay)
+        if is_disconnected is not None and await is_disconnected():
+            outcome["reason"] = "abandoned"
+            producer.cancel()
+            return
+
+
+async def guard_stream(
+    stream: Callable[[], AsyncIterator[T]],
+    name: str,
+    timeout: Optional[float] = None,
+    is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+    grace: float = 0.0,
+    poll_interval: float = DISCONNECT_POLL_INTERVAL,
+) -> AsyncGenerator[T, None]:
+    """Iterate ``stream()`` under the request deadline, in its own task.
+
+    The task is cancelled ``grace`` seconds after the deadline, when
+    ``is_disconnected()`` returns true, or when this generator is closed
+    before the stream is exhausted. This generator then waits for the
+    stream to finish its cleanup.
+
+    Args:
+        stream (Callable[[], AsyncIterator[T]]): Creates the stream. It is
+            called in the new task, which sees the request deadline.
+        name (str): Name the outcome is counted under in
+            :func:`get_request_metrics`.
+        timeout (Optional[float]): Seconds the request may take. An earlier
+            deadline already set for the request is kept.
+        is_disconnected (Optional[Callable[[], Awaitable[bool]]]): Polled
+            every ``poll_interval`` seconds; returns whether the client
+            has gone away.
+        grace (float): Seconds past the deadline before the stream is cut.
+        poll_interval (float): Seconds between ``is_disconnected()`` calls.
+
+    Raises:
+        RequestTimeoutError: When the stream was cut at its deadline.
+    """
+    metrics = _metrics.setdefault(name, RequestMetrics())
+    metrics.started += 1
+    # Bounded, so that a stream does not run ahead of a slow client.
+    queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+    outcome = {"reason": "abandoned"}
+
+    with request_deadline(timeout) as deadline:
+        producer = asyncio.create_task(_produce(stream, queue))
+    producer.add_done_callback(lambda t: _wake_on_cancel(queue, t))
+    cutoff = deadline + grace if deadline is not None else None
+    watchdog = None
+    if cutoff is not None or is_disconnected is not None:
+        watchdog = asyncio.create_task(
+            _watch(producer, cutoff, is_disconnected, poll_interval, outcome),
+        )
+
+    try:
+        while True:
+            kind, value = await queue.get()
+            if kind == _ITEM:
+                yield value
+            elif kind == _DONE:
+                outcome["reason"] = "completed"
+                return
+            elif kind == _ERROR:
+                outcome["reason"] = "failed"
+                raise value
+            else:
+                if outcome["reason"] == "timed_out":
+                    raise RequestTimeoutError("Request deadline exceeded")
+                return
+    finally:
+        if watchdog is not None:
+            watchdog.cancel()
+        if not producer.done():
+            producer.cancel()
+            # Let the stream release its resources before returning.
+            await asyncio.wait([producer])
+        reason = outcome["reason"]
+        setattr(metrics, reason, getattr(metrics, reason) + 1)
+        if reason in ("timed_out", "abandoned"):
+            logger.warning("[%s] request %s", name, reason.replace("_", " "))
@@ -15,6 +15,7 @@ from openai.types.responses import ResponseCreateParams
 from .response_api_adapter_utils import ResponsesAdapter
 from .response_api_agent_adapter import ResponseAPIExecutor
 from ..protocol_adapter import ProtocolAdapter
+from ..request_guard import DEADLINE_GRACE, guard_stream
 from ....schemas.agent_schemas import AgentRequest, BaseResponse
 
 logger = logging.getLogger(__name__)
@@ -68,6 +69,7 @@ class ResponseAPIDefaultAdapter(ProtocolAdapter):
                     self._generate_stream_response_with_timeout(
                         request=request_data,
                         request_id=request_id,
+                        http_request=request,
                     ),
                     media_type="text/event-stream",
                     headers=SSE_HEADERS,
@@ -77,6 +79,7 @@ class ResponseAPIDefaultAdapter(ProtocolAdapter):
             response_obj = await self._collect_non_stream_response(
                 request=request_data,
                 request_id=request_id,
+                http_request=request,
             )
             return JSONResponse(content=response_obj)
 
@@ -120,17 +123,39 @@ class ResponseAPIDefaultAdapter(ProtocolAdapter):
         self,
         request: Dict,
         request_id: str,
+        http_request: Optional[Request] = None,
     ) -> Dict[str, Any]:
         """
         Run the agent and build a non-streaming OpenAI Responses API object.
 
         This collects events until completion and returns a single JSON object
-        representing the final response.
+        representing the final response. The agent run is cancelled when the
+        request times out or the client disconnects.
         """
         last_agent_response: Optional[BaseResponse] = None
         try:
-            async for event in self._executor.execute(request):
+            async for event in guard_stream(
+                lambda: self._executor.execute(request),
+                name="responses",
+                timeout=self._timeout,
+                is_disconnected=(
+                    http_request.is_disconnected if http_request else None
+                ),
+                grace=DEADLINE_GRACE,
+            ):
                 last_agent_response = event
+        except asyncio.TimeoutError:
+            logger.error(f"Request timeout after {self._timeout} seconds")
+            return {
+                "id": request_id,
+                "object": "response",
+                "status": "failed",
+                "error": {
+                    "code": "timeout",
+                    "message": f"Request timed out after "
+                    f"{self._timeout} seconds",
+                },
+            }
         except Exception:
             # Map to Responses error shape
             return {
@@ -162,21 +187,34 @@ class ResponseAPIDefaultAdapter(ProtocolAdapter):
         self,
         request: Dict,
         request_id: str,
+        http_request: Optional[Request] = None,
     ) -> AsyncGenerator[str, None]:
         """
         Generate SSE streaming response with timeout.
 
+        The agent run is cancelled when the request times out or the client
+        disconnects.
+
         Args:
-            agent_request: Agent API request
+            request: Responses API request
+            request_id: Response id
+            http_request: FastAPI Request, polled for client disconnects
 
         Yields:
             str: SSE data chunks
         """
         try:
-            # Add timeout with asyncio.wait_for
-            async for chunk in self._generate_stream_response(
-                request=request,
-                request_id=request_id,
+            async for chunk in guard_stream(
+                lambda: self._generate_stream_response(
+                    request=request,
+                    request_id=request_id,
+                ),
+                name="responses",
+                timeout=self._timeout,
+                is_disconnected=(
+                    http_request.is_disconnected if http_request else None
+                ),
+                grace=DEADLINE_GRACE,
             ):
                 yield chunk
         except asyncio.TimeoutError:
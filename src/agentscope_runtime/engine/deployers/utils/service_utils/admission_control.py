@@ -0,0 +1,277 @@
+# -*- coding: utf-8 -*-
+"""
+Admission control and load shedding for agent services.
+
+The :class:`AdmissionController` bounds how many requests the service runs
+at once, globally and per route. Requests over the limit wait in a bounded
+FIFO queue for at most ``queue_timeout`` seconds; requests that find the
+queue full or time out in it are rejected at once with ``Retry-After``,
+instead of piling up and driving latency up for everyone.
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from fastapi.responses import JSONResponse
+
+logger = logging.getLogger(__name__)
+
+# Requests with these methods are never queued nor rejected
+EXEMPT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class AdmissionRejected(Exception):
+    """A request was shed by the admission controller."""
+
+    def __init__(self, status_code: int, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Shared concurrency limit of an agent service.
+
+    With ``target_latency`` set, the global limit adapts to the observed
+    latency (AIMD): it grows by about one per round of requests finishing
+    within the target, and is cut by ``backoff`` whenever one is slower or
+    fails with a server error. It always stays between ``min_concurrency``
+    and ``max_concurrency``.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 100,
+        route_limits: Optional[Dict[str, int]] = None,
+        max_queue_size: int = 100,
+        queue_timeout: float = 10.0,
+        retry_after: int = 1,
+        target_latency: Optional[float] = None,
+        min_concurrency: int = 1,
+        backoff: float = 0.9,
+    ) -> None:
+        """Initialize the admission controller.
+
+        Args:
+            max_concurrency (int): Requests running at once, over all routes.
+            route_limits (Optional[Dict[str, int]]): Requests running at
+                once per route path, e.g. ``{"/process": 50}``.
+            max_queue_size (int): Requests waiting for a slot; more are
+                rejected at once.
+            queue_timeout (float): Seconds a request may wait for a slot.
+            retry_after (int): ``Retry-After`` seconds of rejections.
+            target_latency (Optional[float]): Seconds a request should take;
+                enables the adaptive limit.
+            min_concurrency (int): Lower bound of the adaptive limit.
+            backoff (float): Factor the adaptive limit is cut by.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        self.route_limits = route_limits or {}
+        self.max_queue_size = max_queue_size
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.target_latency = target_latency
+        self.min_concurrency = max(1, min(min_concurrency, max_concurrency))
+        self.backoff = backoff
+
+        self.limit = float(max_concurrency)
+        self._active = 0
+        self._route_active: Dict[str, int] = {}
+        self._waiters: Deque[Tuple[str, asyncio.Future]] = deque()
+
+        self.admitted = 0
+        self.rejected = 0
+        self.queue_timeouts = 0
+
+    def _route_limit(self, route: str) -> Optional[int]:
+        return self.route_limits.get(route)
+
+    def _can_admit(self, route: str) -> bool:
+        if self._active >= int(self.limit):
+            return False
+        route_limit = self._route_limit(route)
+        return (
+            route_limit is None
+            or self._route_active.get(route, 0) < route_limit
+        )
+
+    def _admit(self, route: str) -> None:
+        self._active += 1
+        self._route_active[route] = self._route_active.get(route, 0) + 1
+        self.admitted += 1
+
+    def _reject(self, route: str, reason: str) -> AdmissionRejected:
+        self.rejected += 1
+        route_limit = self._route_limit(route)
+        # A full route is the client's load, a full service is ours.
+        route_full = (
+            route_limit is not None
+            and self._route_active.get(route, 0) >= route_limit
+        )
+        logger.warning("[admission] rejected %s: %s", route, reason)
+        return AdmissionRejected(
+            429 if route_full else 503,
+            reason,
+            self.retry_after,
+        )
+
+    async def acquire(self, route: str) -> None:
+        """Wait for a slot on ``route``.
+
+        Raises:
+            AdmissionRejected: When the queue is full, or no slot became
+                free within ``queue_timeout`` seconds.
+        """
+        if not self._waiters and self._can_admit(route):
+            self._admit(route)
+            return
+        if len(self._waiters) >= self.max_queue_size:
+            raise self._reject(route, "admission queue is full")
+
+        waiter = (route, asyncio.get_running_loop().create_future())
+        self._waiters.append(waiter)
+        # It may pass waiters held back by their full routes
+        self._wake_waiters()
+        try:
+            # The slot is taken for the waiter by _wake_waiters()
+            await asyncio.wait_for(waiter[1], self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._remove_waiter(waiter)
+            self.queue_timeouts += 1
+            raise self._reject(
+                route,
+                f"no slot within {self.queue_timeout} seconds",
+            ) from None
+        except asyncio.CancelledError:
+            if waiter[1].done() and not waiter[1].cancelled():
+                # Cancelled right after it got its slot
+                self.release(route)
+            else:
+                self._remove_waiter(waiter)
+            raise
+
+    def _remove_waiter(self, waiter: Tuple[str, asyncio.Future]) -> None:
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+        # Wake the next waiters, which may have been blocked behind it
+        self._wake_waiters()
+
+    def release(
+        self,
+        route: str,
+        latency: Optional[float] = None,
+        failed: bool = False,
+    ) -> None:
+        """Free the slot of a finished request on ``route``.
+
+        Args:
+            route (str): Route the slot was acquired for.
+            latency (Optional[float]): Seconds the request took.
+            failed (bool): Whether the request failed with a server error.
+        """
+        self._active -= 1
+        self._route_active[route] -= 1
+        if not self._route_active[route]:
+            del self._route_active[route]
+        if self.target_latency is not None and latency is not None:
+            if failed or latency > self.target_latency:
+                self.limit = max(
+                    float(self.min_concurrency),
+                    self.limit * self.backoff,
+                )
+            elif self._active + 1 >= self.limit / 2:
+                # Grow only while the limit is actually in use
+                self.limit = min(
+                    float(self.max_concurrency),
+                    self.limit + 1 / self.limit,
+                )
+        self._wake_waiters()
+
+    def _wake_waiters(self) -> None:
+        # FIFO, except that waiters of a full route let others pass
+        for waiter in list(self._waiters):
+            if self._active >= int(self.limit):
+                break
+            route, future = waiter
+            if future.done():
+                continue
+            if self._can_admit(route):
+                self._waiters.remove(waiter)
+                self._admit(route)
+                future.set_result(None)
+
+    def get_state(self) -> Dict[str, Any]:
+        """Current limit, load and counters, as reported on ``/health``."""
+        return {
+            "limit": int(self.limit),
+            "max_concurrency": self.max_concurrency,
+            "active": self._active,
+            "queued": len(self._waiters),
+            "routes": {
+                route: {
+                    "active": active,
+                    "limit": self._route_limit(route),
+                }
+                for route, active in self._route_active.items()
+            },
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "queue_timeouts": self.queue_timeouts,
+        }
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware that runs every non-GET HTTP request under an
+    :class:`AdmissionController` slot, held until its response (including a
+    streamed body) is complete.
+    """
+
+    def __init__(self, app, controller: AdmissionController) -> None:
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope.get("method", "GET") in EXEMPT_METHODS
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        route = scope.get("path", "")
+        try:
+            await self.controller.acquire(route)
+        except AdmissionRejected as e:
+            response = JSONResponse(
+                status_code=e.status_code,
+                content={"error": "Service overloaded", "message": e.reason},
+                headers={"Retry-After": str(e.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_with_status(message) -> None:
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        start = time.monotonic()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.controller.release(
+                route,
+                latency=time.monotonic() - start,
+                failed=status["code"] >= 500,
+            )
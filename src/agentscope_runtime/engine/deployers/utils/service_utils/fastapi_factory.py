@@ -8,20 +8,21 @@ import inspect
 import json
 import logging
 from contextlib import asynccontextmanager
-from dataclasses import asdict, is_dataclass
 from typing import Optional, Callable, Type, Any, List, Dict
 
 from a2a.types import A2ARequest
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse, JSONResponse
-from pydantic import BaseModel
 
 from agentscope_runtime.engine.schemas.agent_schemas import AgentRequest
 from agentscope_runtime.engine.schemas.response_api import ResponseAPI
 from ..deployment_modes import DeploymentMode
 from ...adapter.a2a.a2a_protocol_adapter import A2AFastAPIDefaultAdapter
 from ...adapter.protocol_adapter import ProtocolAdapter
+from .admission_control import AdmissionController, AdmissionMiddleware
+from .sse_serializer import get_sse_serializer
+from .task_manager import BackgroundTaskManager, TaskQueueFull
 from ...adapter.responses.response_api_protocol_adapter import (
     ResponseAPIDefaultAdapter,
 )
@@ -122,6 +123,8 @@ class FastAPIAppFactory:
         backend_url: Optional[str] = None,
         enable_embedded_worker: bool = False,
         app_kwargs: Optional[Dict] = None,
+        admission_controller: Optional[AdmissionController] = None,
+        task_manager: Optional[BackgroundTaskManager] = None,
         **kwargs: Any,
     ) -> FastAPI:
         """Create a FastAPI application with unified architecture.
@@ -142,6 +145,10 @@ class FastAPIAppFactory:
             backend_url: Celery backend URL
             enable_embedded_worker: Whether to run embedded Celery worker
             app_kwargs: Additional keyword arguments for the FastAPI app
+            admission_controller: Concurrency limit shared by all
+                non-GET endpoints
+            task_manager: Runs task endpoints when Celery is not
+                configured
             **kwargs: Additional keyword arguments
 
         Returns:
@@ -204,9 +211,11 @@ class FastAPIAppFactory:
         app.state.broker_url = broker_url
         app.state.backend_url = backend_url
         app.state.enable_embedded_worker = enable_embedded_worker
+        app.state.admission_controller = admission_controller
+        app.state.task_manager = task_manager or BackgroundTaskManager()
 
         # Add middleware
-        FastAPIAppFactory._add_middleware(app, mode)
+        FastAPIAppFactory._add_middleware(app, mode, admission_controller)
 
         # Add routes
         FastAPIAppFactory._add_routes(
@@ -302,6 +311,7 @@ class FastAPIAppFactory:
                                     celery_mixin.register_celery_task(
                                         func,
                                         queue,
+                                        ep.get("stream"),
                                     )
                                 )
 
@@ -348,6 +358,12 @@ class FastAPIAppFactory:
             except Exception as e:
                 logger.error(f"Warning: Error during runner cleanup: {e}")
 
+        # Stop background task workers
+        try:
+            await app.state.task_manager.shutdown()
+        except Exception as e:
+            logger.error(f"Warning: Error during task manager cleanup: {e}")
+
     @staticmethod
     async def _create_internal_runner():
         """Create internal runner with configured services."""
@@ -365,8 +381,20 @@ class FastAPIAppFactory:
         return runner
 
     @staticmethod
-    def _add_middleware(app: FastAPI, mode: DeploymentMode):
+    def _add_middleware(
+        app: FastAPI,
+        mode: DeploymentMode,
+        admission_controller: Optional[AdmissionController] = None,
+    ):
         """Add middleware based on deployment mode."""
+        # Added first so that it runs inside CORS, which then also applies
+        # to rejections
+        if admission_controller is not None:
+            app.add_middleware(
+                AdmissionMiddleware,
+                controller=admission_controller,
+            )
+
         # Common middleware
         app.add_middleware(
             CORSMiddleware,
@@ -417,6 +445,11 @@ class FastAPIAppFactory:
             else:
                 status["runner"] = "not_ready"
 
+            if app.state.admission_controller is not None:
+                status[
+                    "admission"
+                ] = app.state.admission_controller.get_state()
+
             return status
 
         # Agent API endpoint
@@ -602,9 +635,10 @@ class FastAPIAppFactory:
                 yield f"data: {json.dumps({'text': str(result)})}\n\n"
             else:
                 # Use runner streaming
+                serializer = get_sse_serializer()
                 async for chunk in runner.stream_query(request):
                     if hasattr(chunk, "model_dump_json"):
-                        yield f"data: {chunk.model_dump_json()}\n\n"
+                        yield serializer.to_event(chunk)
                     elif hasattr(chunk, "json"):
                         yield f"data: {chunk.json()}\n\n"
                     else:
@@ -682,35 +716,9 @@ class FastAPIAppFactory:
             return wrapped_handler
 
     @staticmethod
-    def _to_sse_event(item: Any) -> str:
-        """Normalize streaming items into JSON-serializable structures."""
-
-        def _serialize(value: Any, depth: int = 0):
-            if depth > 20:
-                return f"<too-deep-level-{depth}-{str(value)}>"
-
-            if isinstance(value, (list, tuple, set)):
-                return [_serialize(i, depth=depth + 1) for i in value]
-            elif isinstance(value, dict):
-                return {
-                    k: _serialize(v, depth=depth + 1) for k, v in value.items()
-                }
-            elif isinstance(value, (str, int, float, bool, type(None))):
-                return value
-            elif isinstance(value, BaseModel):
-                return value.model_dump()
-            elif is_dataclass(value):
-                return asdict(value)
-
-            for attr in ("to_map", "to_dict"):
-                method = getattr(value, attr, None)
-                if callable(method):
-                    return method()
-            return str(value)
-
-        serialized = _serialize(item, depth=0)
-
-        return f"data: {json.dumps(serialized, ensure_ascii=False)}\n\n"
+    def _to_sse_event(item: Any) -> bytes:
+        """Encode a streaming item as an SSE event."""
+        return get_sse_serializer().to_event(item)
 
     @staticmethod
     def _create_streaming_parameter_wrapper(
@@ -862,6 +870,8 @@ class FastAPIAppFactory:
                     app,
                     handler,
                     endpoint_config.get("queue", "default"),
+                    endpoint_config.get("priority", 0),
+                    endpoint_config.get("stream"),
                 )
                 app.add_api_route(
                     path,
@@ -881,6 +891,12 @@ class FastAPIAppFactory:
                     methods=["GET"],
                     tags=tags,
                 )
+                app.add_api_route(
+                    f"{status_path}/stream",
+                    FastAPIAppFactory._create_task_stream_handler(app),
+                    methods=["GET"],
+                    tags=tags,
+                )
 
             else:
                 # Regular endpoint handling with automatic parameter parsing
@@ -917,16 +933,20 @@ class FastAPIAppFactory:
                     )
 
     @staticmethod
-    def _create_task_handler(app: FastAPI, task_func: Callable, queue: str):
+    def _create_task_handler(
+        app: FastAPI,
+        task_func: Callable,
+        queue: str,
+        default_priority: int = 0,
+        stream: Optional[bool] = None,
+    ):
         """Create a task handler that executes functions asynchronously."""
 
-        async def task_endpoint(request: dict):
+        async def task_endpoint(
+            request: dict,
+            priority: Optional[int] = None,
+        ):
             try:
-                import uuid
-
-                # Generate task ID
-                task_id = str(uuid.uuid4())
-
                 # Check if Celery is available
                 if (
                     hasattr(app.state, "celery_mixin")
@@ -940,6 +960,7 @@ class FastAPIAppFactory:
                         celery_task = celery_mixin.register_celery_task(
                             task_func,
                             queue,
+                            stream,
                         )
                         task_func.celery_task = celery_task
 
@@ -955,31 +976,13 @@ class FastAPIAppFactory:
                     }
 
                 else:
-                    # Fallback to in-memory task processing
-                    import time
-
-                    # Initialize task storage if not exists
-                    if not hasattr(app.state, "active_tasks"):
-                        app.state.active_tasks = {}
-
-                    # Create task info for tracking
-                    task_info = {
-                        "task_id": task_id,
-                        "status": "submitted",
-                        "queue": queue,
-                        "submitted_at": time.time(),
-                        "request": request,
-                    }
-                    app.state.active_tasks[task_id] = task_info
-
-                    # Execute task asynchronously in background
-                    asyncio.create_task(
-                        FastAPIAppFactory._execute_background_task(
-                            app,
-                            task_id,
-                            task_func,
-                            request,
-                            queue,
+                    # Fallback to the in-process task manager
+                    task_id = await app.state.task_manager.submit(
+                        task_func,
+                        request,
+                        queue=queue,
+                        priority=(
+                            default_priority if priority is None else priority
                         ),
                     )
 
@@ -991,6 +994,17 @@ class FastAPIAppFactory:
                         f"{queue}",
                     }
 
+            except TaskQueueFull as e:
+                return JSONResponse(
+                    status_code=503,
+                    content={
+                        "error": str(e),
+                        "type": "task",
+                        "queue": queue,
+                        "status": "rejected",
+                    },
+                    headers={"Retry-After": "1"},
+                )
             except Exception as e:
                 return {
                     "error": str(e),
@@ -1001,110 +1015,82 @@ class FastAPIAppFactory:
 
         return task_endpoint
 
-    @staticmethod
-    async def _execute_background_task(
-        app: FastAPI,
-        task_id: str,
-        func: Callable,
-        request: dict,
-        queue: str,
-    ):
-        """Execute task in background and update status."""
-        try:
-            import time
-            import concurrent.futures
-
-            # Update status to running
-            if (
-                hasattr(app.state, "active_tasks")
-                and task_id in app.state.active_tasks
-            ):
-                app.state.active_tasks[task_id].update(
-                    {
-                        "status": "running",
-                        "started_at": time.time(),
-                    },
-                )
-
-            # Execute the actual task function
-            if asyncio.iscoroutinefunction(func):
-                result = await func(request)
-            else:
-                # Run sync function in thread pool to avoid blocking
-                with concurrent.futures.ThreadPoolExecutor() as executor:
-                    result = await asyncio.get_event_loop().run_in_executor(
-                        executor,
-                        func,
-                        request,
-                    )
-
-            # Update status to completed
-            if (
-                hasattr(app.state, "active_tasks")
-                and task_id in app.state.active_tasks
-            ):
-                app.state.active_tasks[task_id].update(
-                    {
-                        "status": "completed",
-                        "result": result,
-                        "completed_at": time.time(),
-                    },
-                )
-
-        except Exception as e:
-            # Update status to failed
-            if (
-                hasattr(app.state, "active_tasks")
-                and task_id in app.state.active_tasks
-            ):
-                app.state.active_tasks[task_id].update(
-                    {
-                        "status": "failed",
-                        "error": str(e),
-                        "failed_at": time.time(),
-                    },
-                )
-
     @staticmethod
     def _create_task_status_handler(app: FastAPI):
         """Create a handler for checking task status."""
 
-        async def task_status_handler(task_id: str):
+        async def task_status_handler(
+            task_id: str,
+            request: Request,
+            offset: int = 0,
+            limit: int = 100,
+        ):
             if not task_id:
                 return {"error": "task_id required"}
 
+            if "text/event-stream" in request.headers.get("accept", ""):
+                return FastAPIAppFactory._task_event_stream(
+                    app,
+                    task_id,
+                    offset,
+                )
+
+            # Results of generator tasks are returned in pages
             # Check if Celery is available
             if hasattr(app.state, "celery_mixin") and app.state.celery_mixin:
                 # Use Celery for task status checking
                 celery_mixin = app.state.celery_mixin
-                return celery_mixin.get_task_status(task_id)
+                return await asyncio.to_thread(
+                    celery_mixin.get_task_status,
+                    task_id,
+                    offset,
+                    limit,
+                )
 
-            else:
-                # Fallback to in-memory task status checking
-                if (
-                    not hasattr(app.state, "active_tasks")
-                    or task_id not in app.state.active_tasks
-                ):
-                    return {"error": f"Task {task_id} not found"}
+            return await app.state.task_manager.get_status(
+                task_id,
+                offset=offset,
+                limit=limit,
+            )
 
-                task_info = app.state.active_tasks[task_id]
-                task_status = task_info.get("status", "unknown")
+        return task_status_handler
 
-                # Align with BaseApp.get_task logic - map internal status to
-                # external status format
-                if task_status in ["submitted", "running"]:
-                    return {"status": "pending", "result": None}
-                elif task_status == "completed":
-                    return {
-                        "status": "finished",
-                        "result": task_info.get("result"),
-                    }
-                elif task_status == "failed":
-                    return {
-                        "status": "error",
-                        "result": task_info.get("error", "Unknown error"),
-                    }
-                else:
-                    return {"status": task_status, "result": None}
+    @staticmethod
+    def _create_task_stream_handler(app: FastAPI):
+        """Create a handler streaming task results as SSE."""
 
-        return task_status_handler
+        async def task_stream_handler(task_id: str, offset: int = 0):
+            return FastAPIAppFactory._task_event_stream(app, task_id, offset)
+
+        return task_stream_handler
+
+    @staticmethod
+    def _task_event_stream(
+        app: FastAPI,
+        task_id: str,
+        offset: int = 0,
+    ) -> StreamingResponse:
+        """SSE response with the results of a task as they come."""
+        if hasattr(app.state, "celery_mixin") and app.state.celery_mixin:
+            events = app.state.celery_mixin.stream_task_results(
+                task_id,
+                offset=offset,
+            )
+        else:
+            events = app.state.task_manager.stream_results(
+                task_id,
+                offset=offset,
+            )
+
+        async def generate():
+            async for event in events:
+                yield f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+        return StreamingResponse(
+            generate(),
+            media_type="text/event-stream",
+            headers={
+                "Cache-Control": "no-cache",
+                "Connection": "keep-alive",
+            },
+        )
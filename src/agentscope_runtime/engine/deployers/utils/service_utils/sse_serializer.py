@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+Serialization of streamed items into Server-Sent Events.
+
+Items are encoded to JSON bytes once, without first being rebuilt as
+plain Python structures: pydantic models by their compiled
+pydantic-core serializer, everything else by ``orjson`` when it is
+installed, or by pydantic-core otherwise. How to encode an item is
+decided once per type and cached, and the resulting ``data: ...`` frame is
+returned as bytes ready for a ``StreamingResponse``.
+"""
+import json
+import logging
+from dataclasses import asdict, is_dataclass
+from typing import Any, Callable, Dict, Optional
+
+import pydantic_core
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Deepest nesting the generic walk encodes as is
+MAX_DEPTH = 20
+
+_PRIMITIVES = (str, int, float, bool, type(None))
+_CONTAINERS = (dict, list, tuple, set, frozenset)
+
+
+def to_jsonable(value: Any, depth: int = 0) -> Any:
+    """Normalize ``value`` into JSON-serializable structures.
+
+    This is the generic, pure Python walk; it is used for items the fast
+    encoders cannot handle.
+    """
+    if depth > MAX_DEPTH:
+        return f"<too-deep-level-{depth}-{str(value)}>"
+
+    if isinstance(value, (list, tuple, set)):
+        return [to_jsonable(i, depth=depth + 1) for i in value]
+    elif isinstance(value, dict):
+        return {k: to_jsonable(v, depth=depth + 1) for k, v in value.items()}
+    elif isinstance(value, _PRIMITIVES):
+        return value
+    elif isinstance(value, BaseModel):
+        return value.model_dump()
+    elif is_dataclass(value):
+        return asdict(value)
+
+    for attr in ("to_map", "to_dict"):
+        method = getattr(value, attr, None)
+        if callable(method):
+            return method()
+    return str(value)
+
+
+def _fallback(value: Any) -> Any:
+    # Objects nested in containers that the JSON encoder does not know
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    for attr in ("to_map", "to_dict"):
+        method = getattr(value, attr, None)
+        if callable(method):
+            return method()
+    return str(value)
+
+
+if orjson is not None:
+
+    def dumps(value: Any) -> bytes:
+        """Encode ``value`` as JSON bytes."""
+        return orjson.dumps(
+            value,
+            default=_fallback,
+            option=orjson.OPT_NON_STR_KEYS,
+        )
+
+else:
+
+    def dumps(value: Any) -> bytes:
+        """Encode ``value`` as JSON bytes."""
+        return pydantic_core.to_json(value, fallback=_fallback)
+
+
+def _dumps_legacy(value: Any) -> bytes:
+    return json.dumps(to_jsonable(value), ensure_ascii=False).encode()
+
+
+class SSESerializer:
+    """
+    Encodes streamed items as SSE ``data`` frames.
+
+    The encoder for each item type is picked on first sight and cached;
+    :meth:`register` overrides it for a type. Items an encoder fails on
+    (e.g. too deeply nested, or integers too large for ``orjson``) go
+    through the generic walk of :func:`to_jsonable` instead.
+    """
+
+    def __init__(self) -> None:
+        self._encoders: Dict[type, Callable[[Any], bytes]] = {}
+
+    def register(
+        self,
+        cls: type,
+        encoder: Callable[[Any], bytes],
+    ) -> None:
+        """Encode instances of ``cls`` (exactly) with ``encoder``, which
+        returns JSON bytes."""
+        self._encoders[cls] = encoder
+
+    def _resolve(self, cls: type) -> Callable[[Any], bytes]:
+        if issubclass(cls, BaseModel):
+            return cls.__pydantic_serializer__.to_json
+        if issubclass(cls, _CONTAINERS + _PRIMITIVES):
+            return dumps
+        if is_dataclass(cls):
+            return lambda value: dumps(asdict(value))
+        if callable(getattr(cls, "model_dump_json", None)):
+            return lambda value: value.model_dump_json().encode()
+        for attr in ("to_map", "to_dict"):
+            if callable(getattr(cls, attr, None)):
+                return lambda value, attr=attr: dumps(getattr(value, attr)())
+        return lambda value: dumps(str(value))
+
+    def encode(self, item: Any) -> bytes:
+        """JSON bytes of ``item``."""
+        cls = type(item)
+        encoder = self._encoders.get(cls)
+        if encoder is None:
+            encoder = self._encoders[cls] = self._resolve(cls)
+        try:
+            return encoder(item)
+        except (TypeError, ValueError, RecursionError) as e:
+            logger.debug(
+                "Fast encoding of %s failed, falling back: %s",
+                cls.__name__,
+                e,
+            )
+            return _dumps_legacy(item)
+
+    def to_event(self, item: Any) -> bytes:
+        """SSE frame carrying ``item``."""
+        return b"data: " + self.encode(item) + b"\n\n"
+
+
+_default_serializer: Optional[SSESerializer] = None
+
+
+def get_sse_serializer() -> SSESerializer:
+    """The serializer shared by the streaming endpoints."""
+    global _default_serializer
+    if _default_serializer is None:
+        _default_serializer = SSESerializer()
+    return _default_serializer
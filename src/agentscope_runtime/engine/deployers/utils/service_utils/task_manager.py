@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+"""
+In-process background tasks for agent services without Celery.
+
+Tasks wait in a bounded priority queue and run on a fixed number of
+workers; sync functions share one thread pool of the same size. Task state
+and results live in a pluggable :class:`TaskStore`, so they are bounded and
+expire, and can be kept in Redis or SQLite.
+"""
+import asyncio
+import concurrent.futures
+import inspect
+import itertools
+import logging
+import time
+import uuid
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from fastapi.encoders import jsonable_encoder
+
+from .task_store import InMemoryTaskStore, TaskStore
+
+logger = logging.getLogger(__name__)
+
+_END = object()
+
+
+class TaskQueueFull(Exception):
+    """The background task queue has no room for another task."""
+
+
+def _to_jsonable(value: Any) -> Any:
+    try:
+        return jsonable_encoder(value)
+    except (TypeError, ValueError):
+        return str(value)
+
+
+class BackgroundTaskManager:
+    """
+    Runs background tasks on a bounded worker pool.
+
+    Tasks with a lower ``priority`` run first; tasks of the same priority
+    run in submission order. Tasks implemented as generators store each
+    item they yield as it comes, and the items can be read in pages or
+    streamed while the task still runs.
+    """
+
+    def __init__(
+        self,
+        store: Optional[TaskStore] = None,
+        max_workers: int = 8,
+        max_queue_size: int = 1000,
+    ) -> None:
+        """Initialize the manager.
+
+        Args:
+            store (Optional[TaskStore]): Where task state and results are
+                kept; an :class:`InMemoryTaskStore` by default.
+            max_workers (int): Tasks running at once.
+            max_queue_size (int): Tasks waiting to run; more are refused.
+        """
+        self.store = store or InMemoryTaskStore()
+        self.max_workers = max_workers
+        self.max_queue_size = max_queue_size
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._workers = []
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._sequence = itertools.count()
+        # Set whenever a task run by this manager makes progress
+        self._progress: Dict[str, asyncio.Event] = {}
+
+    def _start(self) -> None:
+        if self._queue is not None:
+            return
+        self._queue = asyncio.PriorityQueue(maxsize=self.max_queue_size)
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="agentscope-task",
+        )
+        self._workers = [
+            asyncio.create_task(self._work()) for _ in range(self.max_workers)
+        ]
+
+    async def submit(
+        self,
+        func: Callable,
+        request: Any,
+        queue: str = "default",
+        priority: int = 0,
+    ) -> str:
+        """Queue ``func(request)`` and return its task id.
+
+        Raises:
+            TaskQueueFull: When ``max_queue_size`` tasks are waiting.
+        """
+        self._start()
+        if self._queue.full():
+            raise TaskQueueFull(
+                f"{self.max_queue_size} tasks are already waiting",
+            )
+        task_id = str(uuid.uuid4())
+        await self.store.create(
+            task_id,
+            {
+                "task_id": task_id,
+                "status": "submitted",
+                "queue": queue,
+                "priority": priority,
+                "streaming": inspect.isasyncgenfunction(func)
+                or inspect.isgeneratorfunction(func),
+                "submitted_at": time.time(),
+            },
+        )
+        self._progress[task_id] = asyncio.Event()
+        self._queue.put_nowait(
+            (priority, next(self._sequence), task_id, func, request),
+        )
+        return task_id
+
+    async def _work(self) -> None:
+        while True:
+            _, _, task_id, func, request = await self._queue.get()
+            try:
+                await self._run(task_id, func, request)
+            except Exception:
+                logger.exception("Failed to record task %s", task_id)
+            finally:
+                event = self._progress.pop(task_id, None)
+                if event is not None:
+                    event.set()
+                self._queue.task_done()
+
+    def _notify(self, task_id: str) -> None:
+        event = self._progress.get(task_id)
+        if event is not None:
+            event.set()
+            # Later waiters wait for the next progress
+            self._progress[task_id] = asyncio.Event()
+
+    async def _run(self, task_id: str, func: Callable, request: Any) -> None:
+        await self.store.update(
+            task_id,
+            {"status": "running", "started_at": time.time()},
+        )
+        self._notify(task_id)
+        loop = asyncio.get_running_loop()
+        try:
+            if inspect.isasyncgenfunction(func):
+                async for item in func(request):
+                    await self._append(task_id, item)
+                result = None
+            elif inspect.isgeneratorfunction(func):
+                gen = await loop.run_in_executor(self._executor, func, request)
+                while True:
+                    item = await loop.run_in_executor(
+                        self._executor,
+                        next,
+                        gen,
+                        _END,
+                    )
+                    if item is _END:
+                        break
+                    await self._append(task_id, item)
+                result = None
+            elif asyncio.iscoroutinefunction(func):
+                result = await func(request)
+            else:
+                result = await loop.run_in_executor(
+                    self._executor,
+                    func,
+                    request,
+                )
+        except Exception as e:
+            await self.store.update(
+                task_id,
+                {
+                    "status": "failed",
+                    "error": str(e),
+                    "failed_at": time.time(),
+                },
+            )
+            return
+        await self.store.update(
+            task_id,
+            {
+                "status": "completed",
+                "result": _to_jsonable(result),
+                "completed_at": time.time(),
+            },
+        )
+
+    async def _append(self, task_id: str, item: Any) -> None:
+        await self.store.append_results(task_id, [_to_jsonable(item)])
+        self._notify(task_id)
+
+    async def get_status(
+        self,
+        task_id: str,
+        offset: int = 0,
+        limit: Optional[int] = 100,
+    ) -> Dict[str, Any]:
+        """Status and result of a task, in the format of task status
+        endpoints.
+
+        For generator tasks, ``result`` is the page of up to ``limit``
+        items from ``offset`` on, along with the ``total`` so far.
+        """
+        record = await self.store.get(task_id)
+        if record is None:
+            return {"error": f"Task {task_id} not found"}
+
+        task_status = record.get("status", "unknown")
+        if task_status in ("submitted", "running"):
+            status = {"status": "pending", "result": None}
+        elif task_status == "completed":
+            status = {"status": "finished", "result": record.get("result")}
+        elif task_status == "failed":
+            return {
+                "status": "error",
+                "result": record.get("error", "Unknown error"),
+            }
+        else:
+            return {"status": task_status, "result": None}
+
+        if record.get("streaming"):
+            status["result"] = await self.store.get_results(
+                task_id,
+                offset,
+                limit,
+            )
+            status["offset"] = offset
+            status["total"] = await self.store.count_results(task_id)
+        return status
+
+    async def stream_results(
+        self,
+        task_id: str,
+        offset: int = 0,
+        poll_interval: float = 0.5,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield the results of a task as they are produced.
+
+        Yields ``{"result": item}`` per result, then a last
+        ``{"status": ...}`` once the task is done. Tasks run by another
+        process are polled every ``poll_interval`` seconds.
+        """
+        while True:
+            event = self._progress.get(task_id)
+            record = await self.store.get(task_id)
+            if record is None:
+                yield {"error": f"Task {task_id} not found"}
+                return
+            items = await self.store.get_results(task_id, offset)
+            for item in items:
+                yield {"result": item}
+            offset += len(items)
+
+            task_status = record.get("status")
+            if task_status == "completed":
+                if not record.get("streaming"):
+                    yield {"result": record.get("result")}
+                yield {"status": "finished"}
+                return
+            if task_status == "failed":
+                yield {"status": "error", "error": record.get("error")}
+                return
+
+            if event is None:
+                await asyncio.sleep(poll_interval)
+            else:
+                try:
+                    await asyncio.wait_for(event.wait(), poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    def get_metrics(self) -> Dict[str, int]:
+        """Queue depth and worker pool size."""
+        return {
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "max_queue_size": self.max_queue_size,
+            "max_workers": self.max_workers,
+        }
+
+    async def shutdown(self) -> None:
+        """Stop the workers; queued tasks are dropped."""
+        for worker in self._workers:
+            worker.cancel()
+        if self._workers:
+            await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        await self.store.close()
@@ -0,0 +1,429 @@
+# -*- coding: utf-8 -*-
+"""
+Stores of background task records and results.
+
+A task record is a JSON-serializable dict with at least ``task_id`` and
+``status``. Tasks producing a stream also have a list of results, which is
+read in pages. Records and results expire ``ttl`` seconds after the task
+was last written to.
+"""
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+DEFAULT_TASK_TTL = 3600  # seconds
+
+
+class TaskStore(ABC):
+    """Where background tasks keep their state and results."""
+
+    def __init__(self, ttl: Optional[float] = DEFAULT_TASK_TTL) -> None:
+        """
+        Args:
+            ttl (Optional[float]): Seconds a task is kept after it was last
+                written to; ``None`` keeps it until evicted or deleted.
+        """
+        self.ttl = ttl
+
+    def _expires_at(self) -> Optional[float]:
+        return time.time() + self.ttl if self.ttl is not None else None
+
+    @abstractmethod
+    async def create(self, task_id: str, record: Dict[str, Any]) -> None:
+        """Store a new task."""
+
+    @abstractmethod
+    async def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Return the record of a task, or ``None`` if it is unknown or
+        expired."""
+
+    @abstractmethod
+    async def update(self, task_id: str, fields: Dict[str, Any]) -> None:
+        """Merge ``fields`` into the record of a task, if it still exists."""
+
+    @abstractmethod
+    async def append_results(self, task_id: str, items: List[Any]) -> None:
+        """Append streamed results of a task."""
+
+    @abstractmethod
+    async def get_results(
+        self,
+        task_id: str,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> List[Any]:
+        """Return up to ``limit`` streamed results from ``offset`` on."""
+
+    @abstractmethod
+    async def count_results(self, task_id: str) -> int:
+        """Number of streamed results of a task."""
+
+    @abstractmethod
+    async def delete(self, task_id: str) -> None:
+        """Forget a task and its results."""
+
+    async def close(self) -> None:
+        """Release the connections of the store."""
+
+
+class InMemoryTaskStore(TaskStore):
+    """
+    Tasks kept in process memory, at most ``max_tasks`` of them.
+
+    When full, the task written to least recently is evicted. Since every
+    write also renews the expiry, that task is also the next to expire, so
+    expired tasks are dropped from the front without a full scan.
+    """
+
+    def __init__(
+        self,
+        max_tasks: int = 10000,
+        ttl: Optional[float] = DEFAULT_TASK_TTL,
+    ) -> None:
+        super().__init__(ttl)
+        self.max_tasks = max_tasks
+        # task_id -> [record, results, expires_at]
+        self._tasks: OrderedDict = OrderedDict()
+
+    def _evict(self) -> None:
+        now = time.time()
+        while self._tasks:
+            _, (_, _, expires_at) = next(iter(self._tasks.items()))
+            if len(self._tasks) <= self.max_tasks and (
+                expires_at is None or expires_at > now
+            ):
+                break
+            self._tasks.popitem(last=False)
+
+    def _touch(self, task_id: str) -> Optional[list]:
+        entry = self._tasks.get(task_id)
+        if entry is None:
+            return None
+        entry[2] = self._expires_at()
+        self._tasks.move_to_end(task_id)
+        return entry
+
+    def _live(self, task_id: str) -> Optional[list]:
+        entry = self._tasks.get(task_id)
+        if entry is None:
+            return None
+        if entry[2] is not None and entry[2] <= time.time():
+            del self._tasks[task_id]
+            return None
+        return entry
+
+    async def create(self, task_id: str, record: Dict[str, Any]) -> None:
+        self._tasks[task_id] = [dict(record), [], self._expires_at()]
+        self._tasks.move_to_end(task_id)
+        self._evict()
+
+    async def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        entry = self._live(task_id)
+        return dict(entry[0]) if entry is not None else None
+
+    async def update(self, task_id: str, fields: Dict[str, Any]) -> None:
+        if self._live(task_id) is not None:
+            self._touch(task_id)[0].update(fields)
+
+    async def append_results(self, task_id: str, items: List[Any]) -> None:
+        if self._live(task_id) is not None:
+            self._touch(task_id)[1].extend(items)
+
+    async def get_results(
+        self,
+        task_id: str,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> List[Any]:
+        entry = self._live(task_id)
+        if entry is None:
+            return []
+        end = None if limit is None else offset + limit
+        return entry[1][offset:end]
+
+    async def count_results(self, task_id: str) -> int:
+        entry = self._live(task_id)
+        return len(entry[1]) if entry is not None else 0
+
+    async def delete(self, task_id: str) -> None:
+        self._tasks.pop(task_id, None)
+
+
+class RedisTaskStore(TaskStore):
+    """
+    Tasks kept in Redis: the record as JSON under ``<prefix>:<task_id>``
+    and the results in the list ``<prefix>:<task_id>:results``, both with
+    the store TTL. Calls of the sync ``redis_client`` run in worker
+    threads.
+    """
+
+    def __init__(
+        self,
+        redis_client,
+        prefix: str = "agentscope:tasks",
+        ttl: Optional[float] = DEFAULT_TASK_TTL,
+    ) -> None:
+        super().__init__(ttl)
+        self.client = redis_client
+        self.prefix = prefix.rstrip(":")
+
+    def _key(self, task_id: str) -> str:
+        return f"{self.prefix}:{task_id}"
+
+    def _results_key(self, task_id: str) -> str:
+        return f"{self.prefix}:{task_id}:results"
+
+    def _ex(self) -> Optional[int]:
+        return max(1, int(self.ttl)) if self.ttl is not None else None
+
+    def _create(self, task_id: str, record: Dict[str, Any]) -> None:
+        self.client.set(self._key(task_id), json.dumps(record), ex=self._ex())
+
+    def _get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        value = self.client.get(self._key(task_id))
+        return json.loads(value) if value else None
+
+    def _update(self, task_id: str, fields: Dict[str, Any]) -> None:
+        record = self._get(task_id)
+        if record is None:
+            return
+        record.update(fields)
+        pipe = self.client.pipeline()
+        pipe.set(self._key(task_id), json.dumps(record), ex=self._ex())
+        if self.ttl is not None:
+            pipe.expire(self._results_key(task_id), self._ex())
+        pipe.execute()
+
+    def _append_results(self, task_id: str, items: List[Any]) -> None:
+        if not items:
+            return
+        pipe = self.client.pipeline()
+        pipe.rpush(
+            self._results_key(task_id),
+            *[json.dumps(item) for item in items],
+        )
+        if self.ttl is not None:
+            pipe.expire(self._results_key(task_id), self._ex())
+            pipe.expire(self._key(task_id), self._ex())
+        pipe.execute()
+
+    def _get_results(
+        self,
+        task_id: str,
+        offset: int,
+        limit: Optional[int],
+    ) -> List[Any]:
+        if limit is not None and limit <= 0:
+            return []
+        end = -1 if limit is None else offset + limit - 1
+        values = self.client.lrange(self._results_key(task_id), offset, end)
+        return [json.loads(value) for value in values]
+
+    async def create(self, task_id: str, record: Dict[str, Any]) -> None:
+        await asyncio.to_thread(self._create, task_id, record)
+
+    async def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self._get, task_id)
+
+    async def update(self, task_id: str, fields: Dict[str, Any]) -> None:
+        await asyncio.to_thread(self._update, task_id, fields)
+
+    async def append_results(self, task_id: str, items: List[Any]) -> None:
+        await asyncio.to_thread(self._append_results, task_id, items)
+
+    async def get_results(
+        self,
+        task_id: str,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> List[Any]:
+        return await asyncio.to_thread(
+            self._get_results,
+            task_id,
+            offset,
+            limit,
+        )
+
+    async def count_results(self, task_id: str) -> int:
+        return await asyncio.to_thread(
+            self.client.llen,
+            self._results_key(task_id),
+        )
+
+    async def delete(self, task_id: str) -> None:
+        await asyncio.to_thread(
+            self.client.delete,
+            self._key(task_id),
+            self._results_key(task_id),
+        )
+
+
+class SQLiteTaskStore(TaskStore):
+    """
+    Tasks kept in a SQLite database file, so that they survive restarts
+    of a single-node service without running Redis.
+    """
+
+    def __init__(
+        self,
+        path: str = "agentscope_tasks.db",
+        ttl: Optional[float] = DEFAULT_TASK_TTL,
+    ) -> None:
+        super().__init__(ttl)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            if path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS tasks ("
+                "task_id TEXT PRIMARY KEY, record TEXT NOT NULL, "
+                "expires_at REAL)",
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS tasks_expires_at "
+                "ON tasks (expires_at)",
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS task_results ("
+                "task_id TEXT NOT NULL, seq INTEGER NOT NULL, "
+                "item TEXT NOT NULL, PRIMARY KEY (task_id, seq))",
+            )
+
+    def _now(self) -> float:
+        return time.time()
+
+    def _purge_expired(self) -> None:
+        now = self._now()
+        self._conn.execute(
+            "DELETE FROM task_results WHERE task_id IN (SELECT task_id "
+            "FROM tasks WHERE expires_at <= ?)",
+            (now,),
+        )
+        self._conn.execute("DELETE FROM tasks WHERE expires_at <= ?", (now,))
+
+    def _create(self, task_id: str, record: Dict[str, Any]) -> None:
+        with self._lock, self._conn:
+            self._purge_expired()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO tasks VALUES (?, ?, ?)",
+                (task_id, json.dumps(record), self._expires_at()),
+            )
+
+    def _get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT record FROM tasks WHERE task_id = ? AND "
+                "(expires_at IS NULL OR expires_at > ?)",
+                (task_id, self._now()),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _update(self, task_id: str, fields: Dict[str, Any]) -> None:
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT record FROM tasks WHERE task_id = ?",
+                (task_id,),
+            ).fetchone()
+            if row is None:
+                return
+            record = json.loads(row[0])
+            record.update(fields)
+            self._conn.execute(
+                "UPDATE tasks SET record = ?, expires_at = ? "
+                "WHERE task_id = ?",
+                (json.dumps(record), self._expires_at(), task_id),
+            )
+
+    def _append_results(self, task_id: str, items: List[Any]) -> None:
+        with self._lock, self._conn:
+            start = self._conn.execute(
+                "SELECT COALESCE(MAX(seq) + 1, 0) FROM task_results "
+                "WHERE task_id = ?",
+                (task_id,),
+            ).fetchone()[0]
+            self._conn.executemany(
+                "INSERT INTO task_results VALUES (?, ?, ?)",
+                [
+                    (task_id, start + i, json.dumps(item))
+                    for i, item in enumerate(items)
+                ],
+            )
+            self._conn.execute(
+                "UPDATE tasks SET expires_at = ? WHERE task_id = ?",
+                (self._expires_at(), task_id),
+            )
+
+    def _get_results(
+        self,
+        task_id: str,
+        offset: int,
+        limit: Optional[int],
+    ) -> List[Any]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT item FROM task_results WHERE task_id = ? "
+                "AND seq >= ? ORDER BY seq LIMIT ?",
+                (task_id, offset, -1 if limit is None else limit),
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def _count_results(self, task_id: str) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM task_results WHERE task_id = ?",
+                (task_id,),
+            ).fetchone()[0]
+
+    def _delete(self, task_id: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM task_results WHERE task_id = ?",
+                (task_id,),
+            )
+            self._conn.execute(
+                "DELETE FROM tasks WHERE task_id = ?",
+                (task_id,),
+            )
+
+    async def create(self, task_id: str, record: Dict[str, Any]) -> None:
+        await asyncio.to_thread(self._create, task_id, record)
+
+    async def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self._get, task_id)
+
+    async def update(self, task_id: str, fields: Dict[str, Any]) -> None:
+        await asyncio.to_thread(self._update, task_id, fields)
+
+    async def append_results(self, task_id: str, items: List[Any]) -> None:
+        if items:
+            await asyncio.to_thread(self._append_results, task_id, items)
+
+    async def get_results(
+        self,
+        task_id: str,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> List[Any]:
+        return await asyncio.to_thread(
+            self._get_results,
+            task_id,
+            offset,
+            limit,
+        )
+
+    async def count_results(self, task_id: str) -> int:
+        return await asyncio.to_thread(self._count_results, task_id)
+
+    async def delete(self, task_id: str) -> None:
+        await asyncio.to_thread(self._delete, task_id)
+
+    async def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -22,6 +22,11 @@ from .deployers import (
     LocalDeployManager,
 )
 from .deployers.adapter.protocol_adapter import ProtocolAdapter
+from .deployers.adapter.request_guard import (
+    RequestTimeoutError,
+    get_request_deadline,
+    guard_stream,
+)
 from .schemas.agent_schemas import (
     Event,
     AgentRequest,
@@ -30,7 +35,11 @@ from .schemas.agent_schemas import (
     SequenceNumberGenerator,
     Error,
 )
-from .schemas.exception import AppBaseException, UnknownAgentException
+from .schemas.exception import (
+    AppBaseException,
+    GatewayTimeoutException,
+    UnknownAgentException,
+)
 from .tracing import TraceType
 from .tracing.wrapper import trace
 from .tracing.message_util import (
@@ -319,16 +328,26 @@ class Runner:
 
             stream_adapter = identity_stream_adapter
 
-        error = None
-        try:
-            async for event in stream_adapter(
+        def handler_stream():
+            return stream_adapter(
                 source_stream=self._call_handler_streaming(
                     self.query_handler,
                     **query_kwargs,
                     **kwargs,
                 ),
                 type_converters=self.out_type_converters,
-            ):
+            )
+
+        # With a request deadline, the handler runs in its own task, which
+        # is cancelled once the deadline has passed.
+        if get_request_deadline() is None:
+            events = handler_stream()
+        else:
+            events = guard_stream(handler_stream, name="runner")
+
+        error = None
+        try:
+            async for event in events:
                 if (
                     event.status == RunStatus.Completed
                     and event.object == "message"
@@ -336,7 +355,9 @@ class Runner:
                     response.add_new_message(event)
                 yield seq_gen.yield_with_sequence(event)
         except Exception as e:
-            if not isinstance(e, AppBaseException):
+            if isinstance(e, RequestTimeoutError):
+                e = GatewayTimeoutException("TIMEOUT", str(e))
+            elif not isinstance(e, AppBaseException):
                 e = UnknownAgentException(original_exception=e)
             error = Error(code=e.code, message=e.message)
             logger.error(f"{error.model_dump()}: {traceback.format_exc()}")
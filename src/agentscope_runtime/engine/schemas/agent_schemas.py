@@ -1,6 +1,5 @@
 # -*- coding: utf-8 -*-
 # type: ignore
-from copy import deepcopy
 from datetime import datetime
 from typing import List, Dict, Optional, Any, Literal, TypeAlias, Annotated
 from typing import Union
@@ -11,7 +10,13 @@ except ImportError:
     from typing_extensions import Self
 from uuid import uuid4
 
-from pydantic import BaseModel, Field, field_validator, ConfigDict
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    PrivateAttr,
+    field_validator,
+)
 from openai.types.chat import ChatCompletionChunk
 
 
@@ -506,6 +511,56 @@ class Message(Event):
 
     metadata: Optional[Dict] = None
 
+    _deltas: Optional[Dict[int, tuple]] = PrivateAttr(default=None)
+    """Content index -> (field, str pieces) appended by deltas since the
+    last flush."""
+
+    def flush_deltas(self, index: Optional[int] = None) -> Self:
+        """
+        Join the text/image_url deltas buffered by `add_delta_content` into
+        their contents, for ``index`` only or for all of them.
+
+        Until then a content holds its value as of the previous flush. This
+        is done by `content_completed`, `completed`, the ``get_*_content``
+        helpers, copies and ``model_dump*``.
+        """
+        deltas = self._deltas
+        if not deltas:
+            return self
+        indexes = list(deltas) if index is None else [index]
+        for i in indexes:
+            pending = deltas.pop(i, None)
+            if pending is None or i >= len(self.content or []):
+                continue
+            field, pieces = pending
+            content = self.content[i]
+            current = getattr(content, field, None) or ""
+            setattr(content, field, current + "".join(pieces))
+        if not deltas:
+            # not shared with copies of the message
+            self._deltas = None
+        return self
+
+    def completed(self) -> Self:
+        self.flush_deltas()
+        return super().completed()
+
+    def model_dump(self, **kwargs) -> Dict[str, Any]:
+        self.flush_deltas()
+        return super().model_dump(**kwargs)
+
+    def model_dump_json(self, **kwargs) -> str:
+        self.flush_deltas()
+        return super().model_dump_json(**kwargs)
+
+    def __copy__(self) -> Self:
+        self.flush_deltas()
+        return super().__copy__()
+
+    def __deepcopy__(self, memo: Optional[Dict[int, Any]] = None) -> Self:
+        self.flush_deltas()
+        return super().__deepcopy__(memo)
+
     @staticmethod
     def from_openai_message(message: Union[BaseModel, dict]) -> "Message":
         """Create a message object from an openai message."""
@@ -586,6 +641,7 @@ class Message(Event):
         if self.content is None:
             return None
 
+        self.flush_deltas()
         for item in self.content:
             if isinstance(item, TextContent):
                 return item.text
@@ -603,6 +659,7 @@ class Message(Event):
         if self.content is None:
             return images
 
+        self.flush_deltas()
         for item in self.content:
             if isinstance(item, ImageContent):
                 images.append(item.image_url)
@@ -620,6 +677,7 @@ class Message(Event):
         if self.content is None:
             return audios
 
+        self.flush_deltas()
         for item in self.content:
             if hasattr(item, "type"):
                 if item.type == "input_audio" and hasattr(
@@ -651,7 +709,10 @@ class Message(Event):
         # new content
         if new_content.index is None:
             content_index = len(self.content)
-            copy = deepcopy(new_content)
+            # data dicts are extended in place by later deltas
+            copy = new_content.model_copy(
+                deep=isinstance(new_content, DataContent),
+            )
             copy.delta = None
             copy.index = content_index
             copy.msg_id = self.id
@@ -669,13 +730,20 @@ class Message(Event):
             pre_content = self.content[new_content.index]
             _type = pre_content.type
 
-            # append text
-            if _type == ContentType.TEXT:
-                pre_content.text += new_content.text
-
-            # append image_url
-            if _type == ContentType.IMAGE:
-                pre_content.image_url += new_content.image_url
+            # append text / image_url; the pieces are buffered and joined
+            # once by flush_deltas() instead of copying the value per delta
+            if _type in (ContentType.TEXT, ContentType.IMAGE):
+                field = "text" if _type == ContentType.TEXT else "image_url"
+                value = getattr(new_content, field)
+                if value:
+                    if self._deltas is None:
+                        self._deltas = {}
+                    self._deltas.setdefault(
+                        new_content.index,
+                        (field, []),
+                    )[
+                        1
+                    ].append(value)
 
             # append data
             if _type == ContentType.DATA:
@@ -704,8 +772,11 @@ class Message(Event):
         if content_index >= len(self.content):
             return None
         else:
+            self.flush_deltas(content_index)
             content = self.content[content_index]
-            new_content = deepcopy(content)
+            # a shallow copy is enough: the accumulated value is an
+            # immutable str and the content receives no more deltas
+            new_content = content.model_copy()
             new_content.delta = False
             new_content.index = content_index
             new_content.msg_id = self.id
@@ -720,7 +791,9 @@ class Message(Event):
 
         # new content
         if new_content.index is None:
-            copy = deepcopy(new_content)
+            copy = new_content.model_copy(
+                deep=isinstance(new_content, DataContent),
+            )
             self.content.append(copy)
 
             new_content.index = len(self.content) - 1
@@ -4,10 +4,11 @@ from typing import Any, List, Union
 from .base import BaseLogHandler, Tracer, TracerHandler
 from .tracing_metric import TraceType
 from .tracing_util import TracingUtil
-from .wrapper import trace
+from .wrapper import get_trace_export_metrics, trace
 
 __all__ = [
     "trace",
+    "get_trace_export_metrics",
     "TraceType",
     "TracingUtil",
 ]
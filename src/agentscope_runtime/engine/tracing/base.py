@@ -11,7 +11,12 @@ from opentelemetry.context.context import Context
 
 # Handler Interface
 class TracerHandler(ABC):
-    """Abstract base class for tracer handlers."""
+    """Abstract base class for tracer handlers.
+
+    Unless spans export them, the payloads of traced calls are shallow
+    copies of the traced objects; convert them with
+    ``tracing_util.obj_to_dict`` when they are written.
+    """
 
     @abstractmethod
     def on_start(
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+import atexit
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_POLICIES = ("drop_newest", "drop_oldest", "sample")
+
+
+class BackgroundExporter:
+    """
+    Hand records to an export callback in batches, from a daemon thread.
+
+    ``submit`` only appends to a bounded buffer, so the caller never waits
+    for the export. When the buffer is full, ``overflow_policy`` decides
+    what is lost:
+
+    - ``drop_newest``: the submitted record is dropped.
+    - ``drop_oldest``: the oldest buffered record is dropped.
+    - ``sample``: like ``drop_newest``, but once the buffer is half full
+      only one in ``sample_every`` records is kept, except ``essential``
+      ones.
+    """
+
+    def __init__(
+        self,
+        export: Callable[[List[Any]], None],
+        max_queue_size: int = 10000,
+        batch_size: int = 256,
+        overflow_policy: str = "drop_newest",
+        sample_every: int = 10,
+        name: str = "trace-exporter",
+    ) -> None:
+        """Initialize the exporter.
+
+        Args:
+            export (Callable[[List[Any]], None]): Called with each batch of
+                records on the writer thread.
+            max_queue_size (int): Maximum number of buffered records.
+            batch_size (int): Maximum number of records per export call.
+            overflow_policy (str): One of ``drop_newest``, ``drop_oldest``
+                or ``sample``.
+            sample_every (int): Keep one in this many records when
+                sampling.
+            name (str): Name of the writer thread.
+        """
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Unsupported overflow policy: {overflow_policy}, "
+                f"expected one of {OVERFLOW_POLICIES}",
+            )
+        self._export = export
+        self.max_queue_size = max(max_queue_size, 1)
+        self.batch_size = max(batch_size, 1)
+        self.overflow_policy = overflow_policy
+        self.sample_every = max(sample_every, 1)
+        self.name = name
+
+        self._buffer: deque = deque()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self._in_flight = 0
+        self._sampled = 0
+        self._metrics = {
+            "submitted": 0,
+            "exported": 0,
+            "dropped": 0,
+            "batches": 0,
+            "export_errors": 0,
+        }
+
+    def submit(self, record: Any, essential: bool = False) -> bool:
+        """Buffer ``record`` for export.
+
+        Args:
+            record (Any): The record passed on to the export callback.
+            essential (bool): Never sampled out (but still dropped when the
+                buffer is full).
+
+        Returns:
+            bool: False if the record was dropped.
+        """
+        with self._cond:
+            if self._closed:
+                self._metrics["dropped"] += 1
+                return False
+            self._metrics["submitted"] += 1
+            depth = len(self._buffer)
+
+            if (
+                self.overflow_policy == "sample"
+                and not essential
+                and depth >= self.max_queue_size // 2
+            ):
+                self._sampled += 1
+                if self._sampled % self.sample_every:
+                    self._metrics["dropped"] += 1
+                    return False
+
+            if depth >= self.max_queue_size:
+                self._metrics["dropped"] += 1
+                if self.overflow_policy != "drop_oldest":
+                    return False
+                self._buffer.popleft()
+
+            self._buffer.append(record)
+            if self._thread is None:
+                self._start()
+            self._cond.notify_all()
+            return True
+
+    def _start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run,
+            name=self.name,
+            daemon=True,
+        )
+        self._thread.start()
+        atexit.register(self.shutdown)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._buffer and not self._closed:
+                    self._cond.wait()
+                if not self._buffer:
+                    return
+                size = min(len(self._buffer), self.batch_size)
+                batch = [self._buffer.popleft() for _ in range(size)]
+                self._in_flight = size
+
+            failed = False
+            try:
+                self._export(batch)
+            except Exception:
+                failed = True
+                logger.exception(f"{self.name} failed to export a batch")
+
+            with self._cond:
+                self._in_flight = 0
+                self._metrics["batches"] += 1
+                if failed:
+                    self._metrics["export_errors"] += 1
+                else:
+                    self._metrics["exported"] += size
+                self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything submitted so far has been exported.
+
+        Args:
+            timeout (Optional[float]): Seconds to wait at most.
+
+        Returns:
+            bool: False on timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._buffer or self._in_flight:
+                if self._thread is None or not self._thread.is_alive():
+                    return False
+                remaining = (
+                    None if deadline is None else deadline - time.monotonic()
+                )
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def shutdown(self, timeout: Optional[float] = 5.0) -> None:
+        """Export what is buffered and stop the writer thread."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def get_metrics(self) -> Dict[str, int]:
+        """Return the export counters and the current queue depth."""
+        with self._cond:
+            return {
+                **self._metrics,
+                "queue_depth": len(self._buffer) + self._in_flight,
+                "max_queue_size": self.max_queue_size,
+            }
@@ -5,12 +5,14 @@ import os
 import time
 from datetime import datetime
 from logging.handlers import RotatingFileHandler
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from pydantic import BaseModel, ConfigDict
 
 from . import TracingUtil
 from .base import TracerHandler
+from .exporter import BackgroundExporter
+from .tracing_util import obj_to_dict
 
 DEFAULT_LOG_NAME = "agentscope-runtime"
 
@@ -57,7 +59,9 @@ class JsonFormatter(logging.Formatter):
             str: The formatted log record as a JSON string.
         """
         log_record = {
-            "time": datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3],
+            # records written in the background carry their creation time
+            "time": getattr(record, "time", None)
+            or datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3],
             "step": getattr(record, "step", None),
             "model": getattr(record, "model", None),
             "user_id": getattr(record, "user_id", None),
@@ -92,6 +96,10 @@ class LocalLogHandler(TracerHandler):
         max_bytes: int = 1024 * 1024 * 1024,
         backup_count: int = 7,
         enable_console: bool = False,
+        async_export: bool = True,
+        export_queue_size: int = 10000,
+        export_batch_size: int = 256,
+        overflow_policy: str = "drop_newest",
         **kwargs: Any,
     ) -> None:
         """Initialize the llm chat log handler.
@@ -106,6 +114,15 @@ class LocalLogHandler(TracerHandler):
             backup_count (int): Number of log files to keep. Defaults to 7.
             enable_console (bool): Whether to enable console logging.
                             Defaults to False.
+            async_export (bool): Format and write the records on a
+                            background thread instead of the caller's.
+                            Defaults to True.
+            export_queue_size (int): Maximum number of records waiting to
+                            be written. Defaults to 10000.
+            export_batch_size (int): Maximum number of records written per
+                            batch. Defaults to 256.
+            overflow_policy (str): What to drop when the queue is full, see
+                            `BackgroundExporter`. Defaults to "drop_newest".
             **kwargs (Any): Additional keyword arguments (unused but kept for
                             compatibility).
         """
@@ -126,6 +143,16 @@ class LocalLogHandler(TracerHandler):
 
         self.logger.setLevel(log_level)
 
+        self.exporter: Optional[BackgroundExporter] = None
+        if async_export:
+            self.exporter = BackgroundExporter(
+                self._write_batch,
+                max_queue_size=export_queue_size,
+                batch_size=export_batch_size,
+                overflow_policy=overflow_policy,
+                name="trace-log-exporter",
+            )
+
     def _set_file_handle(
         self,
         log_dir: str,
@@ -177,6 +204,55 @@ class LocalLogHandler(TracerHandler):
         self.logger.addHandler(info_file_handler)
         self.logger.addHandler(error_file_handler)
 
+    def _submit(
+        self,
+        write: Callable[..., None],
+        *args: Any,
+        essential: bool = False,
+    ) -> None:
+        """Run ``write(*args)`` now, or hand it to the background exporter.
+
+        Values that depend on the caller's context (request id, time) must
+        be resolved before and passed in ``args``.
+        """
+        if self.exporter is None:
+            write(*args)
+        else:
+            self.exporter.submit((write, args), essential=essential)
+
+    @staticmethod
+    def _write_batch(batch: List[Tuple[Callable[..., None], tuple]]) -> None:
+        for write, args in batch:
+            try:
+                write(*args)
+            except Exception:
+                import traceback
+
+                print(traceback.format_exc())
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the records submitted so far are written.
+
+        Args:
+            timeout (Optional[float]): Seconds to wait at most.
+
+        Returns:
+            bool: False on timeout.
+        """
+        if self.exporter is None:
+            return True
+        return self.exporter.flush(timeout)
+
+    def get_export_metrics(self) -> Dict[str, int]:
+        """Queue depth and drop counters of the background exporter."""
+        if self.exporter is None:
+            return {}
+        return self.exporter.get_metrics()
+
+    @staticmethod
+    def _format_time(now: datetime) -> str:
+        return now.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+
     @staticmethod
     def _deep_update(original: Dict[str, Any], update: Dict[str, Any]) -> None:
         """Recursively update a dictionary with another dictionary.
@@ -211,10 +287,25 @@ class LocalLogHandler(TracerHandler):
             payload (Dict[str, Any]): The payload data for the event.
             **kwargs (Any): Additional keyword arguments.
         """
+        self._submit(
+            self._write_start,
+            event_name,
+            payload,
+            TracingUtil.get_request_id(),
+            datetime.now(),
+        )
+
+    def _write_start(
+        self,
+        event_name: str,
+        payload: Dict[str, Any],
+        request_id: str,
+        now: datetime,
+    ) -> None:
         step = f"{event_name}_start"
-        request_id = TracingUtil.get_request_id()
+        payload = obj_to_dict(payload)
         context = payload.get("context", payload)
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+        timestamp = self._format_time(now)
         interval = {"type": step, "cost": 0}
         runtime_context = LogContext(
             time=timestamp,
@@ -251,9 +342,26 @@ class LocalLogHandler(TracerHandler):
             start_time (float): The timestamp when the event started.
             **kwargs (Any): Additional keyword arguments.
         """
+        self._submit(
+            self._write_end,
+            event_name,
+            end_payload,
+            start_time,
+            TracingUtil.get_request_id(),
+            datetime.now(),
+            time.time(),
+        )
 
-        request_id = TracingUtil.get_request_id()
-
+    def _write_end(
+        self,
+        event_name: str,
+        end_payload: Any,
+        start_time: float,
+        request_id: str,
+        now: datetime,
+        end_time: float,
+    ) -> None:
+        end_payload = obj_to_dict(end_payload)
         if isinstance(end_payload, dict):
             context = end_payload
         else:
@@ -262,8 +370,8 @@ class LocalLogHandler(TracerHandler):
                 context["output"] = end_payload
 
         step = f"{event_name}_end"
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-        duration = time.time() - start_time
+        timestamp = self._format_time(now)
+        duration = end_time - start_time
         interval = {"type": step, "cost": f"{duration:.3f}"}
         runtime_context = LogContext(
             time=timestamp,
@@ -289,26 +397,41 @@ class LocalLogHandler(TracerHandler):
                 - start_time: The timestamp when the event started
                 - start_payload: The payload data from event start
         """
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+        self._submit(
+            self._write_log,
+            message,
+            kwargs,
+            TracingUtil.get_request_id(),
+            datetime.now(),
+            time.time(),
+        )
+
+    def _write_log(
+        self,
+        message: str,
+        kwargs: Dict[str, Any],
+        request_id: str,
+        now: datetime,
+        log_time: float,
+    ) -> None:
+        timestamp = self._format_time(now)
         if "step_suffix" in kwargs:
             step_suffix = kwargs["step_suffix"]
             event_name = kwargs["event_name"]
-            payload = kwargs["payload"]
+            payload = obj_to_dict(kwargs["payload"])
             start_time = kwargs["start_time"]
-            start_payload = kwargs["start_payload"]
+            start_payload = obj_to_dict(kwargs["start_payload"])
 
             LocalLogHandler._deep_update(payload, start_payload)
 
             step = f"{event_name}_{step_suffix}"
-            duration = time.time() - start_time
+            duration = log_time - start_time
             interval = {"type": step, "cost": f"{duration:.3f}"}
         else:
             step = ""
             interval = {"type": step, "cost": "0"}
             payload = {}
 
-        request_id = TracingUtil.get_request_id()
-
         if isinstance(payload, dict):
             context = payload
         else:
@@ -346,9 +469,32 @@ class LocalLogHandler(TracerHandler):
             traceback_info (str): The traceback information.
             **kwargs (Any): Additional keyword arguments.
         """
+        self._submit(
+            self._write_error,
+            event_name,
+            start_payload,
+            error,
+            start_time,
+            traceback_info,
+            datetime.now(),
+            time.time(),
+            essential=True,
+        )
+
+    def _write_error(
+        self,
+        event_name: str,
+        start_payload: Dict[str, Any],
+        error: Exception,
+        start_time: float,
+        traceback_info: str,
+        now: datetime,
+        end_time: float,
+    ) -> None:
         step = f"{event_name}_error"
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-        duration = time.time() - start_time
+        start_payload = obj_to_dict(start_payload)
+        timestamp = self._format_time(now)
+        duration = end_time - start_time
         interval = {"type": step, "cost": f"{duration:.3f}"}
         if "context" not in start_payload:
             start_payload["context"] = {}
@@ -1,12 +1,17 @@
 # -*- coding: utf-8 -*-
-from typing import List, Optional, Union
+import copy
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Union
 
 from openai.types.chat import ChatCompletionChunk
-from openai.types.chat.chat_completion_chunk import ChoiceDeltaToolCall
+from openai.types.chat.chat_completion_chunk import (
+    ChoiceDeltaToolCall,
+    ChoiceDeltaToolCallFunction,
+)
 
 from agentscope_runtime.engine.schemas.agent_schemas import (
     Role,
-    FunctionCall,
     AgentResponse,
     RunStatus,
     Message,
@@ -18,7 +23,7 @@ ToolCall = ChoiceDeltaToolCall
 
 
 # TODO: add this for streaming structured output support later
-def merge_incremental_chunk(  # pylint: disable=too-many-branches,too-many-nested-blocks  # noqa: E501
+def merge_incremental_chunk(
     responses: List[ChatCompletionChunk],
 ) -> Optional[ChatCompletionChunk]:
     """
@@ -32,92 +37,7 @@ def merge_incremental_chunk(  # pylint: disable=too-many-branches,too-many-neste
         Optional[ChatCompletionChunk]: The merged chat completion chunk,
         or None if the input list is empty.
     """
-
-    if len(responses) == 0:
-        return None
-
-    if not isinstance(responses[0], ChatCompletionChunk):
-        return None
-
-    # get usage or finish reason
-    merged = ChatCompletionChunk(**responses[-1].__dict__)
-
-    # if the responses has usage info, then merge the finish reason chunk to
-    # usage chunk
-    if not merged.choices and len(responses) > 1:
-        merged.choices = responses[-2].choices
-
-    # might be multiple tool calls result
-    tool_calls_dict = {}
-
-    for resp in reversed(responses[:-1]):
-        for i, j in zip(merged.choices, resp.choices):
-            # jump the finish reason chunk
-            if (i.delta.content is None and j.delta.content is not None) and (
-                i.delta.tool_calls is None and j.delta.tool_calls is not None
-            ):
-                continue
-            if j.delta.role == Role.TOOL:
-                continue
-            # merge content
-            if not i.delta.content and isinstance(j.delta.content, str):
-                i.delta.content = j.delta.content
-            elif isinstance(i.delta.content, str) and isinstance(
-                j.delta.content,
-                str,
-            ):
-                i.delta.content = j.delta.content + i.delta.content
-
-            # merge tool calls
-            elif not i.delta.tool_calls and isinstance(
-                j.delta.tool_calls,
-                list,
-            ):
-                for tool_call in j.delta.tool_calls:
-                    if tool_call.index not in tool_calls_dict:
-                        tool_calls_dict[tool_call.index] = tool_call
-                        # make sure function.arguments is a string
-                        if not tool_call.function.arguments:
-                            tool_calls_dict[
-                                tool_call.index
-                            ].function.arguments = ""
-                    else:
-                        if tool_call.id != "":
-                            tool_calls_dict[tool_call.index].id = tool_call.id
-                        if tool_call.function.name:
-                            tool_calls_dict[
-                                tool_call.index
-                            ].function.name = tool_call.function.name
-                        if (
-                            tool_call.function.arguments
-                            and not tool_calls_dict[
-                                tool_call.index
-                            ].function.arguments.startswith("{")
-                        ):
-                            tool_calls_dict[
-                                tool_call.index
-                            ].function.arguments = (
-                                tool_call.function.arguments
-                                + tool_calls_dict[
-                                    tool_call.index
-                                ].function.arguments
-                            )
-
-        if merged.usage and resp.usage:
-            merged.usage.prompt_tokens += resp.usage.prompt_tokens
-            merged.usage.completion_tokens += resp.usage.completion_tokens
-            merged.usage.total_tokens += resp.usage.total_tokens
-
-    if tool_calls_dict:
-        merged.choices[0].delta.tool_calls = [
-            ToolCall(
-                id=tool_call.id,
-                type=tool_call.type,
-                function=FunctionCall(**tool_call.function.__dict__),
-            )
-            for tool_call in tool_calls_dict.values()
-        ]
-    return merged
+    return ChatCompletionChunkMerger().merge(responses)
 
 
 def get_finish_reason(response: ChatCompletionChunk) -> Optional[str]:
@@ -133,7 +53,7 @@ def get_finish_reason(response: ChatCompletionChunk) -> Optional[str]:
     return finish_reason
 
 
-def merge_agent_response(  # pylint: disable=too-many-return-statements,too-many-branches,too-many-statements,too-many-nested-blocks  # noqa: E501
+def merge_agent_response(
     responses: List[Union[AgentResponse, Message, TextContent]],
 ) -> AgentResponse:
     """
@@ -148,184 +68,7 @@ def merge_agent_response(  # pylint: disable=too-many-return-statements,too-many
     """
     if len(responses) == 0:
         raise ValueError("Cannot merge empty response list")
-
-    # Check if all responses are of the same object type
-    object_types = set()
-    for resp in responses:
-        if hasattr(resp, "object"):
-            object_types.add(resp.object)
-        else:
-            # If no object field, treat as AgentResponse
-            object_types.add("response")
-
-    if len(object_types) > 1:
-        # Mixed object types, convert the last response to AgentResponse
-        last_resp = responses[-1]
-        if isinstance(last_resp, TextContent):
-            # Convert TextContent to Message, then to AgentResponse
-            message = Message(
-                role=Role.ASSISTANT,
-                content=[last_resp],
-                status=last_resp.status or RunStatus.Completed,
-            )
-            return AgentResponse(
-                output=[message],
-                status=message.status,
-                session_id=None,
-            )
-        elif isinstance(last_resp, Message):
-            return AgentResponse(
-                output=[last_resp],
-                status=last_resp.status,
-                session_id=None,
-            )
-        else:
-            return AgentResponse(**last_resp.__dict__)
-
-    object_type = list(object_types)[0]
-
-    if object_type == "content":
-        # For content objects, merge text content and convert to AgentResponse
-        text_contents = [
-            resp for resp in responses if hasattr(resp, "text") and resp.text
-        ]
-        if not text_contents:
-            # Return empty AgentResponse if no text content
-            return AgentResponse(
-                status=RunStatus.Completed,
-                session_id=None,
-            )
-
-        # Merge all text content
-        merged_text = ""
-        last_content = text_contents[-1]
-
-        for content in text_contents:
-            if content.delta:
-                merged_text += content.text
-            else:
-                merged_text = content.text
-
-        # Create a Message with merged content
-        final_content = TextContent(
-            text=merged_text,
-            delta=False,
-            index=0,
-            msg_id=last_content.msg_id,
-            status=RunStatus.Completed,
-        )
-
-        message = Message(
-            role=Role.ASSISTANT,
-            content=[final_content],
-            status=RunStatus.Completed,
-        )
-
-        return AgentResponse(
-            output=[message],
-            status=RunStatus.Completed,
-            session_id=None,
-        )
-
-    elif object_type == "message":
-        # For message objects, convert to AgentResponse
-        messages = [resp for resp in responses if isinstance(resp, Message)]
-        if not messages:
-            return AgentResponse(
-                status=RunStatus.Completed,
-                session_id=None,
-            )
-
-        # Return the last message as AgentResponse
-        last_message = messages[-1]
-        return AgentResponse(
-            output=[last_message],
-            status=last_message.status,
-            session_id=None,
-        )
-
-    else:
-        # For response objects, use existing logic
-        # Filter only AgentResponse objects
-        agent_responses = [
-            resp for resp in responses if isinstance(resp, AgentResponse)
-        ]
-
-        if len(agent_responses) == 0:
-            last_resp = responses[-1]
-            if isinstance(last_resp, Message):
-                return AgentResponse(
-                    output=[last_resp],
-                    status=last_resp.status,
-                    session_id=None,
-                )
-            else:
-                return AgentResponse(**last_resp.__dict__)
-
-        # Get the last AgentResponse as base
-        merged = AgentResponse(**agent_responses[-1].__dict__)
-
-        # If no output, return the merged response
-        if not merged.output:
-            return merged
-
-        # Merge content from all AgentResponse objects
-        content_dict = {}
-
-        for resp in agent_responses:
-            if not resp.output:
-                continue
-
-            for message in resp.output:
-                if not message.content:
-                    continue
-
-                for content in message.content:
-                    if (
-                        content.type == "text"
-                        and hasattr(content, "text")
-                        and content.text
-                    ):
-                        # For text content, accumulate the text
-                        if content.msg_id not in content_dict:
-                            content_dict[content.msg_id] = {
-                                "content": content,
-                                "text": content.text,
-                                "delta": content.delta,
-                            }
-                        else:
-                            # If delta is True, append text; if False, replace
-                            if content.delta:
-                                content_dict[content.msg_id][
-                                    "text"
-                                ] += content.text
-                            else:
-                                content_dict[content.msg_id][
-                                    "text"
-                                ] = content.text
-
-                            # Update the content object with merged text
-                            content_dict[content.msg_id][
-                                "content"
-                            ].text = content_dict[content.msg_id]["text"]
-                            content_dict[content.msg_id][
-                                "content"
-                            ].delta = False
-
-        # Update the merged response with accumulated content
-        if content_dict:
-            for message in merged.output:
-                if message.content:
-                    for content in message.content:
-                        if (
-                            content.type == "text"
-                            and hasattr(content, "msg_id")
-                            and content.msg_id in content_dict
-                        ):
-                            content.text = content_dict[content.msg_id]["text"]
-                            content.delta = False
-
-        return merged
+    return AgentResponseMerger().merge(responses)
 
 
 def get_agent_response_finish_reason(
@@ -353,7 +96,7 @@ def get_agent_response_finish_reason(
     return None
 
 
-def merge_agent_message(  # pylint: disable=too-many-return-statements,too-many-branches,too-many-statements,too-many-nested-blocks  # noqa: E501
+def merge_agent_message(
     messages: List[Union[Message, TextContent]],
 ) -> Message:
     """
@@ -368,161 +111,488 @@ def merge_agent_message(  # pylint: disable=too-many-return-statements,too-many-
     """
     if len(messages) == 0:
         raise ValueError("Cannot merge empty message list")
+    return AgentMessageMerger().merge(messages)
 
-    # Check if all messages are of the same object type
-    object_types = set()
-    for msg in messages:
-        if hasattr(msg, "object"):
-            object_types.add(msg.object)
-        else:
-            # If no object field, treat as Message
-            object_types.add("message")
-
-    if len(object_types) > 1:
-        # Mixed object types, convert the last message to Message
-        last_msg = messages[-1]
-        if isinstance(last_msg, TextContent):
-            # Convert TextContent to Message with delta=False
-            final_content = TextContent(
-                text=last_msg.text,
-                delta=False,
-                index=last_msg.index,
-                msg_id=last_msg.msg_id,
-                status=RunStatus.Completed,
+
+def get_agent_message_finish_reason(
+    message: Optional[Union[Message, TextContent]],
+) -> Optional[str]:
+    if message is None:
+        return None
+
+    if isinstance(message, Message):
+        return "stop" if message.status == RunStatus.Completed else None
+
+    return None
+
+
+class _TextBuffer:
+    """Text pieces joined once on read, capped at ``limit`` characters."""
+
+    __slots__ = ("pieces", "size", "limit", "truncated")
+
+    def __init__(self, limit: Optional[int] = None):
+        self.pieces: List[str] = []
+        self.size = 0
+        self.limit = limit
+        self.truncated = False
+
+    def add(self, text: str, replace: bool = False) -> None:
+        if replace:
+            self.pieces = []
+            self.size = 0
+            self.truncated = False
+        if self.limit is not None and self.size + len(text) > self.limit:
+            text = text[: max(self.limit - self.size, 0)]
+            self.truncated = True
+        if text:
+            self.pieces.append(text)
+            self.size += len(text)
+
+    def value(self) -> str:
+        if len(self.pieces) > 1:
+            self.pieces = ["".join(self.pieces)]
+        return self.pieces[0] if self.pieces else ""
+
+
+class StreamMerger:
+    """
+    Merge streamed chunks as they arrive.
+
+    This base class keeps a copy of each chunk, which ``merge_func`` may
+    modify, and calls ``merge_func`` on them in ``result()``; it is used
+    for custom ``merge_output_func`` callables. With ``max_chunks`` only
+    the most recent chunks are kept, and ``truncated`` tells whether some
+    were dropped. Subclasses fold each chunk into a running summary
+    instead.
+    """
+
+    def __init__(
+        self,
+        merge_func: Optional[Callable[[List[Any]], Any]] = None,
+        max_chunks: Optional[int] = None,
+    ):
+        self.merge_func = merge_func
+        self.chunks: deque = deque(maxlen=max_chunks)
+        self.count = 0
+
+    def add(self, chunk: Any) -> None:
+        self.count += 1
+        # The chunk itself is yielded to the caller as is
+        self.chunks.append(copy.deepcopy(chunk))
+
+    @property
+    def truncated(self) -> bool:
+        """Whether older chunks were dropped from ``chunks``."""
+        return self.chunks.maxlen is not None and self.count > len(
+            self.chunks,
+        )
+
+    def result(self) -> Any:
+        if not self.chunks or self.merge_func is None:
+            return None
+        return self.merge_func(list(self.chunks))
+
+    def merge(self, chunks: List[Any]) -> Any:
+        """Add all ``chunks`` and return the merged result."""
+        for chunk in chunks:
+            self.add(chunk)
+        return self.result()
+
+
+class ChatCompletionChunkMerger(StreamMerger):
+    """
+    Incremental `merge_incremental_chunk`.
+
+    Content and tool call arguments are concatenated in order; the last
+    chunk (or, when it only carries usage, the one before) provides the
+    choices, and usage is summed. Input chunks are never modified.
+    """
+
+    def __init__(self, max_chars: Optional[int] = None):
+        super().__init__()
+        self.max_chars = max_chars
+        self.valid: Optional[bool] = None
+        self.last: Optional[ChatCompletionChunk] = None
+        self.previous: Optional[ChatCompletionChunk] = None
+        self.contents: Dict[int, _TextBuffer] = {}
+        self.tool_calls: Dict[int, Dict[str, Any]] = {}
+        self.usage: Optional[Dict[str, int]] = None
+
+    def add(self, chunk: Any) -> None:
+        self.count += 1
+        if self.valid is None:
+            self.valid = isinstance(chunk, ChatCompletionChunk)
+        if not self.valid or not isinstance(chunk, ChatCompletionChunk):
+            return
+
+        self.previous, self.last = self.last, chunk
+        for position, choice in enumerate(chunk.choices):
+            delta = choice.delta
+            if delta is None or delta.role == Role.TOOL:
+                continue
+            if isinstance(delta.content, str):
+                buffer = self.contents.get(position)
+                if buffer is None:
+                    buffer = self.contents[position] = _TextBuffer(
+                        self.max_chars,
+                    )
+                buffer.add(delta.content)
+            for tool_call in delta.tool_calls or ():
+                self._add_tool_call(tool_call)
+
+        if chunk.usage:
+            usage = self.usage or {
+                "prompt_tokens": 0,
+                "completion_tokens": 0,
+                "total_tokens": 0,
+            }
+            usage["prompt_tokens"] += chunk.usage.prompt_tokens
+            usage["completion_tokens"] += chunk.usage.completion_tokens
+            usage["total_tokens"] += chunk.usage.total_tokens
+            self.usage = usage
+
+    def _add_tool_call(self, tool_call: ChoiceDeltaToolCall) -> None:
+        function = tool_call.function
+        entry = self.tool_calls.get(tool_call.index)
+        if entry is None:
+            entry = self.tool_calls[tool_call.index] = {
+                "id": None,
+                "type": None,
+                "name": None,
+                "arguments": _TextBuffer(self.max_chars),
+            }
+        entry["id"] = entry["id"] or tool_call.id
+        entry["type"] = entry["type"] or tool_call.type
+        if function is None:
+            return
+        entry["name"] = entry["name"] or function.name
+        if function.arguments:
+            # some providers resend the complete arguments at the end
+            entry["arguments"].add(
+                function.arguments,
+                replace=function.arguments.startswith("{"),
             )
-            return Message(
-                role=Role.ASSISTANT,
-                content=[final_content],
-                status=RunStatus.Completed,
+
+    def result(self) -> Optional[ChatCompletionChunk]:
+        if not self.valid:
+            return None
+
+        last = self.last
+        choices = last.choices
+        if not choices and self.previous is not None:
+            choices = self.previous.choices
+
+        merged_choices = []
+        for position, choice in enumerate(choices):
+            update = {}
+            if position in self.contents:
+                update["content"] = self.contents[position].value()
+            if position == 0 and self.tool_calls:
+                update["tool_calls"] = [
+                    ToolCall(
+                        index=index,
+                        id=entry["id"],
+                        type=entry["type"],
+                        function=ChoiceDeltaToolCallFunction(
+                            name=entry["name"],
+                            arguments=entry["arguments"].value(),
+                        ),
+                    )
+                    for index, entry in self.tool_calls.items()
+                ]
+            merged_choices.append(
+                choice.model_copy(
+                    update={"delta": choice.delta.model_copy(update=update)},
+                ),
             )
-        else:
-            return Message(**last_msg.__dict__)
 
-    object_type = list(object_types)[0]
+        update = {"choices": merged_choices}
+        if last.usage and self.usage:
+            update["usage"] = last.usage.model_copy(update=self.usage)
+        return last.model_copy(update=update)
 
-    if object_type == "content":
-        # For content objects, merge text content and convert to Message
-        text_contents = [
-            msg for msg in messages if hasattr(msg, "text") and msg.text
-        ]
-        if not text_contents:
-            # Return empty Message if no text content
-            return Message(
-                role=Role.ASSISTANT,
-                status=RunStatus.Completed,
-            )
 
-        # Merge all text content
-        merged_text = ""
-        last_content = text_contents[-1]
+class _AgentEventMerger(StreamMerger, ABC):
+    """
+    Shared state of the incremental `merge_agent_response` and
+    `merge_agent_message`.
+
+    Only the last event matters once the stream mixes object types, so
+    text is accumulated only while all events share one type.
+    """
 
-        for content in text_contents:
-            if content.delta:
-                merged_text += content.text
-            else:
-                merged_text = content.text
+    def __init__(self, max_chars: Optional[int] = None):
+        super().__init__()
+        self.max_chars = max_chars
+        self.object_types = set()
+        self.last: Any = None
+        self.last_text_content: Optional[TextContent] = None
+        self.texts: Dict[str, _TextBuffer] = {}
+
+    def add(self, chunk: Any) -> None:
+        self.count += 1
+        self.last = chunk
+        object_type = (
+            chunk.object if hasattr(chunk, "object") else self.default_object
+        )
+        self.object_types.add(object_type)
+        if len(self.object_types) > 1:
+            self.texts.clear()
+            return
+
+        if object_type == "content":
+            if getattr(chunk, "text", None):
+                self.last_text_content = chunk
+                self._add_text("", chunk.text, replace=not chunk.delta)
+        else:
+            self._add_event(chunk)
+
+    @abstractmethod
+    def _add_event(self, chunk: Any) -> None:
+        """Fold a chunk that is not a text content into the merge."""
+
+    def _add_text(self, key: str, text: str, replace: bool) -> None:
+        buffer = self.texts.get(key)
+        if buffer is None:
+            buffer = self.texts[key] = _TextBuffer(self.max_chars)
+        buffer.add(text, replace=replace)
+
+    def _add_message_texts(self, message: Message, key_func: Callable):
+        for content in message.content or ():
+            if (
+                content.type == "text"
+                and hasattr(content, "text")
+                and content.text
+            ):
+                key = key_func(content)
+                # the first text of a key is taken as is
+                self._add_text(
+                    key,
+                    content.text,
+                    replace=key not in self.texts or not content.delta,
+                )
 
-        # Create a Message with merged content
-        final_content = TextContent(
-            text=merged_text,
+    def _merged_contents(self, message: Message, key_func: Callable):
+        """Copy of ``message.content`` with the accumulated texts."""
+        if not message.content:
+            return message.content
+        contents = []
+        for content in message.content:
+            if content.type == "text" and hasattr(content, "msg_id"):
+                buffer = self.texts.get(key_func(content))
+                if buffer is not None:
+                    content = content.model_copy(
+                        update={"text": buffer.value(), "delta": False},
+                    )
+            contents.append(content)
+        return contents
+
+    def _merged_text_content(self) -> TextContent:
+        return TextContent(
+            text=self.texts[""].value(),
             delta=False,
             index=0,
-            msg_id=last_content.msg_id,
+            msg_id=self.last_text_content.msg_id,
             status=RunStatus.Completed,
         )
 
-        return Message(
-            role=Role.ASSISTANT,
-            content=[final_content],
-            status=RunStatus.Completed,
-        )
 
-    else:
-        # For message objects, use existing logic
-        # Filter only Message objects
-        message_objects = [msg for msg in messages if isinstance(msg, Message)]
+def _response_text_key(content: Any) -> str:
+    return content.msg_id
 
-        if len(message_objects) == 0:
-            last_msg = messages[-1]
-            if isinstance(last_msg, TextContent):
-                return Message(
-                    role=Role.ASSISTANT,
-                    content=[last_msg],
-                    status=last_msg.status or RunStatus.Completed,
+
+def _message_text_key(content: Any) -> str:
+    # msg_id + index keeps different contents of one message apart
+    return f"{content.msg_id}_{content.index}"
+
+
+class AgentResponseMerger(_AgentEventMerger):
+    """Incremental `merge_agent_response`."""
+
+    default_object = "response"
+
+    def __init__(self, max_chars: Optional[int] = None):
+        super().__init__(max_chars)
+        self.last_message: Optional[Message] = None
+        self.last_response: Optional[AgentResponse] = None
+
+    def _add_event(self, chunk: Any) -> None:
+        if isinstance(chunk, Message):
+            self.last_message = chunk
+        elif isinstance(chunk, AgentResponse):
+            self.last_response = chunk
+            for message in chunk.output or ():
+                self._add_message_texts(message, _response_text_key)
+
+    @staticmethod
+    def _from_last(last: Any) -> AgentResponse:
+        if isinstance(last, TextContent):
+            # Convert TextContent to Message, then to AgentResponse
+            last = Message(
+                role=Role.ASSISTANT,
+                content=[last],
+                status=last.status or RunStatus.Completed,
+            )
+        if isinstance(last, Message):
+            return AgentResponse(
+                output=[last],
+                status=last.status,
+                session_id=None,
+            )
+        return AgentResponse(**last.__dict__)
+
+    def result(self) -> Optional[AgentResponse]:
+        if self.last is None:
+            return None
+
+        if len(self.object_types) > 1:
+            # Mixed object types, convert the last response
+            return self._from_last(self.last)
+
+        object_type = next(iter(self.object_types))
+
+        if object_type == "content":
+            if not self.texts:
+                # Return empty AgentResponse if no text content
+                return AgentResponse(
+                    status=RunStatus.Completed,
+                    session_id=None,
+                )
+            message = Message(
+                role=Role.ASSISTANT,
+                content=[self._merged_text_content()],
+                status=RunStatus.Completed,
+            )
+            return AgentResponse(
+                output=[message],
+                status=RunStatus.Completed,
+                session_id=None,
+            )
+
+        if object_type == "message":
+            if self.last_message is None:
+                return AgentResponse(
+                    status=RunStatus.Completed,
+                    session_id=None,
                 )
-            else:
-                return Message(**last_msg.__dict__)
+            return AgentResponse(
+                output=[self.last_message],
+                status=self.last_message.status,
+                session_id=None,
+            )
 
-        # Get the last Message as base
-        merged = Message(**message_objects[-1].__dict__)
+        if self.last_response is None:
+            return self._from_last(self.last)
+
+        merged = AgentResponse(**self.last_response.__dict__)
+        if merged.output and self.texts:
+            merged.output = [
+                message.model_copy(
+                    update={
+                        "content": self._merged_contents(
+                            message,
+                            _response_text_key,
+                        ),
+                    },
+                )
+                for message in merged.output
+            ]
+        return merged
 
-        # If no content, return the merged message
-        if not merged.content:
-            return merged
 
-        # Merge content from all Message objects
-        # Use msg_id + index as key to avoid overwriting different contents
-        # with the same msg_id but different indexes
-        content_dict = {}
+class AgentMessageMerger(_AgentEventMerger):
+    """Incremental `merge_agent_message`."""
 
-        for msg in message_objects:
-            if not msg.content:
-                continue
+    default_object = "message"
+
+    def __init__(self, max_chars: Optional[int] = None):
+        super().__init__(max_chars)
+        self.last_message: Optional[Message] = None
+
+    def _add_event(self, chunk: Any) -> None:
+        if isinstance(chunk, Message):
+            self.last_message = chunk
+            self._add_message_texts(chunk, _message_text_key)
+
+    def result(self) -> Optional[Message]:
+        last = self.last
+        if last is None:
+            return None
 
-            for content in msg.content:
-                if (
-                    content.type == "text"
-                    and hasattr(content, "text")
-                    and content.text
-                ):
-                    # Create unique key using msg_id and index
-                    content_key = f"{content.msg_id}_{content.index}"
-
-                    # For text content, accumulate the text
-                    if content_key not in content_dict:
-                        content_dict[content_key] = {
-                            "content": content,
-                            "text": content.text,
-                            "delta": content.delta,
-                            "msg_id": content.msg_id,
-                            "index": content.index,
-                        }
-                    else:
-                        # If delta is True, append text; if False, replace
-                        if content.delta:
-                            content_dict[content_key]["text"] += content.text
-                        else:
-                            content_dict[content_key]["text"] = content.text
-
-                        # Update the content object with merged text
-                        content_dict[content_key][
-                            "content"
-                        ].text = content_dict[content_key]["text"]
-                        content_dict[content_key]["content"].delta = False
-
-        # Update the merged message with accumulated content
-        if content_dict:
-            for content in merged.content:
-                if (
-                    content.type == "text"
-                    and hasattr(content, "msg_id")
-                    and hasattr(content, "index")
-                ):
-                    content_key = f"{content.msg_id}_{content.index}"
-                    if content_key in content_dict:
-                        content.text = content_dict[content_key]["text"]
-                        content.delta = False
+        if len(self.object_types) > 1:
+            # Mixed object types, convert the last message to Message
+            if isinstance(last, TextContent):
+                final_content = TextContent(
+                    text=last.text,
+                    delta=False,
+                    index=last.index,
+                    msg_id=last.msg_id,
+                    status=RunStatus.Completed,
+                )
+                return Message(
+                    role=Role.ASSISTANT,
+                    content=[final_content],
+                    status=RunStatus.Completed,
+                )
+            return Message(**last.__dict__)
 
+        if next(iter(self.object_types)) == "content":
+            if not self.texts:
+                # Return empty Message if no text content
+                return Message(
+                    role=Role.ASSISTANT,
+                    status=RunStatus.Completed,
+                )
+            return Message(
+                role=Role.ASSISTANT,
+                content=[self._merged_text_content()],
+                status=RunStatus.Completed,
+            )
+
+        if self.last_message is None:
+            if isinstance(last, TextContent):
+                return Message(
+                    role=Role.ASSISTANT,
+                    content=[last],
+                    status=last.status or RunStatus.Completed,
+                )
+            return Message(**last.__dict__)
+
+        merged = Message(**self.last_message.__dict__)
+        if merged.content and self.texts:
+            merged.content = self._merged_contents(merged, _message_text_key)
         return merged
 
 
-def get_agent_message_finish_reason(
-    message: Optional[Union[Message, TextContent]],
-) -> Optional[str]:
-    if message is None:
-        return None
+_STREAM_MERGERS = {
+    merge_incremental_chunk: ChatCompletionChunkMerger,
+    merge_agent_response: AgentResponseMerger,
+    merge_agent_message: AgentMessageMerger,
+}
 
-    if isinstance(message, Message):
-        return "stop" if message.status == RunStatus.Completed else None
 
-    return None
+def create_stream_merger(
+    merge_func: Callable[[List[Any]], Any],
+    max_chars: Optional[int] = None,
+    max_chunks: Optional[int] = None,
+) -> StreamMerger:
+    """
+    Create the merger used to trace the merged output of a stream.
+
+    Args:
+        merge_func (Callable): The ``merge_output_func`` of ``@trace``.
+        max_chars (Optional[int]): Cap on the text accumulated per content
+            by the built-in mergers.
+        max_chunks (Optional[int]): Cap on the chunks kept for a custom
+            ``merge_func``, which is then called on the most recent ones
+            only; unbounded by default.
+
+    Returns:
+        StreamMerger: An incremental merger for the built-in merge
+        functions, otherwise one that calls ``merge_func`` at the end.
+    """
+    merger_cls = _STREAM_MERGERS.get(merge_func)
+    if merger_cls is not None:
+        return merger_cls(max_chars=max_chars)
+    return StreamMerger(merge_func, max_chunks=max_chunks)
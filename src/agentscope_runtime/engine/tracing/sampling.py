@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import random
+import time
+from typing import Dict, Optional
+
+
+class TraceSampler:
+    """
+    Decide which traced calls record their payloads, and how much of them.
+
+    Head sampling keeps a call with the rate of its trace type (or the
+    default rate), before any payload is built. Tail sampling then keeps
+    the calls head sampling skipped if they failed or took at least
+    ``slow_threshold`` seconds. Span attribute values above their byte
+    limit are cut and suffixed with the size and a hash of the full value.
+    """
+
+    def __init__(
+        self,
+        default_rate: float = 1.0,
+        rates: Optional[Dict[str, float]] = None,
+        keep_errors: bool = True,
+        slow_threshold: Optional[float] = None,
+        max_attribute_bytes: Optional[int] = None,
+        attribute_limits: Optional[Dict[str, int]] = None,
+    ) -> None:
+        """Initialize the sampler.
+
+        Args:
+            default_rate (float): Head sampling rate of trace types without
+                their own rate, from 0 to 1.
+            rates (Optional[Dict[str, float]]): Head sampling rate per trace
+                type.
+            keep_errors (bool): Keep failed calls skipped by head sampling.
+            slow_threshold (Optional[float]): Keep calls skipped by head
+                sampling that took at least this many seconds.
+            max_attribute_bytes (Optional[int]): Byte limit of span
+                attribute values without their own limit.
+            attribute_limits (Optional[Dict[str, int]]): Byte limit per
+                span attribute.
+        """
+        self.default_rate = default_rate
+        self.rates = rates or {}
+        self.keep_errors = keep_errors
+        self.slow_threshold = slow_threshold
+        self.max_attribute_bytes = max_attribute_bytes
+        self.attribute_limits = attribute_limits or {}
+
+    def sample(self, trace_type: str) -> bool:
+        """Head sampling decision for a call of ``trace_type``."""
+        rate = self.rates.get(str(trace_type), self.default_rate)
+        if rate >= 1:
+            return True
+        return rate > 0 and random.random() < rate
+
+    def keep_tail(self, start_time: float, failed: bool = False) -> bool:
+        """Whether to keep a call skipped by head sampling once it is done.
+
+        Args:
+            start_time (float): ``time.time()`` when the call started.
+            failed (bool): Whether the call raised.
+        """
+        if failed:
+            return self.keep_errors
+        return (
+            self.slow_threshold is not None
+            and time.time() - start_time >= self.slow_threshold
+        )
+
+    def truncate(self, key: str, value: str) -> str:
+        """Cut ``value`` of span attribute ``key`` to its byte limit,
+        marker included."""
+        limit = self.attribute_limits.get(key, self.max_attribute_bytes)
+        # a str has at most 4 bytes per character in UTF-8
+        if not limit or len(value) <= limit // 4:
+            return value
+        data = value.encode("utf-8")
+        if len(data) <= limit:
+            return value
+        digest = hashlib.sha256(data).hexdigest()[:16]
+        suffix = f"...[truncated {len(data)} bytes, sha256:{digest}]"
+        if len(suffix) > limit:
+            # no room for the marker
+            return data[:limit].decode("utf-8", errors="ignore")
+        head = data[: limit - len(suffix)].decode("utf-8", errors="ignore")
+        return head + suffix
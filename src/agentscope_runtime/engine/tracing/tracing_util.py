@@ -1,8 +1,11 @@
 # -*- coding: utf-8 -*-
 import contextvars
 import os
+from typing import Any
+
 from opentelemetry import baggage
 from opentelemetry.context import attach
+from pydantic import BaseModel
 
 _user_request_id: contextvars.ContextVar[str] = contextvars.ContextVar(
     "_user_request_id",
@@ -133,3 +136,32 @@ def get_global_attributes() -> dict:
 
 
 _global_attributes = get_global_attributes()
+
+
+def obj_to_dict(obj: Any) -> Any:
+    """Convert an object to a dictionary representation for tracing.
+
+    Args:
+        obj (Any): The object to convert.
+
+    Returns:
+        Any: The dictionary representation of the object, or the object
+            itself if it's a primitive type.
+    """
+    if obj is None:
+        return {}
+    elif isinstance(obj, (str, int, float, bool, type(None))):
+        return obj
+    elif isinstance(obj, dict):
+        return {k: obj_to_dict(v) for k, v in obj.items()}
+    elif isinstance(obj, (list, set, tuple)):
+        return [obj_to_dict(item) for item in obj]
+    elif isinstance(obj, BaseModel):
+        return obj.model_dump()
+    else:
+        result = None
+        try:
+            result = str(obj)
+        except Exception as e:
+            print(f"{obj} str method failed with error: {e}")
+        return result
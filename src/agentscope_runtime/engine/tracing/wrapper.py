@@ -4,13 +4,14 @@
 import contextvars
 import inspect
 import json
+import logging
 import os
 import re
 import time
 import threading
+import traceback
 import uuid
 from collections.abc import Callable
-from copy import deepcopy
 from enum import Enum
 from functools import wraps
 from typing import (
@@ -44,14 +45,19 @@ from opentelemetry.sdk.trace.export import (
 
 from .asyncio_util import aenumerate
 from .message_util import (
+    StreamMerger,
+    create_stream_merger,
     merge_incremental_chunk,
     get_finish_reason,
 )
 
 from .base import Tracer, TracerHandler, EventContext
+from .sampling import TraceSampler
 from .tracing_metric import TraceType
 from .local_logging_handler import LocalLogHandler
-from .tracing_util import TracingUtil
+from .tracing_util import TracingUtil, obj_to_dict
+
+logger = logging.getLogger(__name__)
 
 T_co = TypeVar("T_co", covariant=True)
 
@@ -141,8 +147,6 @@ def trace(  # pylint: disable=too-many-statements
 
             _init_trace_context()
 
-            start_payload = _get_start_payload(args, kwargs, func)
-
             trace_context = kwargs.get("trace_context") if kwargs else None
 
             if trace_context:
@@ -169,16 +173,21 @@ def trace(  # pylint: disable=too-many-statements
             # Auto generate request_id for root span if needed
             _set_request_id(parent_ctx)
 
+            # Decide before any payload is built
+            sampled = _sampler.sample(final_trace_type)
+            start_payload = (
+                _get_start_payload(args, kwargs, func, _payload_converter())
+                if sampled and _payloads_needed()
+                else {}
+            )
+            call_start = time.time()
+
             common_attrs = TracingUtil.get_common_attributes() or {}
 
             span_attributes = {
                 "gen_ai.span.kind": final_trace_type,
                 "gen_ai.user.query_root_flag": 1 if final_is_root_span else 0,
-                "input.mine_type": MineType.JSON,
-                "input.value": json.dumps(
-                    start_payload,
-                    ensure_ascii=False,
-                ),
+                **(_input_attributes(start_payload) if sampled else {}),
                 **common_attrs,
             }
 
@@ -188,7 +197,7 @@ def trace(  # pylint: disable=too-many-statements
                 attributes=span_attributes,
             ) as span:
                 span.set_status(status=StatusCode.OK)
-                with _tracer.event(
+                with (_tracer if sampled else _unsampled_tracer).event(
                     span,
                     final_trace_name,
                     payload=start_payload,
@@ -204,26 +213,40 @@ def trace(  # pylint: disable=too-many-statements
 
                     try:
                         result = await func(*args, **func_kwargs)
-                        end_payload = _obj_to_dict(result)
-                        (
-                            output_mine_type,
-                            output_value,
-                        ) = _get_ot_type_and_value(end_payload)
-                        span.set_attribute(
-                            "output.mine_type",
-                            output_mine_type,
-                        )
-                        span.set_attribute(
-                            "output.value",
-                            output_value,
-                        )
-                        event.on_end(payload=end_payload)
+                        if not sampled:
+                            if _sampler.keep_tail(call_start):
+                                _record_unsampled(
+                                    span,
+                                    final_trace_name,
+                                    func,
+                                    args,
+                                    kwargs,
+                                    call_start,
+                                    output=result,
+                                )
+                        elif _payloads_needed():
+                            end_payload = _payload_converter()(result)
+                            _set_output_attributes(span, end_payload)
+                            event.on_end(payload=end_payload)
                         return result
                     except Exception as e:
                         span.set_status(
                             status=StatusCode.ERROR,
                             description=f"exception={e}",
                         )
+                        if not sampled and _sampler.keep_tail(
+                            call_start,
+                            failed=True,
+                        ):
+                            _record_unsampled(
+                                span,
+                                final_trace_name,
+                                func,
+                                args,
+                                kwargs,
+                                call_start,
+                                error=e,
+                            )
                         event.on_log(str(e))
                         raise e
                     finally:
@@ -244,8 +267,6 @@ def trace(  # pylint: disable=too-many-statements
 
             _init_trace_context()
 
-            start_payload = _get_start_payload(args, kwargs, func)
-
             trace_context = kwargs.get("trace_context") if kwargs else None
 
             if trace_context:
@@ -272,16 +293,21 @@ def trace(  # pylint: disable=too-many-statements
             # Auto generate request_id for root span if needed
             _set_request_id(parent_ctx)
 
+            # Decide before any payload is built
+            sampled = _sampler.sample(final_trace_type)
+            start_payload = (
+                _get_start_payload(args, kwargs, func, _payload_converter())
+                if sampled and _payloads_needed()
+                else {}
+            )
+            call_start = time.time()
+
             common_attrs = TracingUtil.get_common_attributes() or {}
 
             span_attributes = {
                 "gen_ai.span.kind": final_trace_type,
                 "gen_ai.user.query_root_flag": 1 if final_is_root_span else 0,
-                "input.mine_type": MineType.JSON,
-                "input.value": json.dumps(
-                    start_payload,
-                    ensure_ascii=False,
-                ),
+                **(_input_attributes(start_payload) if sampled else {}),
                 **common_attrs,
             }
 
@@ -291,7 +317,7 @@ def trace(  # pylint: disable=too-many-statements
                 attributes=span_attributes,
             ) as span:
                 span.set_status(status=StatusCode.OK)
-                with _tracer.event(
+                with (_tracer if sampled else _unsampled_tracer).event(
                     span,
                     final_trace_name,
                     payload=start_payload,
@@ -307,26 +333,40 @@ def trace(  # pylint: disable=too-many-statements
 
                     try:
                         result = func(*args, **func_kwargs)
-                        end_payload = _obj_to_dict(result)
-                        (
-                            output_mine_type,
-                            output_value,
-                        ) = _get_ot_type_and_value(end_payload)
-                        span.set_attribute(
-                            "output.mine_type",
-                            output_mine_type,
-                        )
-                        span.set_attribute(
-                            "output.value",
-                            output_value,
-                        )
-                        event.on_end(payload=end_payload)
+                        if not sampled:
+                            if _sampler.keep_tail(call_start):
+                                _record_unsampled(
+                                    span,
+                                    final_trace_name,
+                                    func,
+                                    args,
+                                    kwargs,
+                                    call_start,
+                                    output=result,
+                                )
+                        elif _payloads_needed():
+                            end_payload = _payload_converter()(result)
+                            _set_output_attributes(span, end_payload)
+                            event.on_end(payload=end_payload)
                         return result
                     except Exception as e:
                         span.set_status(
                             status=StatusCode.ERROR,
                             description=f"exception={e}",
                         )
+                        if not sampled and _sampler.keep_tail(
+                            call_start,
+                            failed=True,
+                        ):
+                            _record_unsampled(
+                                span,
+                                final_trace_name,
+                                func,
+                                args,
+                                kwargs,
+                                call_start,
+                                error=e,
+                            )
                         event.on_log(str(e))
                         raise e
                     finally:
@@ -349,8 +389,6 @@ def trace(  # pylint: disable=too-many-statements
             """
             _init_trace_context()
 
-            start_payload = _get_start_payload(args, kwargs, func)
-
             trace_context = kwargs.get("trace_context") if kwargs else None
 
             if trace_context:
@@ -377,16 +415,21 @@ def trace(  # pylint: disable=too-many-statements
             # Auto generate request_id for root span if needed
             _set_request_id(parent_ctx)
 
+            # Decide before any payload is built
+            sampled = _sampler.sample(final_trace_type)
+            start_payload = (
+                _get_start_payload(args, kwargs, func, _payload_converter())
+                if sampled and _payloads_needed()
+                else {}
+            )
+            call_start = time.time()
+
             common_attrs = TracingUtil.get_common_attributes() or {}
 
             span_attributes = {
                 "gen_ai.span.kind": final_trace_type,
                 "gen_ai.user.query_root_flag": 1 if final_is_root_span else 0,
-                "input.mine_type": MineType.JSON,
-                "input.value": json.dumps(
-                    start_payload,
-                    ensure_ascii=False,
-                ),
+                **(_input_attributes(start_payload) if sampled else {}),
                 **common_attrs,
             }
 
@@ -396,7 +439,7 @@ def trace(  # pylint: disable=too-many-statements
                 attributes=span_attributes,
             ) as span:
                 span.set_status(status=StatusCode.OK)
-                with _tracer.event(
+                with (_tracer if sampled else _unsampled_tracer).event(
                     span,
                     final_trace_name,
                     payload=start_payload,
@@ -410,7 +453,7 @@ def trace(  # pylint: disable=too-many-statements
                     else:
                         func_kwargs = kwargs.copy() if kwargs else {}
 
-                    cumulated = []
+                    merger = _create_merger(merge_output_func)
 
                     async def iter_entry() -> AsyncGenerator[T_co, None]:
                         """Internal async generator for processing items.
@@ -425,7 +468,8 @@ def trace(  # pylint: disable=too-many-statements
                                 func(*args, **func_kwargs),
                             ):  # type: ignore
                                 yield resp
-                                cumulated.append(resp)
+                                if merger is not None:
+                                    merger.add(resp)
 
                                 if i == 0:
                                     _trace_first_resp(
@@ -433,9 +477,13 @@ def trace(  # pylint: disable=too-many-statements
                                         event,
                                         span,
                                         start_time,
+                                        sampled,
                                     )
 
-                                if get_finish_reason_func is not None:
+                                if (
+                                    sampled
+                                    and get_finish_reason_func is not None
+                                ):
                                     _trace_last_resp(
                                         resp,
                                         get_finish_reason_func,
@@ -443,19 +491,43 @@ def trace(  # pylint: disable=too-many-statements
                                         span,
                                     )
 
-                            if cumulated and merge_output_func is not None:
-                                _trace_merged_resp(
-                                    cumulated,
-                                    merge_output_func,
-                                    event,
-                                    span,
-                                )
+                            if not sampled:
+                                if _sampler.keep_tail(call_start):
+                                    _record_unsampled(
+                                        span,
+                                        final_trace_name,
+                                        func,
+                                        args,
+                                        kwargs,
+                                        call_start,
+                                        output=(
+                                            merger.result()
+                                            if merger is not None
+                                            and merger.count
+                                            else None
+                                        ),
+                                    )
+                            elif merger is not None and merger.count:
+                                _trace_merged_resp(merger, event, span)
 
                         except Exception as e:
                             span.set_status(
                                 status=StatusCode.ERROR,
                                 description=f"exception={e}",
                             )
+                            if not sampled and _sampler.keep_tail(
+                                call_start,
+                                failed=True,
+                            ):
+                                _record_unsampled(
+                                    span,
+                                    final_trace_name,
+                                    func,
+                                    args,
+                                    kwargs,
+                                    call_start,
+                                    error=e,
+                                )
                             event.on_log(str(e))
                             raise e
                         finally:
@@ -482,8 +554,6 @@ def trace(  # pylint: disable=too-many-statements
             """
             _init_trace_context()
 
-            start_payload = _get_start_payload(args, kwargs, func)
-
             trace_context = kwargs.get("trace_context") if kwargs else None
 
             if trace_context:
@@ -510,16 +580,21 @@ def trace(  # pylint: disable=too-many-statements
             # Auto generate request_id for root span if needed
             _set_request_id(parent_ctx)
 
+            # Decide before any payload is built
+            sampled = _sampler.sample(final_trace_type)
+            start_payload = (
+                _get_start_payload(args, kwargs, func, _payload_converter())
+                if sampled and _payloads_needed()
+                else {}
+            )
+            call_start = time.time()
+
             common_attrs = TracingUtil.get_common_attributes() or {}
 
             span_attributes = {
                 "gen_ai.span.kind": final_trace_type,
                 "gen_ai.user.query_root_flag": 1 if final_is_root_span else 0,
-                "input.mine_type": MineType.JSON,
-                "input.value": json.dumps(
-                    start_payload,
-                    ensure_ascii=False,
-                ),
+                **(_input_attributes(start_payload) if sampled else {}),
                 **common_attrs,
             }
 
@@ -529,7 +604,7 @@ def trace(  # pylint: disable=too-many-statements
                 attributes=span_attributes,
             ) as span:
                 span.set_status(status=StatusCode.OK)
-                with _tracer.event(
+                with (_tracer if sampled else _unsampled_tracer).event(
                     span,
                     final_trace_name,
                     payload=start_payload,
@@ -544,11 +619,12 @@ def trace(  # pylint: disable=too-many-statements
                         else:
                             func_kwargs = kwargs.copy() if kwargs else {}
 
-                        cumulated = []
+                        merger = _create_merger(merge_output_func)
                         start_time = int(time.time() * 1000)
                         for i, resp in enumerate(func(*args, **func_kwargs)):
                             yield resp
-                            cumulated.append(resp)
+                            if merger is not None:
+                                merger.add(resp)
 
                             if i == 0:
                                 _trace_first_resp(
@@ -556,9 +632,10 @@ def trace(  # pylint: disable=too-many-statements
                                     event,
                                     span,
                                     start_time,
+                                    sampled,
                                 )
 
-                            if get_finish_reason_func is not None:
+                            if sampled and get_finish_reason_func is not None:
                                 _trace_last_resp(
                                     resp,
                                     get_finish_reason_func,
@@ -566,19 +643,42 @@ def trace(  # pylint: disable=too-many-statements
                                     span,
                                 )
 
-                        if cumulated and merge_output_func is not None:
-                            _trace_merged_resp(
-                                cumulated,
-                                merge_output_func,
-                                event,
-                                span,
-                            )
+                        if not sampled:
+                            if _sampler.keep_tail(call_start):
+                                _record_unsampled(
+                                    span,
+                                    final_trace_name,
+                                    func,
+                                    args,
+                                    kwargs,
+                                    call_start,
+                                    output=(
+                                        merger.result()
+                                        if merger is not None and merger.count
+                                        else None
+                                    ),
+                                )
+                        elif merger is not None and merger.count:
+                            _trace_merged_resp(merger, event, span)
 
                     except Exception as e:
                         span.set_status(
                             status=StatusCode.ERROR,
                             description=f"exception={e}",
                         )
+                        if not sampled and _sampler.keep_tail(
+                            call_start,
+                            failed=True,
+                        ):
+                            _record_unsampled(
+                                span,
+                                final_trace_name,
+                                func,
+                                args,
+                                kwargs,
+                                call_start,
+                                error=e,
+                            )
                         event.on_log(str(e))
                         raise e
                     finally:
@@ -606,13 +706,20 @@ def trace(  # pylint: disable=too-many-statements
     return wrapper
 
 
-def _get_start_payload(args: Any, kwargs: Any, func: Any = None) -> Dict:
+def _get_start_payload(
+    args: Any,
+    kwargs: Any,
+    func: Any = None,
+    convert: Callable[[Any], Any] = obj_to_dict,
+) -> Dict:
     """Extract and format the start payload from function arguments.
 
     Args:
         args (Any): Positional arguments from the function call.
         kwargs (Any): Keyword arguments from the function call.
         func (Any): The function being traced (optional).
+        convert (Callable[[Any], Any]): Converts each argument, see
+            `_payload_converter`.
 
     Returns:
         Dict: The formatted start payload for tracing.
@@ -639,14 +746,14 @@ def _get_start_payload(args: Any, kwargs: Any, func: Any = None) -> Dict:
                         inspect.Parameter.POSITIONAL_ONLY,
                         inspect.Parameter.POSITIONAL_OR_KEYWORD,
                     ):
-                        merged[param.name] = _obj_to_dict(arg)
+                        merged[param.name] = convert(arg)
         except (ValueError, TypeError, IndexError):
             # 如果无法获取函数签名，回退到原来的逻辑
             pass
 
     # 如果没有函数信息或无法解析，使用原来的逻辑
     if not merged and isinstance(args, tuple) and len(args) > 0:
-        dict_args = _obj_to_dict(args)
+        dict_args = convert(args)
         if isinstance(dict_args, list):
             for item in dict_args:
                 if isinstance(item, dict):
@@ -655,7 +762,7 @@ def _get_start_payload(args: Any, kwargs: Any, func: Any = None) -> Dict:
             merged.update(dict_args)
 
     # 处理关键字参数
-    dict_kwargs = _obj_to_dict(kwargs)
+    dict_kwargs = convert(kwargs)
     dict_kwargs = {
         key: value
         for key, value in dict_kwargs.items()
@@ -714,8 +821,15 @@ def _trace_first_resp(
     event: EventContext,
     span: Any,
     start_time: int,
+    sampled: bool = True,
 ) -> None:
-    payload = _obj_to_dict(resp)
+    span.set_attribute(
+        "gen_ai.response.first_delay",
+        int(time.time() * 1000) - start_time,
+    )
+    if not sampled or not _payloads_needed():
+        return
+    payload = _payload_converter()(resp)
     event.on_log(
         "",
         **{
@@ -723,15 +837,12 @@ def _trace_first_resp(
             "payload": payload,
         },
     )
-    span.set_attribute(
-        "gen_ai.response.first_delay",
-        int(time.time() * 1000) - start_time,
-    )
-    _, output_value = _get_ot_type_and_value(payload)
-    span.set_attribute(
-        "gen_ai.response.first_pkg",
-        output_value,
-    )
+    if _span_payloads_exported():
+        _, output_value = _get_ot_type_and_value(payload)
+        span.set_attribute(
+            "gen_ai.response.first_pkg",
+            _truncate("gen_ai.response.first_pkg", output_value),
+        )
 
 
 def _trace_last_resp(
@@ -740,12 +851,10 @@ def _trace_last_resp(
     event: EventContext,
     span: Any,
 ) -> None:
-    resp_copy = deepcopy(resp)
-
-    finish_reason = func(resp_copy)
-    if finish_reason:
+    finish_reason = func(resp)
+    if finish_reason and _payloads_needed():
         step_suffix = "last_resp" if finish_reason == "stop" else finish_reason
-        payload = _obj_to_dict(resp_copy)
+        payload = _payload_converter()(resp)
         event.on_log(
             "",
             **{
@@ -753,23 +862,103 @@ def _trace_last_resp(
                 "payload": payload,
             },
         )
-        _, output_value = _get_ot_type_and_value(payload)
-        span.set_attribute(
-            "gen_ai.response.pkg_" + finish_reason,
-            output_value,
-        )
+        if _span_payloads_exported():
+            key = "gen_ai.response.pkg_" + finish_reason
+            _, output_value = _get_ot_type_and_value(payload)
+            span.set_attribute(key, _truncate(key, output_value))
+
+
+def _create_merger(merge_func: Optional[Callable]) -> Optional[StreamMerger]:
+    """Create the merger folding a traced stream into its output.
+
+    Args:
+        merge_func (Optional[Callable]): The ``merge_output_func`` option.
+
+    Returns:
+        Optional[StreamMerger]: None when outputs are not merged.
+    """
+    if merge_func is None:
+        return None
+    return create_stream_merger(
+        merge_func,
+        max_chars=int(os.getenv("TRACE_MERGE_MAX_CHARS", "1048576")) or None,
+        max_chunks=int(os.getenv("TRACE_MERGE_MAX_CHUNKS", "0")) or None,
+    )
 
 
 def _trace_merged_resp(
-    cumulated: Any,
-    func: Callable,
+    merger: StreamMerger,
     event: EventContext,
     span: Any,
 ) -> None:
-    cumulated_copy = deepcopy(cumulated)
+    if not _payloads_needed():
+        return
+    end_payload = _payload_converter()(merger.result())
+    if getattr(merger, "truncated", False):
+        # A custom merge only saw the tail of the stream
+        logger.warning(
+            f"Traced output merged from the last {len(merger.chunks)} of "
+            f"{merger.count} chunks, see TRACE_MERGE_MAX_CHUNKS",
+        )
+        end_payload = obj_to_dict(end_payload)
+        if isinstance(end_payload, dict):
+            end_payload["truncated"] = True
+        span.set_attribute("output.truncated", True)
+    _set_output_attributes(span, end_payload)
+    event.on_end(
+        payload=end_payload,
+    )
+
+
+def _payloads_needed() -> bool:
+    """Whether a log handler or span exporter consumes trace payloads."""
+    return bool(_tracer.handlers) or _span_payloads_exported()
+
+
+def _payload_converter() -> Callable[[Any], Any]:
+    """How traced objects become payloads.
+
+    Span attributes are set on the traced call's thread, so payloads are
+    dumped there when spans export them. Otherwise only the log handlers
+    use them, and get `_snapshot` copies they dump with `obj_to_dict`
+    when writing, e.g. on the background exporter's thread.
+    """
+    return obj_to_dict if _span_payloads_exported() else _snapshot
 
-    merged_output = func(cumulated_copy)
-    end_payload = _obj_to_dict(merged_output)
+
+def _snapshot(obj: Any) -> Any:
+    """Shallow copy of ``obj`` for a payload dumped later."""
+    if isinstance(obj, BaseModel):
+        return obj.model_copy()
+    if isinstance(obj, dict):
+        return {k: _snapshot(v) for k, v in obj.items()}
+    if isinstance(obj, (list, set, tuple)):
+        return [_snapshot(item) for item in obj]
+    return obj
+
+
+def _span_payloads_exported() -> bool:
+    """Whether span attributes are exported, so payloads are worth
+    serializing into them."""
+    _get_ot_tracer()
+    return _otel_export_payloads
+
+
+def _input_attributes(start_payload: Dict) -> Dict[str, Any]:
+    if not _span_payloads_exported():
+        return {}
+    return {
+        "input.mine_type": MineType.JSON,
+        "input.value": _truncate(
+            "input.value",
+            json.dumps(start_payload, ensure_ascii=False),
+        ),
+    }
+
+
+def _set_output_attributes(span: Any, end_payload: Any) -> None:
+    if not _span_payloads_exported():
+        return
     output_mine_type, output_value = _get_ot_type_and_value(end_payload)
     span.set_attribute(
         "output.mine_type",
@@ -777,11 +966,60 @@ def _trace_merged_resp(
     )
     span.set_attribute(
         "output.value",
-        output_value,
+        _truncate("output.value", output_value),
     )
-    event.on_end(
-        payload=end_payload,
+
+
+def _truncate(key: str, value: Any) -> Any:
+    if isinstance(value, str):
+        return _sampler.truncate(key, value)
+    return value
+
+
+def _record_unsampled(
+    span: Any,
+    event_name: str,
+    func: Any,
+    args: Any,
+    kwargs: Any,
+    start_time: float,
+    output: Any = None,
+    error: Optional[Exception] = None,
+) -> None:
+    """Record a call skipped by head sampling that tail sampling keeps.
+
+    Its payloads are only built now, and its log events emitted at once.
+    Must be called from the ``except`` block when ``error`` is given.
+    """
+    span.set_attribute("gen_ai.trace.tail_sampled", 1)
+    if not _payloads_needed():
+        return
+
+    start_payload = _get_start_payload(
+        args,
+        kwargs,
+        func,
+        _payload_converter(),
     )
+    for key, value in _input_attributes(start_payload).items():
+        span.set_attribute(key, value)
+    end_payload = None
+    if error is None:
+        end_payload = _payload_converter()(output)
+        _set_output_attributes(span, end_payload)
+
+    for handler in _tracer.handlers:
+        handler.on_start(event_name, start_payload)
+        if error is None:
+            handler.on_end(event_name, start_payload, end_payload, start_time)
+        else:
+            handler.on_error(
+                event_name,
+                start_payload,
+                error,
+                start_time,
+                traceback_info=traceback.format_exc(),
+            )
 
 
 def _get_ot_type_and_value(payload: Any) -> tuple[MineType, Any]:
@@ -833,35 +1071,6 @@ def _validate_trace_options(
     return out_trace_type, out_trace_name, out_is_root_span
 
 
-def _obj_to_dict(obj: Any) -> Any:
-    """Convert an object to a dictionary representation for tracing.
-
-    Args:
-        obj (Any): The object to convert.
-
-    Returns:
-        Any: The dictionary representation of the object, or the object
-            itself if it's a primitive type.
-    """
-    if obj is None:
-        return {}
-    elif isinstance(obj, (str, int, float, bool, type(None))):
-        return obj
-    elif isinstance(obj, dict):
-        return {k: _obj_to_dict(v) for k, v in obj.items()}
-    elif isinstance(obj, (list, set, tuple)):
-        return [_obj_to_dict(item) for item in obj]
-    elif isinstance(obj, BaseModel):
-        return obj.model_dump()
-    else:
-        result = None
-        try:
-            result = str(obj)
-        except Exception as e:
-            print(f"{obj} str method failed with error: {e}")
-        return result
-
-
 def _function_accepts_kwargs(func: Any) -> bool:
     """Check if a function accepts **kwargs parameter.
 
@@ -900,10 +1109,50 @@ def _get_service_name() -> str:
         return service_name
 
 
+def _get_sampler() -> TraceSampler:
+    rates = {}
+    for item in os.getenv("TRACE_SAMPLE_RATES", "").split(","):
+        if "=" in item:
+            key, value = item.split("=", 1)
+            rates[key.strip()] = float(value)
+
+    limits = {}
+    for item in os.getenv("TRACE_ATTRIBUTE_BYTE_LIMITS", "").split(","):
+        if "=" in item:
+            key, value = item.split("=", 1)
+            limits[key.strip()] = int(value)
+
+    slow_ms = float(os.getenv("TRACE_SAMPLE_SLOW_MS", "0"))
+    return TraceSampler(
+        default_rate=float(os.getenv("TRACE_SAMPLE_RATE", "1.0")),
+        rates=rates,
+        keep_errors=_str_to_bool(
+            os.getenv("TRACE_SAMPLE_KEEP_ERRORS", "true"),
+        ),
+        slow_threshold=slow_ms / 1000 if slow_ms > 0 else None,
+        max_attribute_bytes=int(os.getenv("TRACE_MAX_ATTRIBUTE_BYTES", "0")),
+        attribute_limits=limits,
+    )
+
+
 def _get_tracer() -> Tracer:
     handlers: list[TracerHandler] = []
     if _str_to_bool(os.getenv("TRACE_ENABLE_LOG", "false")):
-        handlers.append(LocalLogHandler(enable_console=True))
+        handlers.append(
+            LocalLogHandler(
+                enable_console=True,
+                async_export=_str_to_bool(
+                    os.getenv("TRACE_LOG_ASYNC", "true"),
+                ),
+                export_queue_size=int(
+                    os.getenv("TRACE_LOG_QUEUE_SIZE", "10000"),
+                ),
+                overflow_policy=os.getenv(
+                    "TRACE_LOG_OVERFLOW_POLICY",
+                    "drop_newest",
+                ),
+            ),
+        )
 
     tracer = Tracer(handlers=handlers)
     return tracer
@@ -911,6 +1160,7 @@ def _get_tracer() -> Tracer:
 
 _otel_tracer_lock = threading.Lock()
 _otel_tracer = None
+_otel_export_payloads = False
 
 
 # TODO: support more tracing protocols and platforms
@@ -935,7 +1185,11 @@ def _get_ot_tracer() -> ot_trace.Tracer:
         return True
 
     def _get_ot_tracer_inner() -> ot_trace.Tracer:
+        global _otel_export_payloads
+
         if _has_existing_trace_provider():
+            # its span processors are unknown, assume they export
+            _otel_export_payloads = True
             return ot_trace.get_tracer("agentscope_runtime")
         resource = Resource(
             attributes={
@@ -954,10 +1208,12 @@ def _get_ot_tracer() -> ot_trace.Tracer:
                 ),
             )
             provider.add_span_processor(span_exporter)
+            _otel_export_payloads = True
 
         if _str_to_bool(os.getenv("TRACE_ENABLE_DEBUG", "false")):
             span_logger = BatchSpanProcessor(ConsoleSpanExporter())
             provider.add_span_processor(span_logger)
+            _otel_export_payloads = True
 
         tracer = ot_trace.get_tracer(
             "agentscope_runtime",
@@ -976,3 +1232,20 @@ def _get_ot_tracer() -> ot_trace.Tracer:
 
 
 _tracer = _get_tracer()
+# used by calls skipped by head sampling
+_unsampled_tracer = Tracer(handlers=[])
+_sampler = _get_sampler()
+
+
+def get_trace_export_metrics() -> Dict[str, Dict[str, int]]:
+    """Metrics of the trace log handlers writing in the background.
+
+    Returns:
+        Dict[str, Dict[str, int]]: Queue depth and submitted, exported and
+        dropped counts, keyed by handler class name.
+    """
+    return {
+        type(handler).__name__: handler.get_export_metrics()
+        for handler in _tracer.handlers
+        if hasattr(handler, "get_export_metrics")
+    }
@@ -1,5 +1,5 @@
 # -*- coding: utf-8 -*-
-from typing import Optional
+from typing import AsyncIterator, Iterator, Optional
 
 from ...utils import build_image_uri
 from ...registry import SandboxRegistry
@@ -52,6 +52,52 @@ class BaseSandbox(Sandbox):
         """
         return self.call_tool("run_shell_command", {"command": command})
 
+    def run_ipython_cell_stream(
+        self,
+        code: str,
+        timeout: Optional[float] = None,
+        max_output_bytes: Optional[int] = None,
+    ) -> Iterator[dict]:
+        """
+        Run an IPython cell, yielding output events as they are produced.
+
+        Args:
+            code (str): IPython code to execute.
+            timeout (float, optional): Interrupt the cell after this many
+                seconds.
+            max_output_bytes (int, optional): Stop forwarding output past
+                this size.
+        """
+        return self.manager_api.run_ipython_cell_stream(
+            self.sandbox_id,
+            code,
+            timeout=timeout,
+            max_output_bytes=max_output_bytes,
+        )
+
+    def run_shell_command_stream(
+        self,
+        command: str,
+        timeout: Optional[float] = None,
+        max_output_bytes: Optional[int] = None,
+    ) -> Iterator[dict]:
+        """
+        Run a shell command, yielding output events as they are produced.
+
+        Args:
+            command (str): Shell command to execute.
+            timeout (float, optional): Kill the command after this many
+                seconds.
+            max_output_bytes (int, optional): Stop forwarding output past
+                this size.
+        """
+        return self.manager_api.run_shell_command_stream(
+            self.sandbox_id,
+            command,
+            timeout=timeout,
+            max_output_bytes=max_output_bytes,
+        )
+
 
 @SandboxRegistry.register(
     build_image_uri("runtime-sandbox-base"),
@@ -103,3 +149,51 @@ class BaseSandboxAsync(SandboxAsync):
             "run_shell_command",
             {"command": command},
         )
+
+    async def run_ipython_cell_stream(
+        self,
+        code: str,
+        timeout: Optional[float] = None,
+        max_output_bytes: Optional[int] = None,
+    ) -> AsyncIterator[dict]:
+        """
+        Run an IPython cell, yielding output events as they are produced.
+
+        Args:
+            code (str): IPython code to execute.
+            timeout (float, optional): Interrupt the cell after this many
+                seconds.
+            max_output_bytes (int, optional): Stop forwarding output past
+                this size.
+        """
+        async for event in self.manager_api.run_ipython_cell_stream_async(
+            self.sandbox_id,
+            code,
+            timeout=timeout,
+            max_output_bytes=max_output_bytes,
+        ):
+            yield event
+
+    async def run_shell_command_stream(
+        self,
+        command: str,
+        timeout: Optional[float] = None,
+        max_output_bytes: Optional[int] = None,
+    ) -> AsyncIterator[dict]:
+        """
+        Run a shell command, yielding output events as they are produced.
+
+        Args:
+            command (str): Shell command to execute.
+            timeout (float, optional): Kill the command after this many
+                seconds.
+            max_output_bytes (int, optional): Stop forwarding output past
+                this size.
+        """
+        async for event in self.manager_api.run_shell_command_stream_async(
+            self.sandbox_id,
+            command,
+            timeout=timeout,
+            max_output_bytes=max_output_bytes,
+        ):
+            yield event
@@ -1,17 +1,35 @@
 # -*- coding: utf-8 -*-
 import io
+import os
 import sys
+import json
+import codecs
+import ctypes
+import signal
 import logging
 import asyncio
+import threading
 import traceback
+import concurrent.futures
 from contextlib import redirect_stderr, redirect_stdout
+from typing import AsyncIterator, Optional
 
 from fastapi import APIRouter, Body, HTTPException
+from fastapi.responses import StreamingResponse
 from IPython.core.interactiveshell import InteractiveShell
 from mcp.types import CallToolResult, TextContent
 
 SPLIT_OUTPUT_MODE = True
 
+# Streaming endpoints: read size per pipe read, and default cap on the
+# output forwarded to the client (the command keeps running past it)
+STREAM_CHUNK_SIZE = 4096
+STREAM_MAX_OUTPUT_BYTES = 10 * 1024 * 1024
+# Output chunks queued for a slow client before producers wait for it
+STREAM_QUEUE_SIZE = 64
+# Seconds between checks of a closed stream by a waiting IPython writer
+WRITER_POLL_INTERVAL = 0.1
+
 
 generic_router = APIRouter()
 
@@ -197,3 +215,335 @@ async def run_shell_command(
             status_code=500,
             detail=f"{str(e)}: {traceback.format_exc()}",
         ) from e
+
+
+class _OutputLimit:
+    """
+    Applies ``max_output_bytes`` where output is produced, so output past
+    it is discarded instead of queued for the client.
+    """
+
+    def __init__(self, max_output_bytes: Optional[int], state: dict):
+        self.max_output_bytes = max_output_bytes
+        self._state = state
+        self._emitted = 0
+        self._lock = threading.Lock()
+
+    def clip(self, name: str, text: str) -> list:
+        """Return the queue items forwarding ``text``: none once the cap
+        was reached, and a ``truncated`` marker when it is reached."""
+        with self._lock:
+            if name == "stderr":
+                self._state["is_error"] = True
+            if self._state["truncated"]:
+                return []
+            data = text.encode("utf-8")
+            limit = self.max_output_bytes
+            if not limit or self._emitted + len(data) <= limit:
+                self._emitted += len(data)
+                return [(name, text)]
+            self._state["truncated"] = True
+            head = data[: limit - self._emitted].decode(
+                "utf-8",
+                errors="ignore",
+            )
+            self._emitted = limit
+        items = [(name, head)] if head else []
+        return items + [("truncated", "")]
+
+
+class _QueueWriter(io.TextIOBase):
+    """File-like object forwarding writes from a worker thread to a queue.
+
+    Writes wait while the queue is full, until the stream is closed.
+    """
+
+    def __init__(
+        self,
+        loop,
+        queue: asyncio.Queue,
+        name: str,
+        limit: _OutputLimit,
+    ):
+        super().__init__()
+        self._loop = loop
+        self._queue = queue
+        self._name = name
+        self._limit = limit
+        self.closed_stream = False
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, s: str) -> int:
+        if s:
+            for item in self._limit.clip(self._name, s):
+                self.put(item)
+        return len(s)
+
+    def put(self, item) -> None:
+        if self.closed_stream:
+            return
+        try:
+            future = asyncio.run_coroutine_threadsafe(
+                self._queue.put(item),
+                self._loop,
+            )
+        except RuntimeError:
+            # Consumer loop already closed (client went away)
+            return
+        while True:
+            try:
+                future.result(WRITER_POLL_INTERVAL)
+                return
+            except concurrent.futures.TimeoutError:
+                if self.closed_stream:
+                    future.cancel()
+                    return
+
+
+async def _iter_output(
+    queue: asyncio.Queue,
+    sources: int,
+    timeout: Optional[float],
+    max_output_bytes: Optional[int],
+    state: dict,
+) -> AsyncIterator[dict]:
+    """
+    Yield stdout/stderr events from ``queue`` until all ``sources`` sent
+    their ``(name, None)`` end marker or the timeout passes.
+
+    Producers clip the output with `_OutputLimit`, which fills ``state``
+    with ``truncated`` and ``is_error``; ``timed_out`` is recorded here.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout if timeout else None
+
+    while sources:
+        remaining = None if deadline is None else deadline - loop.time()
+        if remaining is not None and remaining <= 0:
+            state["timed_out"] = True
+            return
+        try:
+            name, text = await asyncio.wait_for(queue.get(), remaining)
+        except asyncio.TimeoutError:
+            state["timed_out"] = True
+            return
+
+        if text is None:
+            sources -= 1
+        elif name == "truncated":
+            yield {"type": "truncated", "limit": max_output_bytes}
+        else:
+            yield {"type": name, "text": text}
+
+
+async def _ndjson(events: AsyncIterator[dict]) -> AsyncIterator[str]:
+    async for event in events:
+        yield json.dumps(event, ensure_ascii=False) + "\n"
+
+
+def _kill_process_group(proc) -> None:
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+async def stream_shell_command(
+    command: str,
+    timeout: Optional[float] = None,
+    max_output_bytes: Optional[int] = STREAM_MAX_OUTPUT_BYTES,
+) -> AsyncIterator[dict]:
+    """
+    Run a shell command and yield its output as it is produced.
+
+    Events are ``{"type": "stdout" | "stderr", "text": ...}``, an optional
+    ``{"type": "truncated"}`` and a final ``{"type": "end", ...}`` with
+    the return code. The process group is killed on timeout or when the
+    consumer stops iterating (e.g. the HTTP client disconnects).
+
+    The pipes are read no faster than the client takes the output, and
+    read and discarded once ``max_output_bytes`` is reached.
+    """
+    proc = await asyncio.create_subprocess_shell(
+        command,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        start_new_session=True,
+    )
+    queue: asyncio.Queue = asyncio.Queue(STREAM_QUEUE_SIZE)
+    state = {"timed_out": False, "truncated": False, "is_error": False}
+    limit = _OutputLimit(max_output_bytes, state)
+
+    async def pump(stream, name):
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        while True:
+            chunk = await stream.read(STREAM_CHUNK_SIZE)
+            text = decoder.decode(chunk, final=not chunk)
+            if text:
+                for item in limit.clip(name, text):
+                    await queue.put(item)
+            if not chunk:
+                break
+        await queue.put((name, None))
+
+    pumps = [
+        asyncio.create_task(pump(proc.stdout, "stdout")),
+        asyncio.create_task(pump(proc.stderr, "stderr")),
+    ]
+    try:
+        async for event in _iter_output(
+            queue,
+            len(pumps),
+            timeout,
+            max_output_bytes,
+            state,
+        ):
+            yield event
+
+        if state["timed_out"]:
+            _kill_process_group(proc)
+        returncode = await proc.wait()
+        yield {
+            "type": "end",
+            "returncode": returncode,
+            "timed_out": state["timed_out"],
+            "truncated": state["truncated"],
+            "is_error": state["is_error"] or state["timed_out"],
+        }
+    finally:
+        if proc.returncode is None:
+            _kill_process_group(proc)
+        for task in pumps:
+            task.cancel()
+
+
+def _interrupt_thread(thread: threading.Thread) -> None:
+    """Raise KeyboardInterrupt inside a running IPython worker thread."""
+    if thread.ident is None or not thread.is_alive():
+        return
+    ctypes.pythonapi.PyThreadState_SetAsyncExc(
+        ctypes.c_ulong(thread.ident),
+        ctypes.py_object(KeyboardInterrupt),
+    )
+
+
+async def stream_ipython_cell(
+    code: str,
+    timeout: Optional[float] = None,
+    max_output_bytes: Optional[int] = STREAM_MAX_OUTPUT_BYTES,
+) -> AsyncIterator[dict]:
+    """
+    Run an IPython cell and yield its output as it is produced.
+
+    Emits the same events as `stream_shell_command`, without a return
+    code. The cell is interrupted (KeyboardInterrupt) on timeout or when
+    the consumer stops iterating.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(STREAM_QUEUE_SIZE)
+    state = {"timed_out": False, "truncated": False, "is_error": False}
+    limit = _OutputLimit(max_output_bytes, state)
+    stdout = _QueueWriter(loop, queue, "stdout", limit)
+    stderr = _QueueWriter(loop, queue, "stderr", limit)
+
+    def thread_target():
+        try:
+            with redirect_stdout(stdout), redirect_stderr(stderr):
+                preprocessing_exc_tuple = None
+                try:
+                    transformed_cell = ipy.transform_cell(code)
+                except Exception:
+                    transformed_cell = code
+                    preprocessing_exc_tuple = sys.exc_info()
+
+                if transformed_cell is None:
+                    raise HTTPException(
+                        status_code=500,
+                        detail=(
+                            "IPython cell transformation failed: "
+                            "transformed_cell is None."
+                        ),
+                    )
+
+                asyncio.run(
+                    ipy.run_cell_async(
+                        code,
+                        transformed_cell=transformed_cell,
+                        preprocessing_exc_tuple=preprocessing_exc_tuple,
+                    ),
+                )
+        except BaseException:
+            stderr.write(traceback.format_exc())
+        finally:
+            stdout.put(("done", None))
+
+    thread = threading.Thread(target=thread_target, daemon=True)
+    thread.start()
+
+    finished = False
+    try:
+        async for event in _iter_output(
+            queue,
+            1,
+            timeout,
+            max_output_bytes,
+            state,
+        ):
+            yield event
+        finished = not state["timed_out"]
+
+        yield {
+            "type": "end",
+            "returncode": None,
+            "timed_out": state["timed_out"],
+            "truncated": state["truncated"],
+            "is_error": state["is_error"] or state["timed_out"],
+        }
+    finally:
+        stdout.closed_stream = stderr.closed_stream = True
+        if not finished:
+            _interrupt_thread(thread)
+
+
+@generic_router.post(
+    "/tools/run_ipython_cell/stream",
+    summary="Invoke an IPython cell, streaming output as NDJSON",
+)
+async def run_ipython_cell_stream(
+    code: str = Body(..., example="print('Hello World')"),
+    timeout: Optional[float] = Body(None),
+    max_output_bytes: Optional[int] = Body(STREAM_MAX_OUTPUT_BYTES),
+):
+    """
+    Execute code in the IPython kernel and stream stdout/stderr.
+    """
+    if not code:
+        raise HTTPException(status_code=400, detail="Code is required.")
+
+    return StreamingResponse(
+        _ndjson(stream_ipython_cell(code, timeout, max_output_bytes)),
+        media_type="application/x-ndjson",
+    )
+
+
+@generic_router.post(
+    "/tools/run_shell_command/stream",
+    summary="Invoke a shell command, streaming output as NDJSON",
+)
+async def run_shell_command_stream(
+    command: str = Body(..., example="pwd"),
+    timeout: Optional[float] = Body(None),
+    max_output_bytes: Optional[int] = Body(STREAM_MAX_OUTPUT_BYTES),
+):
+    """
+    Execute a shell command and stream stdout/stderr.
+    """
+    if not command:
+        raise HTTPException(status_code=400, detail="Command is required.")
+
+    return StreamingResponse(
+        _ndjson(stream_shell_command(command, timeout, max_output_bytes)),
+        media_type="application/x-ndjson",
+    )
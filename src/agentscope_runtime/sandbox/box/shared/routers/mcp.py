@@ -1,26 +1,83 @@
 # -*- coding: utf-8 -*-
-import copy
+import asyncio
 import json
 import logging
 import os
+import time
 import traceback
 
-from fastapi import APIRouter, Body, HTTPException, Response
+from fastapi import APIRouter, Body, HTTPException
 
 from .mcp_utils import MCPSessionHandler
 
 mcp_router = APIRouter()
 
 _MCP_SERVERS = {}
+# Tool schemas per server, and the server each tool is routed to
+_TOOL_SCHEMAS = {}
+_TOOL_ROUTES = {}
+# Servers whose tools must be listed again before routing
+_STALE_SERVERS = set()
+_tools_lock = asyncio.Lock()
+# Startup status and timing per server, and the startups in progress
+_SERVER_STATUS = {}
+_STARTING = {}
+_prewarm_task = None
 current_directory = os.path.dirname(os.path.abspath(__file__))
-mcp_server_configs_path = os.path.abspath(
-    os.path.join(current_directory, "../mcp_server_configs.json"),
+# The MCP servers an image starts at boot, before the first request
+mcp_server_configs_path = os.getenv(
+    "MCP_SERVER_CONFIGS_PATH",
+    os.path.abspath(
+        os.path.join(current_directory, "../mcp_server_configs.json"),
+    ),
+)
+# Seconds a server may take to start, unless its `startup_timeout` is set
+MCP_SERVER_STARTUP_TIMEOUT = float(
+    os.getenv("MCP_SERVER_STARTUP_TIMEOUT", "60"),
 )
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+async def _start_server(server: MCPSessionHandler) -> dict:
+    """Initialize a server within its startup timeout, and register it."""
+    timeout = server.config.get(
+        "startup_timeout",
+        MCP_SERVER_STARTUP_TIMEOUT,
+    )
+    start = time.monotonic()
+    try:
+        await asyncio.wait_for(server.initialize(), timeout)
+    except Exception as e:
+        if isinstance(e, asyncio.TimeoutError):
+            error = f"Startup timed out after {timeout} seconds"
+        else:
+            error = str(e)
+        logger.error(f"Failed to initialize server {server.name}: {error}")
+        await server.cleanup()
+        status = {"status": "failed", "error": error}
+    else:
+        _MCP_SERVERS[server.name] = server
+        _STALE_SERVERS.add(server.name)
+        status = {"status": "ready"}
+    status["startup_time"] = round(time.monotonic() - start, 3)
+    _SERVER_STATUS[server.name] = status
+    return status
+
+
+async def _wait_for_startup() -> None:
+    """Wait for servers that are being started, e.g. at boot."""
+    pending = [
+        task
+        for task in (_prewarm_task, *_STARTING.values())
+        if task is not None and not task.done()
+    ]
+    if pending:
+        # Not cancelled along with the request waiting for them
+        await asyncio.wait(pending)
+
+
 # NOTE: DO NOT use API-KEY Server in release version due to security issues
 @mcp_router.post(
     "/mcp/add_servers",
@@ -36,8 +93,12 @@ async def add_servers(
         embed=True,
     ),
 ):
-    global _MCP_SERVERS
+    """Initialize the servers concurrently, each within its
+    ``startup_timeout`` (seconds, in its config).
 
+    Servers that start are added even if others fail; the result of each
+    server, with its startup time, is returned, or included in the error.
+    """
     try:
         if not server_configs:
             raise HTTPException(
@@ -46,36 +107,76 @@ async def add_servers(
             )
 
         new_servers = [
-            MCPSessionHandler(name, config)
+            MCPSessionHandler(name, config, on_tools_changed=_invalidate_tools)
             for name, config in server_configs["mcpServers"].items()
         ]
 
-        fail_servers = []
+        # Servers still starting, e.g. at boot, are not started twice
+        starting = [
+            _STARTING[server.name]
+            for server in new_servers
+            if server.name in _STARTING
+        ]
+        if starting:
+            await asyncio.wait(starting)
 
-        # Initialize the servers
+        results = {}
+        to_start = []
         for server in new_servers:
             if server.name in _MCP_SERVERS:
                 if not overwrite:
+                    results[server.name] = {"status": "skipped"}
                     continue
                 # Cleanup old server
                 await _MCP_SERVERS.pop(server.name).cleanup()
-            try:
-                await server.initialize()
-                _MCP_SERVERS[server.name] = server
-            except Exception as e:
-                logging.error(f"Failed to initialize server: {e}")
-                fail_servers.append(server)
-                continue
+                _forget_tools(server.name)
+            to_start.append(server)
+            _SERVER_STATUS[server.name] = {"status": "starting"}
+
+        # Initialize the servers concurrently
+        tasks = {
+            server.name: asyncio.create_task(_start_server(server))
+            for server in to_start
+        }
+        _STARTING.update(tasks)
+        try:
+            for name, status in zip(
+                tasks,
+                await asyncio.gather(*tasks.values()),
+            ):
+                results[name] = status
+        finally:
+            for name, task in tasks.items():
+                if _STARTING.get(name) is task:
+                    del _STARTING[name]
+        # Keep the config order, which decides where duplicate tools go
+        for server in to_start:
+            if _MCP_SERVERS.get(server.name) is server:
+                _MCP_SERVERS[server.name] = _MCP_SERVERS.pop(server.name)
 
+        # Build the routing table of the new servers
+        try:
+            await _refresh_tools()
+        except Exception:
+            # Logged already; listed again on the next tool call
+            pass
+
+        fail_servers = [
+            name
+            for name, status in results.items()
+            if status["status"] == "failed"
+        ]
         if fail_servers:
-            for server in fail_servers:
-                await server.cleanup()
             raise HTTPException(
                 status_code=500,
-                detail=f"Failed to initialize server: "
-                f"{[server.name for server in fail_servers]}",
+                detail={
+                    "error": f"Failed to initialize server: {fail_servers}",
+                    "servers": results,
+                },
             )
-        return Response(content="OK", status_code=200)
+        return {"servers": results}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -83,49 +184,122 @@ async def add_servers(
         ) from e
 
 
+def _invalidate_tools(server_name: str) -> None:
+    """Have the tools of a server listed again before next use."""
+    if server_name in _MCP_SERVERS:
+        _STALE_SERVERS.add(server_name)
+
+
+def _forget_tools(server_name: str) -> None:
+    _STALE_SERVERS.discard(server_name)
+    if _TOOL_SCHEMAS.pop(server_name, None) is not None:
+        _rebuild_routes()
+
+
+def _rebuild_routes() -> None:
+    global _TOOL_ROUTES
+
+    # The first server listing a tool gets its calls
+    routes = {}
+    for server_name in _MCP_SERVERS:
+        for tool_name in _TOOL_SCHEMAS.get(server_name, {}):
+            routes.setdefault(tool_name, server_name)
+    _TOOL_ROUTES = routes
+
+
+def _build_server_tools(tools) -> dict:
+    server_tools = {}
+    for tool in tools:
+        name = tool.name
+        if name in server_tools:
+            logging.warning(
+                f"Service function `{name}` already exists, "
+                f"skip adding it.",
+            )
+        else:
+            json_schema = {
+                "type": "function",
+                "function": {
+                    "name": tool.name,
+                    "description": tool.description,
+                    "parameters": {
+                        "type": "object",
+                        "properties": tool.inputSchema.get(
+                            "properties",
+                            {},
+                        ),
+                        "required": tool.inputSchema.get(
+                            "required",
+                            [],
+                        ),
+                    },
+                },
+            }
+            server_tools[tool.name] = {
+                "name": tool.name,
+                "json_schema": json_schema,
+            }
+    return server_tools
+
+
+async def _refresh_tools(all_servers: bool = False) -> None:
+    """List the tools of stale servers (or all of them) in parallel, and
+    rebuild the routing table.
+
+    Raises:
+        Exception: The first error of the servers that failed; they stay
+            stale, to be listed again next time.
+    """
+    if not (_STALE_SERVERS or all_servers):
+        return
+
+    error = None
+    async with _tools_lock:
+        if all_servers:
+            _STALE_SERVERS.update(_MCP_SERVERS)
+        server_names = [
+            name for name in _MCP_SERVERS if name in _STALE_SERVERS
+        ]
+        if not server_names:
+            return
+        # Notifications received from now on call for another listing
+        _STALE_SERVERS.difference_update(server_names)
+        results = await asyncio.gather(
+            *(_MCP_SERVERS[name].list_tools() for name in server_names),
+            return_exceptions=True,
+        )
+
+        for server_name, tools in zip(server_names, results):
+            if server_name not in _MCP_SERVERS:
+                # Removed while it was being listed
+                continue
+            if isinstance(tools, BaseException):
+                logger.error(
+                    f"Failed to list tools of server {server_name}: {tools}",
+                )
+                _STALE_SERVERS.add(server_name)
+                error = error or tools
+                continue
+            _TOOL_SCHEMAS[server_name] = _build_server_tools(tools)
+        _rebuild_routes()
+
+    if error is not None:
+        raise error
+
+
 @mcp_router.get(
     "/mcp/list_tools",
     summary="List MCP tools",
 )
 async def list_tools():
     try:
-        mcp_tools = {}
-
-        for server_name, server in _MCP_SERVERS.items():
-            tools = await server.list_tools()
-            server_tools = {}
-            for tool in tools:
-                name = tool.name
-                if name in server_tools:
-                    logging.warning(
-                        f"Service function `{name}` already exists, "
-                        f"skip adding it.",
-                    )
-                else:
-                    json_schema = {
-                        "type": "function",
-                        "function": {
-                            "name": tool.name,
-                            "description": tool.description,
-                            "parameters": {
-                                "type": "object",
-                                "properties": tool.inputSchema.get(
-                                    "properties",
-                                    {},
-                                ),
-                                "required": tool.inputSchema.get(
-                                    "required",
-                                    [],
-                                ),
-                            },
-                        },
-                    }
-                    server_tools[tool.name] = {
-                        "name": tool.name,
-                        "json_schema": json_schema,
-                    }
-            mcp_tools[server_name] = copy.deepcopy(server_tools)
-        return mcp_tools
+        await _wait_for_startup()
+        await _refresh_tools()
+        return {
+            server_name: _TOOL_SCHEMAS[server_name]
+            for server_name in _MCP_SERVERS
+            if server_name in _TOOL_SCHEMAS
+        }
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -133,6 +307,14 @@ async def list_tools():
         ) from e
 
 
+@mcp_router.get(
+    "/mcp/servers",
+    summary="List MCP servers with their startup status and time",
+)
+async def list_servers():
+    return _SERVER_STATUS
+
+
 @mcp_router.post(
     "/mcp/call_tool",
     summary="Execute MCP tool",
@@ -154,14 +336,17 @@ async def call_tool(
                 detail="tool_name is required.",
             )
 
-        tools = await list_tools()
-        for server_name, server_tools in tools.items():
-            if tool_name not in server_tools:
-                continue
-            server = _MCP_SERVERS[server_name]
-            result = await server.call_tool(tool_name, arguments)
-            return result.model_dump()
-        raise ModuleNotFoundError(f"Tool '{tool_name}' not found.")
+        await _wait_for_startup()
+        await _refresh_tools()
+        if tool_name not in _TOOL_ROUTES:
+            # Servers may change their tools without notifying
+            await _refresh_tools(all_servers=True)
+        server_name = _TOOL_ROUTES.get(tool_name)
+        if server_name is None:
+            raise ModuleNotFoundError(f"Tool '{tool_name}' not found.")
+        server = _MCP_SERVERS[server_name]
+        result = await server.call_tool(tool_name, arguments)
+        return result.model_dump()
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -181,10 +366,16 @@ async def cleanup_servers() -> None:
             logging.error(f"Failed to cleanup server: {e}")
 
     _MCP_SERVERS = {}
+    _SERVER_STATUS.clear()
+    _TOOL_SCHEMAS.clear()
+    _TOOL_ROUTES.clear()
+    _STALE_SERVERS.clear()
 
 
 @mcp_router.on_event("startup")
 async def startup_event():
+    global _prewarm_task
+
     # Load MCP server configs
     try:
         with open(mcp_server_configs_path, "r", encoding="utf-8") as file:
@@ -194,14 +385,19 @@ async def startup_event():
         logger.error(f"Failed to load MCP server configs: {e}")
         mcp_server_configs = {}
 
-    # Call the add_servers function
+    # Start them in the background, so the sandbox is reported healthy
+    # meanwhile; tool requests wait for them
     if mcp_server_configs:
-        try:
-            await add_servers(
-                server_configs=mcp_server_configs,
-                overwrite=False,
-            )
-        except Exception as e:
-            logger.error(
-                f"Failed to add MCP servers: {e}, {traceback.format_exc()}",
-            )
+        _prewarm_task = asyncio.create_task(_prewarm(mcp_server_configs))
+
+
+async def _prewarm(mcp_server_configs: dict) -> None:
+    try:
+        await add_servers(
+            server_configs=mcp_server_configs,
+            overwrite=False,
+        )
+    except Exception as e:
+        logger.error(
+            f"Failed to add MCP servers: {e}, {traceback.format_exc()}",
+        )
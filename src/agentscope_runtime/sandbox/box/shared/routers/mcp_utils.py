@@ -6,9 +6,9 @@ import shutil
 import traceback
 from contextlib import AsyncExitStack
 from datetime import timedelta
-from typing import Any
+from typing import Any, Callable
 
-from mcp import ClientSession, StdioServerParameters
+from mcp import ClientSession, StdioServerParameters, types
 from mcp.client.sse import sse_client
 from mcp.client.stdio import stdio_client
 from mcp.client.streamable_http import streamablehttp_client
@@ -32,9 +32,16 @@ def _coerce_timedelta(value: Any, default: timedelta) -> timedelta:
 class MCPSessionHandler:
     """Manages MCP server connections and tool execution."""
 
-    def __init__(self, name: str, config: dict[str, Any]) -> None:
+    def __init__(
+        self,
+        name: str,
+        config: dict[str, Any],
+        on_tools_changed: Callable[[str], None] | None = None,
+    ) -> None:
         self.name: str = name
         self.config: dict[str, Any] = config
+        # Called with the server name on `tools/list_changed` notifications
+        self.on_tools_changed = on_tools_changed
         self.stdio_context: Any | None = None
         self.session: ClientSession | None = None
         self._cleanup_lock: asyncio.Lock = asyncio.Lock()
@@ -94,7 +101,7 @@ class MCPSessionHandler:
                         ),
                     )
             session = await self._exit_stack.enter_async_context(
-                ClientSession(*streams),
+                ClientSession(*streams, message_handler=self._handle_message),
             )
             await session.initialize()
             self.session = session
@@ -103,6 +110,15 @@ class MCPSessionHandler:
             await self.cleanup()
             raise
 
+    async def _handle_message(self, message: Any) -> None:
+        """Handle incoming server messages, i.e. notifications."""
+        if (
+            isinstance(message, types.ServerNotification)
+            and isinstance(message.root, types.ToolListChangedNotification)
+            and self.on_tools_changed is not None
+        ):
+            self.on_tools_changed(self.name)
+
     async def list_tools(self) -> list[Any]:
         """List available tools from the server.
 
@@ -1,13 +1,40 @@
 # -*- coding: utf-8 -*-
+import asyncio
+import base64
+import bisect
+import fnmatch
+import hashlib
+import json
+import queue
+import re
 import shutil
 import os
 import logging
+import tarfile
+import tempfile
+import threading
+import time
 import traceback
+import uuid
+import zlib
+from collections import OrderedDict
+from urllib.parse import quote
+from typing import Iterator, List, Literal, Optional, Tuple
 
 import aiofiles
 
-from fastapi import APIRouter, HTTPException, Query, Body
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, HTTPException, Query, Body, Header, Request
+from fastapi.responses import (
+    FileResponse,
+    JSONResponse,
+    Response,
+    StreamingResponse,
+)
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
 workspace_router = APIRouter()
 
@@ -15,6 +42,23 @@ workspace_router = APIRouter()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+TRANSFER_CHUNK_SIZE = 1024 * 1024
+UPLOADS_DIR = os.environ.get(
+    "WORKSPACE_UPLOADS_DIR",
+    os.path.join(tempfile.gettempdir(), "workspace_uploads"),
+)
+# Seconds after its last chunk an unfinished upload is discarded
+UPLOAD_TTL = float(os.environ.get("WORKSPACE_UPLOAD_TTL", 24 * 3600))
+# Seconds between sweeps of abandoned uploads
+UPLOAD_SWEEP_INTERVAL = 600
+# Compressed bytes fed to zstd per call, which has no output limit: a
+# block expands to at most 128 KiB, so a call yields at most ~8 MiB
+ZSTD_INPUT_SLICE = 256
+
+Compression = Optional[Literal["gzip", "zstd"]]
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
 
 def ensure_within_workspace(
     path: str,
@@ -51,6 +95,13 @@ async def get_workspace_file(
         ...,
         description="Path to the file within /workspace relative to its root",
     ),
+    compression: Compression = Query(
+        None,
+        description="Compress the body on the wire ('gzip' or 'zstd'), "
+        "reported in Content-Encoding. Range requests are only served "
+        "uncompressed.",
+    ),
+    range_header: Optional[str] = Header(None, alias="Range"),
 ):
     """
     Get a file within the /workspace directory.
@@ -63,13 +114,29 @@ async def get_workspace_file(
         if not os.path.isfile(full_path):
             raise HTTPException(status_code=404, detail="File not found.")
 
-        # Return the file using FileResponse
+        if compression:
+            return StreamingResponse(
+                _iter_compressed_file(full_path, _compressor(compression)),
+                media_type="application/octet-stream",
+                headers={"Content-Encoding": compression},
+            )
+
+        if range_header:
+            byte_range = _parse_range(
+                range_header,
+                os.path.getsize(full_path),
+            )
+            if byte_range is not None:
+                return _file_range_response(full_path, *byte_range)
+
         return FileResponse(
             full_path,
             media_type="application/octet-stream",
             filename=os.path.basename(full_path),
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"{str(e)}:\n{traceback.format_exc()}")
         raise HTTPException(
@@ -105,6 +172,174 @@ async def create_or_edit_file(
         ) from e
 
 
+def _matches(rel_path: str, name: str, patterns) -> bool:
+    return any(
+        fnmatch.fnmatch(rel_path, p) or fnmatch.fnmatch(name, p)
+        for p in patterns
+    )
+
+
+def _scan_tree(
+    target_directory: str,
+    max_depth: Optional[int],
+    include: Tuple[str, ...],
+    exclude: Tuple[str, ...],
+):
+    """
+    Walk ``target_directory`` with scandir and return ``(dir_mtimes,
+    items)``: the mtime of every directory visited, and the matching
+    ``(path, is_dir)`` entries sorted by path. Excluded directories are
+    not descended into.
+    """
+    dir_mtimes = {target_directory: os.stat(target_directory).st_mtime_ns}
+    items = []
+    stack = [(target_directory, "", 1)]
+    while stack:
+        path, rel_dir, depth = stack.pop()
+        try:
+            with os.scandir(path) as it:
+                entries = list(it)
+        except OSError as e:
+            logger.warning(f"Skipping unreadable directory {path}: {e}")
+            continue
+        for entry in entries:
+            rel = rel_dir + entry.name
+            if exclude and _matches(rel, entry.name, exclude):
+                continue
+            # Like os.walk: symlinks to directories are listed as
+            # directories, but not descended into
+            is_dir = entry.is_dir()
+            if not include or _matches(rel, entry.name, include):
+                items.append((rel, is_dir))
+            if (
+                is_dir
+                and not entry.is_symlink()
+                and (max_depth is None or depth < max_depth)
+            ):
+                try:
+                    dir_mtimes[entry.path] = entry.stat(
+                        follow_symlinks=False,
+                    ).st_mtime_ns
+                except OSError:
+                    continue
+                stack.append((entry.path, rel + "/", depth + 1))
+    items.sort()
+    return dir_mtimes, items
+
+
+class _ListingCache:
+    """
+    Small LRU cache of directory scans, revalidated by re-stating the
+    directories they visited: adding, removing or renaming an entry
+    changes its parent directory's mtime.
+    """
+
+    def __init__(self, max_size: int = 32):
+        self.max_size = max_size
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _is_fresh(dir_mtimes) -> bool:
+        for path, mtime_ns in dir_mtimes.items():
+            try:
+                if os.stat(path).st_mtime_ns != mtime_ns:
+                    return False
+            except OSError:
+                return False
+        return True
+
+    def get(self, key):
+        with self._lock:
+            cached = self._entries.get(key)
+        if cached is not None and self._is_fresh(cached[1]):
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+            return cached
+
+        fingerprint = hashlib.sha1(repr(key).encode("utf-8"))
+        dir_mtimes, items = _scan_tree(*key)
+        for path in sorted(dir_mtimes):
+            fingerprint.update(f"{path}:{dir_mtimes[path]};".encode("utf-8"))
+        cached = (fingerprint.hexdigest(), dir_mtimes, items)
+        with self._lock:
+            self._entries[key] = cached
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return cached
+
+
+_listing_cache = _ListingCache()
+
+
+def _encode_cursor(path: str) -> str:
+    return base64.urlsafe_b64encode(path.encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> str:
+    try:
+        return base64.urlsafe_b64decode(cursor.encode("ascii")).decode(
+            "utf-8",
+        )
+    except (ValueError, UnicodeError) as e:
+        raise HTTPException(status_code=400, detail="Invalid cursor.") from e
+
+
+def _list_page(
+    target_directory: str,
+    max_depth: Optional[int],
+    include: Tuple[str, ...],
+    exclude: Tuple[str, ...],
+    cursor: Optional[str],
+    limit: Optional[int],
+    with_stat: bool,
+):
+    fingerprint, _, items = _listing_cache.get(
+        (target_directory, max_depth, include, exclude),
+    )
+
+    start = 0
+    if cursor:
+        start = bisect.bisect_right(items, (_decode_cursor(cursor), True))
+    end = len(items) if limit is None else start + limit
+    page = items[start:end]
+
+    etag = hashlib.sha1(
+        f"{fingerprint}:{cursor}:{limit}:{with_stat}".encode("utf-8"),
+    )
+    page_items = []
+    for rel, is_dir in page:
+        item = {"type": "directory" if is_dir else "file", "path": rel}
+        if with_stat:
+            try:
+                st = os.stat(
+                    os.path.join(target_directory, rel),
+                    follow_symlinks=False,
+                )
+                item["size"] = st.st_size
+                item["mtime"] = st.st_mtime
+                # File contents do not touch directory mtimes
+                etag.update(f"{rel}:{st.st_size}:{st.st_mtime_ns};".encode())
+            except OSError:
+                item["size"] = None
+                item["mtime"] = None
+        page_items.append(item)
+
+    total_directories = sum(1 for _, is_dir in items if is_dir)
+    return f'"{etag.hexdigest()}"', {
+        "items": page_items,
+        "statistics": {
+            "total_directories": total_directories,
+            "total_files": len(items) - total_directories,
+        },
+        "next_cursor": (
+            _encode_cursor(page[-1][0]) if page and end < len(items) else None
+        ),
+    }
+
+
 @workspace_router.get(
     "/workspace/list-directories",
     summary="List file items in the /workspace directory, including nested "
@@ -116,10 +351,46 @@ async def list_workspace_files(
         description="Directory to list files and directories from, default "
         "is /workspace.",
     ),
+    max_depth: Optional[int] = Query(
+        None,
+        ge=1,
+        description="Maximum depth to list; 1 lists direct children only. "
+        "Unlimited by default.",
+    ),
+    include: Optional[List[str]] = Query(
+        None,
+        description="Glob patterns an item's relative path or name must "
+        "match to be listed.",
+    ),
+    exclude: Optional[List[str]] = Query(
+        None,
+        description="Glob patterns of items to skip; excluded directories "
+        "are not descended into (e.g. node_modules).",
+    ),
+    cursor: Optional[str] = Query(
+        None,
+        description="Opaque cursor from a previous page's next_cursor.",
+    ),
+    limit: Optional[int] = Query(
+        None,
+        ge=1,
+        description="Maximum number of items per page. All items by "
+        "default.",
+    ),
+    stat: bool = Query(
+        False,
+        description="Include size and mtime for every item.",
+    ),
+    if_none_match: Optional[str] = Header(None),
 ):
     """
     List all files and directories in the specified directory, including
     nested items, with type indication and statistics.
+
+    Items are sorted by path. When ``limit`` is set, ``next_cursor`` is
+    returned until the last page. Responses carry an ETag derived from
+    the visited directories' mtimes; send it back in ``If-None-Match`` to
+    get a 304 when nothing changed.
     """
     try:
         target_directory = ensure_within_workspace(directory)
@@ -128,39 +399,22 @@ async def list_workspace_files(
         if not os.path.isdir(target_directory):
             raise HTTPException(status_code=404, detail="Directory not found.")
 
-        nested_items = []
-        file_count = 0
-        directory_count = 0
-
-        for root, dirs, files in os.walk(target_directory):
-            for d in dirs:
-                dir_path = os.path.join(root, d)
-                nested_items.append(
-                    {
-                        "type": "directory",
-                        "path": os.path.relpath(dir_path, target_directory),
-                    },
-                )
-                directory_count += 1
-
-            for f in files:
-                file_path = os.path.join(root, f)
-                nested_items.append(
-                    {
-                        "type": "file",
-                        "path": os.path.relpath(file_path, target_directory),
-                    },
-                )
-                file_count += 1
-
-        return {
-            "items": nested_items,
-            "statistics": {
-                "total_directories": directory_count,
-                "total_files": file_count,
-            },
-        }
+        etag, body = await asyncio.to_thread(
+            _list_page,
+            target_directory,
+            max_depth,
+            tuple(include or ()),
+            tuple(exclude or ()),
+            cursor,
+            limit,
+            stat,
+        )
+        if if_none_match and etag in if_none_match:
+            return Response(status_code=304, headers={"ETag": etag})
+        return JSONResponse(body, headers={"ETag": etag})
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(
             f"Error listing files: {str(e)}:\n{traceback.format_exc()}",
@@ -323,3 +577,673 @@ async def copy(
             status_code=500,
             detail=f"Error copying: " f"{str(e)}",
         ) from e
+
+
+# -------- Binary, chunked and archive transfers --------
+
+
+def _compressor(compression: Compression):
+    if not compression:
+        return None
+    if compression == "gzip":
+        return zlib.compressobj(wbits=31)
+    if zstandard is None:
+        raise HTTPException(
+            status_code=400,
+            detail="zstd compression is not available.",
+        )
+    return zstandard.ZstdCompressor().compressobj()
+
+
+def _decompressor(compression: Compression):
+    if not compression:
+        return None
+    if compression == "gzip":
+        return zlib.decompressobj(wbits=31)
+    if zstandard is None:
+        raise HTTPException(
+            status_code=400,
+            detail="zstd compression is not available.",
+        )
+    return zstandard.ZstdDecompressor().decompressobj()
+
+
+_ZLIB_DECOMPRESS = type(zlib.decompressobj())
+
+
+def _decompress(decompressor, data: bytes) -> Iterator[bytes]:
+    """
+    Decompress ``data`` in pieces of bounded size, so a small compressed
+    body cannot expand in memory all at once.
+    """
+    if isinstance(decompressor, _ZLIB_DECOMPRESS):
+        while True:
+            out = decompressor.decompress(data, TRANSFER_CHUNK_SIZE)
+            if out:
+                yield out
+            data = decompressor.unconsumed_tail
+            if not data and len(out) < TRANSFER_CHUNK_SIZE:
+                return
+    for i in range(0, len(data), ZSTD_INPUT_SLICE):
+        out = decompressor.decompress(data[i : i + ZSTD_INPUT_SLICE])
+        if out:
+            yield out
+
+
+def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single ``bytes=`` range into inclusive ``(start, end)``
+    offsets within a file of ``size`` bytes.
+
+    Returns None for headers left to FileResponse (several ranges, other
+    units), which serves the whole file before Starlette 0.39. Raises 416
+    for a range outside the file.
+    """
+    match = _RANGE_RE.match(header.strip())
+    if match is None or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    else:
+        # suffix range: the last N bytes
+        start = max(size - int(last), 0)
+        end = size - 1
+    if start > end or start >= size:
+        raise HTTPException(
+            status_code=416,
+            detail="Requested range not satisfiable.",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, end
+
+
+def _file_range_response(path: str, start: int, end: int) -> Response:
+    """206 response streaming bytes ``start`` to ``end`` of ``path``.
+
+    Served here rather than by FileResponse, which only honours Range
+    headers from Starlette 0.39 on.
+    """
+
+    async def iter_range():
+        remaining = end - start + 1
+        async with aiofiles.open(path, "rb") as f:
+            await f.seek(start)
+            while remaining > 0:
+                chunk = await f.read(min(remaining, TRANSFER_CHUNK_SIZE))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+    filename = quote(os.path.basename(path))
+    return StreamingResponse(
+        iter_range(),
+        status_code=206,
+        media_type="application/octet-stream",
+        headers={
+            "Content-Range": f"bytes {start}-{end}/{os.path.getsize(path)}",
+            "Content-Length": str(end - start + 1),
+            "Accept-Ranges": "bytes",
+            "Content-Disposition": f"attachment; filename*=utf-8''{filename}",
+        },
+    )
+
+
+async def _iter_compressed_file(path: str, compressor):
+    async with aiofiles.open(path, "rb") as f:
+        while chunk := await f.read(TRANSFER_CHUNK_SIZE):
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+    yield compressor.flush()
+
+
+async def _write_body(request: Request, f, decompressor) -> int:
+    """Stream the request body into an open aiofiles handle."""
+    written = 0
+    async for chunk in request.stream():
+        pieces = (
+            (chunk,)
+            if decompressor is None
+            else _decompress(decompressor, chunk)
+        )
+        for piece in pieces:
+            if piece:
+                await f.write(piece)
+                written += len(piece)
+    if decompressor is not None:
+        tail = decompressor.flush()
+        if tail:
+            await f.write(tail)
+            written += len(tail)
+    return written
+
+
+@workspace_router.put(
+    "/workspace/files/raw",
+    summary="Upload raw bytes to a file within the /workspace directory",
+)
+async def upload_raw_file(
+    request: Request,
+    file_path: str = Query(
+        ...,
+        description="Path to the file within /workspace",
+    ),
+    compression: Compression = Query(
+        None,
+        description="Compression of the request body ('gzip' or 'zstd').",
+    ),
+):
+    """
+    Stream the request body into a file. The file is replaced atomically
+    once the whole body has been received.
+    """
+    tmp_path = None
+    try:
+        full_path = ensure_within_workspace(file_path)
+        decompressor = _decompressor(compression)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        tmp_path = os.path.join(
+            os.path.dirname(full_path),
+            f".{os.path.basename(full_path)}.{uuid.uuid4().hex}.upload",
+        )
+        async with aiofiles.open(tmp_path, "wb") as f:
+            size = await _write_body(request, f, decompressor)
+        os.replace(tmp_path, full_path)
+        tmp_path = None
+        return {"message": "File uploaded successfully.", "size": size}
+    except HTTPException:
+        raise
+    except (zlib.error, ValueError) as e:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid request body: {str(e)}",
+        ) from e
+    except Exception as e:
+        logger.error(
+            f"Error uploading file: {str(e)}:\n{traceback.format_exc()}",
+        )
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error uploading file: {str(e)}",
+        ) from e
+    finally:
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+_UPLOAD_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+_upload_locks = {}
+_uploads_swept_at: Optional[float] = None
+
+
+def _upload_paths(upload_id: str) -> Tuple[str, str]:
+    if not _UPLOAD_ID_RE.match(upload_id):
+        raise HTTPException(status_code=404, detail="Upload not found.")
+    base = os.path.join(UPLOADS_DIR, upload_id)
+    if not os.path.exists(f"{base}.json"):
+        raise HTTPException(status_code=404, detail="Upload not found.")
+    return f"{base}.json", f"{base}.part"
+
+
+def _upload_in_flight(upload_id: str) -> Optional[JSONResponse]:
+    """Return a 409 response if a chunk of the upload is being written."""
+    lock = _upload_locks.get(upload_id)
+    if lock is None or not lock.locked():
+        return None
+    return JSONResponse(
+        status_code=409,
+        content={"detail": "A chunk of the upload is being written."},
+    )
+
+
+def _sweep_uploads() -> None:
+    """Discard uploads that received nothing for ``UPLOAD_TTL`` seconds."""
+    global _uploads_swept_at
+    now = time.monotonic()
+    if (
+        _uploads_swept_at is not None
+        and now - _uploads_swept_at < UPLOAD_SWEEP_INTERVAL
+    ):
+        return
+    _uploads_swept_at = now
+
+    expire_before = time.time() - UPLOAD_TTL
+    try:
+        with os.scandir(UPLOADS_DIR) as it:
+            entries = list(it)
+    except FileNotFoundError:
+        entries = []
+    last_modified = {}
+    for entry in entries:
+        upload_id, _, ext = entry.name.partition(".")
+        if ext not in ("json", "part"):
+            continue
+        try:
+            mtime = entry.stat(follow_symlinks=False).st_mtime
+        except OSError:
+            continue
+        last_modified[upload_id] = max(
+            mtime,
+            last_modified.get(upload_id, 0),
+        )
+    for upload_id, mtime in last_modified.items():
+        if mtime >= expire_before or _upload_in_flight(upload_id):
+            continue
+        for ext in ("part", "json"):
+            try:
+                os.remove(os.path.join(UPLOADS_DIR, f"{upload_id}.{ext}"))
+            except OSError:
+                pass
+        _upload_locks.pop(upload_id, None)
+        logger.info(f"Discarded abandoned upload {upload_id}")
+    # Locks of uploads gone by other means
+    for upload_id in list(_upload_locks):
+        if upload_id not in last_modified and not _upload_in_flight(
+            upload_id,
+        ):
+            _upload_locks.pop(upload_id, None)
+
+
+def _upload_state(upload_id: str) -> dict:
+    meta_path, part_path = _upload_paths(upload_id)
+    with open(meta_path, "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    return {
+        "upload_id": upload_id,
+        "file_path": meta["file_path"],
+        "offset": os.path.getsize(part_path),
+    }
+
+
+@workspace_router.post(
+    "/workspace/uploads",
+    summary="Start a resumable upload to a file within /workspace",
+)
+async def create_upload(
+    file_path: str = Query(
+        ...,
+        description="Path to the file within /workspace",
+    ),
+):
+    """
+    Start a resumable upload. Send the data with PUT
+    /workspace/uploads/{upload_id} in order, then complete it.
+    """
+    full_path = ensure_within_workspace(file_path)
+    _sweep_uploads()
+    upload_id = uuid.uuid4().hex
+    os.makedirs(UPLOADS_DIR, exist_ok=True)
+    base = os.path.join(UPLOADS_DIR, upload_id)
+    with open(f"{base}.part", "wb"):
+        pass
+    with open(f"{base}.json", "w", encoding="utf-8") as f:
+        json.dump({"file_path": full_path}, f)
+    return {"upload_id": upload_id, "file_path": full_path, "offset": 0}
+
+
+@workspace_router.get(
+    "/workspace/uploads/{upload_id}",
+    summary="Get the state of a resumable upload",
+)
+async def get_upload(upload_id: str):
+    """
+    Return the number of bytes received so far, i.e. where to resume.
+    """
+    return _upload_state(upload_id)
+
+
+@workspace_router.put(
+    "/workspace/uploads/{upload_id}",
+    summary="Append a chunk to a resumable upload",
+)
+async def put_upload_chunk(
+    request: Request,
+    upload_id: str,
+    offset: int = Query(
+        ...,
+        ge=0,
+        description="Offset of this chunk; must equal the bytes received "
+        "so far.",
+    ),
+    compression: Compression = Query(
+        None,
+        description="Compression of this chunk's body ('gzip' or 'zstd').",
+    ),
+):
+    """
+    Append a chunk at ``offset``. A mismatched offset is rejected with 409
+    and the current offset, so the client can resume from there.
+    """
+    _, part_path = _upload_paths(upload_id)
+    decompressor = _decompressor(compression)
+    lock = _upload_locks.setdefault(upload_id, asyncio.Lock())
+    async with lock:
+        if not os.path.exists(part_path):
+            # Completed or aborted while waiting for the lock
+            raise HTTPException(status_code=404, detail="Upload not found.")
+        current = os.path.getsize(part_path)
+        if offset != current:
+            return JSONResponse(
+                status_code=409,
+                content={
+                    "detail": "Offset does not match the upload.",
+                    "offset": current,
+                },
+            )
+        try:
+            async with aiofiles.open(part_path, "ab") as f:
+                await _write_body(request, f, decompressor)
+        except (zlib.error, ValueError) as e:
+            # Drop the partial chunk so the client can resend it
+            os.truncate(part_path, current)
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid request body: {str(e)}",
+            ) from e
+        except Exception:
+            os.truncate(part_path, current)
+            raise
+        return {"upload_id": upload_id, "offset": os.path.getsize(part_path)}
+
+
+@workspace_router.post(
+    "/workspace/uploads/{upload_id}/complete",
+    summary="Finish a resumable upload",
+)
+async def complete_upload(upload_id: str):
+    """
+    Move the received data into place and discard the upload. Rejected
+    with 409 while a chunk is still being written.
+    """
+    busy = _upload_in_flight(upload_id)
+    if busy is not None:
+        return busy
+    state = _upload_state(upload_id)
+    meta_path, part_path = _upload_paths(upload_id)
+    full_path = state["file_path"]
+    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+    shutil.move(part_path, full_path)
+    os.remove(meta_path)
+    _upload_locks.pop(upload_id, None)
+    return {
+        "message": "File uploaded successfully.",
+        "file_path": full_path,
+        "size": state["offset"],
+    }
+
+
+@workspace_router.delete(
+    "/workspace/uploads/{upload_id}",
+    summary="Abort a resumable upload",
+)
+async def abort_upload(upload_id: str):
+    busy = _upload_in_flight(upload_id)
+    if busy is not None:
+        return busy
+    meta_path, part_path = _upload_paths(upload_id)
+    for path in (part_path, meta_path):
+        if os.path.exists(path):
+            os.remove(path)
+    _upload_locks.pop(upload_id, None)
+    return {"message": "Upload aborted."}
+
+
+class _QueueSink:
+    """
+    Write-only file object handing (optionally compressed) data to a
+    bounded queue, so a tar writer thread blocks while the client is slow.
+    """
+
+    def __init__(self, q: queue.Queue, compressor, stop: threading.Event):
+        self.queue = q
+        self.compressor = compressor
+        self.stop = stop
+
+    def put(self, data):
+        while not self.stop.is_set():
+            try:
+                self.queue.put(data, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+        raise OSError("Archive stream was closed by the client.")
+
+    def write(self, data) -> int:
+        size = len(data)
+        if self.compressor is not None:
+            data = self.compressor.compress(bytes(data))
+        if data:
+            self.put(bytes(data))
+        return size
+
+    def close(self):
+        if self.compressor is not None:
+            tail = self.compressor.flush()
+            if tail:
+                self.put(tail)
+
+
+class _QueueReader:
+    """
+    Read-only file object over a queue of (optionally compressed) request
+    body chunks, ended by ``None``.
+    """
+
+    def __init__(self, q: queue.Queue, decompressor):
+        self.queue = q
+        self.decompressor = decompressor
+        self.buffer = bytearray()
+        # Decompressed pieces of the current chunk, taken as needed
+        self.pieces: Iterator[bytes] = iter(())
+        self.eof = False
+
+    def read(self, size: int = -1) -> bytes:
+        while not self.eof and (size < 0 or len(self.buffer) < size):
+            piece = next(self.pieces, None)
+            if piece is not None:
+                self.buffer += piece
+                continue
+            chunk = self.queue.get()
+            if chunk is None:
+                self.eof = True
+                if self.decompressor is not None:
+                    self.buffer += self.decompressor.flush()
+                break
+            if self.decompressor is None:
+                self.pieces = iter((chunk,))
+            else:
+                self.pieces = _decompress(self.decompressor, chunk)
+        if size < 0:
+            size = len(self.buffer)
+        data = bytes(self.buffer[:size])
+        del self.buffer[:size]
+        return data
+
+
+def _write_archive(directory: str, sink: _QueueSink, q: queue.Queue):
+    try:
+        with tarfile.open(
+            fileobj=sink,
+            mode="w|",
+            bufsize=TRANSFER_CHUNK_SIZE,
+        ) as tar:
+            for name in sorted(os.listdir(directory)):
+                tar.add(os.path.join(directory, name), arcname=name)
+        sink.close()
+        end = None
+    except Exception as e:
+        end = e
+    try:
+        sink.put(end)
+    except OSError:
+        pass  # The client went away
+
+
+@workspace_router.get(
+    "/workspace/archive",
+    summary="Export a directory within /workspace as a tar stream",
+)
+async def export_archive(
+    directory: str = Query(
+        "/workspace",
+        description="Directory to export, default is /workspace.",
+    ),
+    compression: Compression = Query(
+        None,
+        description="Compress the tar stream ('gzip' or 'zstd'), reported "
+        "in Content-Encoding.",
+    ),
+):
+    """
+    Stream the directory as a tar archive, produced while it is sent.
+    """
+    target_directory = ensure_within_workspace(directory)
+    if not os.path.isdir(target_directory):
+        raise HTTPException(status_code=404, detail="Directory not found.")
+
+    q: queue.Queue = queue.Queue(maxsize=8)
+    stop = threading.Event()
+    sink = _QueueSink(q, _compressor(compression), stop)
+
+    async def stream():
+        thread = threading.Thread(
+            target=_write_archive,
+            args=(target_directory, sink, q),
+            daemon=True,
+        )
+        thread.start()
+        try:
+            while True:
+                try:
+                    # Bounded wait so no thread is left blocked once the
+                    # client disconnects
+                    item = await asyncio.to_thread(q.get, True, 1.0)
+                except queue.Empty:
+                    continue
+                if item is None:
+                    return
+                if isinstance(item, Exception):
+                    # Headers are sent already; cut the stream short so
+                    # the client sees a truncated archive
+                    logger.error(f"Error exporting archive: {item}")
+                    raise item
+                yield item
+        finally:
+            stop.set()
+
+    headers = {"Content-Encoding": compression} if compression else {}
+    return StreamingResponse(
+        stream(),
+        media_type="application/x-tar",
+        headers=headers,
+    )
+
+
+def _check_member(member: tarfile.TarInfo, target_directory: str):
+    def inside(path: str) -> bool:
+        full = os.path.realpath(os.path.join(target_directory, path))
+        return os.path.commonpath([target_directory, full]) == (
+            target_directory
+        )
+
+    if os.path.isabs(member.name) or not inside(member.name):
+        raise tarfile.TarError(f"Member escapes the target: {member.name}")
+    if member.issym() and not inside(
+        os.path.join(os.path.dirname(member.name), member.linkname),
+    ):
+        raise tarfile.TarError(f"Link escapes the target: {member.name}")
+    if member.islnk() and not inside(member.linkname):
+        raise tarfile.TarError(f"Link escapes the target: {member.name}")
+    if member.isdev():
+        raise tarfile.TarError(
+            f"Device members are not allowed: {member.name}"
+        )
+
+
+def _extract_archive(reader: _QueueReader, target_directory: str) -> int:
+    count = 0
+    # The data filter is only in recent Pythons; members are checked by
+    # hand either way
+    kwargs = {"filter": "data"} if hasattr(tarfile, "data_filter") else {}
+    with tarfile.open(fileobj=reader, mode="r|") as tar:
+        for member in tar:
+            _check_member(member, target_directory)
+            tar.extract(member, target_directory, **kwargs)
+            count += 1
+    # Drain what the client sent after the end-of-archive marker
+    while reader.read(TRANSFER_CHUNK_SIZE):
+        pass
+    return count
+
+
+@workspace_router.put(
+    "/workspace/archive",
+    summary="Import a tar stream into a directory within /workspace",
+)
+async def import_archive(
+    request: Request,
+    directory: str = Query(
+        "/workspace",
+        description="Directory to extract into, default is /workspace.",
+    ),
+    compression: Compression = Query(
+        None,
+        description="Compression of the tar stream ('gzip' or 'zstd').",
+    ),
+):
+    """
+    Extract a tar archive from the request body while it is received.
+    Members escaping the directory, and device files, are rejected.
+    """
+    target_directory = os.path.realpath(ensure_within_workspace(directory))
+    os.makedirs(target_directory, exist_ok=True)
+
+    q: queue.Queue = queue.Queue(maxsize=8)
+    reader = _QueueReader(q, _decompressor(compression))
+    extracted = threading.Event()
+    # Puts wait in a worker thread while the extractor is behind, and
+    # give up once it is done
+    sink = _QueueSink(q, None, extracted)
+
+    def extract():
+        try:
+            return _extract_archive(reader, target_directory)
+        finally:
+            extracted.set()
+
+    task = asyncio.create_task(asyncio.to_thread(extract))
+
+    async def feed(item) -> bool:
+        try:
+            q.put_nowait(item)
+        except queue.Full:
+            try:
+                await asyncio.to_thread(sink.put, item)
+            except OSError:
+                return False
+        return True
+
+    try:
+        async for chunk in request.stream():
+            if task.done() or not await feed(chunk):
+                break
+        else:
+            await feed(None)
+        count = await task
+        return {"message": "Archive imported successfully.", "files": count}
+    except (tarfile.TarError, zlib.error, ValueError, OSError) as e:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid archive: {str(e)}",
+        ) from e
+    finally:
+        if not task.done():
+            # Unblock the extractor if the client went away
+            reader.eof = True
+            try:
+                q.put_nowait(None)
+            except queue.Full:
+                pass
@@ -1,8 +1,15 @@
 # -*- coding: utf-8 -*-
+import copy
+import json
 import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, List, Optional
 from urllib.parse import urljoin
 
 DEFAULT_TIMEOUT = 60
+# Directory listing responses kept for ETag revalidation
+LISTING_CACHE_SIZE = 64
 
 logger = logging.getLogger(__name__)
 
@@ -68,6 +75,66 @@ class SandboxHttpBase:
         if self.secret:
             self.headers["Authorization"] = f"Bearer {self.secret}"
 
+        # Called with the exception of each failed request, e.g. by the
+        # sandbox manager to forget a cached client of a dead container
+        self.on_error: Optional[Callable[[Exception], None]] = None
+
+        # json-encoded listing params -> (etag, response body)
+        self._listing_cache: OrderedDict = OrderedDict()
+        self._listing_lock = threading.Lock()
+
+    def _report_error(self, error: Exception) -> None:
+        if self.on_error is None:
+            return
+        try:
+            self.on_error(error)
+        except Exception as e:
+            logger.debug(f"Error handler failed: {e}")
+
+    @staticmethod
+    def _listing_params(
+        directory: str,
+        max_depth: Optional[int] = None,
+        include: Optional[List[str]] = None,
+        exclude: Optional[List[str]] = None,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+        stat: bool = False,
+    ) -> dict:
+        params = {
+            "directory": directory,
+            "max_depth": max_depth,
+            "include": include,
+            "exclude": exclude,
+            "cursor": cursor,
+            "limit": limit,
+            "stat": stat or None,
+        }
+        return {k: v for k, v in params.items() if v is not None}
+
+    def _cached_listing(self, params: dict):
+        """Return ``(etag, body)`` of a cached listing, with a copy of the
+        body callers may modify, or None."""
+        with self._listing_lock:
+            cached = self._listing_cache.get(
+                json.dumps(params, sort_keys=True),
+            )
+        if cached is None:
+            return None
+        return cached[0], copy.deepcopy(cached[1])
+
+    def _remember_listing(self, params: dict, etag: Optional[str], body):
+        if not etag or not isinstance(body, dict):
+            return
+        key = json.dumps(params, sort_keys=True)
+        # Kept apart from the body returned to the caller
+        body = copy.deepcopy(body)
+        with self._listing_lock:
+            self._listing_cache[key] = (etag, body)
+            self._listing_cache.move_to_end(key)
+            while len(self._listing_cache) > LISTING_CACHE_SIZE:
+                self._listing_cache.popitem(last=False)
+
     @property
     def generic_tools(self) -> dict:
         return self._generic_tools
@@ -1,17 +1,29 @@
 # -*- coding: utf-8 -*-
 # pylint: disable=unused-argument
+import json
 import logging
+import os
 import time
-from typing import Any, Optional
+from typing import Any, BinaryIO, Iterator, List, Optional
 
 import requests
 from pydantic import Field
+from requests.adapters import HTTPAdapter
 
 from .base import SandboxHttpBase
+from .transfer import (
+    RESUMABLE_CHUNK_SIZE,
+    TRANSFER_CHUNK_SIZE,
+    StreamWriter,
+    iter_file,
+)
 from ..model import ContainerModel
 
 
 DEFAULT_TIMEOUT = 60
+# Keep-alive connections kept per client, so concurrent callers sharing a
+# cached client do not reopen sockets
+DEFAULT_POOL_MAXSIZE = 32
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +50,9 @@ class SandboxHttpClient(SandboxHttpBase):
         super().__init__(model, timeout, domain)
         self.session = requests.Session()
         self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_maxsize=DEFAULT_POOL_MAXSIZE)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
 
     def __enter__(self):
         # Wait for the runtime api server to be healthy
@@ -47,6 +62,9 @@ class SandboxHttpClient(SandboxHttpBase):
     def __exit__(self, exc_type, exc_value, traceback):
         pass
 
+    def close(self):
+        self.session.close()
+
     def _request(self, method: str, url: str, **kwargs):
         if "timeout" not in kwargs:
             kwargs["timeout"] = self.timeout
@@ -62,6 +80,7 @@ class SandboxHttpClient(SandboxHttpBase):
                 return r.text
         except requests.exceptions.RequestException as e:
             logger.error(f"HTTP error: {e}")
+            self._report_error(e)
             return {
                 "isError": True,
                 "content": [{"type": "text", "text": str(e)}],
@@ -172,6 +191,67 @@ class SandboxHttpClient(SandboxHttpBase):
             json={"command": command},
         )
 
+    def _stream_events(self, url: str, payload: dict) -> Iterator[dict]:
+        """
+        POST to an NDJSON streaming endpoint and yield decoded events.
+
+        Transport errors are reported as a final ``{"type": "error"}``
+        event instead of being raised, like `safe_request`.
+        """
+        try:
+            with self.session.post(
+                url,
+                json=payload,
+                stream=True,
+                # No read timeout: commands may be silent for a while,
+                # the server enforces the execution timeout
+                timeout=(self.timeout, None),
+            ) as r:
+                r.raise_for_status()
+                for line in r.iter_lines():
+                    if line:
+                        yield json.loads(line)
+        except requests.exceptions.RequestException as e:
+            logger.error(f"HTTP error: {e}")
+            self._report_error(e)
+            yield {"type": "error", "text": str(e)}
+
+    def run_ipython_cell_stream(
+        self,
+        code: str,
+        timeout: Optional[float] = None,
+        max_output_bytes: Optional[int] = None,
+    ) -> Iterator[dict]:
+        """
+        Run an IPython cell, yielding stdout/stderr events as they are
+        produced and a final ``end`` event.
+        """
+        payload = {"code": code, "timeout": timeout}
+        if max_output_bytes is not None:
+            payload["max_output_bytes"] = max_output_bytes
+        yield from self._stream_events(
+            f"{self.base_url}/tools/run_ipython_cell/stream",
+            payload,
+        )
+
+    def run_shell_command_stream(
+        self,
+        command: str,
+        timeout: Optional[float] = None,
+        max_output_bytes: Optional[int] = None,
+    ) -> Iterator[dict]:
+        """
+        Run a shell command, yielding stdout/stderr events as they are
+        produced and a final ``end`` event with the return code.
+        """
+        payload = {"command": command, "timeout": timeout}
+        if max_output_bytes is not None:
+            payload["max_output_bytes"] = max_output_bytes
+        yield from self._stream_events(
+            f"{self.base_url}/tools/run_shell_command/stream",
+            payload,
+        )
+
     # Below the method is used by API Server
     def commit_changes(self, commit_message: str = "Automated commit") -> dict:
         """
@@ -231,6 +311,200 @@ class SandboxHttpClient(SandboxHttpBase):
             return {"data": bytes(file_content)}
         except requests.exceptions.RequestException as e:
             logger.error(f"An error occurred while retrieving the file: {e}")
+            self._report_error(e)
+            return {
+                "isError": True,
+                "content": [{"type": "text", "text": str(e)}],
+            }
+
+    def download_workspace_file(
+        self,
+        file_path: str,
+        fileobj: BinaryIO,
+        compression: Optional[str] = None,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+    ) -> dict:
+        """
+        Stream a file from the /workspace directory into a binary file
+        object, without holding it in memory.
+
+        Args:
+            file_path (str): Path of the file within /workspace.
+            fileobj (BinaryIO): Destination opened for binary writing.
+            compression (str, optional): ``"gzip"`` or ``"zstd"`` to
+                compress on the wire.
+            start (int, optional): First byte of a range to fetch.
+            end (int, optional): Last byte (inclusive) of the range.
+                Ranges are always fetched uncompressed.
+        """
+        params = {"file_path": file_path}
+        headers = {}
+        if start is not None or end is not None:
+            headers[
+                "Range"
+            ] = f"bytes={start or 0}-{'' if end is None else end}"
+            compression = None
+        elif compression:
+            params["compression"] = compression
+        return self._download(
+            f"{self.base_url}/workspace/files",
+            fileobj,
+            compression,
+            params=params,
+            headers=headers,
+        )
+
+    def upload_workspace_file(
+        self,
+        file_path: str,
+        fileobj: BinaryIO,
+        compression: Optional[str] = None,
+    ) -> dict:
+        """
+        Stream a binary file object into a file within /workspace. The
+        target is replaced once the whole body has been received.
+        """
+        params = {"file_path": file_path}
+        if compression:
+            params["compression"] = compression
+        return self.safe_request(
+            "put",
+            f"{self.base_url}/workspace/files/raw",
+            params=params,
+            data=iter_file(fileobj, compression),
+            headers={"Content-Type": "application/octet-stream"},
+        )
+
+    def upload_workspace_file_resumable(
+        self,
+        file_path: str,
+        fileobj: BinaryIO,
+        upload_id: Optional[str] = None,
+        chunk_size: int = RESUMABLE_CHUNK_SIZE,
+        compression: Optional[str] = None,
+        max_retries: int = 3,
+    ) -> dict:
+        """
+        Upload a seekable binary file object in chunks. Failed chunks are
+        retried from the offset the sandbox reports; pass a previous
+        result's ``upload_id`` to resume an interrupted upload.
+        """
+        uploads = f"{self.base_url}/workspace/uploads"
+        fileobj.seek(0, os.SEEK_END)
+        total = fileobj.tell()
+        failures = 0
+        offset = None
+        while True:
+            try:
+                if upload_id is None:
+                    r = self._request(
+                        "post",
+                        uploads,
+                        params={"file_path": file_path},
+                    )
+                    r.raise_for_status()
+                    upload_id = r.json()["upload_id"]
+                    offset = 0
+                elif offset is None:
+                    r = self._request("get", f"{uploads}/{upload_id}")
+                    r.raise_for_status()
+                    offset = r.json()["offset"]
+
+                if offset >= total:
+                    r = self._request(
+                        "post",
+                        f"{uploads}/{upload_id}/complete",
+                    )
+                    r.raise_for_status()
+                    return {**r.json(), "upload_id": upload_id}
+
+                fileobj.seek(offset)
+                params = {"offset": offset}
+                if compression:
+                    params["compression"] = compression
+                r = self._request(
+                    "put",
+                    f"{uploads}/{upload_id}",
+                    params=params,
+                    data=iter_file(fileobj, compression, limit=chunk_size),
+                    headers={"Content-Type": "application/octet-stream"},
+                )
+                if r.status_code == 409:
+                    offset = r.json()["offset"]
+                    continue
+                r.raise_for_status()
+                offset = r.json()["offset"]
+            except requests.exceptions.RequestException as e:
+                failures += 1
+                offset = None
+                if failures > max_retries:
+                    logger.error(f"Upload of {file_path} failed: {e}")
+                    self._report_error(e)
+                    return {
+                        "isError": True,
+                        "upload_id": upload_id,
+                        "content": [{"type": "text", "text": str(e)}],
+                    }
+                logger.warning(f"Retrying upload of {file_path}: {e}")
+
+    def export_workspace_archive(
+        self,
+        directory: str,
+        fileobj: BinaryIO,
+        compression: Optional[str] = None,
+    ) -> dict:
+        """
+        Stream a directory within /workspace as a tar archive into a
+        binary file object. ``compression`` only applies on the wire; the
+        file object receives a plain tar.
+        """
+        params = {"directory": directory}
+        if compression:
+            params["compression"] = compression
+        return self._download(
+            f"{self.base_url}/workspace/archive",
+            fileobj,
+            compression,
+            params=params,
+        )
+
+    def import_workspace_archive(
+        self,
+        directory: str,
+        fileobj: BinaryIO,
+        compression: Optional[str] = None,
+    ) -> dict:
+        """
+        Stream a tar archive from a binary file object and extract it into
+        a directory within /workspace.
+        """
+        params = {"directory": directory}
+        if compression:
+            params["compression"] = compression
+        return self.safe_request(
+            "put",
+            f"{self.base_url}/workspace/archive",
+            params=params,
+            data=iter_file(fileobj, compression),
+            headers={"Content-Type": "application/x-tar"},
+        )
+
+    def _download(self, url, fileobj, compression, **kwargs) -> dict:
+        try:
+            with self._request("get", url, stream=True, **kwargs) as r:
+                r.raise_for_status()
+                writer = StreamWriter(fileobj, compression)
+                # Read the body as sent; decompression is done here
+                for chunk in r.raw.stream(
+                    TRANSFER_CHUNK_SIZE,
+                    decode_content=False,
+                ):
+                    writer.write(chunk)
+                return {"size": writer.close()}
+        except requests.exceptions.RequestException as e:
+            logger.error(f"An error occurred while downloading: {e}")
+            self._report_error(e)
             return {
                 "isError": True,
                 "content": [{"type": "text", "text": str(e)}],
@@ -254,15 +528,81 @@ class SandboxHttpClient(SandboxHttpBase):
     def list_workspace_directories(
         self,
         directory: str = "/workspace",
+        max_depth: Optional[int] = None,
+        include: Optional[List[str]] = None,
+        exclude: Optional[List[str]] = None,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+        stat: bool = False,
     ) -> dict:
         """
         List files in the specified directory within the /workspace.
-        """
-        return self.safe_request(
-            "get",
-            f"{self.base_url}/workspace/list-directories",
-            params={"directory": directory},
+
+        With ``limit`` set, one page is returned; pass its ``next_cursor``
+        back to get the next one, or use iter_workspace_directories().
+        Repeated requests are revalidated with the server's ETag.
+        """
+        params = self._listing_params(
+            directory,
+            max_depth,
+            include,
+            exclude,
+            cursor,
+            limit,
+            stat,
         )
+        cached = self._cached_listing(params)
+        try:
+            r = self._request(
+                "get",
+                f"{self.base_url}/workspace/list-directories",
+                params=params,
+                headers={"If-None-Match": cached[0]} if cached else None,
+            )
+            if r.status_code == 304 and cached:
+                return cached[1]
+            r.raise_for_status()
+            body = r.json()
+            self._remember_listing(params, r.headers.get("ETag"), body)
+            return body
+        except requests.exceptions.RequestException as e:
+            logger.error(f"HTTP error: {e}")
+            self._report_error(e)
+            return {
+                "isError": True,
+                "content": [{"type": "text", "text": str(e)}],
+            }
+
+    def iter_workspace_directories(
+        self,
+        directory: str = "/workspace",
+        max_depth: Optional[int] = None,
+        include: Optional[List[str]] = None,
+        exclude: Optional[List[str]] = None,
+        stat: bool = False,
+        page_size: int = 1000,
+    ) -> Iterator[dict]:
+        """
+        Lazily yield every item under ``directory``, fetching one page of
+        ``page_size`` items at a time.
+        """
+        cursor = None
+        while True:
+            page = self.list_workspace_directories(
+                directory,
+                max_depth=max_depth,
+                include=include,
+                exclude=exclude,
+                cursor=cursor,
+                limit=page_size,
+                stat=stat,
+            )
+            if page.get("isError"):
+                raise RuntimeError(page["content"][0]["text"])
+            yield from page["items"]
+            cursor = page.get("next_cursor")
+            if not cursor:
+                return
 
     def create_workspace_directory(self, directory_path: str) -> dict:
         """
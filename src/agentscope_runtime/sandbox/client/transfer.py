@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""Helpers for streaming workspace file transfers."""
+import asyncio
+import zlib
+from typing import AsyncIterator, BinaryIO, Iterator, Optional
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+TRANSFER_CHUNK_SIZE = 1024 * 1024
+RESUMABLE_CHUNK_SIZE = 8 * 1024 * 1024
+
+
+def compressor(compression: Optional[str]):
+    if not compression:
+        return None
+    if compression == "gzip":
+        return zlib.compressobj(wbits=31)
+    if compression == "zstd":
+        if zstandard is None:
+            raise ImportError(
+                "zstd compression requires the 'zstandard' package",
+            )
+        return zstandard.ZstdCompressor().compressobj()
+    raise ValueError(f"Unsupported compression: {compression}")
+
+
+def decompressor(compression: Optional[str]):
+    if not compression:
+        return None
+    if compression == "gzip":
+        return zlib.decompressobj(wbits=31)
+    if compression == "zstd":
+        if zstandard is None:
+            raise ImportError(
+                "zstd compression requires the 'zstandard' package",
+            )
+        return zstandard.ZstdDecompressor().decompressobj()
+    raise ValueError(f"Unsupported compression: {compression}")
+
+
+def iter_file(
+    fileobj: BinaryIO,
+    compression: Optional[str] = None,
+    chunk_size: int = TRANSFER_CHUNK_SIZE,
+    limit: Optional[int] = None,
+) -> Iterator[bytes]:
+    """
+    Read ``fileobj`` in chunks (at most ``limit`` bytes), compressing them
+    on the fly.
+    """
+    comp = compressor(compression)
+    remaining = limit
+    while remaining is None or remaining > 0:
+        size = chunk_size if remaining is None else min(chunk_size, remaining)
+        chunk = fileobj.read(size)
+        if not chunk:
+            break
+        if remaining is not None:
+            remaining -= len(chunk)
+        if comp is not None:
+            chunk = comp.compress(chunk)
+        if chunk:
+            yield chunk
+    if comp is not None:
+        tail = comp.flush()
+        if tail:
+            yield tail
+
+
+async def aiter_file(
+    fileobj: BinaryIO,
+    compression: Optional[str] = None,
+    chunk_size: int = TRANSFER_CHUNK_SIZE,
+    limit: Optional[int] = None,
+) -> AsyncIterator[bytes]:
+    """Async variant of `iter_file`, reading off the event loop."""
+    chunks = iter_file(fileobj, compression, chunk_size, limit)
+    while True:
+        chunk = await asyncio.to_thread(next, chunks, None)
+        if chunk is None:
+            return
+        yield chunk
+
+
+class StreamWriter:
+    """Write (optionally compressed) chunks into a file object."""
+
+    def __init__(self, fileobj: BinaryIO, compression: Optional[str] = None):
+        self.fileobj = fileobj
+        self.decompressor = decompressor(compression)
+        self.size = 0
+
+    def write(self, chunk: bytes):
+        if self.decompressor is not None:
+            chunk = self.decompressor.decompress(chunk)
+        if chunk:
+            self.fileobj.write(chunk)
+            self.size += len(chunk)
+
+    def close(self) -> int:
+        """Flush the decompressor and return the bytes written."""
+        if self.decompressor is not None:
+            tail = self.decompressor.flush()
+            if tail:
+                self.fileobj.write(tail)
+                self.size += len(tail)
+        return self.size
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def close_connection(client: Any) -> None:
+    """
+    Close a cached runtime client, whichever thread or loop we are on.
+
+    Async clients are closed on the event loop they were opened on; sync
+    clients are closed directly.
+    """
+    try:
+        aclose = getattr(client, "aclose", None)
+        if aclose is not None:
+            loop = getattr(client, "loop", None)
+            if loop is None or loop.is_closed():
+                return
+            try:
+                running = asyncio.get_running_loop()
+            except RuntimeError:
+                running = None
+            if running is loop:
+                loop.create_task(aclose())
+            else:
+                asyncio.run_coroutine_threadsafe(aclose(), loop)
+            return
+
+        close = getattr(client, "close", None)
+        if close is not None:
+            close()
+    except Exception as e:
+        logger.debug(f"Error closing cached connection: {e}")
+
+
+class ConnectionCache:
+    """
+    Thread-safe LRU cache of runtime clients with TTL expiry.
+
+    Keys are ``(identity, scope)`` tuples, where scope separates entries
+    that must not be shared (e.g. async clients bound to different event
+    loops).
+
+    Callers hold a lease on the client they use, taken with
+    ``get(..., lease=True)`` or ``put(..., lease=True)`` and given back
+    with `release`. Clients dropped from the cache (evicted, expired,
+    invalidated or discarded) are closed with `close_connection` once
+    their last lease is released, so requests still using them are not
+    cut off.
+    """
+
+    def __init__(self, max_size: int = 256, ttl: float = 60.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        # (identity, scope) -> (client, created_at)
+        self._entries: OrderedDict = OrderedDict()
+        # id(client) -> number of leases, for clients in use
+        self._leases: Dict[int, int] = {}
+        # id(client) -> client, dropped while in use
+        self._retired: Dict[int, Any] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _drop(self, client: Any, closing: List[Any]) -> None:
+        # Called with the lock held
+        if self._leases.get(id(client)):
+            self._retired[id(client)] = client
+        else:
+            closing.append(client)
+
+    def _lease(self, client: Any) -> None:
+        # Called with the lock held
+        self._leases[id(client)] = self._leases.get(id(client), 0) + 1
+
+    @staticmethod
+    def _close(clients: List[Any]) -> None:
+        for c in clients:
+            close_connection(c)
+
+    def get(
+        self,
+        identity: str,
+        scope: Hashable = None,
+        lease: bool = False,
+    ) -> Optional[Any]:
+        key = (identity, scope)
+        closing: List[Any] = []
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            client, created_at = entry
+            if self.ttl > 0 and time.monotonic() - created_at > self.ttl:
+                self._drop(self._entries.pop(key)[0], closing)
+            else:
+                self._entries.move_to_end(key)
+                if lease:
+                    self._lease(client)
+                return client
+
+        self._close(closing)
+        return None
+
+    def put(
+        self,
+        identity: str,
+        client: Any,
+        scope: Hashable = None,
+        lease: bool = False,
+    ):
+        key = (identity, scope)
+        closing: List[Any] = []
+        with self._lock:
+            if lease:
+                self._lease(client)
+            if not self.enabled:
+                if lease:
+                    # closed once the caller is done with it
+                    self._retired[id(client)] = client
+                return
+            old = self._entries.pop(key, None)
+            if old is not None and old[0] is not client:
+                self._drop(old[0], closing)
+            self._entries[key] = (client, time.monotonic())
+            while len(self._entries) > self.max_size:
+                _, (lru_client, _) = self._entries.popitem(last=False)
+                self._drop(lru_client, closing)
+
+        self._close(closing)
+
+    def release(self, client: Any) -> None:
+        """
+        Give back a lease; closes ``client`` if it was its last lease and
+        the client was dropped from the cache meanwhile.
+        """
+        with self._lock:
+            count = self._leases.get(id(client), 0) - 1
+            if count > 0:
+                self._leases[id(client)] = count
+                return
+            self._leases.pop(id(client), None)
+            retired = self._retired.pop(id(client), None)
+
+        if retired is not None:
+            close_connection(retired)
+
+    def discard(self, client: Any) -> None:
+        """
+        Drop ``client`` from the cache, e.g. after a request through it
+        failed, leaving other cached clients of its identity alone.
+        """
+        closing: List[Any] = []
+        with self._lock:
+            keys = [k for k, v in self._entries.items() if v[0] is client]
+            for k in keys:
+                self._drop(self._entries.pop(k)[0], closing)
+
+        self._close(closing)
+
+    def invalidate(self, *identities: Optional[str]) -> int:
+        """
+        Drop every cached client for the given identities.
+        """
+        targets = {i for i in identities if i}
+        if not targets:
+            return 0
+
+        closing: List[Any] = []
+        with self._lock:
+            keys = [k for k in self._entries if k[0] in targets]
+            for k in keys:
+                self._drop(self._entries.pop(k)[0], closing)
+
+        self._close(closing)
+        return len(keys)
+
+    def clear(self) -> None:
+        closing: List[Any] = []
+        with self._lock:
+            for client, _ in self._entries.values():
+                self._drop(client, closing)
+            self._entries.clear()
+
+        self._close(closing)
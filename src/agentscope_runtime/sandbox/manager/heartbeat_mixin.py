@@ -45,14 +45,19 @@ def touch_session(identity_arg: str = "identity"):
                     )
                     identity = bound.arguments.get(identity_arg)
                     if identity is not None:
-                        session_ctx_id = self.get_session_ctx_id_by_identity(
-                            identity,
+                        session_ctx_id = (
+                            await self.get_session_ctx_id_by_identity_async(
+                                identity,
+                            )
                         )
                         if session_ctx_id:
-                            self.update_heartbeat(session_ctx_id)
-                            if self.needs_restore(session_ctx_id):
+                            await self.update_heartbeat_async(session_ctx_id)
+                            if await self.needs_restore_async(session_ctx_id):
                                 if hasattr(self, "restore_session"):
-                                    self.restore_session(session_ctx_id)
+                                    await asyncio.to_thread(
+                                        self.restore_session,
+                                        session_ctx_id,
+                                    )
                 except Exception as e:
                     logger.debug(f"touch_session failed (ignored): {e}")
 
@@ -102,7 +107,8 @@ class HeartbeatMixin:
         - ``self.container_mapping`` (Mapping-like with set/get/delete/scan)
         - ``self.session_mapping`` (Mapping-like with set/get/delete/scan)
         - ``self.get_info(identity) -> dict`` compatible with
-          ``ContainerModel(**dict)``
+          ``ContainerModel(**dict)``, and ``self.get_info_async`` for the
+          async variants
         - ``self.config.redis_enabled`` (`bool`)
         - ``self.config.heartbeat_lock_ttl`` (`int`)
         - ``self.redis_client`` (redis client or ``None``)
@@ -401,6 +407,112 @@ end
         # fallback for older payloads
         return (info.meta or {}).get("session_ctx_id")
 
+    # ---------- async variants ----------
+    async def _load_session_models_async(
+        self,
+        session_ctx_id: str,
+    ) -> List[ContainerModel]:
+        """Load all container models of a session in one round trip."""
+        if not session_ctx_id:
+            return []
+        try:
+            names = await self.session_mapping.aget(session_ctx_id) or []
+            values = await self.container_mapping.amget(names)
+        except Exception as e:
+            logger.warning(
+                f"_load_session_models_async "
+                f"failed for session_ctx_id={session_ctx_id}: {e}",
+            )
+            return []
+
+        models = []
+        for value in values:
+            if not value:
+                continue
+            try:
+                models.append(ContainerModel(**value))
+            except Exception as e:
+                logger.debug(f"_load_session_models_async skipped: {e}")
+        return models
+
+    async def _save_container_model_async(self, model: ContainerModel) -> None:
+        """Async variant of `_save_container_model`."""
+        await self.container_mapping.aset(
+            model.container_name,
+            model.model_dump(),
+        )
+
+    async def update_heartbeat_async(
+        self,
+        session_ctx_id: str,
+        ts: Optional[float] = None,
+    ) -> float:
+        """Async variant of `update_heartbeat`."""
+        if not session_ctx_id:
+            raise ValueError("session_ctx_id is required")
+
+        ts = float(ts if ts is not None else time.time())
+        now = time.time()
+
+        for model in await self._load_session_models_async(session_ctx_id):
+            if model.state != ContainerState.RUNNING:
+                continue
+
+            model.last_active_at = ts
+            model.updated_at = now
+            model.session_ctx_id = session_ctx_id
+            await self._save_container_model_async(model)
+
+        return ts
+
+    async def needs_restore_async(self, session_ctx_id: str) -> bool:
+        """Async variant of `needs_restore`."""
+        return any(
+            model.state == ContainerState.RECYCLED
+            or model.recycled_at is not None
+            for model in await self._load_session_models_async(session_ctx_id)
+        )
+
+    async def clear_container_recycle_marker_async(
+        self,
+        identity: str,
+        *,
+        set_state: Optional[ContainerState] = None,
+    ) -> None:
+        """Async variant of `clear_container_recycle_marker`."""
+        try:
+            model = ContainerModel(**await self.get_info_async(identity))
+        except Exception as e:
+            logger.debug(f"clear_container_recycle_marker_async: {e}")
+            return
+
+        model.recycled_at = None
+        model.recycle_reason = None
+        if set_state:
+            model.state = set_state
+
+        model.updated_at = time.time()
+        await self._save_container_model_async(model)
+
+    async def get_session_ctx_id_by_identity_async(
+        self,
+        identity: str,
+    ) -> Optional[str]:
+        """Async variant of `get_session_ctx_id_by_identity`."""
+        try:
+            info_dict = await self.get_info_async(identity)
+        except RuntimeError as exc:
+            logger.debug(
+                f"get_session_ctx_id_by_identity_async: container not found "
+                f"for identity {identity}: {exc}",
+            )
+            return None
+
+        info = ContainerModel(**info_dict)
+        if info.session_ctx_id:
+            return info.session_ctx_id
+        return (info.meta or {}).get("session_ctx_id")
+
     # ---------- redis distributed lock ----------
     def _heartbeat_lock_key(self, session_ctx_id: str) -> str:
         """Build the Redis key used for heartbeat locking.
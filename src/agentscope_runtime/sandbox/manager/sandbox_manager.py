@@ -4,6 +4,7 @@
 # pylint: disable=redefined-outer-name, protected-access, too-many-branches
 # pylint: disable=too-many-public-methods, unused-argument
 import asyncio
+import contextlib
 import inspect
 import json
 import time
@@ -12,13 +13,16 @@ import logging
 import os
 import secrets
 import traceback
-from functools import wraps
-from typing import Optional, Dict, Union, List
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, wraps
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Union
 
 import requests
 import shortuuid
 import httpx
 
+from .connection_cache import ConnectionCache
 from .heartbeat_mixin import HeartbeatMixin, touch_session
 from ..constant import TIMEOUT
 from ..client import (
@@ -38,10 +42,15 @@ from ..model import (
 )
 from ..registry import SandboxRegistry
 from ...common.collections import (
+    LoopLocalRedis,
     RedisMapping,
     RedisQueue,
+    RedisSetCollection,
+    RedisSortedSetCollection,
     InMemoryMapping,
     InMemoryQueue,
+    InMemorySetCollection,
+    InMemorySortedSetCollection,
 )
 from ...common.container_clients import ContainerClientFactory
 
@@ -134,6 +143,13 @@ def remote_wrapper_async(
 
 
 class SandboxManager(HeartbeatMixin):
+    # Page size used by the watcher/cleanup loops for batched reads
+    _SCAN_BATCH_SIZE = 200
+    # Seconds before a deadline the watcher could not handle is retried
+    _WATCH_RETRY_DELAY = 5.0
+    # Bumped when the state index has to be built again on upgrade
+    _STATE_INDEX_VERSION = 1
+
     def __init__(
         self,
         config: Optional[SandboxManagerEnvConfig] = None,
@@ -198,17 +214,22 @@ class SandboxManager(HeartbeatMixin):
         self.storage_folder = self.config.storage_folder
 
         self.pool_queues = {}
+        # Per-state index of container names, kept in step with
+        # container_mapping so counting active sandboxes is O(1)
+        self.state_index = {}
         if self.config.redis_enabled:
             import redis
-
-            redis_client = redis.Redis(
-                host=self.config.redis_server,
-                port=self.config.redis_port,
-                db=self.config.redis_db,
-                username=self.config.redis_user,
-                password=self.config.redis_password,
-                decode_responses=True,
-            )
+            import redis.asyncio
+
+            redis_kwargs = {
+                "host": self.config.redis_server,
+                "port": self.config.redis_port,
+                "db": self.config.redis_db,
+                "username": self.config.redis_user,
+                "password": self.config.redis_password,
+                "decode_responses": True,
+            }
+            redis_client = redis.Redis(**redis_kwargs)
             self.redis_client = redis_client
             try:
                 self.redis_client.ping()
@@ -217,18 +238,58 @@ class SandboxManager(HeartbeatMixin):
                     "Unable to connect to the Redis server.",
                 ) from e
 
-            self.container_mapping = RedisMapping(self.redis_client)
+            # Used by the *_async methods, one client per event loop
+            self.async_redis_client = LoopLocalRedis(
+                lambda: redis.asyncio.Redis(**redis_kwargs),
+            )
+            aclient = self.async_redis_client
+
+            self.container_mapping = RedisMapping(
+                self.redis_client,
+                async_client=aclient,
+            )
             self.session_mapping = RedisMapping(
                 self.redis_client,
                 prefix="session_mapping",
+                async_client=aclient,
             )
 
             # Init multi sand box pool
             for t in self.default_type:
                 queue_key = f"{self.config.redis_container_pool_key}:{t.value}"
-                self.pool_queues[t] = RedisQueue(self.redis_client, queue_key)
+                self.pool_queues[t] = RedisQueue(
+                    self.redis_client,
+                    queue_key,
+                    async_client=aclient,
+                )
+
+            for state in ContainerState:
+                index_key = (
+                    f"{self.config.redis_container_state_index_key}:"
+                    f"{self.prefix}:{state.value}"
+                )
+                self.state_index[state] = RedisSetCollection(
+                    self.redis_client,
+                    index_key,
+                    async_client=aclient,
+                )
+
+            schedule_key = (
+                f"{self.config.redis_watch_schedule_key}:{self.prefix}"
+            )
+            self.heartbeat_schedule = RedisSortedSetCollection(
+                self.redis_client,
+                f"{schedule_key}:heartbeat",
+                async_client=aclient,
+            )
+            self.release_schedule = RedisSortedSetCollection(
+                self.redis_client,
+                f"{schedule_key}:released",
+                async_client=aclient,
+            )
         else:
             self.redis_client = None
+            self.async_redis_client = None
             self.container_mapping = InMemoryMapping()
             self.session_mapping = InMemoryMapping()
 
@@ -236,6 +297,12 @@ class SandboxManager(HeartbeatMixin):
             for t in self.default_type:
                 self.pool_queues[t] = InMemoryQueue()
 
+            for state in ContainerState:
+                self.state_index[state] = InMemorySetCollection()
+
+            self.heartbeat_schedule = InMemorySortedSetCollection()
+            self.release_schedule = InMemorySortedSetCollection()
+
         self.container_deployment = self.config.container_deployment
 
         if base_url is None:
@@ -253,13 +320,53 @@ class SandboxManager(HeartbeatMixin):
                 self.config.oss_access_key_secret,
                 self.config.oss_endpoint,
                 self.config.oss_bucket_name,
+                manifest_dir=self.config.storage_manifest_dir,
+                max_workers=self.config.oss_sync_workers,
+                multipart_threshold=self.config.oss_multipart_threshold,
+                part_size=self.config.oss_part_size,
             )
         else:
-            self.storage = LocalStorage()
+            self.storage = LocalStorage(
+                clone_mode=self.config.local_clone_mode,
+            )
+
+        # Blocking container runtime and storage calls made by the
+        # *_async methods run here, so they cannot starve the event loop's
+        # default executor
+        self._reserve_locks = weakref.WeakKeyDictionary()
+        self._blocking_executor = ThreadPoolExecutor(
+            max_workers=self.config.blocking_io_workers,
+            thread_name_prefix="sandbox-io",
+        )
+        # Warm containers are created on their own threads, so a pool
+        # refill never takes the ones serving requests
+        self._pool_refill_executor = ThreadPoolExecutor(
+            max_workers=self.config.pool_refill_workers,
+            thread_name_prefix="sandbox-pool",
+        )
+
+        # Runtime clients reused across tool calls, keyed by identity
+        self._connections = ConnectionCache(
+            max_size=self.config.connection_cache_size,
+            ttl=self.config.connection_cache_ttl,
+        )
 
         self._watcher_stop_event = threading.Event()
         self._watcher_thread = None
         self._watcher_thread_lock = threading.Lock()
+        # Set to wake the watcher early; the pool one asks for a refill
+        self._watcher_wakeup = threading.Event()
+        self._pool_refill_event = threading.Event()
+        self._watcher_metrics = {
+            "ticks": 0,
+            "total_tick_seconds": 0.0,
+            "max_tick_seconds": 0.0,
+            "last_tick": None,
+            "reaped_sessions": 0,
+            "deleted_records": 0,
+            "pool_created": 0,
+            "full_scans": 0,
+        }
 
         logger.debug(str(config))
 
@@ -281,6 +388,8 @@ class SandboxManager(HeartbeatMixin):
         self.stop_watcher()
 
         self.cleanup()
+        self._close_connections()
+        self._shutdown_executors()
 
         if self.http_session:
             try:
@@ -318,6 +427,12 @@ class SandboxManager(HeartbeatMixin):
         self.stop_watcher()
 
         await self.cleanup_async()
+        self._close_connections()
+        self._shutdown_executors()
+
+        async_redis_client = getattr(self, "async_redis_client", None)
+        if async_redis_client is not None:
+            await async_redis_client.aclose()
 
         if self.http_session:
             try:
@@ -337,6 +452,272 @@ class SandboxManager(HeartbeatMixin):
         # TODO: refactor this and mapping, use sandbox_id as identity
         return f"{self.prefix}{session_id}"
 
+    def _save_container_model(self, model: ContainerModel) -> None:
+        super()._save_container_model(model)
+        self._index_container_state(model.container_name, model.state)
+        self._schedule_deadlines(model)
+
+    async def _save_container_model_async(
+        self,
+        model: ContainerModel,
+    ) -> None:
+        await super()._save_container_model_async(model)
+        await self._index_container_state_async(
+            model.container_name,
+            model.state,
+        )
+        deadline = self._deadline_for(model)
+        if deadline:
+            schedule, member, score, gt = deadline
+            await schedule.aadd(member, score, gt=gt)
+
+    async def _run_blocking(self, func, *args, **kwargs):
+        """
+        Run a blocking call (container runtime, storage) on the manager's
+        own executor.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._blocking_executor,
+            partial(func, *args, **kwargs),
+        )
+
+    def _delete_container_model(self, identity: str) -> None:
+        self.container_mapping.delete(identity)
+        self._drop_state_index(identity)
+        self.release_schedule.remove(identity)
+
+    def _delete_container_models(self, identities: List[str]) -> None:
+        if not identities:
+            return
+        self.container_mapping.mdelete(identities)
+        self._drop_state_index(*identities)
+        self.release_schedule.remove_many(identities)
+
+    def _deadline_for(self, model: ContainerModel):
+        """
+        When the watcher next has to look at this container: the heartbeat
+        expiry of its session, or the TTL of its RELEASED record.
+
+        Returns (schedule, member, score, gt) or None.
+        """
+        if (
+            model.state == ContainerState.RUNNING
+            and model.session_ctx_id
+            and model.last_active_at is not None
+        ):
+            # gt: a stale write never moves a session's deadline back
+            return (
+                self.heartbeat_schedule,
+                model.session_ctx_id,
+                float(model.last_active_at) + self.config.heartbeat_timeout,
+                True,
+            )
+        if model.state == ContainerState.RELEASED:
+            ttl = int(getattr(self.config, "released_key_ttl", 0))
+            released_at = model.released_at or model.updated_at or 0
+            if ttl > 0 and released_at > 0:
+                return (
+                    self.release_schedule,
+                    model.container_name,
+                    float(released_at) + ttl,
+                    False,
+                )
+        return None
+
+    def _schedule_deadlines(self, model: ContainerModel) -> None:
+        deadline = self._deadline_for(model)
+        if deadline:
+            schedule, member, score, gt = deadline
+            schedule.add(member, score, gt=gt)
+
+    def _index_container_state(
+        self,
+        container_name: str,
+        state: ContainerState,
+    ) -> None:
+        """
+        Move container_name into the state index of `state`.
+        """
+        state = ContainerState(state)
+        self.state_index[state].move(
+            container_name,
+            [
+                index
+                for other_state, index in self.state_index.items()
+                if other_state != state
+            ],
+        )
+
+    async def _index_container_state_async(
+        self,
+        container_name: str,
+        state: ContainerState,
+    ) -> None:
+        state = ContainerState(state)
+        await self.state_index[state].amove(
+            container_name,
+            [
+                index
+                for other_state, index in self.state_index.items()
+                if other_state != state
+            ],
+        )
+
+    def _drop_state_index(self, *container_names: str) -> None:
+        for index in self.state_index.values():
+            index.remove_many(list(container_names))
+
+    async def _drop_state_index_async(self, *container_names: str) -> None:
+        await asyncio.gather(
+            *(
+                index.aremove_many(list(container_names))
+                for index in self.state_index.values()
+            ),
+        )
+
+    def count_active_containers(self) -> int:
+        """
+        Number of WARM/RUNNING containers according to the state index.
+        """
+        return sum(
+            self.state_index[state].size()
+            for state in (ContainerState.WARM, ContainerState.RUNNING)
+        )
+
+    async def count_active_containers_async(self) -> int:
+        sizes = await asyncio.gather(
+            *(
+                self.state_index[state].asize()
+                for state in (ContainerState.WARM, ContainerState.RUNNING)
+            ),
+        )
+        return sum(sizes)
+
+    def _reserve_instance_slot(
+        self,
+        container_name: str,
+        state: ContainerState,
+    ) -> None:
+        """
+        Claim a slot under max_sandbox_instances for container_name.
+
+        The name is indexed first and the count checked afterwards, so
+        concurrent creators (also across replicas sharing Redis) always
+        see each other and the limit can never be overshot. Raises
+        RuntimeError if no slot is available.
+        """
+        self._index_container_state(container_name, state)
+
+        limit = self.config.max_sandbox_instances
+        if limit > 0 and self.count_active_containers() > limit:
+            self._drop_state_index(container_name)
+            raise RuntimeError(
+                f"Max sandbox instances ({limit}) reached, "
+                f"refusing to create {container_name}.",
+            )
+
+    async def _reserve_instance_slot_async(
+        self,
+        container_name: str,
+        state: ContainerState,
+    ) -> None:
+        """
+        Async variant of `_reserve_instance_slot`.
+
+        Reservations on one loop are serialized: otherwise concurrent
+        creates would all index themselves before any of them counts,
+        and every one of them would back off.
+        """
+        loop = asyncio.get_running_loop()
+        lock = self._reserve_locks.get(loop)
+        if lock is None:
+            lock = self._reserve_locks.setdefault(loop, asyncio.Lock())
+
+        async with lock:
+            await self._index_container_state_async(container_name, state)
+
+            limit = self.config.max_sandbox_instances
+            if (
+                limit > 0
+                and await self.count_active_containers_async() > limit
+            ):
+                await self._drop_state_index_async(container_name)
+                raise RuntimeError(
+                    f"Max sandbox instances ({limit}) reached, "
+                    f"refusing to create {container_name}.",
+                )
+
+    def ensure_state_index(self) -> Optional[dict]:
+        """
+        Build the per-state container index if it was never built, e.g.
+        after upgrading from a version without it.
+
+        Only the first manager to find it missing builds it, and only
+        adds the containers found in container_mapping, so slots reserved
+        by the creates of live replicas are kept. Returns the rebuild
+        result, or None if there was nothing to build.
+        """
+        if self.redis_client is None:
+            # In-memory records start out empty along with the index
+            return None
+        version_key = (
+            f"{self.config.redis_container_state_index_key}:"
+            f"{self.prefix}:version"
+        )
+        if not self.redis_client.set(
+            version_key,
+            self._STATE_INDEX_VERSION,
+            nx=True,
+        ):
+            return None
+        return self.rebuild_state_index(prune=False)
+
+    @remote_wrapper()
+    def rebuild_state_index(self, prune: bool = True) -> dict:
+        """
+        Rebuild the per-state container index from a full scan of
+        container_mapping.
+
+        An admin step to repair drift. With ``prune``, index entries
+        without a record are removed, which also drops the slots reserved
+        by in-flight creates not yet persisted, so only run it while no
+        creates are in progress on any replica.
+        """
+        result = {
+            "scanned": 0,
+            "added": 0,
+            "removed": 0,
+            "errors": 0,
+        }
+
+        expected = {state: set() for state in ContainerState}
+        for _, container_json in self.container_mapping.scan_items(
+            self.prefix,
+            count=self._SCAN_BATCH_SIZE,
+        ):
+            result["scanned"] += 1
+            try:
+                cm = ContainerModel(**container_json)
+            except Exception:
+                # ignore broken records
+                result["errors"] += 1
+                continue
+            expected[cm.state].add(cm.container_name)
+
+        for state, index in self.state_index.items():
+            current = set(index.to_list())
+            for container_name in expected[state] - current:
+                index.add(container_name)
+                result["added"] += 1
+            if not prune:
+                continue
+            for container_name in current - expected[state]:
+                index.remove(container_name)
+                result["removed"] += 1
+
+        return result
+
     def _make_request(self, method: str, endpoint: str, data: dict):
         """
         Make an HTTP request to the specified endpoint.
@@ -437,11 +818,64 @@ class SandboxManager(HeartbeatMixin):
 
         return response.json()
 
+    def _stream_request(self, endpoint: str, data: dict) -> Iterator[dict]:
+        """
+        POST to an NDJSON streaming endpoint of the manager server and
+        yield decoded events.
+        """
+        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        try:
+            with self.http_session.post(
+                url,
+                json=data,
+                stream=True,
+                timeout=(TIMEOUT, None),
+            ) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if line:
+                        yield json.loads(line)
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Error making stream request: {e}")
+            yield {"type": "error", "text": str(e)}
+
+    async def _stream_request_async(
+        self,
+        endpoint: str,
+        data: dict,
+    ) -> AsyncIterator[dict]:
+        """
+        Asynchronously POST to an NDJSON streaming endpoint of the manager
+        server and yield decoded events.
+        """
+        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        try:
+            async with self.httpx_client.stream(
+                "POST",
+                url,
+                json=data,
+                timeout=httpx.Timeout(TIMEOUT, read=None),
+            ) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if line:
+                        yield json.loads(line)
+        except httpx.HTTPError as e:
+            logger.error(f"Error making stream request: {e}")
+            yield {"type": "error", "text": str(e)}
+
     def start_watcher(self) -> bool:
         """
-        Start background heartbeat scanning thread.
+        Start background watcher thread.
         Default: not started automatically. Caller must invoke explicitly.
         If watcher_scan_interval == 0 => disabled, returns False.
+
+        The watcher is deadline driven: each tick only handles sessions
+        whose heartbeat expired and RELEASED records whose TTL ran out,
+        and refills the pool only after containers were taken from it.
+        It sleeps until the next deadline, at most `interval` seconds.
+        A full scan rebuilds the schedule on start and then every
+        watcher_full_scan_interval seconds.
         """
         interval = int(self.config.watcher_scan_interval)
         if interval <= 0:
@@ -450,6 +884,8 @@ class SandboxManager(HeartbeatMixin):
             )
             return False
 
+        full_scan_interval = int(self.config.watcher_full_scan_interval)
+
         with self._watcher_thread_lock:
             if self._watcher_thread and self._watcher_thread.is_alive():
                 return True  # already running
@@ -458,22 +894,30 @@ class SandboxManager(HeartbeatMixin):
 
             def _loop():
                 logger.info(f"Watcher started, interval={interval}s")
+                last_full_scan = None
                 while not self._watcher_stop_event.is_set():
                     try:
-                        hb = self.scan_heartbeat_once()
-                        pool = self.scan_pool_once()
-                        gc = self.scan_released_cleanup_once()
-
-                        logger.debug(
-                            "watcher metrics: "
-                            f"heartbeat={hb}, pool={pool}, released_gc={gc}",
-                        )
+                        if last_full_scan is None or (
+                            full_scan_interval > 0
+                            and time.monotonic() - last_full_scan
+                            >= full_scan_interval
+                        ):
+                            last_full_scan = time.monotonic()
+                            self.rebuild_watch_schedule()
+                            # also catches pool drift, e.g. containers
+                            # taken by another replica
+                            self._pool_refill_event.set()
+
+                        self.watcher_tick()
                     except Exception as e:
                         logger.warning(f"Watcher loop error: {e}")
                         logger.debug(traceback.format_exc())
 
-                    # wait with stop support
-                    self._watcher_stop_event.wait(interval)
+                    # wait with stop / wakeup support
+                    self._watcher_wakeup.wait(
+                        self._next_watch_delay(interval),
+                    )
+                    self._watcher_wakeup.clear()
 
                 logger.info("Watcher stopped")
 
@@ -492,6 +936,7 @@ class SandboxManager(HeartbeatMixin):
         """
         with self._watcher_thread_lock:
             self._watcher_stop_event.set()
+            self._watcher_wakeup.set()
             t = self._watcher_thread
 
         if t and t.is_alive():
@@ -501,6 +946,173 @@ class SandboxManager(HeartbeatMixin):
             if self._watcher_thread is t:
                 self._watcher_thread = None
 
+    def _request_pool_refill(self) -> None:
+        self._pool_refill_event.set()
+        self._watcher_wakeup.set()
+
+    def _next_watch_delay(self, interval: float) -> float:
+        """
+        Seconds until the earliest scheduled deadline, capped at interval
+        so deadlines added by other replicas are still picked up.
+        """
+        delay = float(interval)
+        for schedule in (self.heartbeat_schedule, self.release_schedule):
+            try:
+                head = schedule.peek_min()
+            except Exception as e:
+                logger.debug(f"peek schedule failed: {e}")
+                continue
+            if head is not None:
+                delay = min(delay, head[1] - time.time())
+        return max(delay, 0.0)
+
+    def watcher_tick(self) -> dict:
+        """
+        Run one watcher iteration and record its metrics.
+        """
+        start = time.perf_counter()
+
+        hb = self.process_due_heartbeats()
+        if self._pool_refill_event.is_set():
+            self._pool_refill_event.clear()
+            pool = self.scan_pool_once()
+        else:
+            pool = None
+        gc = self.process_due_releases()
+
+        elapsed = time.perf_counter() - start
+        tick = {
+            "tick_seconds": elapsed,
+            "heartbeat": hb,
+            "pool": pool,
+            "released_gc": gc,
+        }
+
+        metrics = self._watcher_metrics
+        metrics["ticks"] += 1
+        metrics["total_tick_seconds"] += elapsed
+        metrics["max_tick_seconds"] = max(
+            metrics["max_tick_seconds"],
+            elapsed,
+        )
+        metrics["last_tick"] = tick
+        metrics["reaped_sessions"] += hb["reaped_sessions"]
+        metrics["deleted_records"] += gc["deleted"]
+        if pool:
+            metrics["pool_created"] += pool["created"]
+
+        if hb["due"] or gc["due"] or pool:
+            logger.debug(f"watcher metrics: {tick}")
+        return tick
+
+    @remote_wrapper()
+    def get_watcher_metrics(self) -> dict:
+        """
+        Aggregate watcher metrics plus the last tick and schedule sizes.
+        """
+        metrics = dict(self._watcher_metrics)
+        ticks = metrics["ticks"]
+        metrics["avg_tick_seconds"] = (
+            metrics["total_tick_seconds"] / ticks if ticks else 0.0
+        )
+        metrics["heartbeat_schedule_size"] = self.heartbeat_schedule.size()
+        metrics["release_schedule_size"] = self.release_schedule.size()
+        return metrics
+
+    @remote_wrapper()
+    def rebuild_watch_schedule(self) -> dict:
+        """
+        Rebuild the watcher deadlines from a full scan of session_mapping
+        and container_mapping.
+
+        Existing deadlines are only ever pushed later, so it is safe to
+        run while the watcher is active.
+        """
+        timeout = int(self.config.heartbeat_timeout)
+        ttl = int(getattr(self.config, "released_key_ttl", 0))
+        result = {
+            "sessions": 0,
+            "released": 0,
+            "errors": 0,
+        }
+
+        for (
+            session_ctx_id,
+            has_running,
+            last_active,
+        ) in self._iter_session_heartbeats():
+            if has_running and last_active is not None:
+                self.heartbeat_schedule.add(
+                    session_ctx_id,
+                    last_active + timeout,
+                    gt=True,
+                )
+                result["sessions"] += 1
+
+        if ttl > 0:
+            for _, container_json in self.container_mapping.scan_items(
+                self.prefix,
+                count=self._SCAN_BATCH_SIZE,
+            ):
+                try:
+                    cm = ContainerModel(**container_json)
+                except Exception:
+                    result["errors"] += 1
+                    continue
+                if cm.state != ContainerState.RELEASED:
+                    continue
+                released_at = cm.released_at or cm.updated_at or 0
+                if released_at > 0:
+                    self.release_schedule.add(
+                        cm.container_name,
+                        float(released_at) + ttl,
+                    )
+                    result["released"] += 1
+
+        self._watcher_metrics["full_scans"] += 1
+        return result
+
+    def prepull_images(self, scope: Optional[str] = None) -> dict:
+        """
+        Pull the sandbox images in parallel, so the first sandboxes of each
+        type do not wait for their image.
+
+        Args:
+            scope: ``"default"`` for the images of the default sandbox
+                types, ``"all"`` for those of all registered sandbox types,
+                ``"none"`` for none. Defaults to ``config.image_prepull``.
+
+        Returns:
+            dict: Whether each image is present.
+        """
+        scope = scope or self.config.image_prepull
+        if scope == "none" or self.client is None:
+            return {}
+
+        if scope == "all":
+            configs = list(SandboxRegistry.list_all_sandboxes().values())
+        else:
+            configs = [
+                SandboxRegistry.get_config_by_type(t)
+                for t in self.default_type
+            ]
+        images = [config.image_name for config in configs if config]
+
+        start = time.time()
+        results = self.client.pull_images(
+            images,
+            max_workers=self.config.image_pull_workers,
+        )
+        if results:
+            missing = [image for image, ok in results.items() if not ok]
+            logger.info(
+                f"Pre-pulled {len(results) - len(missing)}/{len(results)} "
+                f"sandbox images in {time.time() - start:.1f}s",
+            )
+            if missing:
+                logger.warning(f"Failed to pre-pull images: {missing}")
+        return results
+
     @remote_wrapper()
     def cleanup(self):
         """
@@ -513,6 +1125,7 @@ class SandboxManager(HeartbeatMixin):
         - Does NOT delete ContainerModel records from container_mapping;
             instead it relies on release() to mark them as terminal (RELEASED).
         - Skips containers already in terminal states: RELEASED / RECYCLED.
+        - Stops the manager's worker threads, as it is torn down.
 
         Notes:
         - Uses container_name as identity to avoid ambiguity with session_id.
@@ -524,37 +1137,40 @@ class SandboxManager(HeartbeatMixin):
         # terminal states)
         for queue in self.pool_queues.values():
             try:
-                while queue.size() > 0:
-                    container_json = queue.dequeue()
-                    if not container_json:
-                        continue
+                while True:
+                    batch = queue.dequeue_many(self._SCAN_BATCH_SIZE)
+                    if not batch:
+                        break
 
-                    container_model = ContainerModel(**container_json)
+                    for container_json in batch:
+                        if not container_json:
+                            continue
 
-                    # Terminal states: already cleaned logically
-                    if container_model.state in (
-                        ContainerState.RELEASED,
-                        ContainerState.RECYCLED,
-                    ):
-                        continue
+                        container_model = ContainerModel(**container_json)
 
-                    logger.debug(
-                        f"Destroy pool container"
-                        f" {container_model.container_id} "
-                        f"({container_model.container_name})",
-                    )
-                    # Use container_name to avoid ambiguity
-                    self.release(container_model.container_name)
+                        # Terminal states: already cleaned logically
+                        if container_model.state in (
+                            ContainerState.RELEASED,
+                            ContainerState.RECYCLED,
+                        ):
+                            continue
+
+                        logger.debug(
+                            f"Destroy pool container"
+                            f" {container_model.container_id} "
+                            f"({container_model.container_name})",
+                        )
+                        # Use container_name to avoid ambiguity
+                        self.release(container_model.container_name)
             except Exception as e:
                 logger.error(f"Error cleaning up runtime pool: {e}")
 
         # Clean up remaining containers in mapping
-        for key in self.container_mapping.scan(self.prefix):
+        for key, container_json in self.container_mapping.scan_items(
+            self.prefix,
+            count=self._SCAN_BATCH_SIZE,
+        ):
             try:
-                container_json = self.container_mapping.get(key)
-                if not container_json:
-                    continue
-
                 container_model = ContainerModel(**container_json)
 
                 # Terminal states: already cleaned logically
@@ -572,11 +1188,83 @@ class SandboxManager(HeartbeatMixin):
             except Exception as e:
                 logger.error(f"Error cleaning up container {key}: {e}")
 
+        self._shutdown_executors()
+
     @remote_wrapper_async()
     async def cleanup_async(self, *args, **kwargs):
         """Async wrapper for cleanup()."""
         return await asyncio.to_thread(self.cleanup, *args, **kwargs)
 
+    def _pooled_container_problem(
+        self,
+        container_model: ContainerModel,
+        sandbox_type: SandboxType,
+    ) -> Optional[str]:
+        """
+        Return why a container taken from the pool can't be used, or None.
+        """
+        if container_model.version != SandboxRegistry.get_image_by_type(
+            sandbox_type,
+        ):
+            return f"Container {container_model.session_id} outdated"
+
+        if self.client.inspect(container_model.container_id) is None:
+            return f"Container {container_model.container_id} not found"
+
+        status = self.client.get_status(container_model.container_id)
+        if status != "running":
+            return (
+                f"Container {container_model.container_id} not running "
+                f"({status})"
+            )
+        return None
+
+    @staticmethod
+    def _bind_pool_meta(container_model: ContainerModel, meta: Dict) -> None:
+        session_ctx_id = meta.get("session_ctx_id")
+
+        container_model.meta = meta
+        container_model.session_ctx_id = session_ctx_id
+        container_model.state = (
+            ContainerState.RUNNING if session_ctx_id else ContainerState.WARM
+        )
+        container_model.recycled_at = None
+        container_model.recycle_reason = None
+        container_model.updated_at = time.time()
+
+    def _attach_session(self, container_name: str, session_ctx_id: str):
+        """
+        Add container_name to the session mapping and send the session's
+        first heartbeat (allocation counts as activity).
+        """
+        env_ids = self.session_mapping.get(session_ctx_id) or []
+        if container_name not in env_ids:
+            env_ids.append(container_name)
+            self.session_mapping.set(session_ctx_id, env_ids)
+
+        # Session is alive again; clear restore-required marker
+        self.clear_container_recycle_marker(
+            container_name,
+            set_state=ContainerState.RUNNING,
+        )
+        self.update_heartbeat(session_ctx_id)
+
+    async def _attach_session_async(
+        self,
+        container_name: str,
+        session_ctx_id: str,
+    ):
+        env_ids = await self.session_mapping.aget(session_ctx_id) or []
+        if container_name not in env_ids:
+            env_ids.append(container_name)
+            await self.session_mapping.aset(session_ctx_id, env_ids)
+
+        await self.clear_container_recycle_marker_async(
+            container_name,
+            set_state=ContainerState.RUNNING,
+        )
+        await self.update_heartbeat_async(session_ctx_id)
+
     @remote_wrapper()
     def create_from_pool(self, sandbox_type=None, meta: Optional[Dict] = None):
         """Try to get a container from runtime pool"""
@@ -588,148 +1276,122 @@ class SandboxManager(HeartbeatMixin):
 
         queue = self.pool_queues[sandbox_type]
 
-        def _bind_meta(container_model: ContainerModel):
-            if not meta:
-                return
+        try:
+            # 1) Try dequeue first
+            container_json = queue.dequeue()
+            if container_json:
+                self._request_pool_refill()
+                container_model = ContainerModel(**container_json)
 
-            session_ctx_id = meta.get("session_ctx_id")
+                problem = self._pooled_container_problem(
+                    container_model,
+                    sandbox_type,
+                )
+                if problem:
+                    logger.warning(f"{problem}, dropping it")
+                    self.release(container_model.container_name)
+                else:
+                    # if still valid, bind meta and return
+                    if meta:
+                        self._bind_pool_meta(container_model, meta)
+                        # persist first
+                        self._save_container_model(container_model)
+                        if container_model.session_ctx_id:
+                            self._attach_session(
+                                container_model.container_name,
+                                container_model.session_ctx_id,
+                            )
+                    logger.debug(
+                        f"Retrieved container from pool:"
+                        f" {container_model.session_id}",
+                    )
+                    return container_model.container_name
 
-            container_model.meta = meta
-            container_model.session_ctx_id = session_ctx_id
-            container_model.state = (
-                ContainerState.RUNNING
-                if session_ctx_id
-                else ContainerState.WARM
-            )
-            container_model.recycled_at = None
-            container_model.recycle_reason = None
-            container_model.updated_at = time.time()
+            # 2) Pool empty or invalid -> create a new one and return
+            return self.create(sandbox_type=sandbox_type.value, meta=meta)
 
-            # persist first
-            self.container_mapping.set(
-                container_model.container_name,
-                container_model.model_dump(),
+        except Exception as e:
+            logger.warning(
+                "Error getting container from pool, create a new one.",
             )
+            logger.debug(f"{e}: {traceback.format_exc()}")
+            return self.create(sandbox_type=sandbox_type.value, meta=meta)
 
-            # session mapping + first heartbeat only when session_ctx_id exists
-            if session_ctx_id:
-                env_ids = self.session_mapping.get(session_ctx_id) or []
-                if container_model.container_name not in env_ids:
-                    env_ids.append(container_model.container_name)
+    @remote_wrapper_async()
+    async def create_from_pool_async(
+        self,
+        sandbox_type=None,
+        meta: Optional[Dict] = None,
+    ):
+        """Async variant of create_from_pool()."""
+        sandbox_type = SandboxType(sandbox_type or self.default_type[0])
 
-                self.session_mapping.set(session_ctx_id, env_ids)
+        if sandbox_type not in self.pool_queues:
+            return await self.create_async(
+                sandbox_type=sandbox_type.value,
+                meta=meta,
+            )
 
-                self.clear_container_recycle_marker(
-                    container_model.container_name,
-                    set_state=ContainerState.RUNNING,
-                )
-                self.update_heartbeat(session_ctx_id)
+        queue = self.pool_queues[sandbox_type]
 
         try:
-            # 1) Try dequeue first
-            container_json = queue.dequeue()
+            container_json = await queue.adequeue()
             if container_json:
+                self._request_pool_refill()
                 container_model = ContainerModel(**container_json)
 
-                # version check
-                if (
-                    container_model.version
-                    != SandboxRegistry.get_image_by_type(sandbox_type)
-                ):
-                    logger.warning(
-                        f"Container {container_model.session_id} outdated, "
-                        "dropping it",
-                    )
-                    self.release(container_model.container_name)
-                    container_json = None
+                problem = await self._run_blocking(
+                    self._pooled_container_problem,
+                    container_model,
+                    sandbox_type,
+                )
+                if problem:
+                    logger.warning(f"{problem}, dropping it")
+                    await self.release_async(container_model.container_name)
                 else:
-                    # inspect + status check
-                    if (
-                        self.client.inspect(
-                            container_model.container_id,
-                        )
-                        is None
-                    ):
-                        logger.warning(
-                            f"Container {container_model.container_id} not "
-                            f"found, dropping it",
+                    if meta:
+                        self._bind_pool_meta(container_model, meta)
+                        await self._save_container_model_async(
+                            container_model,
                         )
-                        self.release(container_model.container_name)
-                        container_json = None
-                    else:
-                        status = self.client.get_status(
-                            container_model.container_id,
-                        )
-                        if status != "running":
-                            logger.warning(
-                                f"Container {container_model.container_id} "
-                                f"not running ({status}), dropping it",
+                        if container_model.session_ctx_id:
+                            await self._attach_session_async(
+                                container_model.container_name,
+                                container_model.session_ctx_id,
                             )
-                            self.release(container_model.container_name)
-                            container_json = None
-
-                # if still valid, bind meta and return
-                if container_json:
-                    _bind_meta(container_model)
                     logger.debug(
                         f"Retrieved container from pool:"
                         f" {container_model.session_id}",
                     )
                     return container_model.container_name
 
-            # 2) Pool empty or invalid -> create a new one and return
-            return self.create(sandbox_type=sandbox_type.value, meta=meta)
+            return await self.create_async(
+                sandbox_type=sandbox_type.value,
+                meta=meta,
+            )
 
         except Exception as e:
             logger.warning(
                 "Error getting container from pool, create a new one.",
             )
             logger.debug(f"{e}: {traceback.format_exc()}")
-            return self.create(sandbox_type=sandbox_type.value, meta=meta)
-
-    @remote_wrapper_async()
-    async def create_from_pool_async(self, *args, **kwargs):
-        """Async wrapper for create_from_pool()."""
-        return await asyncio.to_thread(self.create_from_pool, *args, **kwargs)
+            return await self.create_async(
+                sandbox_type=sandbox_type.value,
+                meta=meta,
+            )
 
-    @remote_wrapper()
-    def create(
+    def _prepare_create(
         self,
         sandbox_type=None,
         mount_dir=None,
         storage_path=None,
         environment: Optional[Dict] = None,
         meta: Optional[Dict] = None,
-    ):  # pylint: disable=too-many-return-statements
-        # Enforce max sandbox instances
-        try:
-            limit = self.config.max_sandbox_instances
-            if limit > 0:
-                # Count only ACTIVE containers; exclude terminal states
-                active_states = {
-                    ContainerState.WARM,
-                    ContainerState.RUNNING,
-                }
-                current = 0
-                for key in self.container_mapping.scan(self.prefix):
-                    try:
-                        container_json = self.container_mapping.get(key)
-                        if not container_json:
-                            continue
-                        cm = ContainerModel(**container_json)
-                        if cm.state in active_states:
-                            current += 1
-                    except Exception:
-                        # ignore broken records
-                        continue
-        except RuntimeError as e:
-            logger.warning(str(e))
-            return None
-        except Exception:
-            # Handle unexpected errors from container_mapping.scan() gracefully
-            logger.exception("Failed to check sandbox instance limit")
-            return None
-
+    ) -> Optional[dict]:
+        """
+        Resolve everything create() needs before touching the container
+        runtime. Returns None if the request is invalid.
+        """
         session_ctx_id = None
         if meta and meta.get("session_ctx_id"):
             session_ctx_id = meta["session_ctx_id"]
@@ -748,7 +1410,6 @@ class SandboxManager(HeartbeatMixin):
             config = SandboxRegistry.get_config_by_type(
                 self.default_type[0],
             )
-        image = config.image_name
 
         environment = {
             **(config.environment if config.environment else {}),
@@ -792,128 +1453,184 @@ class SandboxManager(HeartbeatMixin):
                     session_id,
                 )
 
+        return {
+            "session_id": session_id,
+            "session_ctx_id": session_ctx_id,
+            "container_name": self._generate_container_key(session_id),
+            "sandbox_type": target_sandbox_type,
+            "config": config,
+            "environment": environment,
+            "mount_dir": mount_dir,
+            "storage_path": storage_path,
+            "meta": meta,
+            "state": ContainerState.RUNNING
+            if session_ctx_id
+            else ContainerState.WARM,
+        }
+
+    def _download_workspace(self, spec: dict) -> None:
         if (
-            mount_dir
-            and storage_path
+            spec["mount_dir"]
+            and spec["storage_path"]
             and self.container_deployment != "agentrun"
             and self.container_deployment != "fc"
         ):
-            self.storage.download_folder(storage_path, mount_dir)
+            self.storage.download_folder(
+                spec["storage_path"],
+                spec["mount_dir"],
+            )
+
+    def _launch_container(self, spec: dict) -> Optional[ContainerModel]:
+        """
+        Create and check the container described by spec (blocking).
+        Returns its model, or None if it did not come up.
+        """
+        container_name = spec["container_name"]
+        mount_dir = spec["mount_dir"]
+        config = spec["config"]
+        image = config.image_name
 
         # Check for an existing container with the same name
-        container_name = self._generate_container_key(session_id)
-        try:
-            if self.client.inspect(container_name):
-                raise ValueError(
-                    f"Container with name {container_name} already exists.",
-                )
+        if self.client.inspect(container_name):
+            raise ValueError(
+                f"Container with name {container_name} already exists.",
+            )
 
-            # Generate a random secret token
-            runtime_token = secrets.token_hex(16)
+        # Generate a random secret token
+        runtime_token = secrets.token_hex(16)
 
-            # Prepare volume bindings if a mount directory is provided
-            if (
-                mount_dir
-                and self.container_deployment != "agentrun"
-                and self.container_deployment != "fc"
-            ):
-                volume_bindings = {
-                    mount_dir: {
-                        "bind": self.workdir,
-                        "mode": "rw",
-                    },
-                }
-            else:
-                volume_bindings = {}
-
-            if self.readonly_mounts:
-                for host_path, container_path in self.readonly_mounts.items():
-                    if not os.path.isabs(host_path):
-                        host_path = os.path.abspath(host_path)
-                    volume_bindings[host_path] = {
-                        "bind": container_path,
-                        "mode": "ro",
-                    }
-
-            _id, ports, ip, *rest = self.client.create(
-                image,
-                name=container_name,
-                ports=["80/tcp"],  # Nginx
-                volumes=volume_bindings,
-                environment={
-                    "SECRET_TOKEN": runtime_token,
-                    "NGINX_TIMEOUT": str(TIMEOUT) if TIMEOUT else "60",
-                    **environment,
+        # Prepare volume bindings if a mount directory is provided
+        if (
+            mount_dir
+            and self.container_deployment != "agentrun"
+            and self.container_deployment != "fc"
+        ):
+            volume_bindings = {
+                mount_dir: {
+                    "bind": self.workdir,
+                    "mode": "rw",
                 },
-                runtime_config=config.runtime_config,
-            )
+            }
+        else:
+            volume_bindings = {}
+
+        if self.readonly_mounts:
+            for host_path, container_path in self.readonly_mounts.items():
+                if not os.path.isabs(host_path):
+                    host_path = os.path.abspath(host_path)
+                volume_bindings[host_path] = {
+                    "bind": container_path,
+                    "mode": "ro",
+                }
 
-            http_protocol = "http"
-            if rest and rest[0] == "https":
-                http_protocol = "https"
+        _id, ports, ip, *rest = self.client.create(
+            image,
+            name=container_name,
+            ports=["80/tcp"],  # Nginx
+            volumes=volume_bindings,
+            environment={
+                "SECRET_TOKEN": runtime_token,
+                "NGINX_TIMEOUT": str(TIMEOUT) if TIMEOUT else "60",
+                **spec["environment"],
+            },
+            runtime_config=config.runtime_config,
+        )
 
-            if _id is None:
-                return None
+        http_protocol = "http"
+        if rest and rest[0] == "https":
+            http_protocol = "https"
 
-            # Check the container status
-            status = self.client.get_status(container_name)
-            if self.client.get_status(container_name) != "running":
-                logger.warning(
-                    f"Container {container_name} is not running. Current "
-                    f"status: {status}",
-                )
-                return None
+        if _id is None:
+            return None
 
-            # TODO: update ContainerModel according to images & backend
-            container_model = ContainerModel(
-                session_id=session_id,
-                container_id=_id,
-                container_name=container_name,
-                url=f"{http_protocol}://{ip}:{ports[0]}",
-                ports=[ports[0]],
-                mount_dir=str(mount_dir),
-                storage_path=storage_path,
-                runtime_token=runtime_token,
-                version=image,
-                meta=meta or {},
-                timeout=config.timeout,
-                sandbox_type=target_sandbox_type.value,
-                session_ctx_id=session_ctx_id,
-                state=ContainerState.RUNNING
-                if session_ctx_id
-                else ContainerState.WARM,
-                updated_at=time.time(),
+        # Check the container status
+        status = self.client.get_status(container_name)
+        if status != "running":
+            logger.warning(
+                f"Container {container_name} is not running. Current "
+                f"status: {status}",
             )
+            return None
+
+        # TODO: update ContainerModel according to images & backend
+        return ContainerModel(
+            session_id=spec["session_id"],
+            container_id=_id,
+            container_name=container_name,
+            url=f"{http_protocol}://{ip}:{ports[0]}",
+            ports=[ports[0]],
+            mount_dir=str(mount_dir),
+            storage_path=spec["storage_path"],
+            runtime_token=runtime_token,
+            version=image,
+            meta=spec["meta"] or {},
+            timeout=config.timeout,
+            sandbox_type=spec["sandbox_type"].value,
+            session_ctx_id=spec["session_ctx_id"],
+            state=spec["state"],
+            updated_at=time.time(),
+        )
+
+    @remote_wrapper()
+    def create(
+        self,
+        sandbox_type=None,
+        mount_dir=None,
+        storage_path=None,
+        environment: Optional[Dict] = None,
+        meta: Optional[Dict] = None,
+    ):
+        # Enforce max sandbox instances (fast path, the slot itself is
+        # reserved right before the container is created)
+        try:
+            limit = self.config.max_sandbox_instances
+            if limit > 0 and self.count_active_containers() >= limit:
+                raise RuntimeError(
+                    f"Max sandbox instances ({limit}) reached.",
+                )
+        except RuntimeError as e:
+            logger.warning(str(e))
+            return None
+        except Exception:
+            # Handle unexpected errors from the state index gracefully
+            logger.exception("Failed to check sandbox instance limit")
+            return None
+
+        spec = self._prepare_create(
+            sandbox_type,
+            mount_dir,
+            storage_path,
+            environment,
+            meta,
+        )
+        if spec is None:
+            return None
+
+        self._download_workspace(spec)
+
+        container_name = spec["container_name"]
+        try:
+            self._reserve_instance_slot(container_name, spec["state"])
+        except RuntimeError as e:
+            logger.warning(str(e))
+            return None
+
+        try:
+            container_model = self._launch_container(spec)
+            if container_model is None:
+                self._drop_state_index(container_name)
+                return None
 
             # Register in mapping
-            self.container_mapping.set(
-                container_model.container_name,
-                container_model.model_dump(),
-            )
+            self._save_container_model(container_model)
 
-            # Build mapping session_ctx_id to container_name
             # NOTE:
             # - Only containers bound to a user session_ctx_id participate
             #   in heartbeat/reap.
             # - Prewarmed pool containers typically have no session_ctx_id;
             #   do NOT write heartbeat for them.
-            if meta and "session_ctx_id" in meta and meta["session_ctx_id"]:
-                session_ctx_id = meta["session_ctx_id"]
-
-                env_ids = self.session_mapping.get(session_ctx_id) or []
-                if container_model.container_name not in env_ids:
-                    env_ids.append(container_model.container_name)
-                self.session_mapping.set(session_ctx_id, env_ids)
-
-                # First heartbeat on creation (treat "allocate to session"
-                # as first activity)
-                self.update_heartbeat(session_ctx_id)
-
-                # Session is now alive again; clear restore-required marker
-                self.clear_container_recycle_marker(
-                    container_model.container_name,
-                    set_state=ContainerState.RUNNING,
-                )
+            if spec["session_ctx_id"]:
+                self._attach_session(container_name, spec["session_ctx_id"])
 
             logger.debug(
                 f"Created container {container_name}"
@@ -925,13 +1642,139 @@ class SandboxManager(HeartbeatMixin):
                 f"Failed to create container: {e}",
             )
             logger.debug(f"{traceback.format_exc()}")
+            self._drop_state_index(container_name)
             self.release(identity=container_name)
             return None
 
     @remote_wrapper_async()
-    async def create_async(self, *args, **kwargs):
-        """Async wrapper for create()."""
-        return await asyncio.to_thread(self.create, *args, **kwargs)
+    async def create_async(
+        self,
+        sandbox_type=None,
+        mount_dir=None,
+        storage_path=None,
+        environment: Optional[Dict] = None,
+        meta: Optional[Dict] = None,
+    ):
+        """Async variant of create()."""
+        try:
+            limit = self.config.max_sandbox_instances
+            if limit > 0 and await self.count_active_containers_async() >= (
+                limit
+            ):
+                raise RuntimeError(
+                    f"Max sandbox instances ({limit}) reached.",
+                )
+        except RuntimeError as e:
+            logger.warning(str(e))
+            return None
+        except Exception:
+            logger.exception("Failed to check sandbox instance limit")
+            return None
+
+        spec = self._prepare_create(
+            sandbox_type,
+            mount_dir,
+            storage_path,
+            environment,
+            meta,
+        )
+        if spec is None:
+            return None
+
+        await self._run_blocking(self._download_workspace, spec)
+
+        container_name = spec["container_name"]
+        try:
+            await self._reserve_instance_slot_async(
+                container_name,
+                spec["state"],
+            )
+        except RuntimeError as e:
+            logger.warning(str(e))
+            return None
+
+        try:
+            container_model = await self._run_blocking(
+                self._launch_container,
+                spec,
+            )
+            if container_model is None:
+                await self._drop_state_index_async(container_name)
+                return None
+
+            await self._save_container_model_async(container_model)
+
+            if spec["session_ctx_id"]:
+                await self._attach_session_async(
+                    container_name,
+                    spec["session_ctx_id"],
+                )
+
+            logger.debug(
+                f"Created container {container_name}"
+                f":{container_model.model_dump()}",
+            )
+            return container_name
+        except Exception as e:
+            logger.warning(
+                f"Failed to create container: {e}",
+            )
+            logger.debug(f"{traceback.format_exc()}")
+            await self._drop_state_index_async(container_name)
+            await self.release_async(identity=container_name)
+            return None
+
+    @staticmethod
+    def _mark_released(container_info: ContainerModel) -> Optional[str]:
+        """
+        Mark the model RELEASED and unbind it from its session.
+        Returns the session_ctx_id it was bound to.
+        """
+        session_ctx_id = container_info.session_ctx_id or (
+            container_info.meta or {}
+        ).get("session_ctx_id")
+
+        # Mark released (do NOT delete mapping) in model
+        now = time.time()
+        container_info.state = ContainerState.RELEASED
+        container_info.released_at = now
+        container_info.updated_at = now
+        container_info.recycled_at = None
+        container_info.recycle_reason = None
+
+        # Unbind session in model
+        container_info.session_ctx_id = None
+        if container_info.meta is None:
+            container_info.meta = {}
+        container_info.meta.pop("session_ctx_id", None)
+        return session_ctx_id
+
+    def _destroy_container(self, container_info: ContainerModel) -> None:
+        """Stop and remove the container, then upload its workspace."""
+        try:
+            self.client.stop(container_info.container_id, timeout=1)
+        except Exception as e:
+            logger.debug(
+                f"release stop ignored for"
+                f" {container_info.container_id}: {e}",
+            )
+
+        try:
+            self.client.remove(container_info.container_id, force=True)
+        except Exception as e:
+            logger.debug(
+                f"release remove ignored for"
+                f" {container_info.container_id}: {e}",
+            )
+
+        logger.debug(f"Container {container_info.container_name} destroyed.")
+
+        # Upload to storage
+        if container_info.mount_dir and container_info.storage_path:
+            self.storage.upload_folder(
+                container_info.mount_dir,
+                container_info.storage_path,
+            )
 
     @remote_wrapper()
     def release(self, identity):
@@ -950,11 +1793,15 @@ class SandboxManager(HeartbeatMixin):
 
             container_info = ContainerModel(**container_json)
 
-            # remove session key in mapping
-            session_ctx_id = container_info.session_ctx_id or (
-                container_info.meta or {}
-            ).get("session_ctx_id")
+            self._invalidate_connections(
+                identity,
+                container_info.container_name,
+                container_info.session_id,
+            )
 
+            session_ctx_id = self._mark_released(container_info)
+
+            # remove session key in mapping
             if session_ctx_id:
                 env_ids = self.session_mapping.get(session_ctx_id) or []
                 env_ids = [
@@ -969,67 +1816,120 @@ class SandboxManager(HeartbeatMixin):
                     # keep state consistent
                     self.session_mapping.delete(session_ctx_id)
 
-            # Mark released (do NOT delete mapping) in model
-            now = time.time()
-            container_info.state = ContainerState.RELEASED
-            container_info.released_at = now
-            container_info.updated_at = now
-            container_info.recycled_at = None
-            container_info.recycle_reason = None
-
-            # Unbind session in model
-            container_info.session_ctx_id = None
-            if container_info.meta is None:
-                container_info.meta = {}
-            container_info.meta.pop("session_ctx_id", None)
-
-            self.container_mapping.set(
-                container_info.container_name,
-                container_info.model_dump(),
+            self._save_container_model(container_info)
+            self._destroy_container(container_info)
+            return True
+        except Exception as e:
+            logger.warning(
+                f"Failed to destroy container: {e}",
             )
+            logger.debug(f"{traceback.format_exc()}")
+            return False
 
-            try:
-                self.client.stop(container_info.container_id, timeout=1)
-            except Exception as e:
-                logger.debug(
-                    f"release stop ignored for"
-                    f" {container_info.container_id}: {e}",
+    @remote_wrapper_async()
+    async def release_async(self, identity):
+        """Async variant of release()."""
+        try:
+            container_json = await self.container_mapping.aget(identity)
+            if container_json is None:
+                container_json = await self.container_mapping.aget(
+                    self._generate_container_key(identity),
                 )
+                if container_json is None:
+                    logger.warning(
+                        f"release: container not found for {identity}, "
+                        f"treat as already released",
+                    )
+                    return True
 
-            try:
-                self.client.remove(container_info.container_id, force=True)
-            except Exception as e:
-                logger.debug(
-                    f"release remove ignored for"
-                    f" {container_info.container_id}: {e}",
-                )
+            container_info = ContainerModel(**container_json)
+
+            self._invalidate_connections(
+                identity,
+                container_info.container_name,
+                container_info.session_id,
+            )
 
-            logger.debug(f"Container for {identity} destroyed.")
+            session_ctx_id = self._mark_released(container_info)
 
-            # Upload to storage
-            if container_info.mount_dir and container_info.storage_path:
-                self.storage.upload_folder(
-                    container_info.mount_dir,
-                    container_info.storage_path,
-                )
+            if session_ctx_id:
+                env_ids = await self.session_mapping.aget(session_ctx_id) or []
+                env_ids = [
+                    eid
+                    for eid in env_ids
+                    if eid != container_info.container_name
+                ]
+                if env_ids:
+                    await self.session_mapping.aset(session_ctx_id, env_ids)
+                else:
+                    await self.session_mapping.adelete(session_ctx_id)
 
+            await self._save_container_model_async(container_info)
+            await self._run_blocking(self._destroy_container, container_info)
             return True
         except Exception as e:
             logger.warning(
                 f"Failed to destroy container: {e}",
             )
-            logger.debug(f"{traceback.format_exc()}")
+            logger.debug(f"{traceback.format_exc()}")
+            return False
+
+    def _start_container(self, identity, container_id) -> bool:
+        self.client.start(container_id)
+        status = self.client.get_status(container_id)
+        if status != "running":
+            logger.error(
+                f"Failed to start container {identity}. "
+                f"Current status: {status}",
+            )
+            return False
+
+        logger.debug(f"Container {identity} started.")
+        return True
+
+    def _stop_container(self, identity, container_id) -> bool:
+        self.client.stop(container_id, timeout=1)
+
+        status = self.client.get_status(container_id)
+        if status != "exited":
+            logger.error(
+                f"Failed to stop container {identity}. "
+                f"Current status: {status}",
+            )
+            return False
+
+        logger.debug(f"Container {identity} stopped.")
+        return True
+
+    @remote_wrapper()
+    def start(self, identity):
+        try:
+            container_json = self.get_info(identity)
+
+            if not container_json:
+                logger.warning(
+                    f"No container found for {identity}.",
+                )
+                return False
+
+            container_info = ContainerModel(**container_json)
+            return self._start_container(
+                identity,
+                container_info.container_id,
+            )
+
+        except Exception as e:
+            logger.error(
+                f"Failed to start container: {e}:"
+                f" {traceback.format_exc()}",
+            )
             return False
 
     @remote_wrapper_async()
-    async def release_async(self, *args, **kwargs):
-        """Async wrapper for release()."""
-        return await asyncio.to_thread(self.release, *args, **kwargs)
-
-    @remote_wrapper()
-    def start(self, identity):
+    async def start_async(self, identity):
+        """Async variant of start()."""
         try:
-            container_json = self.get_info(identity)
+            container_json = await self.get_info_async(identity)
 
             if not container_json:
                 logger.warning(
@@ -1038,18 +1938,11 @@ class SandboxManager(HeartbeatMixin):
                 return False
 
             container_info = ContainerModel(**container_json)
-
-            self.client.start(container_info.container_id)
-            status = self.client.get_status(container_info.container_id)
-            if status != "running":
-                logger.error(
-                    f"Failed to start container {identity}. "
-                    f"Current status: {status}",
-                )
-                return False
-
-            logger.debug(f"Container {identity} started.")
-            return True
+            return await self._run_blocking(
+                self._start_container,
+                identity,
+                container_info.container_id,
+            )
 
         except Exception as e:
             logger.error(
@@ -1058,11 +1951,6 @@ class SandboxManager(HeartbeatMixin):
             )
             return False
 
-    @remote_wrapper_async()
-    async def start_async(self, *args, **kwargs):
-        """Async wrapper for start()."""
-        return await asyncio.to_thread(self.start, *args, **kwargs)
-
     @remote_wrapper()
     def stop(self, identity):
         try:
@@ -1074,18 +1962,15 @@ class SandboxManager(HeartbeatMixin):
 
             container_info = ContainerModel(**container_json)
 
-            self.client.stop(container_info.container_id, timeout=1)
-
-            status = self.client.get_status(container_info.container_id)
-            if status != "exited":
-                logger.error(
-                    f"Failed to stop container {identity}. "
-                    f"Current status: {status}",
-                )
-                return False
-
-            logger.debug(f"Container {identity} stopped.")
-            return True
+            self._invalidate_connections(
+                identity,
+                container_info.container_name,
+                container_info.session_id,
+            )
+            return self._stop_container(
+                identity,
+                container_info.container_id,
+            )
 
         except Exception as e:
             logger.error(
@@ -1094,9 +1979,33 @@ class SandboxManager(HeartbeatMixin):
             return False
 
     @remote_wrapper_async()
-    async def stop_async(self, *args, **kwargs):
-        """Async wrapper for stop()."""
-        return await asyncio.to_thread(self.stop, *args, **kwargs)
+    async def stop_async(self, identity):
+        """Async variant of stop()."""
+        try:
+            container_json = await self.get_info_async(identity)
+
+            if not container_json:
+                logger.warning(f"No container found for {identity}.")
+                return True
+
+            container_info = ContainerModel(**container_json)
+
+            self._invalidate_connections(
+                identity,
+                container_info.container_name,
+                container_info.session_id,
+            )
+            return await self._run_blocking(
+                self._stop_container,
+                identity,
+                container_info.container_id,
+            )
+
+        except Exception as e:
+            logger.error(
+                f"Failed to stop container: {e}: {traceback.format_exc()}",
+            )
+            return False
 
     @remote_wrapper()
     def get_status(self, identity):
@@ -1104,9 +2013,9 @@ class SandboxManager(HeartbeatMixin):
         return self.client.get_status(identity)
 
     @remote_wrapper_async()
-    async def get_status_async(self, *args, **kwargs):
-        """Async wrapper for get_status()."""
-        return await asyncio.to_thread(self.get_status, *args, **kwargs)
+    async def get_status_async(self, identity):
+        """Async variant of get_status()."""
+        return await self._run_blocking(self.client.get_status, identity)
 
     @remote_wrapper()
     def get_info(self, identity):
@@ -1124,11 +2033,77 @@ class SandboxManager(HeartbeatMixin):
         return container_model
 
     @remote_wrapper_async()
-    async def get_info_async(self, *args, **kwargs):
-        """Async wrapper for get_info()."""
-        return await asyncio.to_thread(self.get_info, *args, **kwargs)
+    async def get_info_async(self, identity):
+        """Async variant of get_info()."""
+        container_model = await self.container_mapping.aget(identity)
+        if container_model is None:
+            container_model = await self.container_mapping.aget(
+                self._generate_container_key(identity),
+            )
+        if container_model is None:
+            raise RuntimeError(f"No container found with id: {identity}.")
+        if hasattr(container_model, "model_dump_json"):
+            container_model = container_model.model_dump_json()
+
+        return container_model
+
+    def _shutdown_executors(self) -> None:
+        for name in ("_blocking_executor", "_pool_refill_executor"):
+            executor = getattr(self, name, None)
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def _close_connections(self) -> None:
+        connections = getattr(self, "_connections", None)
+        if connections is not None:
+            connections.clear()
+
+    def _invalidate_connections(self, *identities) -> None:
+        """
+        Forget cached runtime clients of a container that went away.
+        """
+        connections = getattr(self, "_connections", None)
+        if connections is not None:
+            connections.invalidate(*identities)
+
+    def _watch_connection(self, client) -> None:
+        """
+        Forget ``client`` once a request through it fails, so the next
+        call checks the container's state and health again instead of
+        reusing a client of a container that was released or restarted
+        meanwhile. Requests still using it finish first, see
+        `ConnectionCache`.
+        """
+        if isinstance(client, (SandboxHttpClient, SandboxHttpAsyncClient)):
+            connections = self._connections
+            client.on_error = lambda _: connections.discard(client)
+
+    @contextlib.contextmanager
+    def _connection(self, identity):
+        """Runtime client of ``identity``, leased while in use."""
+        client = self._establish_connection(identity)
+        try:
+            yield client
+        finally:
+            self._connections.release(client)
+
+    @contextlib.asynccontextmanager
+    async def _connection_async(self, identity):
+        """Async variant of _connection()."""
+        client = await self._establish_connection_async(identity)
+        try:
+            yield client
+        finally:
+            self._connections.release(client)
 
     def _establish_connection(self, identity):
+        """Leased runtime client of ``identity``, see `_connection`."""
+        client = self._connections.get(identity, lease=True)
+        if client is not None:
+            # Already known to be healthy, skip get_info and /healthz;
+            # failed requests drop it again, see _watch_connection
+            return client
+
         container_model = ContainerModel(**self.get_info(identity))
 
         # TODO: remake docker name
@@ -1136,67 +2111,83 @@ class SandboxManager(HeartbeatMixin):
             "sandbox-appworld" in container_model.version
             or "sandbox-bfcl" in container_model.version
         ):
-            return TrainingSandboxClient(
+            client = TrainingSandboxClient(
                 base_url=container_model.url,
             ).__enter__()
+        else:
+            client = SandboxHttpClient(
+                container_model,
+            ).__enter__()
 
-        return SandboxHttpClient(
-            container_model,
-        ).__enter__()
+        self._watch_connection(client)
+        self._connections.put(identity, client, lease=True)
+        return client
 
     async def _establish_connection_async(self, identity):
-        container_model = ContainerModel(**self.get_info(identity))
+        # httpx connections are bound to the loop that opened them
+        loop = asyncio.get_running_loop()
+        client = self._connections.get(identity, scope=loop, lease=True)
+        if client is not None:
+            return client
+
+        container_model = ContainerModel(
+            **await self.get_info_async(identity),
+        )
 
-        # TODO: TrainingSandboxClient lacks async, can use asyncio.to_thread()
+        # TrainingSandboxClient lacks async, enter it off the loop
         if (
             "sandbox-appworld" in container_model.version
             or "sandbox-bfcl" in container_model.version
         ):
             client = TrainingSandboxClient(base_url=container_model.url)
-            return client.__enter__()
-        async_client = SandboxHttpAsyncClient(container_model)
-        await async_client.__aenter__()
-        return async_client
+            client = await self._run_blocking(client.__enter__)
+        else:
+            client = SandboxHttpAsyncClient(container_model)
+            await client.__aenter__()
+
+        self._watch_connection(client)
+        self._connections.put(identity, client, scope=loop, lease=True)
+        return client
 
     @remote_wrapper()
     @touch_session(identity_arg="identity")
     def check_health(self, identity):
         """List tool"""
-        client = self._establish_connection(identity)
-        return client.check_health()
+        with self._connection(identity) as client:
+            return client.check_health()
 
     @remote_wrapper_async()
     @touch_session(identity_arg="identity")
     async def check_health_async(self, identity):
-        client = await self._establish_connection_async(identity)
-        return await client.check_health()
+        async with self._connection_async(identity) as client:
+            return await client.check_health()
 
     @remote_wrapper()
     @touch_session(identity_arg="identity")
     def list_tools(self, identity, tool_type=None, **kwargs):
         """List tool"""
-        client = self._establish_connection(identity)
-        return client.list_tools(tool_type=tool_type, **kwargs)
+        with self._connection(identity) as client:
+            return client.list_tools(tool_type=tool_type, **kwargs)
 
     @remote_wrapper_async()
     @touch_session(identity_arg="identity")
     async def list_tools_async(self, identity, tool_type=None, **kwargs):
-        client = await self._establish_connection_async(identity)
-        return await client.list_tools(tool_type=tool_type, **kwargs)
+        async with self._connection_async(identity) as client:
+            return await client.list_tools(tool_type=tool_type, **kwargs)
 
     @remote_wrapper()
     @touch_session(identity_arg="identity")
     def call_tool(self, identity, tool_name=None, arguments=None):
         """Call tool"""
-        client = self._establish_connection(identity)
-        return client.call_tool(tool_name, arguments)
+        with self._connection(identity) as client:
+            return client.call_tool(tool_name, arguments)
 
     @remote_wrapper_async()
     @touch_session(identity_arg="identity")
     async def call_tool_async(self, identity, tool_name=None, arguments=None):
         """Call tool (async)"""
-        client = await self._establish_connection_async(identity)
-        return await client.call_tool(tool_name, arguments)
+        async with self._connection_async(identity) as client:
+            return await client.call_tool(tool_name, arguments)
 
     @remote_wrapper()
     @touch_session(identity_arg="identity")
@@ -1204,11 +2195,11 @@ class SandboxManager(HeartbeatMixin):
         """
         Add MCP servers to runtime.
         """
-        client = self._establish_connection(identity)
-        return client.add_mcp_servers(
-            server_configs=server_configs,
-            overwrite=overwrite,
-        )
+        with self._connection(identity) as client:
+            return client.add_mcp_servers(
+                server_configs=server_configs,
+                overwrite=overwrite,
+            )
 
     @remote_wrapper_async()
     @touch_session(identity_arg="identity")
@@ -1221,11 +2212,163 @@ class SandboxManager(HeartbeatMixin):
         """
         Add MCP servers to runtime (async).
         """
+        async with self._connection_async(identity) as client:
+            return await client.add_mcp_servers(
+                server_configs=server_configs,
+                overwrite=overwrite,
+            )
+
+    @touch_session(identity_arg="identity")
+    def _open_stream(self, identity, method: str, **kwargs):
+        client = self._establish_connection(identity)
+        stream = getattr(client, method, None)
+        if stream is None:
+            self._connections.release(client)
+            raise NotImplementedError(
+                f"{type(client).__name__} does not support {method}",
+            )
+        return self._leased_stream(client, stream(**kwargs))
+
+    def _leased_stream(self, client, events: Iterator[dict]):
+        try:
+            yield from events
+        finally:
+            self._connections.release(client)
+
+    @touch_session(identity_arg="identity")
+    async def _open_stream_async(self, identity, method: str, **kwargs):
         client = await self._establish_connection_async(identity)
-        return await client.add_mcp_servers(
-            server_configs=server_configs,
-            overwrite=overwrite,
-        )
+        stream = getattr(client, method, None)
+        if stream is None or not inspect.isasyncgenfunction(stream):
+            self._connections.release(client)
+            raise NotImplementedError(
+                f"{type(client).__name__} does not support async {method}",
+            )
+        return self._leased_stream_async(client, stream(**kwargs))
+
+    async def _leased_stream_async(self, client, events: AsyncIterator[dict]):
+        try:
+            async for event in events:
+                yield event
+        finally:
+            await events.aclose()
+            self._connections.release(client)
+
+    def run_shell_command_stream(
+        self,
+        identity,
+        command: str,
+        timeout: Optional[float] = None,
+        max_output_bytes: Optional[int] = None,
+    ) -> Iterator[dict]:
+        """
+        Run a shell command in the sandbox, yielding stdout/stderr events
+        as they are produced and a final ``end`` event.
+        """
+        kwargs = {
+            "command": command,
+            "timeout": timeout,
+            "max_output_bytes": max_output_bytes,
+        }
+        if self.http_session:
+            events = self._stream_request(
+                "/run_shell_command_stream",
+                {"identity": identity, **kwargs},
+            )
+        else:
+            events = self._open_stream(
+                identity,
+                "run_shell_command_stream",
+                **kwargs,
+            )
+        yield from events
+
+    async def run_shell_command_stream_async(
+        self,
+        identity,
+        command: str,
+        timeout: Optional[float] = None,
+        max_output_bytes: Optional[int] = None,
+    ) -> AsyncIterator[dict]:
+        """
+        Async variant of run_shell_command_stream().
+        """
+        kwargs = {
+            "command": command,
+            "timeout": timeout,
+            "max_output_bytes": max_output_bytes,
+        }
+        if self.httpx_client is not None:
+            events = self._stream_request_async(
+                "/run_shell_command_stream",
+                {"identity": identity, **kwargs},
+            )
+        else:
+            events = await self._open_stream_async(
+                identity,
+                "run_shell_command_stream",
+                **kwargs,
+            )
+        async for event in events:
+            yield event
+
+    def run_ipython_cell_stream(
+        self,
+        identity,
+        code: str,
+        timeout: Optional[float] = None,
+        max_output_bytes: Optional[int] = None,
+    ) -> Iterator[dict]:
+        """
+        Run an IPython cell in the sandbox, yielding stdout/stderr events
+        as they are produced and a final ``end`` event.
+        """
+        kwargs = {
+            "code": code,
+            "timeout": timeout,
+            "max_output_bytes": max_output_bytes,
+        }
+        if self.http_session:
+            events = self._stream_request(
+                "/run_ipython_cell_stream",
+                {"identity": identity, **kwargs},
+            )
+        else:
+            events = self._open_stream(
+                identity,
+                "run_ipython_cell_stream",
+                **kwargs,
+            )
+        yield from events
+
+    async def run_ipython_cell_stream_async(
+        self,
+        identity,
+        code: str,
+        timeout: Optional[float] = None,
+        max_output_bytes: Optional[int] = None,
+    ) -> AsyncIterator[dict]:
+        """
+        Async variant of run_ipython_cell_stream().
+        """
+        kwargs = {
+            "code": code,
+            "timeout": timeout,
+            "max_output_bytes": max_output_bytes,
+        }
+        if self.httpx_client is not None:
+            events = self._stream_request_async(
+                "/run_ipython_cell_stream",
+                {"identity": identity, **kwargs},
+            )
+        else:
+            events = await self._open_stream_async(
+                identity,
+                "run_ipython_cell_stream",
+                **kwargs,
+            )
+        async for event in events:
+            yield event
 
     @remote_wrapper()
     def get_session_mapping(self, session_ctx_id: str) -> list:
@@ -1233,13 +2376,9 @@ class SandboxManager(HeartbeatMixin):
         return self.session_mapping.get(session_ctx_id) or []
 
     @remote_wrapper_async()
-    async def get_session_mapping_async(self, *args, **kwargs):
-        """Async wrapper for get_session_mapping()."""
-        return await asyncio.to_thread(
-            self.get_session_mapping,
-            *args,
-            **kwargs,
-        )
+    async def get_session_mapping_async(self, session_ctx_id: str) -> list:
+        """Async variant of get_session_mapping()."""
+        return await self.session_mapping.aget(session_ctx_id) or []
 
     @remote_wrapper()
     def list_session_keys(self) -> list:
@@ -1250,9 +2389,9 @@ class SandboxManager(HeartbeatMixin):
         return session_keys
 
     @remote_wrapper_async()
-    async def list_session_keys_async(self, *args, **kwargs):
-        """Async wrapper for list_session_keys()."""
-        return await asyncio.to_thread(self.list_session_keys, *args, **kwargs)
+    async def list_session_keys_async(self) -> list:
+        """Async variant of list_session_keys()."""
+        return [key async for key in self.session_mapping.ascan()]
 
     def reap_session(
         self,
@@ -1274,6 +2413,11 @@ class SandboxManager(HeartbeatMixin):
                 try:
                     info = ContainerModel(**self.get_info(container_name))
 
+                    self._invalidate_connections(
+                        container_name,
+                        info.session_id,
+                    )
+
                     # stop/remove actual container
                     try:
                         self.client.stop(info.container_id, timeout=1)
@@ -1315,10 +2459,7 @@ class SandboxManager(HeartbeatMixin):
                         info.meta = {}
                     info.meta["session_ctx_id"] = session_ctx_id
 
-                    self.container_mapping.set(
-                        info.container_name,
-                        info.model_dump(),
-                    )
+                    self._save_container_model(info)
 
                 except Exception as e:
                     logger.warning(
@@ -1410,10 +2551,7 @@ class SandboxManager(HeartbeatMixin):
                 new_cm.recycled_at = None
                 new_cm.recycle_reason = None
                 new_cm.updated_at = now
-                self.container_mapping.set(
-                    new_cm.container_name,
-                    new_cm.model_dump(),
-                )
+                self._save_container_model(new_cm)
             except Exception as e:
                 logger.warning(
                     f"restore_session: failed to mark new container running:"
@@ -1432,8 +2570,9 @@ class SandboxManager(HeartbeatMixin):
 
         # 4) archive old recycled records so needs_restore becomes False
         for old_name in recycled_old_names:
+            self._invalidate_connections(old_name)
             try:
-                self.container_mapping.delete(old_name)
+                self._delete_container_model(old_name)
             except Exception as e:
                 logger.warning(
                     f"restore_session: failed to delete old model"
@@ -1458,28 +2597,17 @@ class SandboxManager(HeartbeatMixin):
             "errors": 0,
         }
 
-        for session_ctx_id in list(self.session_mapping.scan()):
+        for (
+            session_ctx_id,
+            has_running,
+            last_active,
+        ) in self._iter_session_heartbeats():
             result["scanned_sessions"] += 1
 
-            has_running = False
-            try:
-                env_ids = self.get_session_mapping(session_ctx_id) or []
-                for cname in list(env_ids):
-                    try:
-                        cm = ContainerModel(**self.get_info(cname))
-                    except Exception:
-                        continue
-                    if cm.state == ContainerState.RUNNING:
-                        has_running = True
-                        break
-            except Exception:
-                has_running = False
-
             if not has_running:
                 result["skipped_no_running_containers"] += 1
                 continue
 
-            last_active = self.get_heartbeat(session_ctx_id)
             if last_active is None:
                 result["skipped_no_heartbeat"] += 1
                 continue
@@ -1523,6 +2651,146 @@ class SandboxManager(HeartbeatMixin):
 
         return result
 
+    def process_due_heartbeats(self, limit: Optional[int] = None) -> dict:
+        """
+        Reap sessions whose scheduled heartbeat deadline has passed.
+
+        Only due sessions are touched. A session that got a fresh
+        heartbeat is rescheduled at its new deadline; one that is busy
+        (lock held) or failed is retried after _WATCH_RETRY_DELAY.
+        """
+        timeout = int(self.config.heartbeat_timeout)
+        result = {
+            "due": 0,
+            "reaped_sessions": 0,
+            "rescheduled": 0,
+            "skipped_no_heartbeat": 0,
+            "skipped_lock_busy": 0,
+            "errors": 0,
+        }
+
+        due = self.heartbeat_schedule.pop_due(
+            time.time(),
+            limit=limit or self._SCAN_BATCH_SIZE,
+        )
+        for session_ctx_id, _ in due:
+            result["due"] += 1
+
+            token = self.acquire_heartbeat_lock(session_ctx_id)
+            if not token:
+                result["skipped_lock_busy"] += 1
+                self.heartbeat_schedule.add(
+                    session_ctx_id,
+                    time.time() + self._WATCH_RETRY_DELAY,
+                    gt=True,
+                )
+                continue
+
+            try:
+                last_active = self.get_heartbeat(session_ctx_id)
+                if last_active is None:
+                    # no RUNNING container left, nothing to watch
+                    result["skipped_no_heartbeat"] += 1
+                    continue
+
+                if time.time() - last_active <= timeout:
+                    self.heartbeat_schedule.add(
+                        session_ctx_id,
+                        last_active + timeout,
+                        gt=True,
+                    )
+                    result["rescheduled"] += 1
+                    continue
+
+                ok = self.reap_session(
+                    session_ctx_id,
+                    reason="heartbeat_timeout",
+                )
+                if not ok:
+                    raise RuntimeError(
+                        f"reap_session({session_ctx_id}) failed"
+                    )
+                result["reaped_sessions"] += 1
+
+            except Exception:
+                result["errors"] += 1
+                self.heartbeat_schedule.add(
+                    session_ctx_id,
+                    time.time() + self._WATCH_RETRY_DELAY,
+                    gt=True,
+                )
+                logger.warning(
+                    f"process_due_heartbeats error on session "
+                    f"{session_ctx_id}",
+                )
+                logger.debug(traceback.format_exc())
+            finally:
+                self.release_heartbeat_lock(session_ctx_id, token)
+
+        return result
+
+    def _iter_session_heartbeats(self):
+        """
+        Yield (session_ctx_id, has_running, last_active) for every
+        session, reading sessions and their containers one page at a time
+        instead of one key at a time.
+
+        last_active is None if no RUNNING container has a heartbeat yet.
+        """
+        page = []
+        for item in self.session_mapping.scan_items(
+            count=self._SCAN_BATCH_SIZE,
+        ):
+            page.append(item)
+            if len(page) >= self._SCAN_BATCH_SIZE:
+                yield from self._session_heartbeats_for_page(page)
+                page = []
+        if page:
+            yield from self._session_heartbeats_for_page(page)
+
+    def _session_heartbeats_for_page(self, page):
+        names = sorted(
+            {
+                cname
+                for _, env_ids in page
+                if isinstance(env_ids, list)
+                for cname in env_ids
+            },
+        )
+        models = {}
+        for cname, container_json in zip(
+            names,
+            self.container_mapping.mget(names),
+        ):
+            if not container_json:
+                continue
+            try:
+                models[cname] = ContainerModel(**container_json)
+            except Exception:
+                continue
+
+        for session_ctx_id, env_ids in page:
+            running = [
+                models[cname]
+                for cname in (env_ids if isinstance(env_ids, list) else [])
+                if cname in models
+                and models[cname].state == ContainerState.RUNNING
+            ]
+            if not running:
+                yield session_ctx_id, False, None
+                continue
+
+            heartbeats = [
+                float(cm.last_active_at)
+                for cm in running
+                if cm.last_active_at is not None
+            ]
+            yield (
+                session_ctx_id,
+                True,
+                max(heartbeats) if heartbeats else None,
+            )
+
     def scan_pool_once(self) -> dict:
         """
         Replenish warm pool for each sandbox_type up to pool_size.
@@ -1558,13 +2826,24 @@ class SandboxManager(HeartbeatMixin):
             if need <= 0:
                 continue
 
-            for _ in range(need):
+            def create_warm(_, sandbox_type=t):
                 try:
                     # create a WARM container (no session_ctx_id)
-                    container_name = self.create(
-                        sandbox_type=t.value,
+                    return self.create(
+                        sandbox_type=sandbox_type.value,
                         meta=None,
                     )
+                except Exception:
+                    logger.debug(traceback.format_exc())
+                    return None
+
+            # The containers come up together; on Kubernetes their
+            # readiness is followed by one shared watch
+            for container_name in self._pool_refill_executor.map(
+                create_warm,
+                range(need),
+            ):
+                try:
                     if not container_name:
                         result["failed_create"] += 1
                         continue
@@ -1583,6 +2862,72 @@ class SandboxManager(HeartbeatMixin):
 
         return result
 
+    def process_due_releases(self, limit: Optional[int] = None) -> dict:
+        """
+        Delete RELEASED container records whose scheduled TTL has passed.
+        """
+        ttl = int(getattr(self.config, "released_key_ttl", 0))
+        result = {
+            "due": 0,
+            "deleted": 0,
+            "rescheduled": 0,
+            "skipped_not_released": 0,
+            "errors": 0,
+        }
+        if ttl <= 0:
+            return result
+
+        now = time.time()
+        due = self.release_schedule.pop_due(
+            now,
+            limit=limit or self._SCAN_BATCH_SIZE,
+        )
+        if not due:
+            return result
+        result["due"] = len(due)
+
+        names = [name for name, _ in due]
+        expired = []
+        for name, container_json in zip(
+            names,
+            self.container_mapping.mget(names),
+        ):
+            if not container_json:
+                continue
+            try:
+                cm = ContainerModel(**container_json)
+            except Exception:
+                result["errors"] += 1
+                continue
+
+            if cm.state != ContainerState.RELEASED:
+                result["skipped_not_released"] += 1
+                continue
+
+            released_at = cm.released_at or cm.updated_at or 0
+            if now - released_at <= ttl:
+                self.release_schedule.add(name, float(released_at) + ttl)
+                result["rescheduled"] += 1
+                continue
+
+            expired.append(name)
+
+        try:
+            self._delete_container_models(expired)
+            result["deleted"] += len(expired)
+        except Exception as e:
+            result["errors"] += 1
+            for name in expired:
+                self.release_schedule.add(
+                    name,
+                    now + self._WATCH_RETRY_DELAY,
+                )
+            logger.debug(
+                f"process_due_releases: {e}, {traceback.format_exc()}",
+            )
+
+        return result
+
     def scan_released_cleanup_once(self, max_delete: int = 200) -> dict:
         """
         Delete container_mapping records whose state == RELEASED and expired.
@@ -1605,17 +2950,17 @@ class SandboxManager(HeartbeatMixin):
             return result
 
         now = time.time()
+        expired = []
 
-        for key in self.container_mapping.scan(self.prefix):
-            if result["deleted"] >= max_delete:
+        for key, container_json in self.container_mapping.scan_items(
+            self.prefix,
+            count=self._SCAN_BATCH_SIZE,
+        ):
+            if result["deleted"] + len(expired) >= max_delete:
                 break
 
             result["scanned"] += 1
             try:
-                container_json = self.container_mapping.get(key)
-                if not container_json:
-                    continue
-
                 cm = ContainerModel(**container_json)
 
                 if cm.state != ContainerState.RELEASED:
@@ -1632,8 +2977,11 @@ class SandboxManager(HeartbeatMixin):
                     result["skipped_not_expired"] += 1
                     continue
 
-                self.container_mapping.delete(cm.container_name)
-                result["deleted"] += 1
+                expired.append(cm.container_name)
+                if len(expired) >= self._SCAN_BATCH_SIZE:
+                    self._delete_container_models(expired)
+                    result["deleted"] += len(expired)
+                    expired = []
 
             except Exception as e:
                 result["errors"] += 1
@@ -1642,4 +2990,13 @@ class SandboxManager(HeartbeatMixin):
                     f" {traceback.format_exc()}",
                 )
 
+        try:
+            self._delete_container_models(expired)
+            result["deleted"] += len(expired)
+        except Exception as e:
+            result["errors"] += 1
+            logger.debug(
+                f"scan_released_cleanup_once: {e}, {traceback.format_exc()}",
+            )
+
         return result
@@ -2,6 +2,7 @@
 # pylint: disable=protected-access, unused-argument
 import asyncio
 import inspect
+import json
 import logging
 
 from typing import Optional
@@ -12,7 +13,7 @@ import websockets
 from fastapi import FastAPI, HTTPException, Request, Depends
 from fastapi import WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, Response
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from ...manager.server.config import get_settings
@@ -49,6 +50,8 @@ security = HTTPBearer(auto_error=False)
 # Global SandboxManager instance
 _sandbox_manager: Optional[SandboxManager] = None
 _config: Optional[SandboxManagerEnvConfig] = None
+# Background pull of the sandbox images, see startup_event
+_prepull_task: Optional[asyncio.Task] = None
 
 
 def get_config() -> SandboxManagerEnvConfig:
@@ -59,6 +62,7 @@ def get_config() -> SandboxManagerEnvConfig:
         _config = SandboxManagerEnvConfig(
             container_prefix_key=settings.CONTAINER_PREFIX_KEY,
             file_system=settings.FILE_SYSTEM,
+            local_clone_mode=settings.LOCAL_CLONE_MODE,
             redis_enabled=settings.REDIS_ENABLED,
             container_deployment=settings.CONTAINER_DEPLOYMENT,
             default_mount_dir=settings.DEFAULT_MOUNT_DIR,
@@ -71,6 +75,10 @@ def get_config() -> SandboxManagerEnvConfig:
             oss_access_key_id=settings.OSS_ACCESS_KEY_ID,
             oss_access_key_secret=settings.OSS_ACCESS_KEY_SECRET,
             oss_bucket_name=settings.OSS_BUCKET_NAME,
+            oss_sync_workers=settings.OSS_SYNC_WORKERS,
+            oss_multipart_threshold=settings.OSS_MULTIPART_THRESHOLD,
+            oss_part_size=settings.OSS_PART_SIZE,
+            storage_manifest_dir=settings.STORAGE_MANIFEST_DIR,
             redis_server=settings.REDIS_SERVER,
             redis_port=settings.REDIS_PORT,
             redis_db=settings.REDIS_DB,
@@ -78,6 +86,10 @@ def get_config() -> SandboxManagerEnvConfig:
             redis_password=settings.REDIS_PASSWORD,
             redis_port_key=settings.REDIS_PORT_KEY,
             redis_container_pool_key=settings.REDIS_CONTAINER_POOL_KEY,
+            redis_container_state_index_key=(
+                settings.REDIS_CONTAINER_STATE_INDEX_KEY
+            ),
+            redis_watch_schedule_key=settings.REDIS_WATCH_SCHEDULE_KEY,
             k8s_namespace=settings.K8S_NAMESPACE,
             kubeconfig_path=settings.KUBECONFIG_PATH,
             agent_run_access_key_id=settings.AGENT_RUN_ACCESS_KEY_ID,
@@ -107,8 +119,15 @@ def get_config() -> SandboxManagerEnvConfig:
             heartbeat_timeout=settings.HEARTBEAT_TIMEOUT,
             heartbeat_lock_ttl=settings.HEARTBEAT_LOCK_TTL,
             watcher_scan_interval=settings.WATCHER_SCAN_INTERVAL,
+            watcher_full_scan_interval=settings.WATCHER_FULL_SCAN_INTERVAL,
             released_key_ttl=settings.RELEASE_KET_TTL,
             max_sandbox_instances=settings.MAX_SANDBOX_INSTANCES,
+            blocking_io_workers=settings.BLOCKING_IO_WORKERS,
+            pool_refill_workers=settings.POOL_REFILL_WORKERS,
+            connection_cache_size=settings.CONNECTION_CACHE_SIZE,
+            connection_cache_ttl=settings.CONNECTION_CACHE_TTL,
+            image_prepull=settings.IMAGE_PREPULL,
+            image_pull_workers=settings.IMAGE_PULL_WORKERS,
         )
     return _config
 
@@ -156,7 +175,13 @@ def get_sandbox_manager():
     return _sandbox_manager
 
 
-def create_endpoint(method):
+def create_endpoint(method, async_method=None):
+    """
+    Route handler for a manager method. If the method has an async
+    variant (``<name>_async``) it is awaited instead, so the request never
+    occupies a worker thread.
+    """
+
     async def endpoint(
         request: Request,
         token: HTTPAuthorizationCredentials = Depends(verify_token),
@@ -168,7 +193,9 @@ def create_endpoint(method):
             )
 
             # Check if the method is asynchronous
-            if inspect.iscoroutinefunction(method):
+            if async_method is not None:
+                result = await async_method(**data)
+            elif inspect.iscoroutinefunction(method):
                 # If async, just await it
                 result = await method(**data)
             else:
@@ -188,7 +215,7 @@ def create_endpoint(method):
 
 
 def register_routes(_app, instance):
-    for _, method in inspect.getmembers(
+    for name, method in inspect.getmembers(
         instance,
         predicate=inspect.ismethod,
     ):
@@ -196,7 +223,11 @@ def register_routes(_app, instance):
             http_method = method._http_method.lower()
             path = method._path
 
-            endpoint = create_endpoint(method)
+            async_method = getattr(instance, f"{name}_async", None)
+            if not inspect.iscoroutinefunction(async_method):
+                async_method = None
+
+            endpoint = create_endpoint(method, async_method)
 
             if http_method == "get":
                 _app.get(path)(endpoint)
@@ -206,15 +237,35 @@ def register_routes(_app, instance):
                 _app.delete(path)(endpoint)
 
 
+def _log_prepull_result(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(
+            "Failed to pre-pull sandbox images",
+            exc_info=task.exception(),
+        )
+
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize the SandboxManager on startup"""
+    global _prepull_task
     get_sandbox_manager()
     register_routes(app, _sandbox_manager)
 
+    # Build the instance-limit index if this Redis has none yet
+    _sandbox_manager.ensure_state_index()
+
     # Start heartbeat watcher on server side
     _sandbox_manager.start_watcher()
 
+    # Pull the sandbox images in the background; creates of an image
+    # still being pulled wait for that pull
+    _prepull_task = asyncio.create_task(
+        asyncio.to_thread(_sandbox_manager.prepull_images),
+        name="image-prepull",
+    )
+    _prepull_task.add_done_callback(_log_prepull_result)
+
 
 @app.on_event("shutdown")
 async def shutdown_event():
@@ -224,6 +275,10 @@ async def shutdown_event():
     if not _sandbox_manager:
         return
 
+    if _prepull_task is not None:
+        # The pull itself runs on in its thread
+        _prepull_task.cancel()
+
     # stop watcher first
     _sandbox_manager.stop_watcher()
 
@@ -246,6 +301,42 @@ async def health_check():
     )
 
 
+async def _ndjson(events):
+    try:
+        async for event in events:
+            yield json.dumps(event, ensure_ascii=False) + "\n"
+    except Exception as e:
+        # Headers are already sent, report the failure in-band
+        logger.error(f"Error while streaming: {e}")
+        yield json.dumps({"type": "error", "text": str(e)}) + "\n"
+
+
+@app.post("/run_shell_command_stream")
+async def run_shell_command_stream(
+    request: Request,
+    token: HTTPAuthorizationCredentials = Depends(verify_token),
+):
+    """Proxy a streaming shell command to the sandbox as NDJSON"""
+    data = await request.json()
+    return StreamingResponse(
+        _ndjson(_sandbox_manager.run_shell_command_stream_async(**data)),
+        media_type="application/x-ndjson",
+    )
+
+
+@app.post("/run_ipython_cell_stream")
+async def run_ipython_cell_stream(
+    request: Request,
+    token: HTTPAuthorizationCredentials = Depends(verify_token),
+):
+    """Proxy a streaming IPython cell to the sandbox as NDJSON"""
+    data = await request.json()
+    return StreamingResponse(
+        _ndjson(_sandbox_manager.run_ipython_cell_stream_async(**data)),
+        media_type="application/x-ndjson",
+    )
+
+
 @app.get("/desktop/{sandbox_id}/{path:path}")
 async def proxy_vnc_static(sandbox_id: str, path: str):
     container_json = _sandbox_manager.container_mapping.get(sandbox_id)
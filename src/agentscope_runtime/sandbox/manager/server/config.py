@@ -51,13 +51,22 @@ class Settings(BaseSettings):
     REDIS_PASSWORD: Optional[str] = None
     REDIS_PORT_KEY: str = "_runtime_sandbox_container_occupied_ports"
     REDIS_CONTAINER_POOL_KEY: str = "_runtime_sandbox_container_container_pool"
+    REDIS_CONTAINER_STATE_INDEX_KEY: str = (
+        "_runtime_sandbox_container_state_index"
+    )
+    REDIS_WATCH_SCHEDULE_KEY: str = "_runtime_sandbox_watch_schedule"
 
     # OSS settings
     FILE_SYSTEM: Literal["local", "oss"] = "local"
+    LOCAL_CLONE_MODE: Literal["auto", "copy"] = "auto"
     OSS_ENDPOINT: str = "http://oss-cn-hangzhou.aliyuncs.com"
     OSS_ACCESS_KEY_ID: str = "your-access-key-id"
     OSS_ACCESS_KEY_SECRET: str = "your-access-key-secret"
     OSS_BUCKET_NAME: str = "your-bucket-name"
+    OSS_SYNC_WORKERS: int = 8
+    OSS_MULTIPART_THRESHOLD: int = 32 * 1024 * 1024
+    OSS_PART_SIZE: int = 8 * 1024 * 1024
+    STORAGE_MANIFEST_DIR: Optional[str] = None
 
     # K8S settings
     K8S_NAMESPACE: str = "default"
@@ -103,9 +112,16 @@ class Settings(BaseSettings):
     HEARTBEAT_TIMEOUT: int = 300
     HEARTBEAT_LOCK_TTL: int = 120
     WATCHER_SCAN_INTERVAL: int = 1  # 0 to disable watcher
+    WATCHER_FULL_SCAN_INTERVAL: int = 300  # 0 to scan only on start
     RELEASE_KET_TTL: int = 3600
 
     MAX_SANDBOX_INSTANCES: int = 0  # 0 means unlimited
+    BLOCKING_IO_WORKERS: int = 32
+    POOL_REFILL_WORKERS: int = 4
+    CONNECTION_CACHE_SIZE: int = 256  # 0 disables the cache
+    CONNECTION_CACHE_TTL: float = 60.0
+    IMAGE_PREPULL: Literal["none", "default", "all"] = "none"
+    IMAGE_PULL_WORKERS: int = 4
 
     model_config = ConfigDict(
         extra="allow",
@@ -1,10 +1,15 @@
 # -*- coding: utf-8 -*-
 from .data_storage import DataStorage
 from .local_storage import LocalStorage
-from .oss_storage import OSSStorage
+from .object_store import LocalObjectStore, ObjectInfo, ObjectStore
+from .oss_storage import ObjectStorage, OSSStorage
 
 __all__ = [
     "DataStorage",
     "LocalStorage",
+    "LocalObjectStore",
+    "ObjectInfo",
+    "ObjectStorage",
+    "ObjectStore",
     "OSSStorage",
 ]
@@ -0,0 +1,491 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Optional, Tuple
+
+from .object_store import ObjectInfo, ObjectStore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MANIFEST_DIR = os.path.join("~", ".agentscope-runtime", "sync")
+DELETE_BATCH_SIZE = 1000  # OSS DeleteMultipleObjects limit
+# Seconds between sweeps of manifests of folders no longer synced
+MANIFEST_PRUNE_INTERVAL = 600
+
+
+def _md5_file(path: str) -> str:
+    md5 = hashlib.md5()
+    with open(path, "rb") as f:
+        while chunk := f.read(1024 * 1024):
+            md5.update(chunk)
+    return md5.hexdigest()
+
+
+def _normalize_prefix(prefix: str) -> str:
+    prefix = prefix.replace(os.sep, "/").strip("/")
+    return f"{prefix}/" if prefix else ""
+
+
+def _scan_local(root: str) -> Tuple[Dict[str, Tuple[int, int]], set]:
+    """
+    Walk ``root`` with scandir and return ``({rel_path: (size, mtime_ns)},
+    {rel_dir/})`` using the stat data scandir already has.
+    """
+    files, dirs = {}, set()
+    stack = [("", root)]
+    while stack:
+        rel_dir, path = stack.pop()
+        with os.scandir(path) as it:
+            for entry in it:
+                rel = rel_dir + entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    dirs.add(rel + "/")
+                    stack.append((rel + "/", entry.path))
+                elif entry.is_file():
+                    st = entry.stat()
+                    files[rel] = (st.st_size, st.st_mtime_ns)
+    return files, dirs
+
+
+class SyncManifest:
+    """
+    Local record of ``path -> (size, mtime_ns, etag)`` for one pair of
+    local folder and remote prefix, as of the last successful transfer.
+
+    A file whose size and mtime still match its entry, and whose remote
+    ETag still matches the recorded one, is known to be in sync without
+    hashing it or sending a HEAD request.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: Dict[str, dict] = {}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f).get("entries", {})
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable sync manifest {path}: {e}")
+
+    def get(self, rel: str) -> Optional[dict]:
+        return self.entries.get(rel)
+
+    def set(self, rel: str, size: int, mtime_ns: int, etag: str):
+        self.entries[rel] = {"size": size, "mtime_ns": mtime_ns, "etag": etag}
+
+    def pop(self, rel: str):
+        self.entries.pop(rel, None)
+
+    def matches(
+        self,
+        rel: str,
+        stat: Optional[Tuple[int, int]],
+        obj: Optional[ObjectInfo],
+    ) -> bool:
+        entry = self.entries.get(rel)
+        return (
+            entry is not None
+            and stat is not None
+            and obj is not None
+            and (entry["size"], entry["mtime_ns"]) == tuple(stat)
+            and entry["etag"] == obj.etag
+        )
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = f"{self.path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"entries": self.entries}, f)
+        os.replace(tmp, self.path)
+
+
+class SyncError(RuntimeError):
+    """Raised when some files of a folder sync failed to transfer."""
+
+
+class FolderSync:
+    """
+    Incremental, parallel folder sync between a local directory and an
+    object store prefix.
+
+    Transfers run on a bounded thread pool; files at or above
+    ``multipart_threshold`` are uploaded as parallel parts. Each sync
+    lists the remote prefix once, skips files recorded as unchanged in the
+    manifest, and propagates deletions of previously synced files.
+    """
+
+    def __init__(
+        self,
+        store: ObjectStore,
+        manifest_dir: Optional[str] = None,
+        max_workers: int = 8,
+        multipart_threshold: int = 32 * 1024 * 1024,
+        part_size: int = 8 * 1024 * 1024,
+        manifest_ttl: float = 7 * 24 * 3600,
+        max_manifests: int = 1000,
+    ):
+        self.store = store
+        self.manifest_dir = os.path.expanduser(
+            manifest_dir or DEFAULT_MANIFEST_DIR,
+        )
+        self.max_workers = max(1, max_workers)
+        self.multipart_threshold = multipart_threshold
+        self.part_size = part_size
+        # Every session syncs a new folder, so manifests not saved for
+        # ``manifest_ttl`` seconds, or beyond the ``max_manifests`` most
+        # recent ones, are removed
+        self.manifest_ttl = manifest_ttl
+        self.max_manifests = max_manifests
+        self._prune_lock = threading.Lock()
+        self._pruned_at: Optional[float] = None
+
+    def manifest_for(self, local_path: str, prefix: str) -> SyncManifest:
+        digest = hashlib.sha1(
+            f"{os.path.abspath(local_path)}\n{prefix}".encode("utf-8"),
+        ).hexdigest()
+        return SyncManifest(os.path.join(self.manifest_dir, f"{digest}.json"))
+
+    def prune_manifests(self) -> int:
+        """
+        Remove expired manifests, and the oldest ones beyond
+        ``max_manifests``. Returns the number of files removed.
+        """
+        try:
+            with os.scandir(self.manifest_dir) as it:
+                found = [
+                    (entry.stat().st_mtime, entry.path)
+                    for entry in it
+                    if entry.is_file(follow_symlinks=False)
+                    and entry.name.endswith((".json", ".tmp"))
+                ]
+        except FileNotFoundError:
+            return 0
+
+        found.sort(reverse=True)
+        expire_before = time.time() - self.manifest_ttl
+        removed = 0
+        for i, (mtime, path) in enumerate(found):
+            if (self.manifest_ttl > 0 and mtime < expire_before) or (
+                self.max_manifests > 0 and i >= self.max_manifests
+            ):
+                try:
+                    os.remove(path)
+                    removed += 1
+                except OSError as e:
+                    logger.debug(f"Failed to remove manifest {path}: {e}")
+        return removed
+
+    def _maybe_prune_manifests(self) -> None:
+        now = time.monotonic()
+        with self._prune_lock:
+            if (
+                self._pruned_at is not None
+                and now - self._pruned_at < MANIFEST_PRUNE_INTERVAL
+            ):
+                return
+            self._pruned_at = now
+        removed = self.prune_manifests()
+        if removed:
+            logger.debug(f"Removed {removed} stale sync manifest(s)")
+
+    def _list_remote(self, prefix: str) -> Dict[str, ObjectInfo]:
+        remote = {}
+        for obj in self.store.iter_objects(prefix):
+            rel = obj.key[len(prefix) :]
+            if rel:
+                remote[rel] = obj
+        return remote
+
+    @staticmethod
+    def _same_content(local_file: str, obj: ObjectInfo, size: int) -> bool:
+        # Only reached for files missing from the manifest; multipart
+        # ETags are not content MD5s, so those are simply re-transferred
+        if obj.size != size or "-" in obj.etag:
+            return False
+        return _md5_file(local_file).lower() == obj.etag.lower()
+
+    def _put_part(self, key, upload_id, part_number, path, offset, length):
+        with open(path, "rb") as f:
+            f.seek(offset)
+            data = f.read(length)
+        return part_number, self.store.put_part(
+            key,
+            upload_id,
+            part_number,
+            data,
+        )
+
+    def _upload_multipart(self, pool, key: str, path: str, size: int):
+        upload_id = self.store.init_multipart(key)
+        futures = [
+            pool.submit(
+                self._put_part,
+                key,
+                upload_id,
+                number,
+                path,
+                offset,
+                min(self.part_size, size - offset),
+            )
+            for number, offset in enumerate(
+                range(0, size, self.part_size),
+                start=1,
+            )
+        ]
+        return upload_id, futures
+
+    def _finish_multipart(self, key: str, upload_id: str, futures) -> str:
+        try:
+            parts = [f.result() for f in futures]
+            return self.store.complete_multipart(key, upload_id, parts)
+        except Exception:
+            for f in futures:
+                f.cancel()
+            try:
+                self.store.abort_multipart(key, upload_id)
+            except Exception as e:
+                logger.debug(f"Failed to abort multipart upload {key}: {e}")
+            raise
+
+    def _delete_remote(self, keys):
+        keys = sorted(keys)
+        for i in range(0, len(keys), DELETE_BATCH_SIZE):
+            self.store.delete_objects(keys[i : i + DELETE_BATCH_SIZE])
+
+    @staticmethod
+    def _raise_errors(action: str, target: str, errors: list):
+        if not errors:
+            return
+        for rel, e in errors:
+            logger.error(f"Failed to {action} {rel}: {e}")
+        raise SyncError(
+            f"Failed to {action} {len(errors)} file(s) for {target}: "
+            f"{errors[0][1]}",
+        ) from errors[0][1]
+
+    def upload(self, local_path: str, prefix: str) -> dict:
+        """Mirror ``local_path`` to ``prefix`` and return transfer stats."""
+        prefix = _normalize_prefix(prefix)
+        manifest = self.manifest_for(local_path, prefix)
+        files, dirs = _scan_local(local_path)
+        remote = self._list_remote(prefix)
+        stats = {"uploaded": 0, "skipped": 0, "deleted": 0}
+        errors = []
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="storage-upload",
+        ) as pool:
+            pending = {}
+            multipart = {}
+            for rel, stat in files.items():
+                obj = remote.get(rel)
+                if manifest.matches(rel, stat, obj):
+                    stats["skipped"] += 1
+                    continue
+                path = os.path.join(local_path, rel)
+                if manifest.get(rel) is None and obj is not None:
+                    pending[
+                        pool.submit(self._same_content, path, obj, stat[0])
+                    ] = (rel, stat, "check")
+                    continue
+                self._submit_upload(
+                    pool,
+                    pending,
+                    multipart,
+                    prefix + rel,
+                    rel,
+                    stat,
+                    path,
+                )
+
+            for rel in dirs:
+                if rel in remote:
+                    manifest.set(rel, 0, 0, remote[rel].etag)
+                    continue
+                pending[
+                    pool.submit(self.store.put_bytes, prefix + rel, b"")
+                ] = (
+                    rel,
+                    (0, 0),
+                    "put",
+                )
+
+            while pending:
+                done = next(as_completed(pending))
+                rel, stat, kind = pending.pop(done)
+                try:
+                    result = done.result()
+                except Exception as e:
+                    errors.append((rel, e))
+                    continue
+                if kind == "check":
+                    if result:
+                        manifest.set(rel, *stat, remote[rel].etag)
+                        stats["skipped"] += 1
+                    else:
+                        self._submit_upload(
+                            pool,
+                            pending,
+                            multipart,
+                            prefix + rel,
+                            rel,
+                            stat,
+                            os.path.join(local_path, rel),
+                        )
+                    continue
+                manifest.set(rel, *stat, result)
+                if not rel.endswith("/"):
+                    stats["uploaded"] += 1
+
+            for rel, (key, upload_id, futures, stat) in multipart.items():
+                try:
+                    etag = self._finish_multipart(key, upload_id, futures)
+                except Exception as e:
+                    errors.append((rel, e))
+                    continue
+                manifest.set(rel, *stat, etag)
+                stats["uploaded"] += 1
+
+        # Propagate deletions of files synced before and removed since
+        deleted = [
+            rel
+            for rel in list(manifest.entries)
+            if rel not in files and rel not in dirs
+        ]
+        try:
+            self._delete_remote(
+                prefix + rel for rel in deleted if rel in remote
+            )
+            for rel in deleted:
+                manifest.pop(rel)
+            stats["deleted"] = sum(1 for rel in deleted if rel in remote)
+        except Exception as e:
+            errors.append((prefix, e))
+
+        manifest.save()
+        self._maybe_prune_manifests()
+        logger.debug(f"Uploaded {local_path} to {prefix}: {stats}")
+        self._raise_errors("upload", prefix, errors)
+        return stats
+
+    def _submit_upload(self, pool, pending, multipart, key, rel, stat, path):
+        size = stat[0]
+        if self.multipart_threshold and size >= self.multipart_threshold:
+            upload_id, futures = self._upload_multipart(pool, key, path, size)
+            multipart[rel] = (key, upload_id, futures, stat)
+        else:
+            pending[pool.submit(self.store.put_file, key, path)] = (
+                rel,
+                stat,
+                "put",
+            )
+
+    def _download_one(self, key: str, path: str) -> Tuple[int, int]:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{uuid.uuid4().hex}.part"
+        try:
+            self.store.get_file(key, tmp)
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        st = os.stat(path)
+        return st.st_size, st.st_mtime_ns
+
+    def download(self, prefix: str, local_path: str) -> dict:
+        """Mirror ``prefix`` into ``local_path`` and return transfer stats."""
+        prefix = _normalize_prefix(prefix)
+        os.makedirs(local_path, exist_ok=True)
+        manifest = self.manifest_for(local_path, prefix)
+        files, dirs = _scan_local(local_path)
+        remote = self._list_remote(prefix)
+        stats = {"downloaded": 0, "skipped": 0, "deleted": 0}
+        errors = []
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="storage-download",
+        ) as pool:
+            pending = {}
+            for rel, obj in remote.items():
+                path = os.path.join(local_path, rel)
+                if obj.is_dir:
+                    os.makedirs(path, exist_ok=True)
+                    manifest.set(rel, 0, 0, obj.etag)
+                    continue
+                stat = files.get(rel)
+                if manifest.matches(rel, stat, obj):
+                    stats["skipped"] += 1
+                    continue
+                if manifest.get(rel) is None and stat is not None:
+                    pending[
+                        pool.submit(self._same_content, path, obj, stat[0])
+                    ] = (rel, "check")
+                    continue
+                pending[pool.submit(self._download_one, obj.key, path)] = (
+                    rel,
+                    "get",
+                )
+
+            while pending:
+                done = next(as_completed(pending))
+                rel, kind = pending.pop(done)
+                try:
+                    result = done.result()
+                except Exception as e:
+                    errors.append((rel, e))
+                    continue
+                if kind == "check":
+                    if result:
+                        manifest.set(rel, *files[rel], remote[rel].etag)
+                        stats["skipped"] += 1
+                    else:
+                        path = os.path.join(local_path, rel)
+                        pending[
+                            pool.submit(
+                                self._download_one,
+                                remote[rel].key,
+                                path,
+                            )
+                        ] = (rel, "get")
+                    continue
+                manifest.set(rel, *result, remote[rel].etag)
+                stats["downloaded"] += 1
+
+        # Propagate remote deletions, leaving local edits made since the
+        # last sync alone
+        # Deepest paths first so emptied directories can be removed
+        stale = sorted(
+            (r for r in manifest.entries if r not in remote),
+            key=len,
+            reverse=True,
+        )
+        for rel in stale:
+            entry = manifest.get(rel)
+            path = os.path.join(local_path, rel)
+            try:
+                if rel.endswith("/"):
+                    if rel in dirs and not os.listdir(path):
+                        os.rmdir(path)
+                        stats["deleted"] += 1
+                elif files.get(rel) == (entry["size"], entry["mtime_ns"]):
+                    os.remove(path)
+                    stats["deleted"] += 1
+            except OSError as e:
+                errors.append((rel, e))
+                continue
+            manifest.pop(rel)
+
+        manifest.save()
+        self._maybe_prune_manifests()
+        logger.debug(f"Downloaded {prefix} to {local_path}: {stats}")
+        self._raise_errors("download", prefix, errors)
+        return stats
@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+import abc
+import hashlib
+import os
+import shutil
+import threading
+import uuid
+from dataclasses import dataclass
+from typing import Iterator, List, Tuple
+
+
+@dataclass(frozen=True)
+class ObjectInfo:
+    key: str
+    size: int
+    etag: str
+
+    @property
+    def is_dir(self) -> bool:
+        return self.key.endswith("/")
+
+
+class ObjectStore(abc.ABC):
+    """
+    Minimal object store API used by the folder sync engine.
+
+    Implementations must be safe to call from several threads at once.
+    """
+
+    @abc.abstractmethod
+    def iter_objects(self, prefix: str) -> Iterator[ObjectInfo]:
+        """Yield every object whose key starts with ``prefix``."""
+
+    @abc.abstractmethod
+    def put_file(self, key: str, local_path: str) -> str:
+        """Upload a local file in one request and return its ETag."""
+
+    @abc.abstractmethod
+    def put_bytes(self, key: str, data: bytes) -> str:
+        """Store ``data`` under ``key`` and return its ETag."""
+
+    @abc.abstractmethod
+    def get_file(self, key: str, local_path: str) -> None:
+        """Download an object to a local file."""
+
+    @abc.abstractmethod
+    def delete_objects(self, keys: List[str]) -> None:
+        """Delete the given keys. Missing keys are ignored."""
+
+    @abc.abstractmethod
+    def init_multipart(self, key: str) -> str:
+        """Start a multipart upload and return its upload id."""
+
+    @abc.abstractmethod
+    def put_part(
+        self,
+        key: str,
+        upload_id: str,
+        part_number: int,
+        data: bytes,
+    ) -> str:
+        """Upload one part (1-based ``part_number``) and return its ETag."""
+
+    @abc.abstractmethod
+    def complete_multipart(
+        self,
+        key: str,
+        upload_id: str,
+        parts: List[Tuple[int, str]],
+    ) -> str:
+        """Assemble uploaded ``(part_number, etag)`` parts into the object."""
+
+    @abc.abstractmethod
+    def abort_multipart(self, key: str, upload_id: str) -> None:
+        """Discard a multipart upload and its parts."""
+
+
+def _md5_file(path: str) -> str:
+    md5 = hashlib.md5()
+    with open(path, "rb") as f:
+        while chunk := f.read(1024 * 1024):
+            md5.update(chunk)
+    return md5.hexdigest().upper()
+
+
+class LocalObjectStore(ObjectStore):
+    """
+    Directory-backed stand-in for an object store such as OSS.
+
+    Keys map to files under ``root``; ETags follow the OSS format (upper
+    case MD5 for single uploads, ``<md5-of-part-md5s>-<n>`` for multipart
+    uploads). Every request is counted in ``calls`` so tests can assert
+    how many round trips a sync took.
+    """
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+        self._uploads_dir = os.path.join(self.root, ".uploads")
+        self._lock = threading.Lock()
+        self._etags = {}
+        self.calls = {}
+        os.makedirs(self.root, exist_ok=True)
+
+    def _count(self, name: str):
+        with self._lock:
+            self.calls[name] = self.calls.get(name, 0) + 1
+
+    def _path(self, key: str) -> str:
+        path = os.path.abspath(os.path.join(self.root, key))
+        if os.path.commonpath([self.root, path]) != self.root:
+            raise ValueError(f"Key escapes store root: {key}")
+        return path
+
+    def _set_etag(self, key: str, etag: str) -> str:
+        with self._lock:
+            self._etags[key] = etag
+        return etag
+
+    def iter_objects(self, prefix: str) -> Iterator[ObjectInfo]:
+        self._count("list")
+        for root, dirs, files in os.walk(self.root):
+            if root == self.root and ".uploads" in dirs:
+                dirs.remove(".uploads")
+            rel_root = os.path.relpath(root, self.root)
+            rel_root = "" if rel_root == "." else rel_root + "/"
+            entries = [(d + "/", True) for d in dirs]
+            entries += [(f, False) for f in files]
+            for name, is_dir in entries:
+                key = (rel_root + name).replace(os.sep, "/")
+                if not key.startswith(prefix):
+                    continue
+                if is_dir:
+                    # Only explicit directory markers are objects
+                    if key in self._etags:
+                        yield ObjectInfo(key, 0, self._etags[key])
+                    continue
+                path = os.path.join(root, name)
+                etag = self._etags.get(key) or _md5_file(path)
+                yield ObjectInfo(key, os.path.getsize(path), etag)
+
+    def put_file(self, key: str, local_path: str) -> str:
+        self._count("put")
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        shutil.copyfile(local_path, path)
+        return self._set_etag(key, _md5_file(path))
+
+    def put_bytes(self, key: str, data: bytes) -> str:
+        self._count("put")
+        path = self._path(key)
+        if key.endswith("/"):
+            os.makedirs(path, exist_ok=True)
+            return self._set_etag(key, hashlib.md5(data).hexdigest().upper())
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+        return self._set_etag(key, hashlib.md5(data).hexdigest().upper())
+
+    def get_file(self, key: str, local_path: str) -> None:
+        self._count("get")
+        shutil.copyfile(self._path(key), local_path)
+
+    def delete_objects(self, keys: List[str]) -> None:
+        self._count("delete")
+        for key in keys:
+            path = self._path(key)
+            with self._lock:
+                self._etags.pop(key, None)
+            if key.endswith("/"):
+                # Drop the marker; keep the directory if it still has
+                # objects in it
+                if os.path.isdir(path) and not os.listdir(path):
+                    os.rmdir(path)
+            elif os.path.isfile(path):
+                os.remove(path)
+
+    def init_multipart(self, key: str) -> str:
+        self._count("init_multipart")
+        upload_id = uuid.uuid4().hex
+        os.makedirs(os.path.join(self._uploads_dir, upload_id))
+        return upload_id
+
+    def put_part(
+        self,
+        key: str,
+        upload_id: str,
+        part_number: int,
+        data: bytes,
+    ) -> str:
+        self._count("put_part")
+        part_path = os.path.join(
+            self._uploads_dir, upload_id, str(part_number)
+        )
+        with open(part_path, "wb") as f:
+            f.write(data)
+        return hashlib.md5(data).hexdigest().upper()
+
+    def complete_multipart(
+        self,
+        key: str,
+        upload_id: str,
+        parts: List[Tuple[int, str]],
+    ) -> str:
+        self._count("complete_multipart")
+        upload_dir = os.path.join(self._uploads_dir, upload_id)
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        combined = hashlib.md5()
+        with open(path, "wb") as out:
+            for part_number, etag in sorted(parts):
+                with open(
+                    os.path.join(upload_dir, str(part_number)), "rb"
+                ) as f:
+                    shutil.copyfileobj(f, out)
+                combined.update(bytes.fromhex(etag))
+        shutil.rmtree(upload_dir, ignore_errors=True)
+        etag = f"{combined.hexdigest().upper()}-{len(parts)}"
+        return self._set_etag(key, etag)
+
+    def abort_multipart(self, key: str, upload_id: str) -> None:
+        self._count("abort_multipart")
+        shutil.rmtree(
+            os.path.join(self._uploads_dir, upload_id),
+            ignore_errors=True,
+        )
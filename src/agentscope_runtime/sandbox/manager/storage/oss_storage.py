@@ -1,9 +1,12 @@
 # -*- coding: utf-8 -*-
-import os
 import hashlib
+from typing import Iterator, List, Optional, Tuple
+
 import oss2
 
 from .data_storage import DataStorage
+from .folder_sync import FolderSync
+from .object_store import ObjectInfo, ObjectStore
 
 
 def calculate_md5(file_path):
@@ -15,75 +18,119 @@ def calculate_md5(file_path):
     return md5.hexdigest()
 
 
-class OSSStorage(DataStorage):
+class OSSObjectStore(ObjectStore):
+    """`ObjectStore` backed by an ``oss2.Bucket``."""
+
+    def __init__(self, bucket: oss2.Bucket):
+        self.bucket = bucket
+
+    def iter_objects(self, prefix: str) -> Iterator[ObjectInfo]:
+        for obj in oss2.ObjectIterator(self.bucket, prefix=prefix):
+            if obj.is_prefix():
+                continue
+            yield ObjectInfo(obj.key, obj.size, obj.etag.strip('"'))
+
+    def put_file(self, key: str, local_path: str) -> str:
+        return self.bucket.put_object_from_file(key, local_path).etag
+
+    def put_bytes(self, key: str, data: bytes) -> str:
+        return self.bucket.put_object(key, data).etag
+
+    def get_file(self, key: str, local_path: str) -> None:
+        self.bucket.get_object_to_file(key, local_path)
+
+    def delete_objects(self, keys: List[str]) -> None:
+        if keys:
+            self.bucket.batch_delete_objects(keys)
+
+    def init_multipart(self, key: str) -> str:
+        return self.bucket.init_multipart_upload(key).upload_id
+
+    def put_part(
+        self,
+        key: str,
+        upload_id: str,
+        part_number: int,
+        data: bytes,
+    ) -> str:
+        return self.bucket.upload_part(key, upload_id, part_number, data).etag
+
+    def complete_multipart(
+        self,
+        key: str,
+        upload_id: str,
+        parts: List[Tuple[int, str]],
+    ) -> str:
+        return self.bucket.complete_multipart_upload(
+            key,
+            upload_id,
+            [oss2.models.PartInfo(number, etag) for number, etag in parts],
+        ).etag
+
+    def abort_multipart(self, key: str, upload_id: str) -> None:
+        self.bucket.abort_multipart_upload(key, upload_id)
+
+
+class ObjectStorage(DataStorage):
+    """
+    `DataStorage` over any `ObjectStore`, synced incrementally and in
+    parallel by `FolderSync`.
+    """
+
     def __init__(
         self,
-        access_key_id,
-        access_key_secret,
-        endpoint,
-        bucket_name,
+        store: ObjectStore,
+        manifest_dir: Optional[str] = None,
+        max_workers: int = 8,
+        multipart_threshold: int = 32 * 1024 * 1024,
+        part_size: int = 8 * 1024 * 1024,
     ):
-        self.auth = oss2.Auth(access_key_id, access_key_secret)
-        self.bucket = oss2.Bucket(self.auth, endpoint, bucket_name)
+        self.store = store
+        self.sync = FolderSync(
+            store,
+            manifest_dir=manifest_dir,
+            max_workers=max_workers,
+            multipart_threshold=multipart_threshold,
+            part_size=part_size,
+        )
 
     def download_folder(self, source_path, destination_path):
-        """Download a folder from OSS to the local filesystem."""
-        if not os.path.exists(destination_path):
-            os.makedirs(destination_path)
-
-        for obj in oss2.ObjectIterator(self.bucket, prefix=source_path):
-            local_path = os.path.join(
-                destination_path,
-                os.path.relpath(obj.key, source_path),
-            )
-
-            if obj.is_prefix():
-                # Create local directory
-                os.makedirs(local_path, exist_ok=True)
-            else:
-                # Download file
-                os.makedirs(os.path.dirname(local_path), exist_ok=True)
-                self.bucket.get_object_to_file(obj.key, local_path)
+        """Download a folder from the object store to the local filesystem."""
+        return self.sync.download(source_path, destination_path)
 
     def upload_folder(self, source_path, destination_path):
-        """Upload a local folder to OSS."""
-        for root, dirs, files in os.walk(source_path):
-            # Upload directory structure
-            for d in dirs:
-                dir_path = os.path.join(root, d)
-                oss_dir_path = os.path.join(
-                    destination_path,
-                    os.path.relpath(dir_path, source_path),
-                )
-                # Maintain structure with an empty object
-                self.bucket.put_object(oss_dir_path + "/", b"")
-
-            # Upload files
-            for file in files:
-                local_file_path = os.path.join(root, file)
-                oss_file_path = os.path.join(
-                    destination_path,
-                    os.path.relpath(local_file_path, source_path),
-                )
-
-                local_md5 = calculate_md5(local_file_path)
-
-                try:
-                    oss_md5 = (
-                        self.bucket.head_object(oss_file_path)
-                        .headers["ETag"]
-                        .strip('"')
-                    )
-                except oss2.exceptions.NoSuchKey:
-                    oss_md5 = None
-
-                # Upload if MD5 does not match or file does not exist
-                if local_md5 != oss_md5:
-                    self.bucket.put_object_from_file(
-                        oss_file_path,
-                        local_file_path,
-                    )
+        """Upload a local folder to the object store."""
+        return self.sync.upload(source_path, destination_path)
 
     def path_join(self, *args):
-        """Join path components for OSS."""
+        """Join path components for object keys."""
         return "/".join(args)
+
+
+class OSSStorage(ObjectStorage):
+    def __init__(
+        self,
+        access_key_id,
+        access_key_secret,
+        endpoint,
+        bucket_name,
+        manifest_dir: Optional[str] = None,
+        max_workers: int = 8,
+        multipart_threshold: int = 32 * 1024 * 1024,
+        part_size: int = 8 * 1024 * 1024,
+    ):
+        self.auth = oss2.Auth(access_key_id, access_key_secret)
+        # One pooled connection per transfer worker
+        self.bucket = oss2.Bucket(
+            self.auth,
+            endpoint,
+            bucket_name,
+            session=oss2.Session(pool_size=max(max_workers, 10)),
+        )
+        super().__init__(
+            OSSObjectStore(self.bucket),
+            manifest_dir=manifest_dir,
+            max_workers=max_workers,
+            multipart_threshold=multipart_threshold,
+            part_size=part_size,
+        )
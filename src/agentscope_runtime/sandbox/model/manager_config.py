@@ -23,6 +23,12 @@ class SandboxManagerEnvConfig(BaseModel):
         None,
         description="Folder path in storage.",
     )
+    local_clone_mode: Literal["auto", "copy"] = Field(
+        "auto",
+        description="How the local file system clones workspaces: 'auto' "
+        "tries copy-on-write reflinks, then copies; "
+        "'copy' always copies.",
+    )
     redis_enabled: bool = Field(
         False,
         description="Indicates if Redis is enabled.",
@@ -90,6 +96,29 @@ class SandboxManagerEnvConfig(BaseModel):
         "your-bucket-name",
         description="Bucket name in OSS. Required if file_system is 'oss'.",
     )
+    oss_sync_workers: int = Field(
+        8,
+        description="Number of parallel transfers used to sync a session "
+        "workspace with OSS.",
+        ge=1,
+    )
+    oss_multipart_threshold: int = Field(
+        32 * 1024 * 1024,
+        description="Files of at least this many bytes are uploaded to OSS "
+        "as parallel multipart uploads.",
+        ge=1,
+    )
+    oss_part_size: int = Field(
+        8 * 1024 * 1024,
+        description="Part size in bytes for OSS multipart uploads.",
+        ge=100 * 1024,
+    )
+    storage_manifest_dir: Optional[str] = Field(
+        None,
+        description="Directory for the local sync manifests that let OSS "
+        "syncs skip unchanged files. Defaults to "
+        "~/.agentscope-runtime/sync.",
+    )
 
     # Redis settings
     redis_server: Optional[str] = Field(
@@ -123,6 +152,14 @@ class SandboxManagerEnvConfig(BaseModel):
         "_runtime_sandbox_container_container_pool",
         description="Prefix for Redis keys related to container pool.",
     )
+    redis_container_state_index_key: str = Field(
+        "_runtime_sandbox_container_state_index",
+        description="Prefix for Redis keys of the per-state container index.",
+    )
+    redis_watch_schedule_key: str = Field(
+        "_runtime_sandbox_watch_schedule",
+        description="Prefix for Redis sorted sets of watcher deadlines.",
+    )
 
     # Kubernetes settings
     k8s_namespace: Optional[str] = Field(
@@ -268,6 +305,15 @@ class SandboxManagerEnvConfig(BaseModel):
         ),
         ge=0,
     )
+    watcher_full_scan_interval: int = Field(
+        default=300,
+        description=(
+            "Seconds between full scans that rebuild the watcher deadline "
+            "schedule and top up the pool. A full scan always runs when "
+            "the watcher starts. 0 disables the periodic scans."
+        ),
+        ge=0,
+    )
     released_key_ttl: int = Field(
         default=3600,
         description=(
@@ -282,6 +328,42 @@ class SandboxManagerEnvConfig(BaseModel):
         "0 means unlimited.",
         ge=0,
     )
+    blocking_io_workers: int = Field(
+        default=32,
+        description="Threads for the blocking container runtime and "
+        "storage calls made by the async manager API.",
+        gt=0,
+    )
+    pool_refill_workers: int = Field(
+        default=4,
+        description="Threads creating warm pool containers, kept apart "
+        "from the blocking I/O threads so pool refills cannot hold up "
+        "API calls.",
+        gt=0,
+    )
+    connection_cache_size: int = Field(
+        default=256,
+        description="Maximum number of sandbox runtime clients kept open "
+        "for reuse across tool calls. 0 disables the cache.",
+        ge=0,
+    )
+    connection_cache_ttl: float = Field(
+        default=60.0,
+        description="Seconds a cached runtime client is reused before it "
+        "is re-created and health-checked again. 0 means no expiry.",
+        ge=0,
+    )
+    image_prepull: Literal["none", "default", "all"] = Field(
+        default="none",
+        description="Images the manager server pulls on startup: none, "
+        "those of the default sandbox types, or those of all registered "
+        "sandbox types.",
+    )
+    image_pull_workers: int = Field(
+        default=4,
+        description="Images pulled in parallel on startup.",
+        gt=0,
+    )
 
     @model_validator(mode="after")
     def check_settings(self):
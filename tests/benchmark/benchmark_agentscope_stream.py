@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+Microbenchmark of adapting an AgentScope message stream.
+
+AgentScope streams a cumulative message, so each chunk carries the whole
+answer so far. Prints the per-chunk cost of
+:func:`adapt_agentscope_message_stream` for a short and a long answer;
+the two should stay close, as chunks are neither copied nor re-scanned
+from the start. Run it with::
+
+    python tests/benchmark/benchmark_agentscope_stream.py
+"""
+import argparse
+import asyncio
+import time
+
+from agentscope.message import Msg
+
+from agentscope_runtime.adapters.agentscope.stream import (
+    adapt_agentscope_message_stream,
+)
+
+
+async def per_chunk_seconds(chunks: int, chunk_size: int = 64) -> float:
+    piece = "x" * chunk_size
+    msg = Msg("assistant", [], "assistant")
+
+    async def source():
+        text = ""
+        for i in range(chunks):
+            text += piece
+            msg.content = [{"type": "text", "text": text}]
+            yield msg, i == chunks - 1
+
+    start = time.perf_counter()
+    async for _ in adapt_agentscope_message_stream(source()):
+        pass
+    return (time.perf_counter() - start) / chunks
+
+
+async def run(lengths, repeat: int) -> None:
+    await per_chunk_seconds(50)  # warm up
+    print(f"{'chunks':>8}{'per chunk':>14}")
+    for chunks in lengths:
+        best = min([await per_chunk_seconds(chunks) for _ in range(repeat)])
+        print(f"{chunks:>8}{best * 1e6:>12.1f}us")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--lengths", type=int, nargs="+", default=[200, 4000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(run(args.lengths, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+Microbenchmark of accumulating streamed text deltas into a message.
+
+Prints the per-delta cost of :meth:`Message.add_delta_content` plus the
+final :meth:`Message.content_completed` for a short and a long answer;
+the two should stay close, as deltas are buffered and joined once
+instead of being concatenated on each append. Run it with::
+
+    python tests/benchmark/benchmark_message_delta.py
+"""
+import argparse
+import time
+
+from agentscope_runtime.engine.schemas.agent_schemas import (
+    Message,
+    TextContent,
+)
+
+
+def per_delta_seconds(deltas: int, delta_size: int = 1024) -> float:
+    piece = "x" * delta_size
+    message = Message(role="assistant")
+    start = time.perf_counter()
+    first = message.add_delta_content(TextContent(delta=True, text=piece))
+    for _ in range(deltas - 1):
+        message.add_delta_content(
+            TextContent(delta=True, text=piece, index=first.index),
+        )
+    message.content_completed(first.index)
+    return (time.perf_counter() - start) / deltas
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument(
+        "--lengths",
+        type=int,
+        nargs="+",
+        default=[500, 10000],
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    per_delta_seconds(50)  # warm up
+    print(f"{'deltas':>8}{'per delta':>14}")
+    for deltas in args.lengths:
+        best = min(per_delta_seconds(deltas) for _ in range(args.repeat))
+        print(f"{deltas:>8}{best * 1e6:>12.2f}us")
+
+
+if __name__ == "__main__":
+    main()
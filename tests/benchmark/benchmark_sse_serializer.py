@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+Microbenchmark of SSE serialization of streamed items.
+
+Compares events per second of the previous path (a Python walk over each
+item, ``model_dump()`` and ``json.dumps``) with the cached per-type
+encoders of :class:`SSESerializer`. Run it with::
+
+    python tests/benchmark/benchmark_sse_serializer.py
+"""
+import argparse
+import json
+import time
+
+from agentscope_runtime.engine.deployers.utils.service_utils.sse_serializer import (  # noqa: E501
+    SSESerializer,
+    orjson,
+    to_jsonable,
+)
+from agentscope_runtime.engine.schemas.agent_schemas import TextContent
+
+
+def legacy_to_sse_event(item) -> str:
+    return f"data: {json.dumps(to_jsonable(item), ensure_ascii=False)}\n\n"
+
+
+def legacy_model_event(item) -> str:
+    return f"data: {item.model_dump_json()}\n\n"
+
+
+def workloads():
+    delta = TextContent(delta=True, text="你好, world", index=0, msg_id="m1")
+    return {
+        "token model": (delta, legacy_to_sse_event),
+        "runner event": (delta, legacy_model_event),
+        "token dict": (
+            {"delta": "hello", "index": 3, "finish_reason": None},
+            legacy_to_sse_event,
+        ),
+        "nested dict": (
+            {
+                "choices": [
+                    {"delta": {"content": "hi", "role": "assistant"}},
+                ],
+                "usage": {"input_tokens": 10, "output_tokens": 2},
+                "content": delta,
+            },
+            legacy_to_sse_event,
+        ),
+    }
+
+
+def events_per_second(encode, item, number: int) -> float:
+    start = time.perf_counter()
+    for _ in range(number):
+        frame = encode(item)
+        if isinstance(frame, str):
+            # StreamingResponse encodes str chunks itself
+            frame.encode()
+    return number / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--number", type=int, default=100000)
+    args = parser.parse_args()
+
+    serializer = SSESerializer()
+    print(f"JSON encoder: {'orjson' if orjson else 'pydantic-core'}")
+    print(f"{'workload':<14}{'before':>14}{'after':>14}{'speedup':>10}")
+    for name, (item, legacy) in workloads().items():
+        before = events_per_second(legacy, item, args.number)
+        after = events_per_second(serializer.to_event, item, args.number)
+        print(
+            f"{name:<14}{before:>12,.0f}/s{after:>12,.0f}/s"
+            f"{after / before:>9.1f}x",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+Microbenchmark of tracing a streamed LLM response.
+
+Prints the per-chunk cost of a generator decorated with ``@trace`` and
+the built-in ``merge_incremental_chunk``, for a short and a long stream;
+the two should stay close, as chunks are folded into the merged output
+as they are yielded instead of being kept and merged at the end. Run it
+with::
+
+    python tests/benchmark/benchmark_trace_stream.py
+"""
+import argparse
+import time
+
+from openai.types.chat import ChatCompletionChunk
+
+from agentscope_runtime.engine.tracing import trace
+
+
+def make_chunk(content, finish_reason=None) -> ChatCompletionChunk:
+    return ChatCompletionChunk(
+        id="chunk",
+        object="chat.completion.chunk",
+        created=1,
+        model="m",
+        choices=[
+            {
+                "index": 0,
+                "delta": {"content": content},
+                "finish_reason": finish_reason,
+            },
+        ],
+    )
+
+
+def per_chunk_seconds(chunks: int) -> float:
+    @trace("LLM", trace_name="bench")
+    def stream():
+        for _ in range(chunks):
+            yield make_chunk("x" * 16)
+        yield make_chunk("", finish_reason="stop")
+
+    start = time.perf_counter()
+    for _ in stream():
+        pass
+    return (time.perf_counter() - start) / chunks
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--lengths", type=int, nargs="+", default=[200, 2000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    per_chunk_seconds(50)  # warm up
+    print(f"{'chunks':>8}{'per chunk':>14}")
+    for chunks in args.lengths:
+        best = min(per_chunk_seconds(chunks) for _ in range(args.repeat))
+        print(f"{chunks:>8}{best * 1e6:>12.1f}us")
+
+
+if __name__ == "__main__":
+    main()
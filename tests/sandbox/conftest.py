@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=unused-argument,redefined-outer-name
+import threading
+import time
+
+import fakeredis
+import pytest
+
+from agentscope_runtime.sandbox.enums import SandboxType
+from agentscope_runtime.sandbox.manager.sandbox_manager import SandboxManager
+from agentscope_runtime.sandbox.model import SandboxManagerEnvConfig
+
+
+class StubContainerClient:
+    """Container client that records what the manager asked it to do."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.ids = set()
+        self.threads = set()
+        self.lock = threading.Lock()
+
+    def create(self, image, name, ports, volumes, environment, **kwargs):
+        if self.delay:
+            time.sleep(self.delay)
+        with self.lock:
+            self.threads.add(threading.current_thread().name)
+            self.ids.add(f"cid-{name}")
+        return f"cid-{name}", [18080], "127.0.0.1", "http"
+
+    def inspect(self, identity):
+        return {"Id": identity} if identity in self.ids else None
+
+    def get_status(self, identity):
+        return "running"
+
+    def stop(self, container_id, timeout=1):
+        pass
+
+    def remove(self, container_id, force=True):
+        self.ids.discard(container_id)
+
+
+@pytest.fixture()
+def make_manager(monkeypatch):
+    """Build local SandboxManagers backed by a StubContainerClient.
+
+    The factory takes ``redis_enabled`` (served by fakeredis) and any other
+    SandboxManagerEnvConfig field; the stub is ``manager.client``.
+    """
+    from agentscope_runtime.common.container_clients import (
+        ContainerClientFactory,
+    )
+    from agentscope_runtime.sandbox.manager.storage import LocalStorage
+
+    monkeypatch.setattr(LocalStorage, "upload_folder", lambda *a, **k: None)
+    monkeypatch.setattr(LocalStorage, "download_folder", lambda *a, **k: None)
+
+    def _make_manager(redis_enabled=False, **config):
+        client = StubContainerClient()
+        monkeypatch.setattr(
+            ContainerClientFactory,
+            "create_client",
+            lambda *args, **kwargs: client,
+        )
+
+        if redis_enabled:
+            import redis
+            import redis.asyncio
+
+            server = fakeredis.FakeServer()
+            monkeypatch.setattr(
+                redis,
+                "Redis",
+                lambda **kwargs: fakeredis.FakeRedis(
+                    server=server,
+                    decode_responses=True,
+                ),
+            )
+            monkeypatch.setattr(
+                redis.asyncio,
+                "Redis",
+                lambda **kwargs: fakeredis.FakeAsyncRedis(
+                    server=server,
+                    decode_responses=True,
+                ),
+            )
+
+        cfg = SandboxManagerEnvConfig(
+            **{
+                "redis_enabled": redis_enabled,
+                "redis_server": "localhost" if redis_enabled else None,
+                "redis_port": 6379 if redis_enabled else None,
+                "redis_db": 0 if redis_enabled else None,
+                "file_system": "local",
+                "container_deployment": "docker",
+                "pool_size": 0,
+                "default_mount_dir": "sessions_mount_dir",
+                "watcher_scan_interval": 0,
+                **config,
+            },
+        )
+        return SandboxManager(config=cfg, default_type=SandboxType.BASE)
+
+    return _make_manager
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=protected-access,redefined-outer-name
+import asyncio
+import time
+
+import fakeredis
+import pytest
+
+from agentscope_runtime.common.collections import (
+    LoopLocalRedis,
+    RedisMapping,
+    RedisQueue,
+    RedisSetCollection,
+)
+from agentscope_runtime.sandbox.enums import SandboxType
+from agentscope_runtime.sandbox.model import (
+    ContainerState,
+)
+
+
+@pytest.fixture(params=[False, True], ids=["memory", "redis"])
+def manager(request, make_manager):
+    mgr = make_manager(redis_enabled=request.param, max_sandbox_instances=5)
+    mgr.client.delay = 0.05
+    return mgr
+
+
+def test_concurrent_create_async_respects_limit(manager):
+    async def main():
+        return await asyncio.gather(
+            *(
+                manager.create_async(meta={"session_ctx_id": f"s{i}"})
+                for i in range(8)
+            ),
+        )
+
+    names = [name for name in asyncio.run(main()) if name]
+
+    assert len(names) == 5
+    assert manager.count_active_containers() == 5
+    # container runtime calls ran on the manager's own pool
+    assert all(
+        t.startswith("sandbox-io") for t in manager.client.threads
+    ), manager.client.threads
+
+    info = manager.get_info(names[0])
+    session_ctx_id = info["session_ctx_id"]
+    assert info["state"] == ContainerState.RUNNING
+    assert info["last_active_at"] is not None
+    assert manager.get_session_mapping(session_ctx_id) == [names[0]]
+    assert manager.heartbeat_schedule.score(session_ctx_id) is not None
+
+
+def test_release_and_pool_async(manager):
+    pooled = manager.create()
+    manager.pool_queues[SandboxType.BASE].enqueue(
+        manager.container_mapping.get(pooled),
+    )
+
+    async def main():
+        name = await manager.create_from_pool_async(
+            meta={"session_ctx_id": "s1"},
+        )
+        keys = await manager.list_session_keys_async()
+        released = await manager.release_async(name)
+        return name, keys, released
+
+    name, keys, released = asyncio.run(main())
+
+    assert name == pooled
+    assert keys == ["s1"]
+    assert released is True
+    assert manager.get_info(name)["state"] == ContainerState.RELEASED
+    assert manager.get_session_mapping("s1") == []
+    assert manager._pool_refill_event.is_set()
+
+
+def test_redis_collections_async_across_loops():
+    server = fakeredis.FakeServer()
+    sync_client = fakeredis.FakeRedis(server=server, decode_responses=True)
+    aclient = LoopLocalRedis(
+        lambda: fakeredis.FakeAsyncRedis(server=server, decode_responses=True),
+    )
+    mapping = RedisMapping(sync_client, prefix="m", async_client=aclient)
+    queue = RedisQueue(sync_client, "q", async_client=aclient)
+    index = RedisSetCollection(sync_client, "s", async_client=aclient)
+
+    async def write():
+        await mapping.aset("a", {"x": 1})
+        await queue.aenqueue({"y": 2})
+        return await index.aadd("a")
+
+    async def read():
+        keys = [key async for key in mapping.ascan()]
+        return (
+            keys,
+            await mapping.amget(["a", "b"]),
+            await queue.adequeue(),
+            await index.asize(),
+        )
+
+    # Each asyncio.run() uses a new loop and so a new async client
+    assert asyncio.run(write()) is True
+    assert asyncio.run(read()) == (["a"], [{"x": 1}, None], {"y": 2}, 1)
+    assert mapping.get("a") == {"x": 1}
+
+
+def test_async_exit_shuts_down_executors(manager):
+    async def main():
+        async with manager:
+            return await manager.create_async()
+
+    name = asyncio.run(main())
+
+    assert manager.get_info(name)["state"] == ContainerState.RELEASED
+    for executor in (
+        manager._blocking_executor,
+        manager._pool_refill_executor,
+    ):
+        with pytest.raises(RuntimeError):
+            executor.submit(time.sleep, 0)
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=unused-argument,protected-access,redefined-outer-name
+import time
+
+import pytest
+import requests
+
+from agentscope_runtime.sandbox.enums import SandboxType
+from agentscope_runtime.sandbox.manager import sandbox_manager as sm_module
+from agentscope_runtime.sandbox.manager.connection_cache import (
+    ConnectionCache,
+)
+
+
+class FakeConnection:
+    def __init__(self, name="c"):
+        self.name = name
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_cache_lru_eviction_closes_clients():
+    cache = ConnectionCache(max_size=2, ttl=0)
+    a, b, c = FakeConnection("a"), FakeConnection("b"), FakeConnection("c")
+    cache.put("a", a)
+    cache.put("b", b)
+    assert cache.get("a") is a  # "a" becomes most recently used
+
+    cache.put("c", c)
+
+    assert cache.get("b") is None
+    assert b.closed and not a.closed
+    assert len(cache) == 2
+
+
+def test_cache_ttl_and_invalidate():
+    cache = ConnectionCache(max_size=10, ttl=0.05)
+    a = FakeConnection()
+    cache.put("a", a, scope="loop-1")
+    assert cache.get("a") is None  # different scope
+    assert cache.get("a", scope="loop-1") is a
+
+    time.sleep(0.06)
+    assert cache.get("a", scope="loop-1") is None
+    assert a.closed
+
+    b = FakeConnection()
+    cache.put("b", b)
+    cache.put("b", FakeConnection(), scope="loop-2")
+    assert cache.invalidate("b", None) == 2
+    assert b.closed
+
+
+def test_leased_clients_are_closed_after_release():
+    cache = ConnectionCache(max_size=1, ttl=0)
+    a, b = FakeConnection("a"), FakeConnection("b")
+    cache.put("a", a, lease=True)
+    assert cache.get("a", lease=True) is a
+
+    # Evicted while two requests use it
+    cache.put("b", b)
+    assert cache.get("a") is None
+    cache.release(a)
+    assert not a.closed
+    cache.release(a)
+    assert a.closed
+
+    # A failed request drops its own client, not a newer one
+    assert cache.get("b", lease=True) is b
+    cache.discard(a)
+    assert cache.get("b") is b
+    cache.discard(b)
+    assert cache.get("b") is None and not b.closed
+    cache.release(b)
+    assert b.closed
+
+
+def test_cache_disabled():
+    cache = ConnectionCache(max_size=0)
+    cache.put("a", FakeConnection())
+    assert cache.get("a") is None
+
+    # Leased clients are still closed after use
+    a = FakeConnection()
+    cache.put("a", a, lease=True)
+    cache.release(a)
+    assert a.closed
+
+
+class CountingHttpClient(FakeConnection):
+    health_probes = 0
+
+    def __init__(self, model):
+        super().__init__(model.container_name)
+
+    def __enter__(self):
+        CountingHttpClient.health_probes += 1
+        return self
+
+    def call_tool(self, name, arguments=None):
+        return {"tool": name, "client": id(self)}
+
+
+@pytest.fixture()
+def mgr(make_manager, monkeypatch):
+    monkeypatch.setattr(sm_module, "SandboxHttpClient", CountingHttpClient)
+    CountingHttpClient.health_probes = 0
+    return make_manager()
+
+
+def test_manager_reuses_connection_until_release(mgr, monkeypatch):
+    cname = mgr.create(sandbox_type=SandboxType.BASE)
+
+    get_info_calls = []
+    original_get_info = mgr.get_info
+
+    def counting_get_info(identity):
+        get_info_calls.append(identity)
+        return original_get_info(identity)
+
+    monkeypatch.setattr(mgr, "get_info", counting_get_info)
+
+    first = mgr.call_tool(cname, "echo", {})
+    second = mgr.call_tool(cname, "echo", {})
+
+    assert first["client"] == second["client"]
+    assert CountingHttpClient.health_probes == 1
+    # One lookup to build the client; touch_session resolves the session
+    # on every call regardless
+    assert get_info_calls.count(cname) == 3
+
+    client = mgr._connections.get(cname)
+    mgr.release(cname)
+
+    assert client.closed
+    assert mgr._connections.get(cname) is None
+
+
+def test_failed_request_drops_cached_connection(mgr, monkeypatch):
+    from agentscope_runtime.sandbox.client import SandboxHttpClient
+
+    class FailingHttpClient(SandboxHttpClient):
+        def __enter__(self):
+            CountingHttpClient.health_probes += 1
+            return self
+
+        def _request(self, method, url, **kwargs):
+            raise requests.ConnectionError("container is gone")
+
+    monkeypatch.setattr(sm_module, "SandboxHttpClient", FailingHttpClient)
+    cname = mgr.create(sandbox_type=SandboxType.BASE)
+
+    result = mgr.call_tool(cname, "echo", {})
+    assert result["isError"]
+    assert mgr._connections.get(cname) is None
+
+    # The next call checks the container again
+    mgr.call_tool(cname, "echo", {})
+    assert CountingHttpClient.health_probes == 2
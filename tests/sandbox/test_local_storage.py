@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=redefined-outer-name
+import errno
+import os
+
+import pytest
+
+from agentscope_runtime.sandbox.manager.storage import LocalStorage
+from agentscope_runtime.sandbox.manager.storage import local_storage
+
+
+def _write(path, data, mode=None):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+    if mode is not None:
+        os.chmod(path, mode)
+
+
+@pytest.fixture()
+def source(tmp_path):
+    root = tmp_path / "src"
+    _write(str(root / "rw.txt"), b"writable")
+    _write(str(root / "data" / "ro.bin"), b"dataset", mode=0o444)
+    os.makedirs(root / "empty")
+    return str(root)
+
+
+@pytest.fixture()
+def no_reflink(monkeypatch):
+    calls = []
+
+    def unsupported(src, dst):
+        calls.append(src)
+        raise OSError(errno.EOPNOTSUPP, "not supported")
+
+    monkeypatch.setattr(local_storage, "reflink", unsupported)
+    return calls
+
+
+def test_clone_falls_back_to_copy(source, tmp_path, no_reflink):
+    dest = str(tmp_path / "dest")
+    storage = LocalStorage()
+
+    stats = storage.download_folder(source, dest)
+
+    assert stats == {"reflink": 0, "copy": 2, "skipped": 0}
+    # Read-only files are copied too, never linked to the source
+    ro_src = os.path.join(source, "data", "ro.bin")
+    ro_dest = os.path.join(dest, "data", "ro.bin")
+    assert not os.path.samefile(ro_src, ro_dest)
+    assert os.stat(ro_dest).st_nlink == 1
+    assert os.path.isdir(os.path.join(dest, "empty"))
+    # The unsupported reflink is remembered for this device pair
+    assert len(no_reflink) == 1
+
+
+def test_clone_skips_unchanged_files(source, tmp_path, no_reflink):
+    dest = str(tmp_path / "dest")
+    storage = LocalStorage()
+    storage.download_folder(source, dest)
+
+    assert storage.download_folder(source, dest)["skipped"] == 2
+
+    _write(os.path.join(source, "rw.txt"), b"changed")
+    stats = storage.download_folder(source, dest)
+
+    assert stats["copy"] == 1 and stats["skipped"] == 1
+    with open(os.path.join(dest, "rw.txt"), "rb") as f:
+        assert f.read() == b"changed"
+
+
+def test_copy_mode_never_links(source, tmp_path, no_reflink):
+    dest = str(tmp_path / "dest")
+
+    stats = LocalStorage(clone_mode="copy").download_folder(source, dest)
+
+    assert stats["copy"] == 2
+    assert not no_reflink
+    assert not os.path.samefile(
+        os.path.join(source, "data", "ro.bin"),
+        os.path.join(dest, "data", "ro.bin"),
+    )
+
+
+def test_reflink_used_when_supported(source, tmp_path, monkeypatch):
+    def fake_reflink(src, dst):
+        with open(src, "rb") as fsrc, open(dst, "xb") as fdst:
+            fdst.write(fsrc.read())
+
+    monkeypatch.setattr(local_storage, "reflink", fake_reflink)
+    dest = str(tmp_path / "dest")
+
+    stats = LocalStorage().download_folder(source, dest)
+
+    assert stats["reflink"] == 2
+    assert os.path.getmtime(os.path.join(dest, "rw.txt")) == os.path.getmtime(
+        os.path.join(source, "rw.txt"),
+    )
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=redefined-outer-name,protected-access
+import os
+import time
+
+import pytest
+
+from agentscope_runtime.sandbox.manager.storage import (
+    LocalObjectStore,
+    ObjectStorage,
+)
+from agentscope_runtime.sandbox.manager.storage.folder_sync import SyncError
+
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def _read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+@pytest.fixture()
+def store(tmp_path):
+    return LocalObjectStore(str(tmp_path / "bucket"))
+
+
+@pytest.fixture()
+def storage(store, tmp_path):
+    return ObjectStorage(
+        store,
+        manifest_dir=str(tmp_path / "manifests"),
+        max_workers=4,
+        multipart_threshold=1024,
+        part_size=256,
+    )
+
+
+@pytest.fixture()
+def workspace(tmp_path):
+    root = tmp_path / "workspace"
+    _write(str(root / "a.txt"), b"alpha")
+    _write(str(root / "sub" / "b.txt"), b"beta")
+    _write(str(root / "big.bin"), os.urandom(1000 + 1024))
+    os.makedirs(root / "empty")
+    return str(root)
+
+
+def test_upload_then_incremental_upload(storage, store, workspace):
+    stats = storage.upload_folder(workspace, "sessions/s1")
+    assert stats == {"uploaded": 3, "skipped": 0, "deleted": 0}
+    assert store.calls["init_multipart"] == 1
+    assert store.calls["put_part"] == 8
+
+    bucket = store.root
+    assert _read(os.path.join(bucket, "sessions/s1/sub/b.txt")) == b"beta"
+    assert _read(os.path.join(bucket, "sessions/s1/big.bin")) == _read(
+        os.path.join(workspace, "big.bin"),
+    )
+    assert os.path.isdir(os.path.join(bucket, "sessions/s1/empty"))
+
+    # Nothing changed: one LIST, no uploads and no hashing
+    store.calls.clear()
+    stats = storage.upload_folder(workspace, "sessions/s1")
+    assert stats == {"uploaded": 0, "skipped": 3, "deleted": 0}
+    assert store.calls == {"list": 1}
+
+    # Modify one file, delete another
+    _write(os.path.join(workspace, "a.txt"), b"alpha v2")
+    os.remove(os.path.join(workspace, "sub", "b.txt"))
+    store.calls.clear()
+    stats = storage.upload_folder(workspace, "sessions/s1")
+
+    assert stats == {"uploaded": 1, "skipped": 1, "deleted": 1}
+    assert _read(os.path.join(bucket, "sessions/s1/a.txt")) == b"alpha v2"
+    assert not os.path.exists(os.path.join(bucket, "sessions/s1/sub/b.txt"))
+
+
+def test_download_roundtrip_and_remote_deletions(
+    storage,
+    store,
+    workspace,
+    tmp_path,
+):
+    storage.upload_folder(workspace, "sessions/s1")
+    restored = str(tmp_path / "restored")
+
+    stats = storage.download_folder("sessions/s1", restored)
+    assert stats["downloaded"] == 3
+    assert _read(os.path.join(restored, "sub", "b.txt")) == b"beta"
+    assert os.path.isdir(os.path.join(restored, "empty"))
+
+    store.calls.clear()
+    stats = storage.download_folder("sessions/s1", restored)
+    assert stats == {"downloaded": 0, "skipped": 3, "deleted": 0}
+    assert store.calls == {"list": 1}
+
+    # Deleted remotely: removed locally; local-only files are kept
+    store.delete_objects(["sessions/s1/a.txt"])
+    _write(os.path.join(restored, "local_only.txt"), b"keep")
+    stats = storage.download_folder("sessions/s1", restored)
+
+    assert stats["deleted"] == 1
+    assert not os.path.exists(os.path.join(restored, "a.txt"))
+    assert os.path.exists(os.path.join(restored, "local_only.txt"))
+
+
+def test_first_sync_without_manifest_skips_identical_files(
+    store,
+    workspace,
+    tmp_path,
+):
+    ObjectStorage(store, manifest_dir=str(tmp_path / "m1")).upload_folder(
+        workspace,
+        "s",
+    )
+    store.calls.clear()
+
+    # A fresh manifest dir: identical files are detected by MD5, no PUTs
+    fresh = ObjectStorage(store, manifest_dir=str(tmp_path / "m2"))
+    stats = fresh.upload_folder(workspace, "s")
+
+    assert stats["uploaded"] == 0
+    assert "put" not in store.calls
+
+
+def test_failed_transfer_is_reported_and_retried(
+    storage,
+    store,
+    workspace,
+    monkeypatch,
+):
+    original = store.put_file
+
+    def flaky_put(key, local_path):
+        if key.endswith("a.txt"):
+            raise OSError("boom")
+        return original(key, local_path)
+
+    monkeypatch.setattr(store, "put_file", flaky_put)
+    with pytest.raises(SyncError):
+        storage.upload_folder(workspace, "s")
+
+    monkeypatch.setattr(store, "put_file", original)
+    stats = storage.upload_folder(workspace, "s")
+    # Only the failed file is sent again
+    assert stats["uploaded"] == 1
+
+
+def test_stale_manifests_are_pruned(store, tmp_path):
+    storage = ObjectStorage(store, manifest_dir=str(tmp_path / "m"))
+    sync = storage.sync
+    sync.max_manifests = 2
+    for i in range(4):
+        _write(str(tmp_path / f"w{i}" / "a.txt"), b"alpha")
+        storage.upload_folder(str(tmp_path / f"w{i}"), f"sessions/s{i}")
+
+    # Only the first sync of the sweep interval pruned
+    assert len(os.listdir(sync.manifest_dir)) == 4
+    assert sync.prune_manifests() == 2
+    assert len(os.listdir(sync.manifest_dir)) == 2
+
+    sync.manifest_ttl = 0.01
+    old = time.time() - 1
+    for name in os.listdir(sync.manifest_dir):
+        os.utime(os.path.join(sync.manifest_dir, name), (old, old))
+    assert sync.prune_manifests() == 2
+    assert not os.listdir(sync.manifest_dir)
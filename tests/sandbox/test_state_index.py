@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=unused-argument,protected-access,redefined-outer-name
+import pytest
+
+from agentscope_runtime.sandbox.model import (
+    ContainerModel,
+    ContainerState,
+)
+from agentscope_runtime.sandbox.enums import SandboxType
+
+
+@pytest.fixture(params=[False, True], ids=["in_memory", "redis"])
+def redis_enabled(request):
+    return request.param
+
+
+def test_max_sandbox_instances_enforced(make_manager, redis_enabled):
+    mgr = make_manager(redis_enabled, max_sandbox_instances=2)
+
+    first = mgr.create(sandbox_type=SandboxType.BASE)
+    second = mgr.create(
+        sandbox_type=SandboxType.BASE,
+        meta={"session_ctx_id": "sess"},
+    )
+    assert first and second
+    assert mgr.count_active_containers() == 2
+    assert mgr.create(sandbox_type=SandboxType.BASE) is None
+
+    # Releasing frees a slot
+    assert mgr.release(first)
+    assert mgr.count_active_containers() == 1
+    assert mgr.create(sandbox_type=SandboxType.BASE) is not None
+
+
+def test_state_index_follows_lifecycle(make_manager, redis_enabled):
+    mgr = make_manager(redis_enabled)
+
+    cname = mgr.create(
+        sandbox_type=SandboxType.BASE,
+        meta={"session_ctx_id": "sess"},
+    )
+    running = mgr.state_index[ContainerState.RUNNING]
+    assert running.contains(cname)
+
+    mgr.reap_session("sess")
+    assert not running.contains(cname)
+    assert mgr.state_index[ContainerState.RECYCLED].contains(cname)
+
+    mgr.restore_session("sess")
+    assert mgr.state_index[ContainerState.RECYCLED].size() == 0
+    assert mgr.count_active_containers() == 1
+
+
+def test_rebuild_state_index(make_manager, redis_enabled):
+    mgr = make_manager(redis_enabled)
+    cname = mgr.create(sandbox_type=SandboxType.BASE)
+
+    # Record written behind the index's back, plus a stale index entry
+    cm = ContainerModel(**mgr.get_info(cname))
+    cm.container_name = f"{mgr.prefix}external"
+    cm.state = ContainerState.RUNNING
+    mgr.container_mapping.set(cm.container_name, cm.model_dump())
+    mgr.state_index[ContainerState.RUNNING].add("gone")
+
+    result = mgr.rebuild_state_index()
+
+    assert result["added"] == 1
+    assert result["removed"] == 1
+    assert mgr.state_index[ContainerState.WARM].contains(cname)
+    assert mgr.state_index[ContainerState.RUNNING].to_list() == [
+        cm.container_name,
+    ]
+    assert mgr.count_active_containers() == 2
+
+
+def test_ensure_state_index_builds_once(make_manager):
+    mgr = make_manager(redis_enabled=True)
+    cname = mgr.create(sandbox_type=SandboxType.BASE)
+    # An index from before the upgrade, plus a slot reserved by a create
+    # still in progress on another replica
+    for index in mgr.state_index.values():
+        index.clear()
+    mgr.state_index[ContainerState.WARM].add("reserved")
+
+    result = mgr.ensure_state_index()
+
+    assert result["added"] == 1 and result["removed"] == 0
+    assert set(mgr.state_index[ContainerState.WARM].to_list()) == {
+        cname,
+        "reserved",
+    }
+    assert mgr.ensure_state_index() is None
+
+
+def test_state_moves_are_atomic(make_manager, monkeypatch):
+    mgr = make_manager(redis_enabled=True)
+    mgr._index_container_state("c1", ContainerState.WARM)
+
+    commands = []
+    original = mgr.redis_client.pipeline
+
+    def pipeline(*args, **kwargs):
+        commands.append(kwargs.get("transaction"))
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(mgr.redis_client, "pipeline", pipeline)
+    mgr._index_container_state("c1", ContainerState.RUNNING)
+
+    assert commands == [True]
+    assert mgr.state_index[ContainerState.RUNNING].contains("c1")
+    assert not mgr.state_index[ContainerState.WARM].contains("c1")
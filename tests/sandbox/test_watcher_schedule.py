@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=protected-access,redefined-outer-name
+import time
+
+import fakeredis
+import pytest
+
+from agentscope_runtime.common.collections import (
+    InMemorySortedSetCollection,
+    RedisSortedSetCollection,
+)
+from agentscope_runtime.sandbox.model import (
+    ContainerModel,
+    ContainerState,
+)
+
+
+@pytest.fixture(params=["memory", "redis"])
+def sorted_set(request):
+    if request.param == "memory":
+        return InMemorySortedSetCollection()
+    client = fakeredis.FakeRedis(decode_responses=True)
+    return RedisSortedSetCollection(client, "deadlines")
+
+
+def test_sorted_set_pops_only_due_members(sorted_set):
+    sorted_set.add("a", 30)
+    sorted_set.add("b", 10)
+    sorted_set.add("c", 20)
+
+    # gt only moves a score later
+    sorted_set.add("b", 5, gt=True)
+    assert sorted_set.score("b") == 10
+    sorted_set.add("b", 40, gt=True)
+    assert sorted_set.score("b") == 40
+
+    sorted_set.remove("a")
+    assert sorted_set.peek_min() == ("c", 20)
+    assert sorted_set.pop_due(25) == [("c", 20)]
+    assert sorted_set.pop_due(25) == []
+    assert sorted_set.size() == 1
+    assert sorted_set.pop_due(100, limit=10) == [("b", 40)]
+    assert sorted_set.peek_min() is None
+
+
+def _running(name, session_ctx_id, last_active):
+    return ContainerModel(
+        session_id=name,
+        container_id=f"cid-{name}",
+        container_name=name,
+        url="http://127.0.0.1:1",
+        ports=[1],
+        mount_dir="",
+        storage_path="",
+        runtime_token="token",
+        version="v",
+        state=ContainerState.RUNNING,
+        session_ctx_id=session_ctx_id,
+        last_active_at=last_active,
+    )
+
+
+@pytest.mark.parametrize("redis_enabled", [False, True])
+def test_watcher_tick_handles_only_due_work(make_manager, redis_enabled):
+    manager = make_manager(redis_enabled=redis_enabled)
+    timeout = manager.config.heartbeat_timeout
+    now = time.time()
+
+    for name, session, last_active in (
+        ("c-idle", "s-idle", now - timeout - 10),
+        ("c-busy", "s-busy", now),
+    ):
+        manager._save_container_model(_running(name, session, last_active))
+        manager.session_mapping.set(session, [name])
+
+    released = _running("c-old", None, None)
+    released.state = ContainerState.RELEASED
+    released.released_at = now - manager.config.released_key_ttl - 10
+    manager._save_container_model(released)
+
+    assert manager.heartbeat_schedule.size() == 2
+    assert manager.release_schedule.size() == 1
+
+    tick = manager.watcher_tick()
+
+    assert tick["heartbeat"]["due"] == 1
+    assert tick["heartbeat"]["reaped_sessions"] == 1
+    assert tick["released_gc"]["deleted"] == 1
+    assert tick["pool"] is None
+    assert manager.get_info("c-idle")["state"] == ContainerState.RECYCLED
+    assert manager.get_info("c-busy")["state"] == ContainerState.RUNNING
+    assert manager.container_mapping.get("c-old") is None
+    assert manager.heartbeat_schedule.peek_min()[0] == "s-busy"
+    assert manager.release_schedule.size() == 0
+
+    metrics = manager.get_watcher_metrics()
+    assert metrics["ticks"] == 1
+    assert metrics["reaped_sessions"] == 1
+    assert metrics["deleted_records"] == 1
+    assert metrics["heartbeat_schedule_size"] == 1
+
+
+def test_fresh_heartbeat_reschedules_due_session(make_manager):
+    manager = make_manager()
+    timeout = manager.config.heartbeat_timeout
+
+    manager._save_container_model(_running("c1", "s1", time.time()))
+    manager.session_mapping.set("s1", ["c1"])
+    # a deadline left over from an older heartbeat
+    manager.heartbeat_schedule.clear()
+    manager.heartbeat_schedule.add("s1", time.time() - 1)
+
+    result = manager.process_due_heartbeats()
+
+    assert result["rescheduled"] == 1
+    assert result["reaped_sessions"] == 0
+    assert manager.heartbeat_schedule.score("s1") > time.time() + timeout / 2
+
+
+def test_rebuild_watch_schedule_and_pool_refill_event(make_manager):
+    manager = make_manager(redis_enabled=True)
+
+    manager._save_container_model(_running("c1", "s1", time.time()))
+    manager.session_mapping.set("s1", ["c1"])
+    manager.heartbeat_schedule.clear()
+
+    result = manager.rebuild_watch_schedule()
+    assert result["sessions"] == 1
+    assert manager.heartbeat_schedule.size() == 1
+
+    assert manager._next_watch_delay(1) <= 1
+    assert not manager._pool_refill_event.is_set()
+    manager._request_pool_refill()
+    assert manager._pool_refill_event.is_set()
+    assert manager.watcher_tick()["pool"] is not None
+    assert not manager._pool_refill_event.is_set()
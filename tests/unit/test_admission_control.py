@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=protected-access
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from agentscope_runtime.engine.deployers.utils.service_utils.admission_control import (  # noqa: E501
+    AdmissionController,
+    AdmissionMiddleware,
+    AdmissionRejected,
+)
+
+
+async def test_bounded_queue_and_timeout():
+    controller = AdmissionController(
+        max_concurrency=1,
+        max_queue_size=1,
+        queue_timeout=0.05,
+    )
+    await controller.acquire("/process")
+
+    waiting = asyncio.create_task(controller.acquire("/process"))
+    await asyncio.sleep(0)
+    with pytest.raises(AdmissionRejected) as rejected:
+        await controller.acquire("/process")
+    assert rejected.value.status_code == 503
+    assert controller.get_state()["queued"] == 1
+
+    controller.release("/process")
+    await waiting
+    assert controller.get_state()["active"] == 1
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        await controller.acquire("/process")
+    assert rejected.value.status_code == 503
+    assert controller.queue_timeouts == 1
+    assert controller.get_state()["queued"] == 0
+
+
+async def test_route_limits():
+    controller = AdmissionController(
+        max_concurrency=10,
+        route_limits={"/ag-ui": 1},
+        queue_timeout=0.01,
+    )
+    await controller.acquire("/ag-ui")
+    blocked = asyncio.create_task(controller.acquire("/ag-ui"))
+    await asyncio.sleep(0)
+
+    # other routes pass the waiter held back by its full route
+    await asyncio.wait_for(controller.acquire("/process"), 1)
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        await blocked
+    assert rejected.value.status_code == 429
+    assert controller.get_state()["routes"] == {
+        "/ag-ui": {"active": 1, "limit": 1},
+        "/process": {"active": 1, "limit": None},
+    }
+
+
+async def test_adaptive_limit():
+    controller = AdmissionController(
+        max_concurrency=8,
+        min_concurrency=2,
+        target_latency=1.0,
+        backoff=0.5,
+    )
+    for _ in range(4):
+        await controller.acquire("/process")
+        controller.release("/process", latency=5.0)
+    assert controller.get_state()["limit"] == 2
+
+    # the limit grows only while it is in use
+    for _ in range(50):
+        for _ in range(2):
+            await controller.acquire("/process")
+        for _ in range(2):
+            controller.release("/process", latency=0.1)
+    assert controller.get_state()["limit"] == 4
+
+    for _ in range(50):
+        in_use = controller.get_state()["limit"]
+        for _ in range(in_use):
+            await controller.acquire("/process")
+        for _ in range(in_use):
+            controller.release("/process", latency=0.1)
+    assert controller.get_state()["limit"] == 8
+
+
+async def test_middleware_sheds_load():
+    controller = AdmissionController(
+        max_concurrency=1,
+        max_queue_size=0,
+        retry_after=3,
+    )
+    release = asyncio.Event()
+    app = FastAPI()
+
+    @app.post("/process")
+    async def process():
+        await release.wait()
+        return {"ok": True}
+
+    @app.get("/health")
+    async def health():
+        return controller.get_state()
+
+    app.add_middleware(AdmissionMiddleware, controller=controller)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport,
+        base_url="http://test",
+    ) as client:
+        first = asyncio.create_task(client.post("/process"))
+        while controller.get_state()["active"] == 0:
+            await asyncio.sleep(0.001)
+
+        rejected = await client.post("/process")
+        assert rejected.status_code == 503
+        assert rejected.headers["retry-after"] == "3"
+
+        # GET requests are never shed
+        state = await client.get("/health")
+        assert state.json()["active"] == 1
+
+        release.set()
+        assert (await first).json() == {"ok": True}
+        assert controller.get_state()["active"] == 0
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+import copy
+from types import SimpleNamespace
+
+from agentscope.message import Msg
+
+from agentscope_runtime.adapters.agentscope import stream as stream_module
+from agentscope_runtime.adapters.agentscope.stream import (
+    adapt_agentscope_message_stream,
+)
+from agentscope_runtime.engine.schemas.agent_schemas import (
+    MessageType,
+    RunStatus,
+    TextContent,
+)
+
+
+def _chunks(contents, last=True):
+    """One Msg per chunk, all with the same id, as AgentScope streams a
+    cumulative message."""
+    msgs = []
+    for content in contents:
+        msg = Msg("assistant", content, "assistant")
+        if msgs:
+            msg.id = msgs[0].id
+        msgs.append(msg)
+    return [(msg, last and i == len(msgs) - 1) for i, msg in enumerate(msgs)]
+
+
+async def _aiter(items):
+    for item in items:
+        yield item
+
+
+async def _collect(pairs):
+    return [
+        event async for event in adapt_agentscope_message_stream(_aiter(pairs))
+    ]
+
+
+def _text_deltas(events):
+    return [
+        e.text
+        for e in events
+        if isinstance(e, TextContent) and e.delta and e.text
+    ]
+
+
+async def test_deltas_without_touching_source():
+    def thinking(text):
+        return {"type": "thinking", "thinking": text}
+
+    def text(value):
+        return {"type": "text", "text": value}
+
+    pairs = _chunks(
+        [
+            [thinking("hm")],
+            [thinking("hmm")],
+            [thinking("hmm"), text("Hel")],
+            [thinking("hmm"), text("Hello")],
+        ],
+    )
+    before = [copy.deepcopy(msg.to_dict()) for msg, _ in pairs]
+
+    events = await _collect(pairs)
+
+    # the source messages are left as they were
+    assert [msg.to_dict() for msg, _ in pairs] == before
+    assert _text_deltas(events) == ["hm", "m", "Hel", "lo"]
+
+    # Messages are yielded again as their status changes; key them by id
+    completed = {
+        e.id: e
+        for e in events
+        if getattr(e, "object", None) == "message"
+        and e.status == RunStatus.Completed
+    }
+    assert sorted(m.type for m in completed.values()) == [
+        MessageType.MESSAGE,
+        MessageType.REASONING,
+    ]
+
+
+async def test_deltas_are_tracked_per_block():
+    pairs = _chunks(
+        [
+            [{"type": "text", "text": "Hel"}],
+            [{"type": "text", "text": "Hello"}, {"type": "text", "text": "W"}],
+            [
+                {"type": "text", "text": "Hello"},
+                {"type": "text", "text": "World"},
+            ],
+        ],
+        last=False,
+    )
+
+    events = await _collect(pairs)
+
+    assert _text_deltas(events) == ["Hel", "lo", "W", "orld"]
+
+
+async def test_chunks_are_not_copied(monkeypatch):
+    def deepcopy(obj):
+        raise AssertionError("source chunk was deep-copied")
+
+    monkeypatch.setattr(
+        stream_module,
+        "copy",
+        SimpleNamespace(deepcopy=deepcopy),
+    )
+    pairs = _chunks(
+        [[{"type": "text", "text": "x" * n}] for n in range(1, 50)],
+    )
+
+    events = await _collect(pairs)
+
+    assert "".join(_text_deltas(events)) == "x" * 49
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=redefined-outer-name
+import asyncio
+import threading
+import time
+
+import fakeredis
+import pytest
+from fastapi.testclient import TestClient
+
+from agentscope_runtime.engine.app import AgentApp
+from agentscope_runtime.engine.deployers.utils.service_utils.task_manager import (  # noqa: E501
+    BackgroundTaskManager,
+    TaskQueueFull,
+)
+from agentscope_runtime.engine.deployers.utils.service_utils.task_store import (  # noqa: E501
+    InMemoryTaskStore,
+    RedisTaskStore,
+    SQLiteTaskStore,
+)
+
+
+@pytest.fixture(params=["memory", "redis", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        yield InMemoryTaskStore()
+    elif request.param == "redis":
+        yield RedisTaskStore(fakeredis.FakeRedis(), prefix="test:tasks")
+    else:
+        store = SQLiteTaskStore(str(tmp_path / "tasks.db"))
+        yield store
+        asyncio.run(store.close())
+
+
+async def test_store_records_and_pages(store):
+    await store.create("t1", {"task_id": "t1", "status": "submitted"})
+    await store.update("t1", {"status": "running"})
+    await store.append_results("t1", [1, 2, 3])
+    await store.append_results("t1", [{"n": 4}])
+
+    assert await store.get("t1") == {"task_id": "t1", "status": "running"}
+    assert await store.count_results("t1") == 4
+    assert await store.get_results("t1", 1, 2) == [2, 3]
+    assert await store.get_results("t1", 2) == [3, {"n": 4}]
+
+    await store.delete("t1")
+    assert await store.get("t1") is None
+    assert await store.get_results("t1") == []
+    # updates of forgotten tasks are dropped
+    await store.update("t1", {"status": "completed"})
+    assert await store.get("t1") is None
+
+
+async def test_in_memory_store_evicts_and_expires():
+    store = InMemoryTaskStore(max_tasks=2, ttl=60)
+    for task_id in ("a", "b", "c"):
+        await store.create(task_id, {"task_id": task_id})
+    assert await store.get("a") is None
+    assert await store.get("c") is not None
+
+    store.ttl = 0.01
+    await store.update("b", {"status": "completed"})
+    await asyncio.sleep(0.02)
+    assert await store.get("b") is None
+
+
+async def test_priorities_and_shared_pool():
+    manager = BackgroundTaskManager(max_workers=1, max_queue_size=2)
+    started = threading.Event()
+    release = threading.Event()
+    order = []
+
+    def blocker(request):
+        started.set()
+        release.wait(5)
+        return threading.current_thread().name
+
+    async def record(request):
+        order.append(request)
+        return request
+
+    first = await manager.submit(blocker, None)
+    while not started.is_set():
+        await asyncio.sleep(0.001)
+    await manager.submit(record, "low", priority=5)
+    await manager.submit(record, "high", priority=-1)
+    with pytest.raises(TaskQueueFull):
+        await manager.submit(record, "refused")
+
+    release.set()
+    while (await manager.get_status(first))["status"] != "finished":
+        await asyncio.sleep(0.001)
+    status = await manager.get_status(first)
+    assert status["result"].startswith("agentscope-task")
+    while len(order) < 2:
+        await asyncio.sleep(0.001)
+    assert order == ["high", "low"]
+    await manager.shutdown()
+
+
+async def test_generator_results_pages_and_stream():
+    manager = BackgroundTaskManager()
+
+    async def numbers(request):
+        for i in range(request["n"]):
+            await asyncio.sleep(0)
+            yield {"i": i}
+
+    def failing(request):
+        yield 1
+        raise RuntimeError("boom")
+
+    task_id = await manager.submit(numbers, {"n": 5})
+    events = [event async for event in manager.stream_results(task_id)]
+    assert events == [{"result": {"i": i}} for i in range(5)] + [
+        {"status": "finished"},
+    ]
+
+    status = await manager.get_status(task_id, offset=3, limit=10)
+    assert status == {
+        "status": "finished",
+        "result": [{"i": 3}, {"i": 4}],
+        "offset": 3,
+        "total": 5,
+    }
+
+    task_id = await manager.submit(failing, None)
+    events = [event async for event in manager.stream_results(task_id)]
+    assert events == [{"result": 1}, {"status": "error", "error": "boom"}]
+    await manager.shutdown()
+
+
+def test_task_endpoints_without_celery():
+    app = AgentApp(app_name="tasks")
+
+    @app.task("/jobs", priority=1)
+    def job(request):
+        return {"doubled": request["x"] * 2}
+
+    with TestClient(app.get_fastapi_app()) as client:
+        submitted = client.post("/jobs?priority=0", json={"x": 21}).json()
+        assert submitted["status"] == "submitted"
+
+        deadline = time.time() + 5
+        status = {}
+        while time.time() < deadline:
+            status = client.get(f"/jobs/{submitted['task_id']}").json()
+            if status["status"] != "pending":
+                break
+            time.sleep(0.01)
+        assert status == {"status": "finished", "result": {"doubled": 42}}
+
+        stream = client.get(f"/jobs/{submitted['task_id']}/stream")
+        assert stream.text.splitlines()[::2] == [
+            'data: {"result": {"doubled": 42}}',
+            'data: {"status": "finished"}',
+        ]
+        assert "not found" in client.get("/jobs/unknown").json()["error"]
+
+        stream = client.get(
+            f"/jobs/{submitted['task_id']}",
+            headers={"Accept": "text/event-stream"},
+        )
+        assert stream.headers["content-type"].startswith("text/event-stream")
+        assert 'data: {"status": "finished"}' in stream.text
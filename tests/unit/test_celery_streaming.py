@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=protected-access
+import asyncio
+
+import fakeredis
+import pytest
+
+from agentscope_runtime.engine.app.celery_mixin import CeleryMixin
+
+
+@pytest.fixture
+def mixin():
+    mixin = CeleryMixin(
+        broker_url="memory://",
+        backend_url="cache+memory://",
+    )
+    mixin.celery_app.conf.task_always_eager = True
+    mixin.celery_app.conf.task_store_eager_result = True
+    mixin._stream_client = fakeredis.FakeRedis()
+    return mixin
+
+
+def test_streaming_is_opt_in():
+    mixin = CeleryMixin(
+        broker_url="amqp://localhost",
+        backend_url="redis://localhost:6379/1",
+    )
+    assert mixin.stream_url is None
+    # A Redis backend is used by tasks asking for streaming
+    assert mixin._redis_url == "redis://localhost:6379/1"
+
+    with pytest.raises(RuntimeError):
+        CeleryMixin("memory://", "cache+memory://").register_celery_task(
+            lambda: None,
+            stream=True,
+        )
+
+
+async def test_generator_items_are_published(mixin):
+    def numbers(n):
+        for i in range(n):
+            yield {"i": i}
+
+    task = mixin.register_celery_task(numbers, stream=True)
+    task_id = task.delay(5).id
+
+    assert mixin.get_streamed_results(task_id, 1, 2) == [{"i": 1}, {"i": 2}]
+    assert mixin.get_task_status(task_id, offset=3, limit=10) == {
+        "status": "finished",
+        "result": [{"i": 3}, {"i": 4}],
+        "offset": 3,
+        "total": 5,
+    }
+
+    events = [
+        event async for event in mixin.stream_task_results(task_id, offset=2)
+    ]
+    assert events == [{"result": {"i": i}} for i in range(2, 5)] + [
+        {"status": "finished"},
+    ]
+
+
+async def test_plain_results(mixin):
+    def double(x):
+        return x * 2
+
+    task_id = mixin.register_celery_task(double).delay(21).id
+    assert mixin.get_task_status(task_id) == {
+        "status": "finished",
+        "result": 42,
+    }
+    events = [event async for event in mixin.stream_task_results(task_id)]
+    assert events == [{"result": 42}, {"status": "finished"}]
+
+
+def test_failing_generator(mixin):
+    async def failing():
+        yield 1
+        raise RuntimeError("boom")
+
+    async def collect(task_id):
+        return [event async for event in mixin.stream_task_results(task_id)]
+
+    # Eager async tasks run their own event loop
+    task_id = mixin.register_celery_task(failing, stream=True).apply().id
+    events = asyncio.run(collect(task_id))
+    assert events == [{"result": 1}, {"status": "error", "error": "boom"}]
+
+
+def test_generator_results_collected_unless_streaming(mixin):
+    def numbers(n):
+        yield from range(n)
+
+    task_id = mixin.register_celery_task(numbers).delay(3).id
+    assert mixin.get_task_status(task_id) == {
+        "status": "finished",
+        "result": [0, 1, 2],
+    }
+
+
+def test_progress_updates_are_throttled(mixin, monkeypatch):
+    updates = []
+    monkeypatch.setattr(
+        "celery.app.task.Task.update_state",
+        lambda self, **kwargs: updates.append(kwargs["meta"]),
+    )
+
+    def numbers(n):
+        yield from range(n)
+
+    task_id = mixin.register_celery_task(numbers, stream=True).delay(500).id
+
+    assert updates == [{"streamed": True, "total": 1}]
+    status = mixin.get_task_status(task_id)
+    assert status["total"] == 500 and len(status["result"]) == 500
+
+
+async def test_unknown_task_stops_pending(mixin):
+    events = [
+        event
+        async for event in mixin.stream_task_results(
+            "no-such-task",
+            poll_interval=0.01,
+            pending_timeout=0.05,
+        )
+    ]
+    assert events == [{"status": "pending"}]
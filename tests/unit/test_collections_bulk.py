@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=redefined-outer-name
+import fakeredis
+import pytest
+
+from agentscope_runtime.common.collections import (
+    InMemoryMapping,
+    InMemoryQueue,
+    InMemorySetCollection,
+    RedisMapping,
+    RedisQueue,
+    RedisSetCollection,
+)
+
+
+@pytest.fixture()
+def redis_client():
+    return fakeredis.FakeRedis(decode_responses=True)
+
+
+@pytest.fixture(params=["in_memory", "redis"])
+def mapping(request, redis_client):
+    if request.param == "redis":
+        return RedisMapping(redis_client, prefix="test")
+    return InMemoryMapping()
+
+
+@pytest.fixture(params=["in_memory", "redis"])
+def queue(request, redis_client):
+    if request.param == "redis":
+        return RedisQueue(redis_client, "test_queue")
+    return InMemoryQueue()
+
+
+def test_mapping_bulk_ops(mapping):
+    mapping.mset({f"k{i}": {"i": i} for i in range(5)})
+
+    assert mapping.mget(["k0", "k4", "missing"]) == [
+        {"i": 0},
+        {"i": 4},
+        None,
+    ]
+    assert mapping.mget([]) == []
+
+    mapping.mdelete(["k0", "k1"])
+    assert sorted(mapping.scan("k")) == ["k2", "k3", "k4"]
+
+
+def test_mapping_scan_items(mapping):
+    mapping.mset({f"a{i}": {"i": i} for i in range(250)})
+    mapping.set("b0", {"i": -1})
+
+    items = dict(mapping.scan_items("a", count=50))
+
+    assert len(items) == 250
+    assert items["a42"] == {"i": 42}
+    assert "b0" not in items
+
+
+def test_redis_scan_items_uses_one_mget_per_page(redis_client, mocker):
+    mapping = RedisMapping(redis_client)
+    mapping.mset({f"k{i}": {"i": i} for i in range(300)})
+
+    get_spy = mocker.spy(redis_client, "get")
+    mget_spy = mocker.spy(redis_client, "mget")
+    scan_spy = mocker.spy(redis_client, "scan")
+
+    assert len(list(mapping.scan_items("k", count=100))) == 300
+    assert get_spy.call_count == 0
+    assert mget_spy.call_count <= scan_spy.call_count
+
+
+def test_queue_bulk_ops(queue):
+    queue.enqueue_many([{"i": i} for i in range(5)])
+
+    assert queue.dequeue_many(2) == [{"i": 0}, {"i": 1}]
+    assert queue.size() == 3
+    assert queue.dequeue_many(10) == [{"i": 2}, {"i": 3}, {"i": 4}]
+    assert queue.dequeue_many(1) == []
+    assert queue.is_empty()
+
+
+@pytest.mark.parametrize("backend", ["in_memory", "redis"])
+def test_set_remove_many(backend, redis_client):
+    if backend == "redis":
+        collection = RedisSetCollection(redis_client, "test_set")
+    else:
+        collection = InMemorySetCollection()
+
+    for value in ("a", "b", "c"):
+        collection.add(value)
+    collection.remove_many(["a", "c", "missing"])
+    collection.remove_many([])
+
+    assert collection.to_list() == ["b"]
+    assert collection.size() == 1
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=redefined-outer-name
+import queue
+import threading
+import time
+from types import SimpleNamespace
+
+import docker
+import pytest
+
+from agentscope_runtime.common.container_clients.docker_client import (
+    DockerClient,
+)
+
+
+class FakeImages:
+    def __init__(self, present=()):
+        self.present = set(present)
+        self.gets = 0
+        self.pulls = []
+        self.pull_started = threading.Event()
+        self.release_pull = threading.Event()
+        self.release_pull.set()
+
+    def get(self, image):
+        self.gets += 1
+        if image not in self.present:
+            raise docker.errors.ImageNotFound(image)
+
+    def pull(self, image):
+        self.pulls.append(image)
+        self.pull_started.set()
+        self.release_pull.wait(5)
+        if image.startswith("broken"):
+            raise docker.errors.APIError("pull failed")
+        self.present.add(image)
+
+
+class FakeEvents:
+    """A blocking Docker event stream fed by the test."""
+
+    def __init__(self):
+        self.queue = queue.Queue()
+
+    def __iter__(self):
+        while True:
+            event = self.queue.get()
+            if event is None:
+                return
+            yield event
+
+
+class FakeDocker:
+    def __init__(self, images):
+        self.images = images
+        self.event_stream = FakeEvents()
+        self.containers = SimpleNamespace(list=lambda **kwargs: [])
+
+    def events(self, **kwargs):
+        return self.event_stream
+
+
+@pytest.fixture
+def fake_docker(monkeypatch):
+    fake = FakeDocker(FakeImages(present={"base:1"}))
+    monkeypatch.setattr(docker, "from_env", lambda: fake)
+    yield fake
+    fake.event_stream.queue.put(None)
+
+
+def make_client():
+    config = SimpleNamespace(port_range=(50000, 50010), redis_enabled=False)
+    return DockerClient(config)
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline
+        time.sleep(0.005)
+
+
+def test_presence_is_cached_until_an_image_event(fake_docker):
+    client = make_client()
+    for _ in range(3):
+        assert client.ensure_image("base:1")
+    assert fake_docker.images.gets == 1
+
+    fake_docker.event_stream.queue.put({"Action": "pull", "id": "x:1"})
+    fake_docker.event_stream.queue.put({"Action": "delete", "id": "sha256"})
+    wait_for(lambda: not client._images)
+    assert client.ensure_image("base:1")
+    assert fake_docker.images.gets == 2
+
+
+def test_cache_is_not_trusted_after_the_event_stream_ends(fake_docker):
+    client = make_client()
+    assert client.ensure_image("base:1")
+    fake_docker.event_stream.queue.put(None)
+    wait_for(lambda: client._events_thread is None)
+
+    # The stream is not reopened right away, and nothing is cached
+    assert client.ensure_image("base:1")
+    assert client.ensure_image("base:1")
+    assert fake_docker.images.gets == 3
+
+
+def test_concurrent_creates_share_one_pull(fake_docker):
+    client = make_client()
+    fake_docker.images.release_pull.clear()
+    results = []
+
+    def ensure():
+        results.append(client.ensure_image("new:1"))
+
+    threads = [threading.Thread(target=ensure) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    assert fake_docker.images.pull_started.wait(5)
+    fake_docker.images.release_pull.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == [True] * 5
+    assert fake_docker.images.pulls == ["new:1"]
+    assert not client._pulls
+
+
+def test_removal_during_a_check_is_not_lost(fake_docker):
+    client = make_client()
+    fake_docker.images.release_pull.clear()
+    pulling = threading.Thread(target=client.ensure_image, args=("new:1",))
+    pulling.start()
+    assert fake_docker.images.pull_started.wait(5)
+
+    # The image is removed before the pull reports it present
+    fake_docker.event_stream.queue.put({"Action": "untag", "id": "new:1"})
+    wait_for(lambda: client._images_generation == 1)
+    fake_docker.images.release_pull.set()
+    pulling.join(5)
+
+    assert "new:1" not in client._images
+    gets = fake_docker.images.gets
+    assert client.ensure_image("new:1")
+    assert fake_docker.images.gets == gets + 1
+
+
+def test_pull_images_reports_progress(fake_docker):
+    client = make_client()
+    progress = []
+    results = client.pull_images(
+        ["base:1", "new:1", "broken:1", "new:1"],
+        max_workers=2,
+        progress=lambda *args: progress.append(args),
+    )
+    assert results == {"base:1": True, "new:1": True, "broken:1": False}
+    assert sorted(fake_docker.images.pulls) == ["broken:1", "new:1"]
+    assert [p[:2] for p in progress] == [(1, 3), (2, 3), (3, 3)]
+    assert {p[2]: p[3] for p in progress} == results
+
+    # Failed pulls are retried by the next create
+    assert not client.ensure_image("broken:1")
+    assert fake_docker.images.pulls.count("broken:1") == 2
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=redefined-outer-name
+import asyncio
+import json
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from agentscope_runtime.sandbox.box.shared.routers import generic
+from agentscope_runtime.sandbox.box.shared.routers.generic import (
+    generic_router,
+)
+
+
+@pytest.fixture()
+def client():
+    app = FastAPI()
+    app.include_router(generic_router)
+    return TestClient(app)
+
+
+def _events(response):
+    return [json.loads(line) for line in response.iter_lines() if line]
+
+
+def test_shell_stream_emits_output_then_end(client):
+    with client.stream(
+        "POST",
+        "/tools/run_shell_command/stream",
+        json={"command": "echo out; echo err 1>&2; exit 3"},
+    ) as response:
+        assert response.headers["content-type"].startswith(
+            "application/x-ndjson",
+        )
+        events = _events(response)
+
+    text = {
+        kind: "".join(e["text"] for e in events if e["type"] == kind)
+        for kind in ("stdout", "stderr")
+    }
+    assert text == {"stdout": "out\n", "stderr": "err\n"}
+    assert events[-1]["type"] == "end"
+    assert events[-1]["returncode"] == 3
+    assert events[-1]["is_error"]
+
+
+def test_shell_stream_caps_output(client):
+    with client.stream(
+        "POST",
+        "/tools/run_shell_command/stream",
+        json={"command": "yes | head -c 100000", "max_output_bytes": 1000},
+    ) as response:
+        events = _events(response)
+
+    forwarded = sum(len(e["text"]) for e in events if e["type"] == "stdout")
+    assert forwarded <= 1000
+    assert any(e["type"] == "truncated" for e in events)
+    assert events[-1]["truncated"]
+
+
+def test_shell_stream_timeout_kills_process(client):
+    start = time.monotonic()
+    with client.stream(
+        "POST",
+        "/tools/run_shell_command/stream",
+        json={"command": "echo start; sleep 30", "timeout": 0.5},
+    ) as response:
+        events = _events(response)
+
+    assert time.monotonic() - start < 10
+    assert events[0] == {"type": "stdout", "text": "start\n"}
+    assert events[-1]["timed_out"]
+    assert events[-1]["is_error"]
+
+
+def test_ipython_stream(client):
+    pytest.importorskip("IPython")
+    with client.stream(
+        "POST",
+        "/tools/run_ipython_cell/stream",
+        json={"code": "print('hello')"},
+    ) as response:
+        events = _events(response)
+
+    out = "".join(e["text"] for e in events if e["type"] == "stdout")
+    assert "hello" in out
+    assert events[-1]["type"] == "end"
+
+
+@pytest.mark.parametrize(
+    "max_output_bytes, drained", [(None, False), (1000, True)]
+)
+async def test_shell_stream_waits_for_client_until_cap(
+    tmp_path,
+    max_output_bytes,
+    drained,
+):
+    marker = tmp_path / "done"
+    events = generic.stream_shell_command(
+        f"head -c 5000000 /dev/zero | tr '\\\\0' x; touch {marker}",
+        max_output_bytes=max_output_bytes,
+    )
+    try:
+        assert (await events.__anext__())["type"] == "stdout"
+        # The client stalls: without a cap the command is held by the full
+        # pipe, past the cap its output is read and discarded
+        await asyncio.sleep(1)
+        assert marker.exists() == drained
+    finally:
+        await events.aclose()
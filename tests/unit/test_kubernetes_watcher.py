@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=redefined-outer-name,protected-access
+import asyncio
+import queue
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from kubernetes import client
+from kubernetes.client.rest import ApiException
+
+from agentscope_runtime.common.container_clients import kubernetes_client
+from agentscope_runtime.common.container_clients.kubernetes_watcher import (
+    ObjectWatcher,
+)
+
+
+def make_pod(name, phase="Pending", ready=False):
+    return client.V1Pod(
+        metadata=client.V1ObjectMeta(name=name),
+        status=client.V1PodStatus(
+            phase=phase,
+            container_statuses=[
+                client.V1ContainerStatus(
+                    name="main",
+                    image="image",
+                    image_id="",
+                    ready=ready,
+                    restart_count=0,
+                ),
+            ],
+        ),
+    )
+
+
+class FakeCoreV1:
+    """Pods of a fake API server, with a watch fed by their changes."""
+
+    def __init__(self):
+        self.pods = {}
+        self.events = queue.Queue()
+        self.lists = 0
+        self.reads = 0
+        self.watches = 0
+
+    def _put(self, event_type, pod):
+        self.events.put({"type": event_type, "object": pod})
+
+    def list_namespaced_pod(self, namespace, label_selector=None, **kwargs):
+        self.lists += 1
+        return SimpleNamespace(
+            items=list(self.pods.values()),
+            metadata=SimpleNamespace(resource_version="1"),
+        )
+
+    def read_namespaced_pod(self, name, namespace):
+        self.reads += 1
+        if name not in self.pods:
+            raise ApiException(status=404)
+        return self.pods[name]
+
+    def create_namespaced_pod(self, namespace, body):
+        pod = make_pod(body.metadata.name)
+        self.pods[pod.metadata.name] = pod
+        self._put("ADDED", pod)
+
+    def set_pod(self, name, phase="Running", ready=True, emit=True):
+        pod = make_pod(name, phase, ready)
+        self.pods[name] = pod
+        if emit:
+            self._put("MODIFIED", pod)
+
+    def delete_pod(self, name):
+        self._put("DELETED", self.pods.pop(name))
+
+    def watch_factory(self):
+        api = self
+
+        class FakeWatch:
+            def __init__(self):
+                self._stop = False
+
+            def stop(self):
+                self._stop = True
+
+            def stream(self, func, **kwargs):
+                api.watches += 1
+                while not self._stop:
+                    try:
+                        yield api.events.get(timeout=0.01)
+                    except queue.Empty:
+                        continue
+
+        return FakeWatch()
+
+
+@pytest.fixture
+def api():
+    return FakeCoreV1()
+
+
+def make_watcher(api, resync_interval=10.0):
+    return ObjectWatcher(
+        api.list_namespaced_pod,
+        api.read_namespaced_pod,
+        "default",
+        resync_interval=resync_interval,
+        watch_factory=api.watch_factory,
+    )
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline
+        time.sleep(0.005)
+
+
+def test_one_watch_resolves_all_waits(api):
+    watcher = make_watcher(api)
+    names = [f"pod-{i}" for i in range(20)]
+    for name in names:
+        api.set_pod(name, "Pending", False, emit=False)
+    results = {}
+
+    def wait(name):
+        results[name] = watcher.wait(
+            name,
+            kubernetes_client._pod_ready,
+            timeout=5,
+            default=False,
+        )
+
+    threads = [threading.Thread(target=wait, args=(n,)) for n in names]
+    for thread in threads:
+        thread.start()
+    wait_for(lambda: len(watcher._waiters) == len(names))
+    for name in names[:-1]:
+        api.set_pod(name)
+    api.set_pod(names[-1], "Failed", False)
+    for thread in threads:
+        thread.join(5)
+
+    assert results == {**{n: True for n in names[:-1]}, names[-1]: False}
+    assert api.reads == 0
+    assert api.lists == 1
+    # The watch stops once nothing is waited for
+    wait_for(lambda: watcher._thread is None)
+
+
+def test_deleted_and_missed_objects(api):
+    watcher = make_watcher(api, resync_interval=0.05)
+    api.set_pod("gone", "Pending", False, emit=False)
+    deleter = threading.Timer(0.05, api.delete_pod, args=("gone",))
+    deleter.start()
+    assert not watcher.wait("gone", kubernetes_client._pod_ready, 5, False)
+
+    # Changes the watch does not report are found by direct reads
+    api.set_pod("quiet", "Pending", False, emit=False)
+    timer = threading.Timer(
+        0.1,
+        api.set_pod,
+        args=("quiet",),
+        kwargs={"emit": False},
+    )
+    timer.start()
+    assert watcher.wait("quiet", kubernetes_client._pod_ready, 5, False)
+    assert api.reads >= 1
+
+    # Objects that do not exist are not waited for
+    assert not watcher.wait("never", kubernetes_client._pod_ready, 5, "late")
+    api.set_pod("slow", "Pending", False, emit=False)
+    assert (
+        watcher.wait("slow", kubernetes_client._pod_ready, 0.1, "late")
+        == "late"
+    )
+
+
+def test_forbidden_watch_falls_back_to_reads(api, caplog):
+    def forbidden(**kwargs):
+        api.lists += 1
+        raise ApiException(status=403)
+
+    watcher = ObjectWatcher(
+        forbidden,
+        api.read_namespaced_pod,
+        "default",
+        resync_interval=0.05,
+        watch_factory=api.watch_factory,
+    )
+    api.set_pod("a", "Pending", False, emit=False)
+    threading.Timer(0.1, api.set_pod, args=("a",)).start()
+    assert watcher.wait("a", kubernetes_client._pod_ready, 5, False)
+    assert api.reads >= 1
+    # The list is retried at the resync pace and reported once
+    assert api.lists <= 5
+    warnings = [r for r in caplog.records if "forbidden" in r.message]
+    assert len(warnings) == 1
+
+
+async def test_wait_async(api):
+    watcher = make_watcher(api)
+    api.set_pod("a", "Pending", False, emit=False)
+    api.set_pod("b", emit=False)
+    waits = asyncio.gather(
+        watcher.wait_async("a", kubernetes_client._pod_ready, 5, False),
+        watcher.wait_async("b", kubernetes_client._pod_ready, 5, False),
+    )
+    await asyncio.sleep(0.05)
+    api.set_pod("a")
+    assert await waits == [True, True]
+
+
+def test_create_batch_waits_together(api, monkeypatch):
+    monkeypatch.setattr(
+        kubernetes_client.k8s_config,
+        "load_incluster_config",
+        lambda: None,
+    )
+    monkeypatch.setattr(
+        kubernetes_client.client,
+        "CoreV1Api",
+        lambda: api,
+    )
+    monkeypatch.setattr(
+        kubernetes_client.client,
+        "AppsV1Api",
+        lambda: SimpleNamespace(
+            list_namespaced_deployment=None,
+            read_namespaced_deployment=None,
+        ),
+    )
+    api.list_namespace = lambda: None
+    api.list_namespaced_service = api.read_namespaced_service = None
+    config = SimpleNamespace(k8s_namespace="default", kubeconfig_path=None)
+    k8s = kubernetes_client.KubernetesClient(config)
+    k8s.pod_watcher.watch_factory = api.watch_factory
+
+    specs = [{"image": "image", "name": f"sandbox-{i}"} for i in range(3)]
+    results = []
+    creator = threading.Thread(
+        target=lambda: results.extend(k8s.create_batch(specs, timeout=5)),
+    )
+    creator.start()
+    wait_for(lambda: len(api.pods) == 3)
+    for i in range(2):
+        api.set_pod(f"sandbox-{i}")
+    api.set_pod("sandbox-2", "Failed", False)
+    creator.join(5)
+
+    assert results == [
+        ("sandbox-0", [], "localhost"),
+        ("sandbox-1", [], "localhost"),
+        (None, None, None),
+    ]
+    # Followed by one list and watch, not by polling each pod
+    assert api.lists == 1
+    assert api.reads == 0
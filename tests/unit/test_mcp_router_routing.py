@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=redefined-outer-name,protected-access
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from mcp import types
+
+from agentscope_runtime.sandbox.box.shared.routers import mcp as mcp_router
+from agentscope_runtime.sandbox.box.shared.routers import mcp_utils
+
+
+class FakeSessionHandler:
+    tools = {}
+
+    def __init__(self, name, config, on_tools_changed=None):
+        self.name = name
+        self.config = config
+        self.on_tools_changed = on_tools_changed
+        self.list_calls = 0
+        self.calls = []
+
+    async def initialize(self):
+        await asyncio.sleep(self.config.get("delay", 0))
+        if self.config.get("fail"):
+            raise RuntimeError("spawn failed")
+
+    async def list_tools(self):
+        self.list_calls += 1
+        return [
+            SimpleNamespace(
+                name=name,
+                description=f"{name} tool",
+                inputSchema={"properties": {"x": {"type": "integer"}}},
+            )
+            for name in self.tools[self.name]
+        ]
+
+    async def call_tool(self, tool_name, arguments):
+        self.calls.append((tool_name, arguments))
+        return SimpleNamespace(
+            model_dump=lambda: {"server": self.name, "tool": tool_name},
+        )
+
+    async def cleanup(self):
+        pass
+
+
+@pytest.fixture
+async def servers(monkeypatch):
+    monkeypatch.setattr(mcp_router, "MCPSessionHandler", FakeSessionHandler)
+    FakeSessionHandler.tools = {
+        "files": ["read_file", "write_file"],
+        "browser": ["navigate", "read_file"],
+        "shell": ["run"],
+    }
+    await mcp_router.add_servers(
+        server_configs={
+            "mcpServers": {name: {} for name in FakeSessionHandler.tools},
+        },
+        overwrite=False,
+    )
+    yield mcp_router._MCP_SERVERS
+    await mcp_router.cleanup_servers()
+
+
+async def test_calls_are_routed_without_listing_tools(servers):
+    assert mcp_router._TOOL_ROUTES == {
+        "read_file": "files",
+        "write_file": "files",
+        "navigate": "browser",
+        "run": "shell",
+    }
+    for _ in range(3):
+        result = await mcp_router.call_tool(tool_name="run", arguments={})
+    assert result == {"server": "shell", "tool": "run"}
+    assert [server.list_calls for server in servers.values()] == [1, 1, 1]
+
+    tools = await mcp_router.list_tools()
+    assert list(tools) == ["files", "browser", "shell"]
+    assert tools["shell"]["run"]["json_schema"]["function"]["parameters"] == {
+        "type": "object",
+        "properties": {"x": {"type": "integer"}},
+        "required": [],
+    }
+    assert [server.list_calls for server in servers.values()] == [1, 1, 1]
+
+
+async def test_list_changed_notification_refreshes_one_server(servers):
+    FakeSessionHandler.tools["shell"] = ["run", "kill"]
+    servers["shell"].on_tools_changed("shell")
+
+    result = await mcp_router.call_tool(tool_name="kill", arguments={})
+    assert result == {"server": "shell", "tool": "kill"}
+    assert [server.list_calls for server in servers.values()] == [1, 1, 2]
+
+
+async def test_unknown_tools_refresh_all_servers(servers):
+    FakeSessionHandler.tools["browser"] = ["navigate", "click"]
+    result = await mcp_router.call_tool(tool_name="click", arguments={})
+    assert result == {"server": "browser", "tool": "click"}
+    assert [server.list_calls for server in servers.values()] == [2, 2, 2]
+
+    with pytest.raises(Exception, match="not found"):
+        await mcp_router.call_tool(tool_name="missing", arguments={})
+
+
+async def test_overwrite_replaces_routes(servers):
+    FakeSessionHandler.tools["files"] = ["stat"]
+    await mcp_router.add_servers(
+        server_configs={"mcpServers": {"files": {}}},
+        overwrite=True,
+    )
+    assert mcp_router._TOOL_ROUTES == {
+        "navigate": "browser",
+        "read_file": "browser",
+        "run": "shell",
+        "stat": "files",
+    }
+
+
+async def test_session_handler_reports_list_changed():
+    changed = []
+    handler = mcp_utils.MCPSessionHandler(
+        "shell",
+        {},
+        on_tools_changed=changed.append,
+    )
+    await handler._handle_message(
+        types.ServerNotification(
+            types.ToolListChangedNotification(
+                method="notifications/tools/list_changed",
+            ),
+        ),
+    )
+    await handler._handle_message(RuntimeError("stream error"))
+    assert changed == ["shell"]
+
+
+async def test_servers_start_concurrently_with_timeouts(monkeypatch):
+    monkeypatch.setattr(mcp_router, "MCPSessionHandler", FakeSessionHandler)
+    FakeSessionHandler.tools = {name: [name] for name in "abcde"}
+    configs = {
+        "a": {"delay": 0.2},
+        "b": {"delay": 0.2},
+        "c": {"delay": 0.2},
+        "d": {"delay": 5, "startup_timeout": 0.1},
+        "e": {"fail": True},
+    }
+
+    start = time.monotonic()
+    with pytest.raises(HTTPException) as error:
+        await mcp_router.add_servers(
+            server_configs={"mcpServers": configs},
+            overwrite=False,
+        )
+    assert time.monotonic() - start < 1
+
+    servers = error.value.detail["servers"]
+    assert {name: status["status"] for name, status in servers.items()} == {
+        "a": "ready",
+        "b": "ready",
+        "c": "ready",
+        "d": "failed",
+        "e": "failed",
+    }
+    assert servers["a"]["startup_time"] >= 0.2
+    assert "timed out" in servers["d"]["error"]
+    assert servers["e"]["error"] == "spawn failed"
+
+    # the servers that started are in use
+    assert list(mcp_router._MCP_SERVERS) == ["a", "b", "c"]
+    assert await mcp_router.list_servers() == servers
+    result = await mcp_router.call_tool(tool_name="b", arguments={})
+    assert result == {"server": "b", "tool": "b"}
+
+    again = await mcp_router.add_servers(
+        server_configs={"mcpServers": {"a": {}}},
+        overwrite=False,
+    )
+    assert again == {"servers": {"a": {"status": "skipped"}}}
+    await mcp_router.cleanup_servers()
+
+
+async def test_prewarmed_servers_are_waited_for(monkeypatch, tmp_path):
+    monkeypatch.setattr(mcp_router, "MCPSessionHandler", FakeSessionHandler)
+    FakeSessionHandler.tools = {"shell": ["run"]}
+    configs_path = tmp_path / "mcp_server_configs.json"
+    configs_path.write_text(
+        json.dumps({"mcpServers": {"shell": {"delay": 0.1}}}),
+    )
+    monkeypatch.setattr(
+        mcp_router,
+        "mcp_server_configs_path",
+        str(configs_path),
+    )
+
+    await mcp_router.startup_event()
+    await asyncio.sleep(0)
+    assert (await mcp_router.list_servers())["shell"] == {
+        "status": "starting",
+    }
+
+    result = await mcp_router.call_tool(tool_name="run", arguments={})
+    assert result == {"server": "shell", "tool": "run"}
+    assert (await mcp_router.list_servers())["shell"]["status"] == "ready"
+    await mcp_router.cleanup_servers()
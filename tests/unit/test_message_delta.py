@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+import copy
+
+from agentscope_runtime.engine.schemas.agent_schemas import (
+    DataContent,
+    Message,
+    RunStatus,
+    TextContent,
+)
+
+
+def _stream_text(message, pieces):
+    first = message.add_delta_content(TextContent(delta=True, text=pieces[0]))
+    for piece in pieces[1:]:
+        message.add_delta_content(
+            TextContent(delta=True, text=piece, index=first.index),
+        )
+    return first.index
+
+
+def test_delta_text_is_joined_on_read():
+    message = Message(role="assistant")
+    index = _stream_text(message, ["Hel", "lo", " ", "World"])
+
+    content = message.content[index]
+    assert message.get_text_content() == "Hello World"
+    assert content.text == "Hello World"
+    assert message.model_dump()["content"][0]["text"] == "Hello World"
+
+    # reads in between do not lose later chunks
+    message.add_delta_content(TextContent(delta=True, text="!", index=index))
+    snapshot = copy.copy(message)
+    message.add_delta_content(TextContent(delta=True, text="?", index=index))
+    assert snapshot.get_text_content() == "Hello World!"
+    assert '"text":"Hello World!?"' in message.model_dump_json()
+
+    # later deltas extend a value assigned after a flush
+    content.text = "Hi"
+    message.add_delta_content(TextContent(delta=True, text="!", index=index))
+    assert message.get_text_content() == "Hi!"
+
+    completed = message.content_completed(index)
+    assert completed.text == "Hi!"
+    assert completed.delta is False
+    assert completed.status == RunStatus.Completed
+    assert message.content[index].status is None
+    assert completed == TextContent(**completed.model_dump())
+
+
+def test_delta_data_does_not_leak_into_first_event():
+    message = Message(role="assistant")
+    first = message.add_delta_content(
+        DataContent(delta=True, data={"name": "f", "arguments": "{"}),
+    )
+    message.add_delta_content(
+        DataContent(
+            delta=True,
+            data={"arguments": '"a": 1}'},
+            index=first.index,
+        ),
+    )
+
+    assert first.data == {"name": "f", "arguments": "{"}
+    assert message.content[first.index].data["arguments"] == '{"a": 1}'
+
+
+def test_deltas_are_buffered_and_joined_once():
+    message = Message(role="assistant")
+    pieces = ["x"] * 1000
+    index = _stream_text(message, pieces)
+
+    content = message.content[index]
+    # Nothing was joined while streaming, the field keeps the first value
+    assert dict(content)["text"] == "x"
+    assert len(message.__pydantic_private__["_deltas"][index][1]) == 999
+
+    assert message.completed().content[index].text == "x" * 1000
+    assert dict(content)["text"] == "x" * 1000
+    assert message.__pydantic_private__["_deltas"] is None
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=redefined-outer-name
+import socket
+
+import fakeredis
+import pytest
+
+from agentscope_runtime.common.collections import (
+    InMemoryPortAllocator,
+    RedisPortAllocator,
+)
+
+PORTS = range(40000, 40020)
+
+
+@pytest.fixture(params=["in_memory", "redis"])
+def make_allocator(request):
+    redis_client = fakeredis.FakeRedis(decode_responses=True)
+
+    def make(port_range=PORTS, check_bind=False):
+        if request.param == "redis":
+            return RedisPortAllocator(
+                redis_client,
+                key="test_ports",
+                port_range=port_range,
+                check_bind=check_bind,
+            )
+        return InMemoryPortAllocator(port_range, check_bind=check_bind)
+
+    return make
+
+
+def test_allocates_from_rotating_cursor(make_allocator):
+    allocator = make_allocator()
+    first = allocator.allocate(3)
+    assert first == [40000, 40001, 40002]
+    assert allocator.allocate(2) == [40003, 40004]
+
+    # released ports are reused only after a full rotation
+    allocator.release(first)
+    assert allocator.allocate(1) == [40005]
+    assert allocator.allocate(15) == list(range(40006, 40020)) + [40000]
+    assert allocator.allocate(2) == [40001, 40002]
+
+    with pytest.raises(RuntimeError, match="Not enough free ports"):
+        allocator.allocate(1)
+    assert sorted(allocator.allocated()) == list(PORTS)
+
+
+def test_failed_allocation_keeps_nothing(make_allocator):
+    allocator = make_allocator()
+    allocator.allocate(18)
+    with pytest.raises(RuntimeError):
+        allocator.allocate(3)
+    assert len(allocator.allocated()) == 18
+
+
+def test_processes_share_the_bitmap():
+    redis_client = fakeredis.FakeRedis(decode_responses=True)
+    allocators = [
+        RedisPortAllocator(redis_client, "shared", PORTS, check_bind=False)
+        for _ in range(2)
+    ]
+    ports = [
+        port for _ in range(5) for a in allocators for port in a.allocate(2)
+    ]
+    assert sorted(ports) == list(PORTS)
+
+
+def test_bound_ports_are_skipped(make_allocator):
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("", 0))
+        s.listen()
+        taken = s.getsockname()[1]
+        allocator = make_allocator(range(taken, taken + 3), check_bind=True)
+        ports = allocator.allocate(1)
+    assert taken not in ports
+    assert taken not in allocator.allocated()
+
+
+def test_reconcile_reclaims_leaked_ports(make_allocator):
+    allocator = make_allocator()
+    leaked = allocator.allocate(4)
+
+    # recently allocated ports are kept, for containers being created
+    assert allocator.reconcile(in_use=[40010]) == 0
+    assert sorted(allocator.allocated()) == leaked + [40010]
+
+    assert allocator.reconcile(in_use=leaked[:1] + [40010], grace=0) == 3
+    assert sorted(allocator.allocated()) == [40000, 40010]
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=protected-access
+import asyncio
+import json
+
+import pytest
+
+from agentscope_runtime.engine.deployers.adapter.request_guard import (
+    RequestTimeoutError,
+    get_remaining_time,
+    get_request_metrics,
+    guard_stream,
+    request_deadline,
+)
+from agentscope_runtime.engine.deployers.adapter.responses import (
+    ResponseAPIDefaultAdapter,
+)
+from agentscope_runtime.engine.runner import Runner
+from agentscope_runtime.engine.schemas.agent_schemas import (
+    AgentRequest,
+    RunStatus,
+)
+
+
+class HangingStream:
+    """Async stream that yields once, then hangs until cancelled."""
+
+    def __init__(self):
+        self.deadline_left = None
+        self.cancelled = asyncio.Event()
+
+    async def __call__(self, *args, **kwargs):
+        self.deadline_left = get_remaining_time()
+        yield "first"
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            self.cancelled.set()
+            raise
+
+
+def _counts(name):
+    return dict(get_request_metrics().get(name, {}))
+
+
+async def test_guard_cancels_stream_at_deadline():
+    stream = HangingStream()
+    before = _counts("test_deadline")
+
+    chunks = []
+    with pytest.raises(RequestTimeoutError):
+        async for chunk in guard_stream(
+            stream,
+            name="test_deadline",
+            timeout=0.05,
+        ):
+            chunks.append(chunk)
+
+    assert chunks == ["first"]
+    assert stream.cancelled.is_set()
+    assert 0 < stream.deadline_left <= 0.05
+    metrics = get_request_metrics()["test_deadline"]
+    assert metrics["timed_out"] == before.get("timed_out", 0) + 1
+    assert metrics["in_flight"] == 0
+
+
+async def test_guard_cancels_stream_on_disconnect():
+    stream = HangingStream()
+    polls = []
+
+    async def is_disconnected():
+        polls.append(1)
+        return len(polls) >= 2
+
+    chunks = [
+        chunk
+        async for chunk in guard_stream(
+            stream,
+            name="test_disconnect",
+            is_disconnected=is_disconnected,
+            poll_interval=0.01,
+        )
+    ]
+
+    assert chunks == ["first"]
+    assert stream.cancelled.is_set()
+    assert get_request_metrics()["test_disconnect"]["abandoned"] >= 1
+
+
+async def test_guard_cancels_stream_when_closed_early():
+    stream = HangingStream()
+    guarded = guard_stream(stream, name="test_closed")
+    assert await guarded.__anext__() == "first"
+    await guarded.aclose()
+    assert stream.cancelled.is_set()
+
+
+class HangingRunner(Runner):
+    def __init__(self):
+        super().__init__()
+        self.framework_type = "text"
+        self.stream = HangingStream()
+
+    async def query_handler(self, *args, **kwargs):
+        async for chunk in self.stream():
+            yield chunk
+
+
+async def test_runner_reports_deadline_as_failed_response():
+    request = AgentRequest.model_validate(
+        {
+            "input": [
+                {"role": "user", "content": [{"type": "text", "text": "hi"}]}
+            ]
+        },
+    )
+    async with HangingRunner() as runner:
+        with request_deadline(0.05):
+            events = [e async for e in runner.stream_query(request=request)]
+
+    assert runner.stream.cancelled.is_set()
+    assert events[-1].status == RunStatus.Failed
+    assert events[-1].error.code == "TIMEOUT"
+
+
+class HangingExecutor:
+    def __init__(self):
+        self.stream = HangingStream()
+
+    async def execute(self, request):
+        async for _ in self.stream():
+            # empty events are not sent
+            yield None
+
+
+async def test_responses_adapter_enforces_timeout(monkeypatch):
+    monkeypatch.setattr(
+        "agentscope_runtime.engine.deployers.adapter.responses."
+        "response_api_protocol_adapter.DEADLINE_GRACE",
+        0,
+    )
+    adapter = ResponseAPIDefaultAdapter(timeout=0.05)
+    adapter._executor = HangingExecutor()
+
+    chunks = [
+        chunk
+        async for chunk in adapter._generate_stream_response_with_timeout(
+            request={},
+            request_id="resp_1",
+        )
+    ]
+
+    assert adapter._executor.stream.cancelled.is_set()
+    assert len(chunks) == 1
+    event, data = chunks[0].strip().split("\n")
+    assert event == "event: response.failed"
+    assert json.loads(data[len("data: ") :])["error"]["code"] == "timeout"
+
+    adapter._executor = HangingExecutor()
+    response = await adapter._collect_non_stream_response(
+        request={},
+        request_id="resp_2",
+    )
+    assert response["error"]["code"] == "timeout"
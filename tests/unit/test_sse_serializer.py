@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=protected-access
+import json
+from dataclasses import dataclass
+from datetime import datetime
+
+from pydantic import BaseModel
+
+from agentscope_runtime.engine.deployers.utils.service_utils.sse_serializer import (  # noqa: E501
+    SSESerializer,
+    to_jsonable,
+)
+
+
+class Message(BaseModel):
+    role: str
+    content: str
+    created_at: datetime = datetime(2025, 1, 1)
+
+
+@dataclass
+class Usage:
+    tokens: int
+
+
+class Mappable:
+    def to_map(self):
+        return {"mapped": True}
+
+
+def decode(frame: bytes):
+    assert frame.startswith(b"data: ") and frame.endswith(b"\n\n")
+    return json.loads(frame[len(b"data: ") : -2])
+
+
+def test_encodes_like_the_generic_walk():
+    serializer = SSESerializer()
+    message = Message(role="assistant", content="你好")
+    items = [
+        "token",
+        42,
+        None,
+        {"delta": "x", "index": [1, 2.5, True]},
+        Usage(tokens=3),
+        Mappable(),
+        object,
+    ]
+    for item in items:
+        assert decode(serializer.to_event(item)) == to_jsonable(item)
+
+    frame = serializer.to_event(message)
+    assert "你好".encode() in frame
+    assert decode(frame) == json.loads(message.model_dump_json())
+
+    nested = decode(serializer.to_event({"messages": [message], "ids": {1}}))
+    assert nested == {
+        "messages": [json.loads(message.model_dump_json())],
+        "ids": [1],
+    }
+
+
+def test_encoders_are_cached_per_type():
+    serializer = SSESerializer()
+    serializer.to_event(Usage(tokens=1))
+    serializer.to_event(Usage(tokens=2))
+    assert list(serializer._encoders) == [Usage]
+
+    serializer.register(Usage, lambda usage: b'{"custom": true}')
+    assert (
+        serializer.to_event(Usage(tokens=3)) == b'data: {"custom": true}\n\n'
+    )
+
+
+def test_falls_back_when_fast_encoding_fails():
+    serializer = SSESerializer()
+    deep = current = {}
+    for _ in range(300):
+        current["child"] = current = {}
+    assert decode(serializer.to_event(deep))["child"]
+
+    assert decode(serializer.to_event({"n": 2**70})) == {"n": 2**70}
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+import json
+import logging
+import threading
+import time
+
+import pytest
+from pydantic import BaseModel
+
+from agentscope_runtime.engine.tracing import TracingUtil, trace, wrapper
+from agentscope_runtime.engine.tracing.exporter import BackgroundExporter
+from agentscope_runtime.engine.tracing.local_logging_handler import (
+    DEFAULT_LOG_NAME,
+    LocalLogHandler,
+)
+
+
+class Answer(BaseModel):
+    text: str
+
+    def model_dump(self, **kwargs):
+        Answer.dumped_on.append(threading.current_thread())
+        return super().model_dump(**kwargs)
+
+
+Answer.dumped_on = []
+
+
+class BlockedExport:
+    """Export callback that blocks until released."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.batches = []
+
+    def __call__(self, batch):
+        self.release.wait(5)
+        self.batches.append(batch)
+
+
+@pytest.mark.parametrize(
+    "policy, kept",
+    [
+        ("drop_newest", [0, 1, 2, 3, 4]),
+        ("drop_oldest", [0, 6, 7, 8, 9]),
+    ],
+)
+def test_overflow_policies(policy, kept):
+    export = BlockedExport()
+    exporter = BackgroundExporter(
+        export,
+        max_queue_size=4,
+        overflow_policy=policy,
+    )
+    exporter.submit(0)
+    # wait for the writer to take the first record and block on it
+    while exporter.get_metrics()["queue_depth"] != 1 or exporter._buffer:
+        time.sleep(0.001)
+
+    start = time.perf_counter()
+    for i in range(1, 10):
+        exporter.submit(i)
+    assert time.perf_counter() - start < 0.1
+
+    metrics = exporter.get_metrics()
+    assert metrics["queue_depth"] == 5
+    assert metrics["dropped"] == 5
+
+    export.release.set()
+    assert exporter.flush(5)
+    assert [r for batch in export.batches for r in batch] == kept
+    metrics = exporter.get_metrics()
+    assert metrics["exported"] == 5
+    assert metrics["queue_depth"] == 0
+    exporter.shutdown()
+
+
+def test_sample_policy_keeps_essential_records():
+    export = BlockedExport()
+    exporter = BackgroundExporter(
+        export,
+        max_queue_size=100,
+        overflow_policy="sample",
+        sample_every=10,
+    )
+    exporter.submit(0)
+    # wait for the writer to take the first record and block on it
+    while exporter.get_metrics()["queue_depth"] != 1 or exporter._buffer:
+        time.sleep(0.001)
+
+    for i in range(50):
+        exporter.submit(i)
+    for i in range(100):
+        exporter.submit(i)
+    exporter.submit("error", essential=True)
+
+    export.release.set()
+    assert exporter.flush(5)
+    records = [r for batch in export.batches for r in batch]
+    assert len(records) == 1 + 50 + 10 + 1
+    assert records[-1] == "error"
+    exporter.shutdown()
+
+
+def test_local_log_handler_writes_in_background(tmp_path):
+    handler = LocalLogHandler(log_dir=str(tmp_path), log_file_name="bg")
+    try:
+        TracingUtil.set_request_id("req-1")
+        handler.on_start("llm", {"query": "hi"})
+        handler.on_end("llm", {}, {"answer": "hello"}, time.time())
+        assert handler.flush(5)
+
+        (log_file,) = tmp_path.glob("bg-info.log.*")
+        records = [
+            json.loads(line) for line in log_file.read_text().splitlines()
+        ]
+        assert [r["step"] for r in records] == ["llm_start", "llm_end"]
+        assert {r["request_id"] for r in records} == {"req-1"}
+        assert records[1]["context"] == {"answer": "hello"}
+
+        metrics = handler.get_export_metrics()
+        assert metrics["exported"] == 2
+        assert metrics["dropped"] == 0
+    finally:
+        TracingUtil.set_request_id("")
+        handler.exporter.shutdown()
+        logger = logging.getLogger(DEFAULT_LOG_NAME)
+        for log_handler in list(logger.handlers):
+            logger.removeHandler(log_handler)
+            log_handler.close()
+
+
+def test_payloads_are_dumped_by_the_exporter(tmp_path, monkeypatch):
+    handler = LocalLogHandler(log_dir=str(tmp_path), log_file_name="lazy")
+    monkeypatch.setattr(wrapper._tracer, "handlers", [handler])
+    monkeypatch.setattr(wrapper, "_span_payloads_exported", lambda: False)
+
+    @trace("llm")
+    def answer(question):
+        return Answer(text=question.text.upper())
+
+    try:
+        assert answer(Answer(text="hi")).text == "HI"
+        assert handler.flush(5)
+
+        assert Answer.dumped_on
+        assert threading.current_thread() not in Answer.dumped_on
+        (log_file,) = tmp_path.glob("lazy-info.log.*")
+        records = [
+            json.loads(line) for line in log_file.read_text().splitlines()
+        ]
+        assert records[0]["context"] == {"question": {"text": "hi"}}
+        assert records[1]["context"] == {"text": "HI"}
+    finally:
+        handler.exporter.shutdown()
+        logger = logging.getLogger(DEFAULT_LOG_NAME)
+        for log_handler in list(logger.handlers):
+            logger.removeHandler(log_handler)
+            log_handler.close()
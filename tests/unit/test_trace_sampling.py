@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=protected-access
+import hashlib
+import time
+
+import pytest
+
+from agentscope_runtime.engine.tracing import trace, wrapper
+from agentscope_runtime.engine.tracing.base import TracerHandler
+from agentscope_runtime.engine.tracing.sampling import TraceSampler
+
+
+class RecordingHandler(TracerHandler):
+    def __init__(self):
+        self.events = []
+
+    def on_start(self, event_name, payload, **kwargs):
+        self.events.append(("start", event_name, payload))
+
+    def on_end(self, event_name, start_payload, end_payload, start_time, **kw):
+        self.events.append(("end", event_name, end_payload))
+
+    def on_log(self, message, **kwargs):
+        pass
+
+    def on_error(self, event_name, start_payload, error, start_time, **kw):
+        self.events.append(("error", event_name, str(error)))
+
+
+class CountingArg:
+    """Counts how often tracing serializes it."""
+
+    def __init__(self):
+        self.serialized = 0
+
+    def __str__(self):
+        self.serialized += 1
+        return "arg"
+
+
+@pytest.fixture
+def handler(monkeypatch):
+    handler = RecordingHandler()
+    monkeypatch.setattr(wrapper._tracer, "handlers", [handler])
+    return handler
+
+
+def test_head_sampling_skips_payloads(monkeypatch, handler):
+    monkeypatch.setattr(
+        wrapper,
+        "_sampler",
+        TraceSampler(rates={"LLM": 0.0}, slow_threshold=0.05),
+    )
+
+    @trace("LLM", trace_name="llm")
+    def llm(value, fail=False, delay=0.0):
+        time.sleep(delay)
+        if fail:
+            raise RuntimeError("boom")
+        return {"answer": 1}
+
+    @trace("TOOL", trace_name="tool")
+    def tool(value):
+        return {"result": 2}
+
+    arg = CountingArg()
+    assert llm(arg) == {"answer": 1}
+    assert arg.serialized == 0
+    assert handler.events == []
+
+    # other trace types keep the default rate
+    tool("x")
+    assert [e[0] for e in handler.events] == ["start", "end"]
+    handler.events.clear()
+
+    # failed and slow calls are kept by tail sampling
+    with pytest.raises(RuntimeError):
+        llm(arg, fail=True)
+    assert [e[0] for e in handler.events] == ["start", "error"]
+    assert handler.events[1][2] == "boom"
+    handler.events.clear()
+
+    llm("slow", delay=0.06)
+    assert handler.events == [
+        ("start", "llm", {"value": "slow", "delay": 0.06}),
+        ("end", "llm", {"answer": 1}),
+    ]
+
+
+def test_streams_are_sampled_too(monkeypatch, handler):
+    monkeypatch.setattr(
+        wrapper,
+        "_sampler",
+        TraceSampler(default_rate=0.0),
+    )
+
+    @trace("LLM", trace_name="stream", merge_output_func=lambda c: sum(c))
+    def stream(fail=False):
+        yield 1
+        yield 2
+        if fail:
+            raise ValueError("late")
+
+    assert list(stream()) == [1, 2]
+    assert handler.events == []
+
+    with pytest.raises(ValueError):
+        list(stream(fail=True))
+    assert [e[0] for e in handler.events] == ["start", "error"]
+
+
+def test_attribute_truncation(monkeypatch):
+    sampler = TraceSampler(
+        max_attribute_bytes=64,
+        attribute_limits={"input.value": 96},
+    )
+    value = "é" * 40
+    truncated = sampler.truncate("output.value", value)
+
+    digest = hashlib.sha256(value.encode("utf-8")).hexdigest()[:16]
+    suffix = f"...[truncated 80 bytes, sha256:{digest}]"
+    assert truncated == "é" * ((64 - len(suffix)) // 2) + suffix
+    assert len(truncated.encode("utf-8")) <= 64
+    assert sampler.truncate("input.value", "short") == "short"
+    # too small a limit for the marker
+    assert TraceSampler(max_attribute_bytes=8).truncate("k", value) == "é" * 4
+    assert TraceSampler().truncate("output.value", value) == value
+
+    wrapper._get_ot_tracer()
+    monkeypatch.setattr(wrapper, "_otel_export_payloads", True)
+    monkeypatch.setattr(wrapper, "_sampler", sampler)
+    attributes = wrapper._input_attributes({"query": "x" * 100})
+    assert attributes["input.value"].startswith(
+        '{"query": "xxxxxxxxxxxxxxxxxxx',
+    )
+    assert "truncated 113 bytes" in attributes["input.value"]
+    assert len(attributes["input.value"].encode("utf-8")) <= 96
+
+
+def test_sampler_from_env(monkeypatch):
+    monkeypatch.setenv("TRACE_SAMPLE_RATE", "0.5")
+    monkeypatch.setenv("TRACE_SAMPLE_RATES", "LLM=0.1, TOOL=1")
+    monkeypatch.setenv("TRACE_SAMPLE_SLOW_MS", "2000")
+    monkeypatch.setenv("TRACE_ATTRIBUTE_BYTE_LIMITS", "output.value=1024")
+    monkeypatch.setenv("TRACE_MAX_ATTRIBUTE_BYTES", "4096")
+
+    sampler = wrapper._get_sampler()
+
+    assert sampler.default_rate == 0.5
+    assert sampler.rates == {"LLM": 0.1, "TOOL": 1.0}
+    assert sampler.slow_threshold == 2.0
+    assert sampler.keep_errors is True
+    assert sampler.attribute_limits == {"output.value": 1024}
+    assert sampler.max_attribute_bytes == 4096
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+import pytest
+from openai.types.chat import ChatCompletionChunk
+
+from agentscope_runtime.engine.schemas.agent_schemas import (
+    AgentResponse,
+    Message,
+    TextContent,
+)
+from agentscope_runtime.engine.tracing import message_util, trace, wrapper
+from agentscope_runtime.engine.tracing.base import TracerHandler
+from agentscope_runtime.engine.tracing.message_util import (
+    ChatCompletionChunkMerger,
+    create_stream_merger,
+    merge_agent_message,
+    merge_agent_response,
+    merge_incremental_chunk,
+)
+
+
+class RecordingHandler(TracerHandler):
+    def __init__(self):
+        self.end_payloads = []
+
+    def on_start(self, event_name, payload, **kwargs):
+        pass
+
+    def on_end(self, event_name, start_payload, end_payload, start_time, **kw):
+        self.end_payloads.append(end_payload)
+
+    def on_log(self, message, **kwargs):
+        pass
+
+    def on_error(self, *args, **kwargs):
+        pass
+
+
+def _chunk(content=None, tool_calls=None, finish_reason=None, usage=None):
+    data = {
+        "id": "chunk",
+        "object": "chat.completion.chunk",
+        "created": 1,
+        "model": "m",
+        "choices": [
+            {
+                "index": 0,
+                "delta": {"content": content, "tool_calls": tool_calls},
+                "finish_reason": finish_reason,
+            },
+        ],
+    }
+    if usage:
+        data["choices"] = []
+        data["usage"] = usage
+    return ChatCompletionChunk(**data)
+
+
+def _tool_call(arguments, **kwargs):
+    return [{"index": 0, "function": {"arguments": arguments}, **kwargs}]
+
+
+def test_merge_incremental_chunk_leaves_chunks_untouched():
+    chunks = [
+        _chunk("Hel"),
+        _chunk("lo"),
+        _chunk(
+            tool_calls=_tool_call(
+                '{"a":',
+                id="call-1",
+                type="function",
+            ),
+        ),
+        _chunk(tool_calls=_tool_call(" 1}")),
+        _chunk("", finish_reason="stop"),
+        _chunk(
+            usage={
+                "prompt_tokens": 1,
+                "completion_tokens": 2,
+                "total_tokens": 3,
+            },
+        ),
+    ]
+    before = [chunk.model_dump() for chunk in chunks]
+
+    merged = merge_incremental_chunk(chunks)
+
+    assert [chunk.model_dump() for chunk in chunks] == before
+    choice = merged.choices[0]
+    assert choice.delta.content == "Hello"
+    assert choice.finish_reason == "stop"
+    assert choice.delta.tool_calls[0].id == "call-1"
+    assert choice.delta.tool_calls[0].function.arguments == '{"a": 1}'
+    assert merged.usage.total_tokens == 3
+
+    capped = ChatCompletionChunkMerger(max_chars=4).merge(chunks)
+    assert capped.choices[0].delta.content == "Hell"
+
+
+def test_merge_agent_events():
+    def response(text, delta=True):
+        content = TextContent(text=text, delta=delta, msg_id="m1", index=0)
+        message = Message(id="m1", role="assistant", content=[content])
+        return AgentResponse(output=[message])
+
+    responses = [response("a"), response("b"), response("c")]
+
+    assert merge_agent_response(responses).output[0].content[0].text == "abc"
+    assert merge_agent_message([r.output[0] for r in responses]).content[
+        0
+    ].text == ("abc")
+    # the inputs are not modified
+    assert [r.output[0].content[0].text for r in responses] == [
+        "a",
+        "b",
+        "c",
+    ]
+
+    contents = [
+        TextContent(delta=True, text="a", msg_id="m1"),
+        TextContent(delta=False, text="ab!", msg_id="m1"),
+        TextContent(delta=True, text="?", msg_id="m1"),
+    ]
+    assert merge_agent_message(contents).get_text_content() == "ab!?"
+
+
+def test_custom_merge_gets_copies_of_all_chunks(monkeypatch):
+    handler = RecordingHandler()
+    monkeypatch.setattr(wrapper._tracer, "handlers", [handler])
+
+    def merge(chunks):
+        total = chunks[0]
+        for chunk in chunks[1:]:
+            total["n"] += chunk["n"]
+        return total
+
+    @trace("LLM", merge_output_func=merge, get_finish_reason_func=None)
+    def numbers():
+        for n in range(20000):
+            yield {"n": n}
+
+    out = list(numbers())
+
+    assert handler.end_payloads == [{"n": sum(range(20000))}]
+    # The chunks yielded to the caller are left as they were
+    assert out[0] == {"n": 0}
+
+
+def test_trace_marks_a_windowed_custom_merge(monkeypatch):
+    monkeypatch.setenv("TRACE_MERGE_MAX_CHUNKS", "3")
+    handler = RecordingHandler()
+    monkeypatch.setattr(wrapper._tracer, "handlers", [handler])
+    seen = []
+
+    def merge(chunks):
+        seen.append(list(chunks))
+        return {"sum": sum(chunks)}
+
+    @trace("LLM", merge_output_func=merge, get_finish_reason_func=None)
+    def numbers():
+        yield from range(10)
+
+    assert list(numbers()) == list(range(10))
+    assert seen == [[7, 8, 9]]
+    assert handler.end_payloads == [{"sum": 24, "truncated": True}]
+
+
+def test_builtin_merge_keeps_no_chunks():
+    merger = create_stream_merger(merge_incremental_chunk)
+    for _ in range(100):
+        merger.add(_chunk("x"))
+    merger.add(_chunk("", finish_reason="stop"))
+
+    assert not merger.chunks
+    assert merger.result().choices[0].delta.content == "x" * 100
+
+
+def test_event_merger_subclasses_must_add_events():
+    class IncompleteMerger(message_util._AgentEventMerger):
+        pass
+
+    with pytest.raises(TypeError):
+        IncompleteMerger()
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=redefined-outer-name
+import os
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from agentscope_runtime.sandbox.box.shared.routers import workspace
+from agentscope_runtime.sandbox.client import SandboxHttpClient
+from agentscope_runtime.sandbox.model import ContainerModel
+
+
+def _touch(path, data=b"x"):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+@pytest.fixture()
+def tree(tmp_path, monkeypatch):
+    root = tmp_path / "workspace"
+    for name in ("a.py", "b.txt", "src/c.py", "src/deep/d.py"):
+        _touch(str(root / name))
+    for i in range(50):
+        _touch(str(root / "node_modules" / f"pkg{i}" / "index.js"))
+
+    ensure = workspace.ensure_within_workspace
+    monkeypatch.setattr(
+        workspace,
+        "ensure_within_workspace",
+        lambda path: ensure(path, str(tmp_path)),
+    )
+    return root
+
+
+@pytest.fixture()
+def api():
+    app = FastAPI()
+    app.include_router(workspace.workspace_router)
+    return TestClient(app)
+
+
+def _list(api, **params):
+    return api.get(
+        "/workspace/list-directories",
+        params={"directory": "workspace", **params},
+    )
+
+
+def test_listing_filters_and_depth(tree, api):
+    body = _list(api, exclude="node_modules", max_depth=2).json()
+
+    assert [i["path"] for i in body["items"]] == [
+        "a.py",
+        "b.txt",
+        "src",
+        "src/c.py",
+        "src/deep",
+    ]
+    assert body["statistics"] == {"total_directories": 2, "total_files": 3}
+    assert body["next_cursor"] is None
+
+    body = _list(
+        api,
+        include="*.py",
+        exclude="node_modules",
+        stat=True,
+    ).json()
+    assert [i["path"] for i in body["items"]] == [
+        "a.py",
+        "src/c.py",
+        "src/deep/d.py",
+    ]
+    assert body["items"][0]["size"] == 1
+    assert "mtime" in body["items"][0]
+
+
+def test_listing_pagination_and_etag(tree, api):
+    paths, cursor = [], None
+    while True:
+        params = {"limit": 30}
+        if cursor:
+            params["cursor"] = cursor
+        body = _list(api, **params).json()
+        paths += [i["path"] for i in body["items"]]
+        cursor = body["next_cursor"]
+        if not cursor:
+            break
+
+    assert len(paths) == len(set(paths)) == 4 + 2 + 1 + 100
+    assert paths == sorted(paths)
+
+    first = _list(api, limit=10)
+    etag = first.headers["ETag"]
+    assert _list(api, limit=10).headers["ETag"] == etag
+    not_modified = api.get(
+        "/workspace/list-directories",
+        params={"directory": "workspace", "limit": 10},
+        headers={"If-None-Match": etag},
+    )
+    assert not_modified.status_code == 304
+
+    _touch(str(tree / "new.txt"))
+    changed = api.get(
+        "/workspace/list-directories",
+        params={"directory": "workspace", "limit": 10},
+        headers={"If-None-Match": etag},
+    )
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+
+def test_client_iterates_pages_lazily(tree, api, monkeypatch):
+    client = SandboxHttpClient(
+        ContainerModel(
+            session_id="s",
+            container_id="c",
+            container_name="n",
+            url="http://localhost:1/",
+            ports=[1],
+        ),
+    )
+    requests_made = []
+
+    def fake_request(method, url, **kwargs):
+        requests_made.append(kwargs["params"].get("cursor"))
+        kwargs.pop("timeout", None)
+        return api.request(method, url.split("/fastapi", 1)[-1], **kwargs)
+
+    monkeypatch.setattr(client, "_request", fake_request)
+
+    items = client.iter_workspace_directories(
+        "workspace",
+        exclude=["node_modules"],
+        page_size=2,
+    )
+    assert next(items)["path"] == "a.py"
+    assert len(requests_made) == 1
+
+    assert len(list(items)) == 5
+    assert len(requests_made) == 3
+
+    # Unchanged listing is served from the client cache after a 304
+    first = client.list_workspace_directories("workspace", limit=5)
+    assert client.list_workspace_directories("workspace", limit=5) == first
+    # Callers get their own copy of cached bodies
+    first["items"].clear()
+    assert client.list_workspace_directories("workspace", limit=5)["items"]
+
+
+def test_symlinked_directories_are_listed_not_followed(tree, api):
+    os.symlink(tree / "src", tree / "link")
+
+    body = _list(api, exclude="node_modules").json()
+
+    items = {i["path"]: i["type"] for i in body["items"]}
+    assert items["link"] == "directory"
+    assert "link/c.py" not in items
@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=redefined-outer-name,protected-access
+import asyncio
+import io
+import os
+import socket
+import tarfile
+import threading
+import time
+import zlib
+
+import pytest
+import requests
+import uvicorn
+from fastapi import FastAPI
+
+from agentscope_runtime.sandbox.box.shared.routers import workspace
+from agentscope_runtime.sandbox.client import (
+    SandboxHttpAsyncClient,
+    SandboxHttpClient,
+)
+from agentscope_runtime.sandbox.model import ContainerModel
+
+
+@pytest.fixture()
+def root(tmp_path, monkeypatch):
+    base = tmp_path / "workspace"
+    base.mkdir()
+    ensure = workspace.ensure_within_workspace
+    monkeypatch.setattr(
+        workspace,
+        "ensure_within_workspace",
+        lambda path: ensure(path, str(base)),
+    )
+    monkeypatch.setattr(workspace, "UPLOADS_DIR", str(tmp_path / "uploads"))
+    return base
+
+
+@pytest.fixture()
+def model(root):
+    app = FastAPI()
+    app.include_router(workspace.workspace_router, prefix="/fastapi")
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="error"),
+    )
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    yield ContainerModel(
+        session_id="s",
+        container_id="c",
+        container_name="n",
+        url=f"http://127.0.0.1:{port}/",
+        ports=[port],
+    )
+    server.should_exit = True
+    thread.join(5)
+
+
+PAYLOAD = os.urandom(300_000) + b"\x00" * 300_000
+
+
+@pytest.mark.parametrize("compression", [None, "gzip"])
+def test_upload_download_raw_bytes(model, root, compression):
+    client = SandboxHttpClient(model)
+
+    result = client.upload_workspace_file(
+        "bin/data.bin",
+        io.BytesIO(PAYLOAD),
+        compression=compression,
+    )
+    assert result["size"] == len(PAYLOAD)
+    assert (root / "bin" / "data.bin").read_bytes() == PAYLOAD
+
+    out = io.BytesIO()
+    result = client.download_workspace_file(
+        "bin/data.bin",
+        out,
+        compression=compression,
+    )
+    assert result["size"] == len(PAYLOAD)
+    assert out.getvalue() == PAYLOAD
+
+    part = io.BytesIO()
+    client.download_workspace_file("bin/data.bin", part, start=10, end=19)
+    assert part.getvalue() == PAYLOAD[10:20]
+
+
+def test_range_requests(model, root):
+    (root / "data.bin").write_bytes(PAYLOAD)
+    url = f"{model.url}fastapi/workspace/files"
+    params = {"file_path": "data.bin"}
+
+    for header, expected in [
+        ("bytes=10-19", PAYLOAD[10:20]),
+        ("bytes=599990-", PAYLOAD[599990:]),
+        ("bytes=-5", PAYLOAD[-5:]),
+        ("bytes=599995-700000", PAYLOAD[599995:]),
+    ]:
+        response = requests.get(url, params=params, headers={"Range": header})
+        assert response.status_code == 206
+        assert response.content == expected
+        assert response.headers["Content-Range"].endswith(f"/{len(PAYLOAD)}")
+
+    response = requests.get(
+        url,
+        params=params,
+        headers={"Range": f"bytes={len(PAYLOAD)}-"},
+    )
+    assert response.status_code == 416
+    assert response.headers["Content-Range"] == f"bytes */{len(PAYLOAD)}"
+
+
+def test_resumable_upload_resumes_after_failure(model, root, monkeypatch):
+    client = SandboxHttpClient(model)
+    original = client._request  # pylint: disable=protected-access
+    puts = []
+
+    def flaky(method, url, **kwargs):
+        if method == "put" and "/uploads/" in url:
+            puts.append(kwargs["params"]["offset"])
+            if len(puts) == 2:
+                raise requests.exceptions.ConnectionError("dropped")
+        return original(method, url, **kwargs)
+
+    monkeypatch.setattr(client, "_request", flaky)
+    result = client.upload_workspace_file_resumable(
+        "big.bin",
+        io.BytesIO(PAYLOAD),
+        chunk_size=200_000,
+    )
+
+    assert result["size"] == len(PAYLOAD)
+    assert (root / "big.bin").read_bytes() == PAYLOAD
+    # The failed chunk is re-sent from the offset the server reported
+    assert puts == [0, 200_000, 200_000, 400_000]
+
+
+def test_archive_export_import_roundtrip(model, root):
+    (root / "src" / "pkg").mkdir(parents=True)
+    (root / "src" / "pkg" / "a.txt").write_text("alpha")
+    (root / "src" / "b.bin").write_bytes(PAYLOAD)
+    client = SandboxHttpClient(model)
+
+    archive = io.BytesIO()
+    client.export_workspace_archive("src", archive, compression="gzip")
+    archive.seek(0)
+    with tarfile.open(fileobj=archive, mode="r") as tar:
+        assert sorted(tar.getnames()) == ["b.bin", "pkg", "pkg/a.txt"]
+
+    archive.seek(0)
+    result = client.import_workspace_archive("copy", archive, "gzip")
+    assert result["files"] == 3
+    assert (root / "copy" / "pkg" / "a.txt").read_text() == "alpha"
+    assert (root / "copy" / "b.bin").read_bytes() == PAYLOAD
+
+
+def test_archive_import_rejects_escaping_members(model, root):
+    archive = io.BytesIO()
+    with tarfile.open(fileobj=archive, mode="w") as tar:
+        info = tarfile.TarInfo("../evil.txt")
+        info.size = 4
+        tar.addfile(info, io.BytesIO(b"evil"))
+    archive.seek(0)
+
+    result = SandboxHttpClient(model).import_workspace_archive(
+        "dest",
+        archive,
+    )
+
+    assert result["isError"]
+    assert not (root / "evil.txt").exists()
+
+
+def test_async_client_transfers(model, root):
+    async def main():
+        client = SandboxHttpAsyncClient(model)
+        try:
+            await client.upload_workspace_file(
+                "async.bin",
+                io.BytesIO(PAYLOAD),
+                compression="gzip",
+            )
+            out = io.BytesIO()
+            result = await client.download_workspace_file(
+                "async.bin",
+                out,
+                compression="gzip",
+            )
+            resumable = await client.upload_workspace_file_resumable(
+                "async2.bin",
+                io.BytesIO(PAYLOAD),
+                chunk_size=250_000,
+            )
+        finally:
+            await client.aclose()
+        return out.getvalue(), result, resumable
+
+    data, result, resumable = asyncio.run(main())
+    assert data == PAYLOAD and result["size"] == len(PAYLOAD)
+    assert resumable["size"] == len(PAYLOAD)
+    assert (root / "async2.bin").read_bytes() == PAYLOAD
+
+
+def test_decompression_is_bounded():
+    bomb = zlib.compress(b"\x00" * (20 * workspace.TRANSFER_CHUNK_SIZE))
+    decompressor = zlib.decompressobj()
+
+    pieces = list(workspace._decompress(decompressor, bomb))
+
+    assert len(pieces) == 20
+    assert max(map(len, pieces)) == workspace.TRANSFER_CHUNK_SIZE
+
+
+def test_upload_busy_and_abandoned(model, root, monkeypatch):
+    client = SandboxHttpClient(model)
+    base = client.base_url
+    upload_id = requests.post(
+        f"{base}/workspace/uploads",
+        params={"file_path": "slow.bin"},
+        timeout=5,
+    ).json()["upload_id"]
+
+    # A chunk is being written
+    lock = asyncio.Lock()
+    asyncio.run(lock.acquire())
+    workspace._upload_locks[upload_id] = lock
+    r = requests.post(
+        f"{base}/workspace/uploads/{upload_id}/complete",
+        timeout=5,
+    )
+    assert r.status_code == 409
+    lock.release()
+
+    # Uploads idle for longer than the TTL are swept by the next one
+    monkeypatch.setattr(workspace, "UPLOAD_TTL", 0)
+    monkeypatch.setattr(workspace, "_uploads_swept_at", None)
+    requests.post(
+        f"{base}/workspace/uploads",
+        params={"file_path": "other.bin"},
+        timeout=5,
+    )
+    r = requests.get(f"{base}/workspace/uploads/{upload_id}", timeout=5)
+    assert r.status_code == 404
+    assert upload_id not in workspace._upload_locks